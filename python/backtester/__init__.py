@@ -1,5 +1,33 @@
-"""Backtest utilities package."""
+"""
+Backtest utilities package.
 
-from .simple_backtest import SimpleBacktest
+Public names are resolved lazily so ``import backtester`` (and CLI help
+screens) stay cheap; pandas/NumPy load on first use of an attribute.
+"""
 
-__all__ = ["SimpleBacktest"]
+from __future__ import annotations
+
+from importlib import import_module
+from typing import Any
+
+_EXPORTS = {
+    "BacktestClient": ".server",
+    "CrossSectionalMomentum": ".cross_sectional",
+    "ExchangeFile": ".binary_io",
+    "MultiStrategyBacktest": ".multi_strategy",
+    "PairsBacktest": ".pairs",
+    "ResultStore": ".result_store",
+    "SimpleBacktest": ".simple_backtest",
+    "Sweep": ".sweep",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,141 @@
+"""
+Batched evaluation of many ``SimpleBacktest`` variants over one symbol.
+
+A run goes through cached stages, each keyed by the parameters that feed it:
+
+    data        ``Dataset`` frame per (csv, precision, timeframe)
+    indicators  ``IndicatorStore`` array per indicator node
+    signals     ``Dataset`` signal memo per ``SimpleBacktest.signal_params()``
+    simulation  per variant
+
+so a sweep over simulation-only parameters (initial_capital, position_size,
+atr_multiplier, rsi_exit_threshold, allow_short on crossovers) parses the CSV,
+evaluates indicators, and generates signals once. Variants are then simulated
+in batches: signal-driven ones as rows of one positions -> equity pass, and
+position-dependent ones (ATR trailing stop, RSI exit, intrabar stop fills)
+that share bars as rows of one ``kernels.simulate_strategies`` walk, the
+same kernel ``SimpleBacktest.run`` uses (numba-compiled when installed).
+
+Example:
+    frame = run_variants(
+        "data/SPY.csv",
+        [{"atr_multiplier": m, "position_size": s} for m in (1.5, 2.0, 3.0) for s in (1, 5)],
+        base_params={"use_atr_trailing_stop": True},
+    )
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import indicators
+from .dataset import Dataset
+from .simple_backtest import SimpleBacktest, simulate_arrays
+from .simulation import (
+    TRADING_DAYS,
+    batch_metrics,
+    count_trades,
+    equity_from_positions,
+    periods_per_year,
+    positions_from_signals,
+)
+
+BATCH_METRICS = ["total_return", "sharpe_ratio", "max_drawdown", "total_trades"]
+
+Cell = Tuple[int, SimpleBacktest]
+
+
+def _is_path_dependent(backtest: SimpleBacktest) -> bool:
+    """True when run() rules depend on the open position (ATR stop or RSI exit)."""
+    required = backtest.required_indicators()
+    return (backtest.use_atr_trailing_stop and "atr" in required) or (
+        backtest.use_rsi_exit and "rsi" in required
+    )
+
+
+def evaluate_variants(
+    csv_file: str,
+    variants: Sequence[Dict[str, Any]],
+    dataset: Optional[Dataset] = None,
+    chunk_size: int = 512,
+) -> Dict[str, np.ndarray]:
+    """
+    Metric arrays aligned with ``variants`` (``SimpleBacktest`` keyword dicts).
+
+    Invalid configurations (constructor ``ValueError``) are left as NaN.
+    ``chunk_size`` bounds the number of variants simulated per batch.
+    """
+    dataset = dataset or Dataset(csv_file)
+    metrics = {name: np.full(len(variants), np.nan) for name in BATCH_METRICS}
+    pending: Dict[Hashable, List[Cell]] = {}
+
+    def store(cells: List[Cell], equity: np.ndarray, trades: np.ndarray, periods: float) -> None:
+        values = batch_metrics(equity, periods)
+        values["total_trades"] = trades
+        for row, (index, _) in enumerate(cells):
+            for name in BATCH_METRICS:
+                metrics[name][index] = values[name][row]
+
+    def flush(key: Hashable) -> None:
+        cells = pending.pop(key, [])
+        if not cells:
+            return
+        first = cells[0][1]
+        close = first.indicators.get(indicators.CLOSE)
+        periods = TRADING_DAYS if first.timeframe is None else periods_per_year(first.data["Date"])
+        if key[0] == "signals":
+            positions = np.vstack(
+                [positions_from_signals(backtest.signals, backtest.allow_short) for _, backtest in cells]
+            )
+            equity = equity_from_positions(close, positions, first.initial_capital, first.position_size)
+            store(cells, equity, count_trades(positions), periods)
+            return
+        _, equity, exit_prices, _, final_exit = simulate_arrays([backtest for _, backtest in cells])
+        store(cells, equity, (~np.isnan(exit_prices)).sum(axis=1) + final_exit, periods)
+
+    for index, params in enumerate(variants):
+        try:
+            backtest = SimpleBacktest(csv_file, **params)
+        except ValueError:
+            continue  # e.g. fast_window >= slow_window
+        backtest.load_data(dataset)
+        backtest.calculate_indicators()
+        backtest.generate_signals()
+        frame_key = (backtest.precision, backtest.timeframe)
+        if not _is_path_dependent(backtest):
+            # Positions follow from signals: rows of any signals share one pass.
+            key: Hashable = ("signals", frame_key, backtest.initial_capital, backtest.position_size)
+        else:
+            # Every variant on the same bars is one row of a single kernel walk.
+            key = ("path", frame_key)
+        pending.setdefault(key, []).append((index, backtest))
+        if len(pending[key]) >= chunk_size:
+            flush(key)
+    for key in list(pending):
+        flush(key)
+    return metrics
+
+
+def run_variants(
+    csv_file: str,
+    variants: Sequence[Dict[str, Any]],
+    base_params: Optional[Dict[str, Any]] = None,
+    dataset: Optional[Dataset] = None,
+    chunk_size: int = 512,
+) -> pd.DataFrame:
+    """
+    Evaluate ``base_params`` updated with each variant dict.
+
+    Returns one row per variant: the variant's own parameters followed by
+    ``BATCH_METRICS`` (NaN for invalid configurations).
+    """
+    base_params = dict(base_params or {})
+    configs = [{**base_params, **variant} for variant in variants]
+    metrics = evaluate_variants(csv_file, configs, dataset=dataset, chunk_size=chunk_size)
+    frame = pd.DataFrame([dict(variant) for variant in variants], index=range(len(variants)))
+    for name in BATCH_METRICS:
+        frame[name] = metrics[name]
+    return frame
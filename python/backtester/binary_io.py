@@ -0,0 +1,262 @@
+"""
+Fixed-layout binary exchange file for signals, indicators, and trades.
+
+The file replaces ``signals.csv`` as the hand-off to the downstream (C++) order
+executor. Everything is little-endian and every column is a contiguous,
+64-byte-aligned array, so a consumer can ``mmap`` the file and point at the
+columns directly without parsing text. The full layout is documented in
+``docs/BINARY_EXCHANGE_FORMAT.md``:
+
+    header (64 bytes) | table directory (32 bytes/table)
+    | column descriptors (48 bytes/column) | column data (64-byte aligned)
+
+Tables written from a ``SimpleBacktest``:
+    signals: date, close, signal, plus one column per indicator role
+             (fast, slow, rsi, atr, bb_*, macd*, donchian_*)
+    trades:  entry_date, entry_price, exit_date, exit_price, quantity, pnl
+
+Example:
+    write_backtest(backtest, "results/SPY_signals.qtbx")
+    with ExchangeFile("results/SPY_signals.qtbx") as exchange:
+        signals = exchange.table("signals")     # zero-copy NumPy views
+        print(exchange.symbol, signals["signal"][-5:])
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .dataset import symbol_from_path
+
+if TYPE_CHECKING:
+    from .simple_backtest import SimpleBacktest
+
+MAGIC = b"QTBXCHG\x00"
+VERSION = 1
+ALIGNMENT = 64
+
+# magic, version, header size, table count, symbol, strategy, initial capital, position size, reserved
+HEADER = struct.Struct("<8sHHI16s16sdi4x")
+# name, row count, column count, reserved
+TABLE_ENTRY = struct.Struct("<16sQI4x")
+# name, dtype code, reserved, data offset, data size in bytes
+COLUMN_ENTRY = struct.Struct("<24sB7xQQ")
+
+# dtype code -> NumPy dtype; datetimes are int64 nanoseconds since the Unix epoch (UTC).
+DTYPE_CODES: Dict[int, np.dtype] = {
+    1: np.dtype("<i1"),
+    2: np.dtype("<i4"),
+    3: np.dtype("<i8"),
+    4: np.dtype("<f4"),
+    5: np.dtype("<f8"),
+    6: np.dtype("<M8[ns]"),
+}
+_CODE_FOR_DTYPE = {dtype: code for code, dtype in DTYPE_CODES.items()}
+
+Table = Dict[str, np.ndarray]
+
+
+def _fixed(text: str, size: int, what: str) -> bytes:
+    encoded = text.encode("ascii")
+    if len(encoded) >= size:
+        raise ValueError(f"{what} '{text}' is longer than {size - 1} bytes.")
+    return encoded
+
+
+def _text(raw: bytes) -> str:
+    return raw.split(b"\x00", 1)[0].decode("ascii")
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _little_endian(values: np.ndarray) -> np.ndarray:
+    values = np.asarray(values)
+    if values.dtype.kind == "M":
+        values = values.astype("datetime64[ns]")
+    dtype = values.dtype.newbyteorder("<")
+    if dtype not in _CODE_FOR_DTYPE:
+        raise ValueError(f"Unsupported column dtype: {values.dtype}")
+    return np.ascontiguousarray(values, dtype=dtype)
+
+
+def write_tables(
+    path: Union[str, Path],
+    tables: Dict[str, Table],
+    symbol: str = "",
+    strategy: str = "",
+    initial_capital: float = 0.0,
+    position_size: int = 0,
+) -> Path:
+    """
+    Write named tables of equal-length columns to ``path``.
+
+    The file is written to a temporary name and renamed into place, so readers
+    never observe a partially written file.
+    """
+    layout: List[Tuple[str, int, List[Tuple[str, np.ndarray]]]] = []
+    for table_name, columns in tables.items():
+        arrays = [(name, _little_endian(values)) for name, values in columns.items()]
+        lengths = {len(values) for _, values in arrays}
+        if len(lengths) > 1:
+            raise ValueError(f"Columns of table '{table_name}' have different lengths: {sorted(lengths)}")
+        layout.append((table_name, lengths.pop() if lengths else 0, arrays))
+
+    column_count = sum(len(arrays) for _, _, arrays in layout)
+    offset = _align(HEADER.size + TABLE_ENTRY.size * len(layout) + COLUMN_ENTRY.size * column_count)
+    directory = bytearray()
+    descriptors = bytearray()
+    blocks: List[Tuple[int, np.ndarray]] = []
+    for table_name, rows, arrays in layout:
+        directory += TABLE_ENTRY.pack(_fixed(table_name, 16, "Table name"), rows, len(arrays))
+        for name, values in arrays:
+            descriptors += COLUMN_ENTRY.pack(
+                _fixed(name, 24, "Column name"), _CODE_FOR_DTYPE[values.dtype], offset, values.nbytes
+            )
+            blocks.append((offset, values))
+            offset = _align(offset + values.nbytes)
+
+    header = HEADER.pack(
+        MAGIC,
+        VERSION,
+        HEADER.size,
+        len(layout),
+        _fixed(symbol, 16, "Symbol"),
+        _fixed(strategy, 16, "Strategy"),
+        float(initial_capital),
+        int(position_size),
+    )
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("wb") as handle:
+        handle.write(header)
+        handle.write(directory)
+        handle.write(descriptors)
+        for block_offset, values in blocks:
+            handle.write(b"\x00" * (block_offset - handle.tell()))
+            handle.write(values.view(np.uint8))
+        handle.write(b"\x00" * (offset - handle.tell()))
+    os.replace(tmp_path, path)
+    return path
+
+
+def backtest_tables(backtest: SimpleBacktest) -> Dict[str, Table]:
+    """Signals (with indicator columns) and the trade ledger of a backtest as arrays."""
+    backtest._ensure_signals()
+    signals: Table = {
+        "date": backtest.data["Date"].to_numpy(dtype="datetime64[ns]"),
+        "close": backtest.data["Close"].to_numpy(),
+        "signal": backtest.signals,
+    }
+    for role, node in backtest.required_indicators().items():
+        signals[role] = backtest.indicators.get(node)
+    trades = backtest.trades
+    ledger: Table = {
+        "entry_date": np.array([trade.entry_date for trade in trades], dtype="datetime64[ns]"),
+        "entry_price": np.array([trade.entry_price for trade in trades], dtype=np.float64),
+        "exit_date": np.array([trade.exit_date for trade in trades], dtype="datetime64[ns]"),
+        "exit_price": np.array([trade.exit_price for trade in trades], dtype=np.float64),
+        "quantity": np.array([trade.quantity for trade in trades], dtype=np.int64),
+        "pnl": np.array([trade.pnl for trade in trades], dtype=np.float64),
+    }
+    return {"signals": signals, "trades": ledger}
+
+
+def write_backtest(backtest: SimpleBacktest, path: Union[str, Path]) -> Path:
+    """Export a backtest's signals, indicators, and trades (signals must be generated)."""
+    return write_tables(
+        path,
+        backtest_tables(backtest),
+        symbol=symbol_from_path(backtest.csv_file),
+        strategy=backtest.strategy,
+        initial_capital=backtest.initial_capital,
+        position_size=backtest.position_size,
+    )
+
+
+class ExchangeFile:
+    """
+    Memory-mapped reader for exchange files.
+
+    Column arrays are read-only views into the mapping. ``close()`` unmaps the
+    file once no such view is alive; otherwise the mapping is released with them.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._tables = self._parse()
+        except Exception:
+            self._mmap.close()
+            raise
+
+    def _parse(self) -> Dict[str, Table]:
+        buffer = self._mmap
+        if len(buffer) < HEADER.size:
+            raise ValueError(f"{self.path} is too small to be an exchange file.")
+        magic, version, header_size, table_count, symbol, strategy, capital, size = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not an exchange file (bad magic {magic!r}).")
+        if version != VERSION:
+            raise ValueError(f"Unsupported exchange file version {version} (expected {VERSION}).")
+        self.symbol = _text(symbol)
+        self.strategy = _text(strategy)
+        self.initial_capital = capital
+        self.position_size = size
+
+        entries = [
+            TABLE_ENTRY.unpack_from(buffer, header_size + index * TABLE_ENTRY.size) for index in range(table_count)
+        ]
+        position = header_size + table_count * TABLE_ENTRY.size
+        tables: Dict[str, Table] = {}
+        for raw_name, rows, column_count in entries:
+            columns: Table = {}
+            for _ in range(column_count):
+                raw_column, code, offset, nbytes = COLUMN_ENTRY.unpack_from(buffer, position)
+                position += COLUMN_ENTRY.size
+                dtype = DTYPE_CODES.get(code)
+                if dtype is None:
+                    raise ValueError(f"Unknown dtype code {code} in {self.path}.")
+                if nbytes != rows * dtype.itemsize or offset + nbytes > len(buffer):
+                    raise ValueError(f"Column '{_text(raw_column)}' in {self.path} is truncated or corrupt.")
+                columns[_text(raw_column)] = np.frombuffer(buffer, dtype=dtype, count=rows, offset=offset)
+            tables[_text(raw_name)] = columns
+        return tables
+
+    @property
+    def table_names(self) -> List[str]:
+        return list(self._tables)
+
+    def table(self, name: str) -> Table:
+        """Columns of ``name`` as zero-copy NumPy arrays."""
+        if name not in self._tables:
+            raise KeyError(f"No table '{name}' in {self.path}; available: {self.table_names}")
+        return self._tables[name]
+
+    def to_frame(self, name: str) -> pd.DataFrame:
+        """Copy a table into a DataFrame."""
+        return pd.DataFrame({column: values.copy() for column, values in self.table(name).items()})
+
+    def close(self) -> None:
+        self._tables = {}
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass  # arrays handed out are still alive; the mapping is released with them
+
+    def __enter__(self) -> "ExchangeFile":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,202 @@
+"""
+Crash-safe checkpoints for long sweeps and parameter searches.
+
+A ``Checkpoint`` is an append-only JSON-lines journal: one header line with
+a fingerprint of the work (config, options), then one line per completed
+unit of work holding its key and a small payload (usually the summary
+metrics). Each line is flushed and fsynced before the next unit counts as
+done. A crash therefore loses at most the units in flight. A torn final
+line is detected and cut off when the journal is reopened. Restarting with
+the same fingerprint skips every journaled key; a different fingerprint is
+refused so stale results never mix with new ones.
+
+``run_resumable`` drives a lazy stream of ``(key, task)`` pairs through a
+function, serially or in a process pool with a bounded number of tasks in
+flight. It skips finished keys and journals each result through
+``on_result`` as soon as it arrives. On Ctrl-C it stops submitting, lets
+the tasks already running finish and journals them, then re-raises
+``KeyboardInterrupt``. Pool workers ignore SIGINT so this drain is not cut short.
+
+Example:
+    with Checkpoint("results/sweep.journal", fingerprint=spec_hash) as checkpoint:
+        run_resumable(
+            ((run_key(config), config) for config in sweep),
+            run_one,
+            checkpoint,
+            on_result=lambda key, config, metrics: metrics,
+            workers=4,
+        )
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import signal
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Set, Tuple, Union
+
+
+def run_key(config: Dict[str, Any]) -> str:
+    """Stable key for one run config (order-independent)."""
+    payload = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:20]
+
+
+def fingerprint(*parts: Any) -> str:
+    """Hash of everything that changes what a journal's results mean."""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:20]
+
+
+class Checkpoint:
+    """Append-only, fsynced journal of completed work keys and their payloads."""
+
+    def __init__(self, path: Union[str, Path], fingerprint: str = "", resume: bool = True) -> None:
+        """
+        Args:
+            path: Journal file (created with its parent directory if missing).
+            fingerprint: Identifies the work; reopening with a different one raises ValueError.
+            resume: Keep and continue an existing journal; False starts over.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.fingerprint = fingerprint
+        if not resume and self.path.exists():
+            self.path.unlink()
+        self._keys: Set[str] = set()
+        self.resumed = 0
+        if self.path.exists():
+            self._load()
+            self.resumed = len(self._keys)
+        self._file = open(self.path, "a", encoding="utf-8")
+        if self._file.tell() == 0:
+            self._write({"fingerprint": fingerprint})
+
+    def _load(self) -> None:
+        good = 0
+        with open(self.path, "rb") as handle:
+            for number, line in enumerate(handle):
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break  # torn write from a crash; everything after it is dropped
+                if not line.endswith(b"\n"):
+                    break
+                if number == 0:
+                    if entry.get("fingerprint") != self.fingerprint:
+                        raise ValueError(
+                            f"Checkpoint {self.path} belongs to different work "
+                            "(config or options changed); start over to replace it."
+                        )
+                else:
+                    self._keys.add(entry["key"])
+                good += len(line)
+        if good < self.path.stat().st_size:
+            with open(self.path, "r+b") as handle:
+                handle.truncate(good)
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(entry, default=str) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def record(self, key: str, payload: Any = None) -> None:
+        """Mark ``key`` done; durable once this returns."""
+        self._write({"key": key, "payload": payload})
+        self._keys.add(key)
+
+    def payloads(self) -> Iterator[Tuple[str, Any]]:
+        """Journaled ``(key, payload)`` pairs, streamed from disk in completion order."""
+        self._file.flush()
+        with open(self.path, "r", encoding="utf-8") as handle:
+            next(handle, None)
+            for line in handle:
+                entry = json.loads(line)
+                yield entry["key"], entry["payload"]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self) -> "Checkpoint":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def _ignore_sigint() -> None:
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def run_resumable(
+    tasks: Iterable[Tuple[str, Any]],
+    function: Callable[[Any], Any],
+    checkpoint: Checkpoint,
+    on_result: Callable[[str, Any, Any], Any],
+    workers: int = 1,
+    max_pending: Optional[int] = None,
+) -> int:
+    """
+    Run every task whose key is not journaled yet; returns how many ran.
+
+    Args:
+        tasks: Lazy ``(key, task)`` pairs; keys must be unique.
+        function: Called with each task (in a worker process when ``workers > 1``,
+            so it and the tasks must be picklable).
+        checkpoint: Journal of finished keys.
+        on_result: Called in this process as ``on_result(key, task, result)`` to write
+            outputs; its return value is the journal payload.
+        workers: Worker processes (1 = in-process).
+        max_pending: Tasks submitted ahead of completion (default: 4 per worker).
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1.")
+    pending_tasks = ((key, task) for key, task in tasks if key not in checkpoint)
+    completed = 0
+    if workers == 1:
+        for key, task in pending_tasks:
+            result = function(task)
+            checkpoint.record(key, on_result(key, task, result))
+            completed += 1
+        return completed
+
+    limit = max_pending or workers * 4
+    in_flight: Dict[Future, Tuple[str, Any]] = {}
+
+    def collect(done: Iterable[Future]) -> None:
+        nonlocal completed
+        for future in done:
+            key, task = in_flight.pop(future)
+            checkpoint.record(key, on_result(key, task, future.result()))
+            completed += 1
+
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_ignore_sigint)
+    try:
+        for key, task in pending_tasks:
+            while len(in_flight) >= limit:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+            in_flight[pool.submit(function, task)] = (key, task)
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            collect(done)
+    except KeyboardInterrupt:
+        # Drop queued tasks, then journal the ones already running.
+        for future in list(in_flight):
+            if future.cancel():
+                in_flight.pop(future)
+        collect(list(in_flight))
+        raise
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+    return completed
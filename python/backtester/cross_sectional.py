@@ -0,0 +1,337 @@
+"""
+Cross-sectional momentum over a universe of symbols.
+
+Where ``SimpleBacktest`` trades one symbol against its own history, this
+ranks a whole universe on every rebalance date and holds the top ``top_k``
+symbols long (and optionally the bottom ``bottom_k`` short), equal weight
+per leg. Everything is computed on (dates x symbols) matrices:
+
+    panel        Close/High/Low aligned on the union of dates (``load_panel``)
+    indicators   the usual indicator graph, evaluated column-wise on the panel
+    scores       lookback return, or return / volatility of daily returns
+    selection    one ``argpartition`` per leg over the rebalance rows
+    equity       held weights drift with prices between rebalances
+
+Trend (Close vs moving average) and volatility (ATR / Close) filters reuse the
+indicator helpers. Weights are set at the rebalance bar's close, like
+``SimpleBacktest``'s market-on-close fills. Symbols enter the ranking once
+they have enough history, and drop out after their last bar. A held symbol
+that stops trading keeps its last price until the next rebalance.
+
+Example:
+    panel = load_panel(sorted(Path("data/universe").glob("*.csv")))
+    strategy = CrossSectionalMomentum(panel, lookback=126, skip=21, top_k=20, trend_window=200)
+    strategy.run()
+    print(strategy.get_results())
+    weights = strategy.get_weights()   # rebalance dates x symbols
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from . import indicators
+from .dataset import PRECISIONS, read_ohlcv_csv, symbol_from_path
+from .indicators import Indicator, IndicatorStore
+from .simulation import batch_metrics, periods_per_year
+
+RANKINGS = ("return", "vol_adjusted")
+PANEL_FIELDS = ("Close", "High", "Low")
+
+Panel = Dict[str, pd.DataFrame]
+
+
+def load_panel(paths: Sequence[Union[str, Path]], fields: Sequence[str] = PANEL_FIELDS) -> Panel:
+    """
+    Read one OHLCV CSV per symbol into ``field -> DataFrame(dates x symbols)``.
+
+    Dates are the union across files; a symbol is NaN before its first and
+    after its last bar, and gaps inside its history are forward-filled.
+    Symbols come from ``symbol_from_path`` and must be unique.
+    """
+    if not paths:
+        raise ValueError("At least one CSV is required to build a panel.")
+    columns: Dict[str, Dict[str, pd.Series]] = {field: {} for field in fields}
+    for path in paths:
+        symbol = symbol_from_path(path)
+        if symbol in columns[fields[0]]:
+            raise ValueError(f"Duplicate symbol {symbol} in universe ({path}).")
+        frame = read_ohlcv_csv(path).drop_duplicates("Date", keep="last").set_index("Date")
+        for field in fields:
+            if field not in frame.columns:
+                raise ValueError(f"{path} is missing column {field}")
+            columns[field][symbol] = frame[field]
+    return {field: _listed_ffill(pd.concat(series, axis=1).sort_index()) for field, series in columns.items()}
+
+
+def _listed_ffill(frame: pd.DataFrame) -> pd.DataFrame:
+    """Forward-fill gaps only between each column's first and last valid value."""
+    return frame.ffill().where(frame.bfill().notna())
+
+
+class PanelStore(IndicatorStore):
+    """``IndicatorStore`` whose columns are (dates x symbols) matrices."""
+
+    def __init__(self, panel: Panel, dtype: Any = np.float64) -> None:
+        super().__init__(pd.DataFrame(), dtype)
+        self._panel = panel
+
+    def _column(self, name: str) -> np.ndarray:
+        if name not in self._panel:
+            raise RuntimeError(f"Panel missing required field for indicators: {name}")
+        return self._panel[name].to_numpy(dtype=self.dtype, copy=True)
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Column indices of the ``k`` highest finite scores in each row (unordered).
+
+    Returns ``(indices, valid)``, both (rows, k); ``valid`` is False where a
+    row has fewer than ``k`` finite scores and the slot is padding.
+    """
+    rows, columns = scores.shape
+    k = min(k, columns)
+    keys = np.where(np.isnan(scores), np.inf, -scores)
+    if k < columns:
+        indices = np.argpartition(keys, k - 1, axis=1)[:, :k]
+    else:
+        indices = np.broadcast_to(np.arange(columns), (rows, columns)).copy()
+    valid = np.isfinite(np.take_along_axis(keys, indices, axis=1))
+    return indices, valid
+
+
+class CrossSectionalMomentum:
+    """Rank a symbol universe by momentum and hold the top (and bottom) k."""
+
+    def __init__(
+        self,
+        panel: Panel,
+        lookback: int = 126,
+        skip: int = 0,
+        ranking: str = "return",
+        vol_window: int = 63,
+        top_k: int = 10,
+        bottom_k: int = 0,
+        rebalance_every: int = 1,
+        trend_window: Optional[int] = None,
+        moving_average: str = "sma",
+        atr_period: int = 14,
+        max_atr_pct: Optional[float] = None,
+        cost_bps: float = 0.0,
+        initial_capital: float = 100_000.0,
+        precision: str = "float64",
+    ) -> None:
+        """
+        Args:
+            panel: ``field -> DataFrame(dates x symbols)``; needs Close, plus
+                High/Low when ``max_atr_pct`` is set.
+            lookback: Bars of return used for ranking.
+            skip: Most recent bars excluded from the lookback (e.g. 21 for 12-1 momentum).
+            ranking: "return" or "vol_adjusted" (return / std of daily returns over ``vol_window``).
+            top_k: Symbols held long, each at 1/top_k of equity.
+            bottom_k: Symbols held short, each at -1/bottom_k of equity (0 = long only).
+            rebalance_every: Bars between rebalances (1 = daily).
+            trend_window: Only long above / short below this moving average of Close.
+            moving_average: "sma", "ema", "wma", or "wema" for the trend filter.
+            atr_period: ATR window for the volatility filter.
+            max_atr_pct: Skip symbols whose ATR / Close exceeds this fraction.
+            cost_bps: Cost charged on traded notional at each rebalance, in basis points.
+            initial_capital: Starting equity.
+            precision: "float64" or "float32" for the panel and indicators.
+        """
+        if "Close" not in panel:
+            raise ValueError("Panel needs a Close field.")
+        if ranking not in RANKINGS:
+            raise ValueError(f"Unsupported ranking: {ranking}. Choose from {RANKINGS}")
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unsupported precision: {precision}. Choose from {sorted(PRECISIONS)}")
+        if lookback < 1 or skip < 0 or vol_window < 2 or rebalance_every < 1:
+            raise ValueError("lookback and rebalance_every must be >= 1, vol_window >= 2, and skip >= 0.")
+        if top_k < 0 or bottom_k < 0 or top_k + bottom_k == 0:
+            raise ValueError("top_k and bottom_k must be non-negative and hold at least one symbol.")
+        if max_atr_pct is not None and max_atr_pct <= 0:
+            raise ValueError("max_atr_pct must be positive.")
+
+        self.panel = panel
+        self.lookback = lookback
+        self.skip = skip
+        self.ranking = ranking
+        self.vol_window = vol_window
+        self.top_k = top_k
+        self.bottom_k = bottom_k
+        self.rebalance_every = rebalance_every
+        self.trend_window = trend_window
+        self.moving_average = moving_average
+        self.atr_period = atr_period
+        self.max_atr_pct = max_atr_pct
+        self.cost_bps = cost_bps
+        self.initial_capital = initial_capital
+        self.precision = precision
+
+        close = panel["Close"]
+        self.dates = pd.DatetimeIndex(close.index)
+        self.symbols: List[str] = [str(symbol) for symbol in close.columns]
+        self.indicators = PanelStore(panel, PRECISIONS[precision])
+        self.rebalance_rows = np.arange(0, len(self.dates), rebalance_every)
+        self._holdings: Optional[np.ndarray] = None
+        self._weights: Optional[np.ndarray] = None
+        self._turnover: Optional[np.ndarray] = None
+        self._equity: pd.Series = pd.Series(dtype=float)
+        self._results: Dict[str, float] = {}
+        self.required_indicators()  # validates moving_average early
+
+    @classmethod
+    def from_csv(cls, paths: Sequence[Union[str, Path]], **params: Any) -> "CrossSectionalMomentum":
+        fields = ["Close"] if params.get("max_atr_pct") is None else list(PANEL_FIELDS)
+        return cls(load_panel(paths, fields), **params)
+
+    # ------------------------------------------------------------------ #
+    # Scores and selection
+    # ------------------------------------------------------------------ #
+    def required_indicators(self) -> Dict[str, Indicator]:
+        close = indicators.CLOSE
+        nodes = {"momentum": indicators.returns(indicators.lag(close, self.skip), self.lookback)}
+        if self.ranking == "vol_adjusted":
+            nodes["volatility"] = indicators.rolling_std(indicators.returns(close, 1), self.vol_window)
+        if self.trend_window is not None:
+            nodes["trend"] = indicators.moving_average(self.moving_average, close, self.trend_window)
+        if self.max_atr_pct is not None:
+            nodes["atr"] = indicators.atr(self.atr_period)
+        return nodes
+
+    def scores(self) -> np.ndarray:
+        """Ranking score per (rebalance row, symbol); NaN where not rankable."""
+        nodes = self.required_indicators()
+        rows = self.rebalance_rows
+        scores = np.array(self.indicators.get(nodes["momentum"])[rows], dtype=np.float64)
+        if "volatility" in nodes:
+            volatility = self.indicators.get(nodes["volatility"])[rows]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                scores = np.where(volatility > 0, scores / volatility, np.nan)
+        if "atr" in nodes:
+            close = self.indicators.get(indicators.CLOSE)[rows]
+            with np.errstate(invalid="ignore"):
+                calm = self.indicators.get(nodes["atr"])[rows] <= self.max_atr_pct * close
+            scores[~calm] = np.nan
+        return scores
+
+    def _select(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(holdings, weights), both (rebalances, top_k + bottom_k); weight 0 marks an empty slot."""
+        scores = self.scores()
+        long_scores, short_scores = scores, -scores
+        if self.trend_window is not None:
+            rows = self.rebalance_rows
+            close = self.indicators.get(indicators.CLOSE)[rows]
+            trend = self.indicators.get(self.required_indicators()["trend"])[rows]
+            long_scores = np.where(close > trend, scores, np.nan)
+            short_scores = np.where(close < trend, -scores, np.nan)
+
+        holdings, weights = [], []
+        if self.top_k:
+            indices, valid = top_k_indices(long_scores, self.top_k)
+            holdings.append(indices)
+            weights.append(np.where(valid, 1.0 / self.top_k, 0.0))
+        if self.bottom_k:
+            if self.top_k:
+                # A symbol already held long is not shorted on the same date.
+                np.put_along_axis(short_scores, holdings[0], np.nan, axis=1)
+            indices, valid = top_k_indices(short_scores, self.bottom_k)
+            holdings.append(indices)
+            weights.append(np.where(valid, -1.0 / self.bottom_k, 0.0))
+        return np.hstack(holdings), np.hstack(weights)
+
+    # ------------------------------------------------------------------ #
+    # Simulation
+    # ------------------------------------------------------------------ #
+    def run(self) -> None:
+        """Select holdings on every rebalance row and build the equity curve."""
+        holdings, weights = self._select()
+        rows = self.rebalance_rows
+        # Valuation prices: a held symbol that stops trading keeps its last price.
+        marks = self.panel["Close"].ffill().to_numpy(dtype=np.float64)
+        cash = 1.0 - weights.sum(axis=1)
+
+        # Segment s is held from the close of rows[s] to the close of rows[s + 1].
+        bars = len(self.dates)
+        segment = np.searchsorted(rows, np.arange(bars), side="right") - 1
+        held = segment[:-1]
+        base = marks[rows][np.arange(len(rows))[:, None], holdings]
+        base = np.where(weights != 0, base, 1.0)
+
+        def value(at: np.ndarray, segments: np.ndarray) -> np.ndarray:
+            """Value of segment ``segments[i]``'s book at bar ``at[i]`` per unit of equity at its rebalance."""
+            prices = marks[at[:, None], holdings[segments]]
+            growth = np.where(weights[segments] != 0, prices / base[segments], 0.0)
+            return cash[segments] + (weights[segments] * growth).sum(axis=1)
+
+        step = np.arange(1, bars)
+        end_value = value(step, held)
+        start_value = value(step - 1, held)
+        returns = np.zeros(bars)
+        returns[1:] = end_value / start_value - 1
+
+        # Turnover against the previous book drifted to the rebalance close.
+        dense_new = np.zeros((len(rows), len(self.symbols)))
+        np.add.at(dense_new, (np.arange(len(rows))[:, None], holdings), weights)
+        drifted = np.zeros_like(dense_new)
+        if len(rows) > 1:
+            previous = np.arange(len(rows) - 1)
+            prices = marks[rows[1:, None], holdings[previous]]
+            growth = np.where(weights[previous] != 0, prices / base[previous], 0.0)
+            book_value = value(rows[1:], previous)
+            np.add.at(drifted[1:], (previous[:, None], holdings[previous]), weights[previous] * growth / book_value[:, None])
+        self._turnover = np.abs(dense_new - drifted).sum(axis=1)
+
+        factors = 1 + returns
+        factors[rows] *= 1 - self._turnover * self.cost_bps / 10_000
+        self._equity = pd.Series(self.initial_capital * np.cumprod(factors), index=self.dates, name="equity")
+        self._holdings, self._weights = holdings, weights
+
+        metrics = batch_metrics(self._equity.to_numpy(), periods_per_year(self.dates))
+        self._results = {
+            "total_return": round(float(metrics["total_return"][0]), 2),
+            "max_drawdown": round(float(metrics["max_drawdown"][0]), 2),
+            "sharpe_ratio": round(float(metrics["sharpe_ratio"][0]), 2),
+            "rebalances": int(len(rows)),
+            "avg_holdings": round(float((weights != 0).sum(axis=1).mean()), 2),
+            "avg_turnover": round(float(self._turnover.mean() * 100), 2),
+        }
+
+    # ------------------------------------------------------------------ #
+    # Results
+    # ------------------------------------------------------------------ #
+    def get_results(self) -> Dict[str, float]:
+        if not self._results:
+            raise RuntimeError("Backtest has not been run yet.")
+        return self._results
+
+    def get_equity_curve(self) -> pd.Series:
+        if self._equity.empty:
+            raise RuntimeError("Backtest has not been run yet.")
+        return self._equity.copy()
+
+    def get_weights(self) -> pd.DataFrame:
+        """Target weights set at each rebalance date (rebalance dates x symbols)."""
+        if self._holdings is None or self._weights is None:
+            raise RuntimeError("Backtest has not been run yet.")
+        dense = np.zeros((len(self.rebalance_rows), len(self.symbols)))
+        np.add.at(dense, (np.arange(len(self.rebalance_rows))[:, None], self._holdings), self._weights)
+        return pd.DataFrame(dense, index=self.dates[self.rebalance_rows], columns=self.symbols)
+
+    def get_holdings(self) -> pd.DataFrame:
+        """Long table of (Date, Symbol, Weight) for every non-empty slot, by date."""
+        if self._holdings is None or self._weights is None:
+            raise RuntimeError("Backtest has not been run yet.")
+        rows, slots = np.nonzero(self._weights)
+        frame = pd.DataFrame(
+            {
+                "Date": self.dates[self.rebalance_rows[rows]],
+                "Symbol": np.asarray(self.symbols, dtype=object)[self._holdings[rows, slots]],
+                "Weight": self._weights[rows, slots],
+            }
+        )
+        return frame.sort_values(["Date", "Weight", "Symbol"], ascending=[True, False, True], ignore_index=True)
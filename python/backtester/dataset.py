@@ -0,0 +1,213 @@
+"""
+Shared OHLCV datasets for running many backtests over the same CSV.
+
+A ``Dataset`` parses its CSV once (lazily, on first access) and owns the
+``IndicatorStore`` for that frame, so every ``SimpleBacktest`` that is handed
+the same dataset reuses both the parsed frame and any indicator node another
+run already evaluated. ``DatasetCache`` hands out one ``Dataset`` per file.
+Lazy parsing and cache lookups are guarded by locks so threads may share them.
+Frames and stores are kept per (precision, timeframe); resampled timeframes
+come from a ``ResampleCache`` (see ``backtester.resample``). Signal arrays are
+memoized too, keyed by the parameters that feed signal generation, so runs
+that differ only in simulation settings (capital, size, stops) share them.
+That memo is a bounded LRU (``max_signals`` arrays), so a long-lived process
+sweeping grids of one-off signal keys does not grow without limit.
+
+Example:
+    cache = DatasetCache()
+    for params in runs:
+        backtest = SimpleBacktest(csv_path, **params)
+        backtest.load_data(cache.get(csv_path))
+        backtest.calculate_indicators()
+        ...
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .indicators import IndicatorStore
+from .resample import ResampleCache, default_cache
+
+REQUIRED_COLUMNS = {"Date", "Close"}
+NUMERIC_COLUMNS = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+PRECISIONS = {"float64": np.float64, "float32": np.float32}
+_SYMBOL_PATTERN = re.compile(r"^(.+?)_\d{4}-\d{2}-\d{2}")
+
+
+def symbol_from_path(path: Union[str, Path]) -> str:
+    """Derive a ticker from names like ``SPY_2025-11-01_2020-01-01.csv`` or ``AAPL.csv``."""
+    stem = Path(path).stem
+    match = _SYMBOL_PATTERN.match(stem)
+    return (match.group(1) if match else stem).upper()
+
+
+def source_key(path: Union[str, Path]) -> str:
+    """Cache key for a CSV: its symbol plus a hash of the resolved path, so same-stem files never collide."""
+    digest = hashlib.sha1(str(Path(path).resolve()).encode("utf-8")).hexdigest()[:12]
+    return f"{symbol_from_path(path)}_{digest}"
+
+
+def read_ohlcv_csv(path: Union[str, Path]) -> pd.DataFrame:
+    """Load a CSV into a DataFrame, validate columns, and sort by date."""
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"CSV file not found: {path}")
+
+    df = pd.read_csv(path)
+    missing = REQUIRED_COLUMNS.difference(df.columns)
+    if missing:
+        raise ValueError(f"CSV missing required columns: {missing}")
+
+    df["Date"] = pd.to_datetime(df["Date"])
+    df.sort_values("Date", inplace=True)
+    df.reset_index(drop=True, inplace=True)
+    return df
+
+
+def downcast_ohlcv(df: pd.DataFrame, precision: str = "float32") -> pd.DataFrame:
+    """Return a copy with price and volume columns stored at ``precision``."""
+    dtype = PRECISIONS[precision]
+    columns = {col: df[col].astype(dtype) for col in NUMERIC_COLUMNS if col in df.columns}
+    return df.assign(**columns)
+
+
+class Dataset:
+    """Parsed OHLCV frame plus the indicator store evaluated on it."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        frame: Optional[pd.DataFrame] = None,
+        resample_cache: Optional[ResampleCache] = None,
+        max_signals: int = 256,
+    ) -> None:
+        self.path = Path(path)
+        self._frame = frame
+        self._resample_cache = resample_cache
+        self._frames: Dict[Tuple[str, Optional[str]], pd.DataFrame] = {}
+        self._stores: Dict[Tuple[str, Optional[str]], IndicatorStore] = {}
+        self._signals: "OrderedDict[Tuple[str, Optional[str], str], np.ndarray]" = OrderedDict()
+        self.max_signals = max_signals
+        self._lock = threading.RLock()
+        self.signal_hits = 0
+        self.signal_misses = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self._frame is not None
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """The parsed OHLCV frame (read from disk on first access)."""
+        if self._frame is None:
+            with self._lock:
+                if self._frame is None:
+                    self._frame = read_ohlcv_csv(self.path)
+        return self._frame
+
+    @property
+    def indicators(self) -> IndicatorStore:
+        """Float64 indicator store shared by every run on this dataset."""
+        return self.indicators_for("float64")
+
+    def frame_for(self, precision: str = "float64", timeframe: Optional[str] = None) -> pd.DataFrame:
+        """
+        The frame at ``timeframe`` (None = as stored) with numeric columns at
+        ``precision``; resampled and downcast copies are memoized.
+        """
+        if precision == "float64" and timeframe is None:
+            return self.frame
+        key = (precision, timeframe)
+        with self._lock:
+            if key not in self._frames:
+                frame = self.frame
+                if timeframe is not None:
+                    cache = self._resample_cache or default_cache()
+                    frame = cache.get(source_key(self.path), frame, timeframe)
+                self._frames[key] = frame if precision == "float64" else downcast_ohlcv(frame, precision)
+            return self._frames[key]
+
+    def indicators_for(self, precision: str = "float64", timeframe: Optional[str] = None) -> IndicatorStore:
+        """Indicator store evaluating at ``precision`` on ``timeframe``, shared by runs using it."""
+        key = (precision, timeframe)
+        with self._lock:
+            if key not in self._stores:
+                frame = self.frame_for(precision, timeframe)
+                self._stores[key] = IndicatorStore(frame, dtype=PRECISIONS[precision])
+            return self._stores[key]
+
+    def signals_for(
+        self,
+        precision: str,
+        timeframe: Optional[str],
+        key: str,
+        compute: Callable[[], np.ndarray],
+    ) -> np.ndarray:
+        """
+        Signal array for the signal configuration ``key`` (see
+        ``SimpleBacktest.signal_params``), computed once by ``compute`` and
+        shared read-only by every run with the same key. Only the
+        ``max_signals`` most recently used arrays are kept.
+        """
+        memo_key = (precision, timeframe, key)
+        with self._lock:
+            signals = self._signals.get(memo_key)
+            if signals is not None:
+                self._signals.move_to_end(memo_key)
+                self.signal_hits += 1
+                return signals
+        signals = compute()
+        signals.setflags(write=False)
+        with self._lock:
+            self.signal_misses += 1
+            signals = self._signals.setdefault(memo_key, signals)
+            self._signals.move_to_end(memo_key)
+            while len(self._signals) > self.max_signals:
+                self._signals.popitem(last=False)
+            return signals
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+
+class DatasetCache:
+    """One ``Dataset`` per resolved CSV path."""
+
+    def __init__(self) -> None:
+        self._datasets: Dict[Path, Dataset] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: Union[str, Path]) -> Dataset:
+        resolved = Path(path).expanduser().resolve()
+        with self._lock:
+            dataset = self._datasets.get(resolved)
+            if dataset is None:
+                dataset = Dataset(resolved)
+                self._datasets[resolved] = dataset
+            return dataset
+
+    def evict(self, path: Union[str, Path]) -> None:
+        with self._lock:
+            self._datasets.pop(Path(path).expanduser().resolve(), None)
+
+    def stats(self) -> Dict[str, int]:
+        """Datasets parsed plus indicator and signal memo hits/misses across all cached datasets."""
+        with self._lock:
+            datasets = list(self._datasets.values())
+        stores = [store for dataset in datasets for store in dataset._stores.values()]
+        return {
+            "datasets_loaded": sum(1 for dataset in datasets if dataset.loaded),
+            "indicators_computed": sum(store.misses for store in stores),
+            "indicators_reused": sum(store.hits for store in stores),
+            "signals_computed": sum(dataset.signal_misses for dataset in datasets),
+            "signals_reused": sum(dataset.signal_hits for dataset in datasets),
+        }
@@ -0,0 +1,540 @@
+"""
+Feature matrices for ML research, computed from the indicator definitions.
+
+``build_features`` turns one OHLCV frame into a float32 (bars x features)
+matrix, covering:
+
+* moving averages of all four types (SMA, EMA, WMA, WEMA) over a window grid;
+* RSI, ATR, Bollinger width and %B, MACD line and histogram, and the close's
+  position in the Donchian channel, each over its own grid.
+
+The definitions match ``backtester.indicators`` (Wilder RSI, ATR as the mean
+true range, population std in the bands, ``adjust=False`` EMAs with
+``min_periods`` equal to the span). By default, price-level features are
+made scale-free so they compare across symbols. MAs become ``close / ma - 1``,
+and ATR and MACD are divided by the close. Pass ``relative=False`` for the
+raw values.
+
+Each family is computed for its whole window grid at once, not window by
+window:
+
+* SMA, WMA, WEMA, ATR, and the Bollinger mean/std come from one set of
+  prefix sums per series; every window is then two gathers and a subtract;
+* EMAs (and the Wilder averages inside RSI) are one blocked linear scan. A
+  decay-kernel matmul covers each block of bars, and a short carry loop
+  runs once per block, shared by every span;
+* Donchian highs/lows come from one sparse table of power-of-two maxima,
+  with each window answered by a single ``np.maximum``.
+
+Results are written straight into their column block of a preallocated
+float32 matrix. ``build_universe`` stacks many symbols into one matrix, a
+``.npy`` memmap when given a path, so a large universe never has to fit in
+memory. It also adds forward-return labels and the row index (symbol and
+time). ``purged_splits`` gives walk-forward or k-fold train/test indices in
+time order. Training rows within a label horizon of the test block are
+purged on both sides, and further rows after it can be embargoed. The index arrays can
+be passed to scikit-learn as ``cv=``.
+
+Example:
+    grid = FeatureGrid(ma_windows=[10, 20, 50], rsi_periods=[14])
+    matrix = build_features(frame, grid)               # (bars, len(grid.names()))
+    labels = forward_returns(frame["Close"].to_numpy(), [1, 5])
+    universe = build_universe(["../data/SPY.csv", "../data/QQQ.csv"], grid, path="results/features.npy")
+    for train, test in universe.splits(n_splits=5, embargo=5):
+        ...
+"""
+
+from __future__ import annotations
+
+import warnings
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Any, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .dataset import read_ohlcv_csv, symbol_from_path
+
+MA_TYPES = ["sma", "ema", "wma", "wema"]
+# Bars per block of the EMA scan, and rows per restart of the prefix sums.
+EMA_BLOCK = 128
+WINDOW_CHUNK = 16_384
+
+
+@dataclass
+class FeatureGrid:
+    """Window grids per indicator family; ``names()`` fixes the column order."""
+
+    ma_types: List[str] = field(default_factory=lambda: list(MA_TYPES))
+    ma_windows: List[int] = field(default_factory=lambda: [5, 10, 20, 50, 100, 200])
+    rsi_periods: List[int] = field(default_factory=lambda: [7, 14, 21])
+    atr_periods: List[int] = field(default_factory=lambda: [7, 14, 21])
+    bollinger_windows: List[int] = field(default_factory=lambda: [10, 20, 50])
+    bollinger_std: List[float] = field(default_factory=lambda: [2.0])
+    macd: List[Tuple[int, int, int]] = field(default_factory=lambda: [(12, 26, 9), (5, 35, 5)])
+    donchian_windows: List[int] = field(default_factory=lambda: [20, 55])
+
+    def __post_init__(self) -> None:
+        unknown = set(self.ma_types) - set(MA_TYPES)
+        if unknown:
+            raise ValueError(f"Unsupported moving average types: {sorted(unknown)}")
+        self.macd = [tuple(int(value) for value in triple) for triple in self.macd]  # type: ignore[misc]
+        if any(len(triple) != 3 for triple in self.macd):
+            raise ValueError("Each MACD entry must be (fast, slow, signal).")
+        windows = (
+            self.ma_windows + self.rsi_periods + self.atr_periods + self.bollinger_windows + self.donchian_windows
+        )
+        if any(int(window) < 1 for window in windows) or any(value < 1 for triple in self.macd for value in triple):
+            raise ValueError("Feature windows and periods must be >= 1.")
+        if any(value <= 0 for value in self.bollinger_std):
+            raise ValueError("bollinger_std values must be positive.")
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "FeatureGrid":
+        known = {item.name for item in fields(cls)}
+        unknown = set(data) - known
+        if unknown:
+            raise ValueError(f"Unknown feature grid keys: {sorted(unknown)}")
+        return cls(**dict(data))
+
+    def names(self) -> List[str]:
+        names = [f"{kind}_{window}" for kind in self.ma_types for window in self.ma_windows]
+        names += [f"rsi_{period}" for period in self.rsi_periods]
+        names += [f"atr_{period}" for period in self.atr_periods]
+        bands = [(window, num_std) for window in self.bollinger_windows for num_std in self.bollinger_std]
+        names += [f"bb_width_{window}_{num_std:g}" for window, num_std in bands]
+        names += [f"bb_pctb_{window}_{num_std:g}" for window, num_std in bands]
+        names += [f"macd_{fast}_{slow}_{signal}" for fast, slow, signal in self.macd]
+        names += [f"macd_hist_{fast}_{slow}_{signal}" for fast, slow, signal in self.macd]
+        names += [f"donchian_pos_{window}" for window in self.donchian_windows]
+        return names
+
+
+# ---------------------------------------------------------------------- #
+# Batched window kernels
+# ---------------------------------------------------------------------- #
+def window_means(values: np.ndarray, windows: Sequence[int], linear: bool = False) -> np.ndarray:
+    """
+    Trailing-window means for a whole grid of windows from one set of prefix sums.
+
+    ``values`` is one (bars,) series used for every window, or a (bars, k)
+    panel whose column j is averaged over ``windows[j]``. ``linear`` weights
+    the bars 1..w, oldest to newest (WMA); otherwise all weigh the same
+    (SMA). Rows before a full window, or whose window holds a NaN, are NaN.
+
+    Values are centered on their mean, and the prefix sums restart every
+    ``WINDOW_CHUNK`` rows. The position weights of the linear sum therefore
+    stay small, and cancellation error does not grow with the series length.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    windows = [int(window) for window in windows]
+    bars, span = len(values), max(windows)
+    panel = values.reshape(bars, -1)
+    missing = np.isnan(panel)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        reference = np.nan_to_num(np.nanmean(panel, axis=0))
+    centered = np.where(missing, 0.0, panel - reference)
+    source = [0] * len(windows) if panel.shape[1] == 1 else list(range(len(windows)))
+    # Column-major, so each window's result is one contiguous run of rows.
+    out = np.full((len(windows), bars), np.nan)
+    for start in range(0, bars, WINDOW_CHUNK):
+        stop = min(start + WINDOW_CHUNK, bars)
+        base = max(start - span + 1, 0)
+        segment = centered[base:stop]
+        sums = np.zeros((len(segment) + 1, segment.shape[1]))
+        np.cumsum(segment, axis=0, out=sums[1:])
+        if linear:
+            positions = np.arange(len(segment), dtype=np.float64)[:, None]
+            weighted = np.zeros_like(sums)
+            np.cumsum(segment * positions, axis=0, out=weighted[1:])
+        for column, window in enumerate(windows):
+            begin = max(start, window - 1)
+            if begin >= stop:
+                continue
+            head, tail = slice(begin + 1 - base, stop + 1 - base), slice(begin + 1 - window - base, stop + 1 - window - base)
+            total = sums[head, source[column]] - sums[tail, source[column]]
+            if linear:
+                # A bar at segment position j weighs j - (tail start - 1): 1 for the oldest, w for the newest.
+                offsets = np.arange(begin - window - base, stop - window - base, dtype=np.float64)
+                total = weighted[head, source[column]] - weighted[tail, source[column]] - offsets * total
+                out[column, begin:stop] = total / (window * (window + 1) / 2.0)
+            else:
+                out[column, begin:stop] = total / window
+    out += reference[source][:, None]
+
+    if missing.any():
+        gaps = np.zeros((bars + 1, panel.shape[1]), dtype=np.int64)
+        np.cumsum(missing, axis=0, out=gaps[1:])
+        for column, window in enumerate(windows):
+            if window <= bars:
+                inside = gaps[window:, source[column]] - gaps[: bars + 1 - window, source[column]]
+                out[column, window - 1 :][inside > 0] = np.nan
+    return out.T
+
+
+def rolling_mean_stds(values: np.ndarray, windows: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+    """Rolling mean and population std of one series for every window."""
+    values = np.asarray(values, dtype=np.float64)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        reference = float(np.nan_to_num(np.nanmean(values)))
+    centered = values - reference
+    mean = window_means(centered, windows)
+    square = window_means(centered * centered, windows)
+    return mean + reference, np.sqrt(np.maximum(square - mean * mean, 0.0))
+
+
+def ema_scan(values: np.ndarray, alphas: Sequence[float], min_periods: Sequence[int]) -> np.ndarray:
+    """
+    ``adjust=False`` exponential averages for a grid of smoothing factors at once.
+
+    ``values`` is one (bars,) series used for every alpha, or a (bars, k)
+    panel paired column by column. Leading NaNs are skipped, as pandas
+    ``ewm`` does, and each column is NaN until ``min_periods`` observations.
+    Interior NaNs fall back to pandas for that column.
+    """
+    alphas = np.asarray(alphas, dtype=np.float64)
+    k = len(alphas)
+    values = np.asarray(values, dtype=np.float64)
+    # A single series stays one column and is broadcast across the alphas.
+    panel = values.reshape(len(values), -1).copy()
+    bars = len(panel)
+    if bars == 0:
+        return np.empty((0, k))
+    valid = ~np.isnan(panel)
+    first = np.where(valid.any(axis=0), valid.argmax(axis=0), bars)
+    for column, start in enumerate(first):
+        # Repeating the first observation backwards leaves the recursion unchanged from there on.
+        panel[:start, column] = panel[min(start, bars - 1), column]
+    gaps = np.broadcast_to(np.isnan(panel).any(axis=0), (k,))
+    first = np.broadcast_to(first, (k,))
+
+    blocks = -(-bars // EMA_BLOCK)
+    padded = np.zeros((blocks * EMA_BLOCK, panel.shape[1]))
+    padded[:bars] = np.nan_to_num(panel)
+    decay = 1.0 - alphas
+    lag = np.arange(EMA_BLOCK)[:, None] - np.arange(EMA_BLOCK)[None, :]
+    kernel = np.where(lag[None] >= 0, decay[:, None, None] ** np.maximum(lag, 0)[None], 0.0) * alphas[:, None, None]
+    # (k, B, B) @ (k or 1, B, blocks): every block's contribution from its own bars.
+    partial = kernel @ padded.reshape(blocks, EMA_BLOCK, -1).transpose(2, 1, 0)
+    # Only each block's last value feeds the next block, so the carry loop is over k-vectors.
+    block_decay = decay**EMA_BLOCK
+    ends = partial[:, -1, :].T
+    carries = np.empty((blocks, k))
+    carry = np.broadcast_to(padded[0], (k,)).copy()
+    for block in range(blocks):
+        carries[block] = carry
+        carry = ends[block] + block_decay * carry
+    carry_weights = decay[None, :] ** np.arange(1, EMA_BLOCK + 1)[:, None]
+    out = partial.transpose(2, 1, 0) + carry_weights[None] * carries[:, None, :]
+    result = out.reshape(-1, k)[:bars]
+
+    for column in range(k):
+        result[: first[column] + int(min_periods[column]) - 1, column] = np.nan
+        if gaps[column]:
+            source = values if values.ndim == 1 else values[:, column]
+            result[:, column] = (
+                pd.Series(source).ewm(alpha=alphas[column], adjust=False, min_periods=int(min_periods[column])).mean().to_numpy()
+            )
+    return result
+
+
+def exponential_means(values: np.ndarray, spans: Sequence[int]) -> np.ndarray:
+    """EMA(span) for every span, matching ``ewm(span, adjust=False, min_periods=span)``."""
+    spans = [int(span) for span in spans]
+    return ema_scan(values, [2.0 / (span + 1) for span in spans], spans)
+
+
+def rolling_extremes(values: np.ndarray, windows: Sequence[int], kind: str = "max") -> np.ndarray:
+    """Trailing max (or min) for every window from one sparse table of power-of-two spans."""
+    op = np.maximum if kind == "max" else np.minimum
+    values = np.asarray(values, dtype=np.float64)
+    bars = len(values)
+    out = np.full((bars, len(windows)), np.nan)
+    levels = [values]
+    while 2 ** len(levels) <= max(windows):
+        size = 2 ** (len(levels) - 1)
+        previous = levels[-1]
+        level = np.full(bars, np.nan)
+        level[size:] = op(previous[size:], previous[:-size])
+        levels.append(level)
+    for column, window in enumerate(windows):
+        if window > bars:
+            continue
+        power = int(window).bit_length() - 1
+        level, size = levels[power], 2**power
+        rows = np.arange(window - 1, bars)
+        out[window - 1 :, column] = op(level[rows], level[rows - window + size])
+    return out
+
+
+# ---------------------------------------------------------------------- #
+# Feature matrix
+# ---------------------------------------------------------------------- #
+class _Columns:
+    """Writes consecutive column blocks into the output matrix."""
+
+    def __init__(self, out: np.ndarray) -> None:
+        self.out = out
+        self.position = 0
+
+    def put(self, block: np.ndarray) -> None:
+        block = block.reshape(len(block), -1)
+        self.out[:, self.position : self.position + block.shape[1]] = block
+        self.position += block.shape[1]
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = numerator / denominator
+    result[~np.isfinite(result)] = np.nan
+    return result
+
+
+def build_features(
+    frame: pd.DataFrame,
+    grid: Optional[FeatureGrid] = None,
+    relative: bool = True,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Fill a (bars, features) matrix for one OHLCV frame (columns in ``grid.names()`` order).
+
+    Args:
+        frame: Sorted OHLCV frame with High, Low, and Close.
+        grid: Window grids (default: ``FeatureGrid()``).
+        relative: Scale-free MAs (close/ma - 1), ATR and MACD (divided by close).
+        out: Preallocated (bars, features) array or memmap slice to write into;
+            a float32 matrix is allocated when omitted.
+    """
+    grid = grid or FeatureGrid()
+    missing = {"High", "Low", "Close"}.difference(frame.columns)
+    if missing:
+        raise ValueError(f"Frame missing required columns for features: {sorted(missing)}")
+    close = frame["Close"].to_numpy(dtype=np.float64)
+    high = frame["High"].to_numpy(dtype=np.float64)
+    low = frame["Low"].to_numpy(dtype=np.float64)
+    bars, width = len(close), len(grid.names())
+    if out is None:
+        out = np.empty((bars, width), dtype=np.float32)
+    elif out.shape != (bars, width):
+        raise ValueError(f"out has shape {out.shape}, expected {(bars, width)}.")
+    columns = _Columns(out)
+    price = close[:, None]
+
+    # Moving averages: one EMA scan feeds both the EMA and WEMA blocks.
+    windows = list(grid.ma_windows)
+    emas = exponential_means(close, windows) if {"ema", "wema"} & set(grid.ma_types) and windows else None
+    for kind in grid.ma_types:
+        if not windows:
+            break
+        if kind == "sma":
+            averages = window_means(close, windows)
+        elif kind == "ema":
+            averages = emas
+        elif kind == "wma":
+            averages = window_means(close, windows, linear=True)
+        else:
+            averages = window_means(emas, windows, linear=True)
+        columns.put(_ratio(price, averages) - 1.0 if relative else averages)
+
+    if grid.rsi_periods:
+        periods = list(grid.rsi_periods)
+        delta = np.full(bars, np.nan)
+        delta[1:] = np.diff(close)
+        gains, losses = np.clip(delta, 0.0, None), -np.clip(delta, None, 0.0)
+        alphas = [1.0 / period for period in periods]
+        average_gain, average_loss = ema_scan(gains, alphas, periods), ema_scan(losses, alphas, periods)
+        strength = average_gain / np.where(average_loss == 0, np.nan, average_loss)
+        columns.put(100.0 - 100.0 / (1.0 + strength))
+
+    if grid.atr_periods:
+        previous = np.concatenate(([np.nan], close[:-1]))
+        true_range = np.fmax(np.fmax(high - low, np.abs(high - previous)), np.abs(low - previous))
+        averages = window_means(true_range, list(grid.atr_periods))
+        columns.put(_ratio(averages, price) if relative else averages)
+
+    bands = [(window, num_std) for window in grid.bollinger_windows for num_std in grid.bollinger_std]
+    if bands:
+        mean, std = rolling_mean_stds(close, list(grid.bollinger_windows))
+        repeat = len(grid.bollinger_std)
+        mean, std = np.repeat(mean, repeat, axis=1), np.repeat(std, repeat, axis=1)
+        scale = np.tile(np.asarray(grid.bollinger_std, dtype=np.float64), len(grid.bollinger_windows))[None, :]
+        columns.put(_ratio(2.0 * scale * std, mean))
+        columns.put(_ratio(price - mean + scale * std, 2.0 * scale * std))
+
+    if grid.macd:
+        spans = sorted({span for fast, slow, _ in grid.macd for span in (fast, slow)})
+        emas = exponential_means(close, spans)
+        position = {span: index for index, span in enumerate(spans)}
+        lines = np.column_stack([emas[:, position[fast]] - emas[:, position[slow]] for fast, slow, _ in grid.macd])
+        signals = exponential_means(lines, [signal for _, _, signal in grid.macd])
+        histogram = lines - signals
+        columns.put(_ratio(lines, price) if relative else lines)
+        columns.put(_ratio(histogram, price) if relative else histogram)
+
+    if grid.donchian_windows:
+        windows = list(grid.donchian_windows)
+        upper = rolling_extremes(high, windows, "max")
+        lower = rolling_extremes(low, windows, "min")
+        columns.put(_ratio(price - lower, upper - lower))
+
+    if columns.position != width:
+        raise RuntimeError(f"Wrote {columns.position} feature columns, expected {width}.")
+    return out
+
+
+# ---------------------------------------------------------------------- #
+# Labels and splits
+# ---------------------------------------------------------------------- #
+def forward_returns(close: np.ndarray, horizons: Sequence[int]) -> np.ndarray:
+    """Simple return from each bar's close to the close ``h`` bars later, per horizon (NaN at the end)."""
+    close = np.asarray(close, dtype=np.float64)
+    out = np.full((len(close), len(horizons)), np.nan, dtype=np.float32)
+    for column, horizon in enumerate(horizons):
+        if horizon < 1:
+            raise ValueError("Label horizons must be >= 1.")
+        if horizon < len(close):
+            out[:-horizon, column] = close[horizon:] / close[:-horizon] - 1.0
+    return out
+
+
+def direction_labels(returns: np.ndarray, threshold: float = 0.0) -> np.ndarray:
+    """-1/0/1 classes for returns below -threshold, within it, or above it (NaN stays NaN)."""
+    returns = np.asarray(returns, dtype=np.float32)
+    labels = np.where(returns > threshold, 1.0, np.where(returns < -threshold, -1.0, 0.0)).astype(np.float32)
+    labels[np.isnan(returns)] = np.nan
+    return labels
+
+
+def purged_splits(
+    times: Union[int, np.ndarray],
+    n_splits: int = 5,
+    horizon: int = 1,
+    embargo: int = 0,
+    expanding: bool = True,
+) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Train/test row indices split by time, with label-overlap purging.
+
+    Args:
+        times: Number of bars (one series), or each row's timestamp for a
+            stacked universe. Rows sharing a timestamp always land together.
+        n_splits: Number of test blocks.
+        horizon: Bars a label looks ahead; training rows within this many bars
+            of a test block are dropped on both sides (before it, and after it
+            for k-fold) so no training label overlaps a test label.
+        embargo: Extra bars after the purged gap following a test block also
+            dropped from training (k-fold only).
+        expanding: Walk-forward (train only on the past, test blocks after a
+            first training block). False gives purged k-fold over all blocks.
+    """
+    if n_splits < 2 and expanding is False:
+        raise ValueError("k-fold needs n_splits >= 2.")
+    if n_splits < 1 or horizon < 0 or embargo < 0:
+        raise ValueError("n_splits must be >= 1 and horizon/embargo >= 0.")
+    if isinstance(times, (int, np.integer)):
+        steps = np.arange(int(times))
+        count = int(times)
+    else:
+        _, steps = np.unique(np.asarray(times), return_inverse=True)
+        count = int(steps.max()) + 1 if len(steps) else 0
+    blocks = n_splits + 1 if expanding else n_splits
+    if count < blocks:
+        raise ValueError(f"{count} time step(s) cannot be split into {blocks} blocks.")
+    edges = np.linspace(0, count, blocks + 1).astype(np.int64)
+    splits = []
+    for block in range(1 if expanding else 0, blocks):
+        start, stop = edges[block], edges[block + 1]
+        train = np.zeros(count, dtype=bool)
+        train[: max(start - horizon, 0)] = True
+        if not expanding:
+            train[min(stop + horizon + embargo, count) :] = True
+        test = np.zeros(count, dtype=bool)
+        test[start:stop] = True
+        splits.append((np.flatnonzero(train[steps]), np.flatnonzero(test[steps])))
+    return splits
+
+
+# ---------------------------------------------------------------------- #
+# Universes
+# ---------------------------------------------------------------------- #
+@dataclass
+class FeatureSet:
+    """Stacked features, labels, and row index for a symbol universe."""
+
+    matrix: np.ndarray
+    names: List[str]
+    labels: np.ndarray
+    horizons: List[int]
+    times: np.ndarray
+    symbols: np.ndarray
+    symbol_names: List[str]
+
+    def valid_rows(self) -> np.ndarray:
+        """Rows with every feature and label finite (past indicator warm-up and label tails)."""
+        valid = np.isfinite(self.labels).all(axis=1)
+        for start in range(0, len(self.matrix), WINDOW_CHUNK):
+            stop = start + WINDOW_CHUNK
+            valid[start:stop] &= np.isfinite(self.matrix[start:stop]).all(axis=1)
+        return valid
+
+    def splits(self, n_splits: int = 5, embargo: int = 0, expanding: bool = True) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """``purged_splits`` over this universe's timestamps, purged by the longest horizon."""
+        return purged_splits(self.times, n_splits, max(self.horizons), embargo, expanding)
+
+
+def build_universe(
+    sources: Union[Mapping[str, pd.DataFrame], Iterable[Union[str, Path]]],
+    grid: Optional[FeatureGrid] = None,
+    horizons: Sequence[int] = (1, 5),
+    relative: bool = True,
+    path: Optional[Union[str, Path]] = None,
+) -> FeatureSet:
+    """
+    Stack the features of many symbols into one matrix, rows grouped by symbol.
+
+    ``sources`` maps symbol -> frame, or lists CSV paths (symbols from file
+    names). With ``path``, the matrix is a ``.npy`` memmap written there
+    (reopen with ``np.load(path, mmap_mode="r")``). CSVs are then read one at
+    a time, straight into their slice of the file.
+    """
+    grid = grid or FeatureGrid()
+    horizons = [int(horizon) for horizon in horizons]
+    if isinstance(sources, Mapping):
+        entries: List[Tuple[str, Any]] = list(sources.items())
+        lengths = [len(frame) for _, frame in entries]
+    else:
+        entries = [(symbol_from_path(source), Path(source)) for source in sources]
+        lengths = [len(pd.read_csv(source, usecols=["Date"])) for _, source in entries]
+    if not entries:
+        raise ValueError("No symbols to build features for.")
+    names = grid.names()
+    rows = sum(lengths)
+    if path is not None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        matrix = np.lib.format.open_memmap(Path(path), mode="w+", dtype=np.float32, shape=(rows, len(names)))
+    else:
+        matrix = np.empty((rows, len(names)), dtype=np.float32)
+    labels = np.empty((rows, len(horizons)), dtype=np.float32)
+    times = np.empty(rows, dtype="datetime64[ns]")
+    symbols = np.empty(rows, dtype=np.int32)
+
+    start = 0
+    for code, ((symbol, source), length) in enumerate(zip(entries, lengths)):
+        frame = source if isinstance(source, pd.DataFrame) else read_ohlcv_csv(source)
+        if len(frame) != length:
+            raise RuntimeError(f"{symbol} changed length while building features.")
+        stop = start + length
+        build_features(frame, grid, relative, out=matrix[start:stop])
+        labels[start:stop] = forward_returns(frame["Close"].to_numpy(), horizons)
+        times[start:stop] = pd.to_datetime(frame["Date"] if "Date" in frame.columns else frame.index).to_numpy(
+            dtype="datetime64[ns]"
+        )
+        symbols[start:stop] = code
+        start = stop
+    if isinstance(matrix, np.memmap):
+        matrix.flush()
+    return FeatureSet(matrix, names, labels, horizons, times, symbols, [symbol for symbol, _ in entries])
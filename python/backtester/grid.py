@@ -0,0 +1,147 @@
+"""
+Two-parameter grid evaluation for sensitivity analysis.
+
+Every grid cell is a ``SimpleBacktest`` configuration sharing one ``Dataset``,
+so each indicator is evaluated once per distinct axis value (e.g. one SMA per
+window on a fast x slow grid) and reused by every cell that needs it. Cells
+are simulated in batches by ``backtester.batch.evaluate_variants``: those
+whose positions follow directly from their signals as 2-D arrays in chunks,
+and those using ATR trailing stops or RSI exits as rows of one
+``kernels.simulate_strategies`` walk (numba-compiled when installed).
+
+Example:
+    grid = run_grid(
+        "data/SPY.csv",
+        "fast_window", range(5, 105),
+        "slow_window", range(10, 210, 2),
+        base_params={"moving_average": "ema"},
+    )
+    sharpe = grid.metrics["sharpe_ratio"]   # shape (len(y_values), len(x_values))
+
+Pass a ``Checkpoint`` to evaluate the grid in blocks of y rows and journal
+each block's metrics; a rerun with the same journal skips finished rows.
+"""
+
+from __future__ import annotations
+
+import inspect
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .batch import BATCH_METRICS, evaluate_variants
+from .checkpoint import Checkpoint
+from .dataset import Dataset
+from .simple_backtest import SimpleBacktest
+
+GRID_METRICS = BATCH_METRICS
+# Cells share one bar series, so the timeframe can be fixed in base_params but not swept.
+GRID_PARAMETERS = [
+    name
+    for name in inspect.signature(SimpleBacktest.__init__).parameters
+    if name not in {"self", "csv_file", "timeframe"}
+]
+
+
+@dataclass
+class GridResult:
+    """Metric matrices indexed [y, x]; invalid parameter combinations are NaN."""
+
+    x_param: str
+    x_values: List[Any]
+    y_param: str
+    y_values: List[Any]
+    metrics: Dict[str, np.ndarray]
+
+    def matrix(self, metric: str) -> pd.DataFrame:
+        """One metric as a DataFrame with y values as rows and x values as columns."""
+        return pd.DataFrame(
+            self.metrics[metric],
+            index=pd.Index(self.y_values, name=self.y_param),
+            columns=pd.Index(self.x_values, name=self.x_param),
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """Long format: one row per cell with both parameters and all metrics."""
+        ys, xs = np.meshgrid(np.arange(len(self.y_values)), np.arange(len(self.x_values)), indexing="ij")
+        frame = pd.DataFrame(
+            {
+                self.x_param: np.asarray(self.x_values, dtype=object)[xs.ravel()],
+                self.y_param: np.asarray(self.y_values, dtype=object)[ys.ravel()],
+            }
+        )
+        for name, values in self.metrics.items():
+            frame[name] = values.ravel()
+        return frame
+
+
+def run_grid(
+    csv_file: str,
+    x_param: str,
+    x_values: Sequence[Any],
+    y_param: str,
+    y_values: Sequence[Any],
+    base_params: Optional[Dict[str, Any]] = None,
+    dataset: Optional[Dataset] = None,
+    chunk_size: int = 512,
+    checkpoint: Optional[Checkpoint] = None,
+) -> GridResult:
+    """
+    Evaluate every (x, y) combination of two ``SimpleBacktest`` parameters.
+
+    Args:
+        csv_file: OHLCV CSV shared by all cells.
+        x_param, y_param: ``SimpleBacktest`` keyword names for the two axes.
+        x_values, y_values: Values to sweep on each axis.
+        base_params: Fixed keyword arguments applied to every cell.
+        dataset: Optional pre-loaded ``Dataset`` for ``csv_file``.
+        chunk_size: Number of vectorizable cells simulated per batch.
+        checkpoint: Optional journal; rows are then evaluated and journaled in
+            blocks of about ``chunk_size`` cells, and journaled rows are reused.
+    """
+    for name in (x_param, y_param):
+        if name not in GRID_PARAMETERS:
+            raise ValueError(f"Unknown SimpleBacktest parameter: {name}")
+    if x_param == y_param:
+        raise ValueError("x_param and y_param must differ.")
+    base_params = dict(base_params or {})
+    base_params.pop(x_param, None)
+    base_params.pop(y_param, None)
+    x_values, y_values = list(x_values), list(y_values)
+    shape = (len(y_values), len(x_values))
+    if checkpoint is None:
+        variants = [{**base_params, x_param: x_value, y_param: y_value} for y_value in y_values for x_value in x_values]
+        values = evaluate_variants(csv_file, variants, dataset=dataset, chunk_size=chunk_size)
+        metrics = {name: values[name].reshape(shape) for name in GRID_METRICS}
+        return GridResult(x_param, x_values, y_param, y_values, metrics)
+
+    metrics = {name: np.full(shape, np.nan) for name in GRID_METRICS}
+    for _, rows in checkpoint.payloads():
+        for row, row_metrics in rows.items():
+            for name in GRID_METRICS:
+                metrics[name][int(row)] = np.array(row_metrics[name], dtype=np.float64)
+    dataset = dataset or Dataset(csv_file)
+    rows_per_block = max(1, chunk_size // max(1, len(x_values)))
+    for start in range(0, len(y_values), rows_per_block):
+        key = f"rows:{start}"
+        if key in checkpoint:
+            continue
+        block = range(start, min(start + rows_per_block, len(y_values)))
+        variants = [
+            {**base_params, x_param: x_value, y_param: y_values[row]} for row in block for x_value in x_values
+        ]
+        values = evaluate_variants(csv_file, variants, dataset=dataset, chunk_size=chunk_size)
+        payload = {}
+        for offset, row in enumerate(block):
+            cells = slice(offset * len(x_values), (offset + 1) * len(x_values))
+            for name in GRID_METRICS:
+                metrics[name][row] = values[name][cells]
+            # JSON has no NaN literal in strict readers; None round-trips to NaN above.
+            payload[str(row)] = {
+                name: [None if np.isnan(value) else float(value) for value in values[name][cells]]
+                for name in GRID_METRICS
+            }
+        checkpoint.record(key, payload)
+    return GridResult(x_param, x_values, y_param, y_values, metrics)
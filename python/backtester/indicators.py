@@ -0,0 +1,282 @@
+"""
+Declarative indicator graph evaluated lazily into a NumPy-backed store.
+
+Indicators are immutable ``Indicator`` nodes (kind + input nodes + params), so
+two strategies that ask for the same computation build equal nodes and share
+one result. ``IndicatorStore`` evaluates a node only when it is requested,
+pulling in its dependencies first (e.g. WEMA -> EMA -> Close, Bollinger bands
+-> SMA + rolling std), and keeps every result as a NumPy array keyed by node
+instead of inserting columns into the OHLCV DataFrame.
+
+Example:
+    store = IndicatorStore(frame)
+    fast, slow = sma(CLOSE, 20), sma(CLOSE, 50)
+    spread = store.get(fast) - store.get(slow)   # Close/SMA20/SMA50 computed once
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class Indicator:
+    """Node in the indicator graph."""
+
+    kind: str
+    inputs: Tuple["Indicator", ...] = ()
+    params: Tuple[Any, ...] = ()
+
+    def __str__(self) -> str:
+        if self.kind == "column":
+            return str(self.params[0])
+        args = [str(node) for node in self.inputs] + [str(param) for param in self.params]
+        return f"{self.kind}({', '.join(args)})"
+
+
+# ---------------------------------------------------------------------- #
+# Node constructors
+# ---------------------------------------------------------------------- #
+def column(name: str) -> Indicator:
+    return Indicator("column", (), (name,))
+
+
+OPEN = column("Open")
+CLOSE = column("Close")
+HIGH = column("High")
+LOW = column("Low")
+
+
+def sma(source: Indicator, window: int) -> Indicator:
+    return Indicator("sma", (source,), (int(window),))
+
+
+def ema(source: Indicator, span: int) -> Indicator:
+    return Indicator("ema", (source,), (int(span),))
+
+
+def wma(source: Indicator, window: int) -> Indicator:
+    return Indicator("wma", (source,), (int(window),))
+
+
+def moving_average(kind: str, source: Indicator, window: int) -> Indicator:
+    """Build an SMA/EMA/WMA/WEMA node; WEMA is a WMA over the EMA of the same window."""
+    kind = kind.lower()
+    if kind == "sma":
+        return sma(source, window)
+    if kind == "ema":
+        return ema(source, window)
+    if kind == "wma":
+        return wma(source, window)
+    if kind == "wema":
+        return wma(ema(source, window), window)
+    raise ValueError(f"Unsupported moving average type: {kind}")
+
+
+def rolling_std(source: Indicator, window: int) -> Indicator:
+    return Indicator("rolling_std", (source,), (int(window),))
+
+
+def rolling_max(source: Indicator, window: int) -> Indicator:
+    return Indicator("rolling_max", (source,), (int(window),))
+
+
+def rolling_min(source: Indicator, window: int) -> Indicator:
+    return Indicator("rolling_min", (source,), (int(window),))
+
+
+def lag(source: Indicator, periods: int) -> Indicator:
+    """``source`` shifted ``periods`` bars later (NaN for the first bars)."""
+    return Indicator("lag", (source,), (int(periods),))
+
+
+def returns(source: Indicator, periods: int = 1) -> Indicator:
+    """Simple return of ``source`` over the last ``periods`` bars."""
+    return Indicator("returns", (source,), (int(periods),))
+
+
+def rsi(period: int, source: Indicator = CLOSE) -> Indicator:
+    return Indicator("rsi", (source,), (int(period),))
+
+
+def true_range() -> Indicator:
+    return Indicator("true_range", (HIGH, LOW, CLOSE))
+
+
+def atr(period: int) -> Indicator:
+    """Average True Range as a simple mean of the true range."""
+    return sma(true_range(), period)
+
+
+def bollinger_bands(window: int, num_std: float, source: Indicator = CLOSE) -> Tuple[Indicator, Indicator, Indicator]:
+    """Return (mid, upper, lower) nodes."""
+    mid = sma(source, window)
+    std = rolling_std(source, window)
+    upper = Indicator("band", (mid, std), (float(num_std),))
+    lower = Indicator("band", (mid, std), (-float(num_std),))
+    return mid, upper, lower
+
+
+def macd(fast: int, slow: int, signal: int, source: Indicator = CLOSE) -> Tuple[Indicator, Indicator]:
+    """Return (MACD line, signal line) nodes."""
+    line = Indicator("difference", (ema(source, fast), ema(source, slow)))
+    return line, ema(line, signal)
+
+
+def donchian(window: int) -> Tuple[Indicator, Indicator]:
+    """Return (upper channel, lower channel) nodes over High/Low."""
+    return rolling_max(HIGH, window), rolling_min(LOW, window)
+
+
+# ---------------------------------------------------------------------- #
+# Kernels: NumPy arrays in, NumPy array out
+#
+# Inputs are (bars,) series or (bars, symbols) panels; windows run down axis 0.
+# ---------------------------------------------------------------------- #
+def _pandas(values: np.ndarray) -> Any:
+    return pd.DataFrame(values) if values.ndim == 2 else pd.Series(values)
+
+
+def _sma_kernel(values: np.ndarray, window: int) -> np.ndarray:
+    return _pandas(values).rolling(window=window, min_periods=window).mean().to_numpy()
+
+
+def _ema_kernel(values: np.ndarray, span: int) -> np.ndarray:
+    return _pandas(values).ewm(span=span, adjust=False, min_periods=span).mean().to_numpy()
+
+
+def _wma_kernel(values: np.ndarray, window: int) -> np.ndarray:
+    """Linearly weighted moving average (heavier weight on recent data)."""
+    out = np.full(values.shape, np.nan, dtype=values.dtype)
+    if len(values) < window:
+        return out
+    weights = np.arange(1, window + 1, dtype=values.dtype)
+    windows = np.lib.stride_tricks.sliding_window_view(values, window, axis=0)
+    out[window - 1 :] = windows @ weights / weights.sum()
+    return out
+
+
+def _rolling_std_kernel(values: np.ndarray, window: int) -> np.ndarray:
+    return _pandas(values).rolling(window=window, min_periods=window).std(ddof=0).to_numpy()
+
+
+def _rolling_max_kernel(values: np.ndarray, window: int) -> np.ndarray:
+    return _pandas(values).rolling(window=window, min_periods=window).max().to_numpy()
+
+
+def _rolling_min_kernel(values: np.ndarray, window: int) -> np.ndarray:
+    return _pandas(values).rolling(window=window, min_periods=window).min().to_numpy()
+
+
+def _rsi_kernel(values: np.ndarray, period: int) -> np.ndarray:
+    """Relative Strength Index with Wilder smoothing."""
+    delta = _pandas(values).diff()
+    gain = delta.clip(lower=0.0)
+    loss = -delta.clip(upper=0.0)
+    avg_gain = gain.ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+    avg_loss = loss.ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+    rs = avg_gain / avg_loss.replace(0, np.nan)
+    return (100 - (100 / (1 + rs))).to_numpy()
+
+
+def _lag_kernel(values: np.ndarray, periods: int) -> np.ndarray:
+    out = np.full(values.shape, np.nan, dtype=values.dtype)
+    if periods < len(values):
+        out[periods:] = values[: len(values) - periods]
+    return out
+
+
+def _returns_kernel(values: np.ndarray, periods: int) -> np.ndarray:
+    out = np.full(values.shape, np.nan, dtype=values.dtype)
+    if periods < len(values):
+        out[periods:] = values[periods:] / values[: len(values) - periods] - 1
+    return out
+
+
+def _true_range_kernel(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    prev_close = np.empty_like(close)
+    prev_close[0] = np.nan
+    prev_close[1:] = close[:-1]
+    # fmax skips NaN like DataFrame.max(axis=1), so the first bar is High - Low.
+    return np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
+
+
+def _band_kernel(mid: np.ndarray, std: np.ndarray, offset: float) -> np.ndarray:
+    return mid + offset * std
+
+
+def _difference_kernel(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    return left - right
+
+
+KERNELS: Dict[str, Callable[..., np.ndarray]] = {
+    "sma": _sma_kernel,
+    "ema": _ema_kernel,
+    "wma": _wma_kernel,
+    "rolling_std": _rolling_std_kernel,
+    "rolling_max": _rolling_max_kernel,
+    "rolling_min": _rolling_min_kernel,
+    "lag": _lag_kernel,
+    "returns": _returns_kernel,
+    "rsi": _rsi_kernel,
+    "true_range": _true_range_kernel,
+    "band": _band_kernel,
+    "difference": _difference_kernel,
+}
+
+
+class IndicatorStore:
+    """
+    Lazily evaluated, memoized indicator arrays for one OHLCV frame.
+
+    ``dtype`` sets the precision of input columns and stored results. Kernels
+    backed by pandas rolling/ewm accumulate in float64 internally; their
+    outputs are cast back to ``dtype``.
+    """
+
+    def __init__(self, frame: pd.DataFrame, dtype: Any = np.float64) -> None:
+        self._frame = frame
+        self.dtype = np.dtype(dtype)
+        self._values: Dict[Indicator, np.ndarray] = {}
+        # hits: demanded nodes served from the store; misses: nodes computed.
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, node: Indicator) -> bool:
+        return node in self._values
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def get(self, node: Indicator) -> np.ndarray:
+        """Return the array for ``node``, evaluating it (and its inputs) on first use."""
+        cached = self._values.get(node)
+        if cached is not None:
+            return cached
+        if node.kind == "column":
+            values = self._column(node.params[0])
+        else:
+            kernel = KERNELS.get(node.kind)
+            if kernel is None:
+                raise ValueError(f"Unknown indicator kind: {node.kind}")
+            inputs = [self.get(source) for source in node.inputs]
+            values = np.asarray(kernel(*inputs, *node.params), dtype=self.dtype)
+            self.misses += 1
+        values.setflags(write=False)
+        # setdefault keeps the first result if two threads raced on the same node.
+        return self._values.setdefault(node, values)
+
+    def evaluate(self, nodes: Iterable[Indicator]) -> List[np.ndarray]:
+        """Evaluate a batch of demanded nodes; already-stored ones count as reuse hits."""
+        nodes = list(nodes)
+        self.hits += sum(1 for node in nodes if node in self._values)
+        return [self.get(node) for node in nodes]
+
+    def _column(self, name: str) -> np.ndarray:
+        if name not in self._frame.columns:
+            raise RuntimeError(f"Data missing required column for indicators: {name}")
+        return self._frame[name].to_numpy(dtype=self.dtype, copy=True)
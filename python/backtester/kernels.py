@@ -0,0 +1,462 @@
+"""
+Typed array kernels for the path-dependent loops, JIT-compiled when numba is available.
+
+Kernels (each written once, in the subset of Python that numba compiles):
+    donchian_positions       Donchian breakout position recursion
+    rsi_bollinger_positions  RSI + Bollinger mean-reversion state machine
+    pairs_positions          spread z-score entry/exit/stop state machine
+    sliding_max              rolling maximum with a monotonic queue
+    simulate_strategies      the ``SimpleBacktest.run`` bar loop (ATR trailing
+                             stop with close or intrabar fills, RSI exit) for
+                             one or many strategies in a single walk
+
+With numba installed, kernels are compiled on first call with
+``njit(cache=True)``. The machine code is cached in ``__pycache__`` next to
+this module (or under ``NUMBA_CACHE_DIR``), so later processes load it
+instead of compiling again. Without numba the same functions run as plain
+Python on NumPy arrays and give the same results.
+
+The backend is chosen by ``QT_KERNEL_BACKEND``: "auto" (default, numba when
+importable), "numba", or "python". ``set_backend`` changes it at runtime.
+``scripts/benchmark_kernels.py`` reports the speedup per kernel.
+
+Example:
+    from backtester import kernels
+    print(kernels.active_backend())          # "numba" or "python"
+    positions = kernels.donchian_positions(high_channel, low_channel, close, False)
+    kernels.set_backend("python")            # e.g. to compare against the fallback
+"""
+
+from __future__ import annotations
+
+import math
+import os
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+BACKENDS = ("auto", "numba", "python")
+
+_numba_module: Any = None
+_numba_checked = False
+_backend = os.environ.get("QT_KERNEL_BACKEND", "auto").lower()
+
+
+def numba_available() -> bool:
+    """True when numba can be imported (checked once, lazily)."""
+    global _numba_module, _numba_checked
+    if not _numba_checked:
+        _numba_checked = True
+        try:
+            import numba
+        except ImportError:
+            _numba_module = None
+        else:
+            _numba_module = numba
+    return _numba_module is not None
+
+
+def set_backend(name: str) -> None:
+    """Select "auto", "numba", or "python" for subsequent kernel calls."""
+    global _backend
+    name = name.lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown kernel backend: {name}. Choose from {BACKENDS}.")
+    if name == "numba" and not numba_available():
+        raise RuntimeError("The numba kernel backend was requested but numba is not installed.")
+    _backend = name
+
+
+def active_backend() -> str:
+    """The backend kernels currently run on: "numba" or "python"."""
+    if _backend not in BACKENDS:
+        raise ValueError(f"Unknown QT_KERNEL_BACKEND: {_backend}. Choose from {BACKENDS}.")
+    if _backend == "python":
+        return "python"
+    if numba_available():
+        return "numba"
+    if _backend == "numba":
+        raise RuntimeError("QT_KERNEL_BACKEND=numba but numba is not installed.")
+    return "python"
+
+
+class Kernel:
+    """A kernel function plus its lazily compiled numba version."""
+
+    def __init__(self, func: Callable[..., Any]) -> None:
+        self.name = func.__name__
+        self.python = func
+        self._compiled: Optional[Callable[..., Any]] = None
+
+    @property
+    def compiled(self) -> Callable[..., Any]:
+        if self._compiled is None:
+            if not numba_available():
+                raise RuntimeError("numba is not installed.")
+            self._compiled = _numba_module.njit(cache=True)(self.python)
+        return self._compiled
+
+    def __call__(self, *args: Any) -> Any:
+        if active_backend() == "numba":
+            return self.compiled(*args)
+        return self.python(*args)
+
+
+KERNELS: Dict[str, Kernel] = {}
+
+
+def kernel(func: Callable[..., Any]) -> Kernel:
+    wrapped = Kernel(func)
+    KERNELS[wrapped.name] = wrapped
+    return wrapped
+
+
+# ---- #
+# Signal recursions
+# ---- #
+@kernel
+def _donchian_kernel(high_channel, low_channel, close, allow_short, out):  # type: ignore[no-untyped-def]
+    position = 0
+    for i in range(close.shape[0]):
+        if math.isnan(high_channel[i]) or math.isnan(low_channel[i]):
+            continue
+        if close[i] >= high_channel[i]:
+            position = 1
+        elif close[i] <= low_channel[i]:
+            position = -1 if allow_short else 0
+        out[i] = position
+
+
+@kernel
+def _rsi_bollinger_kernel(  # type: ignore[no-untyped-def]
+    close, rsi, mid, lower, upper, long_entry, long_exit, short_entry, short_exit, allow_short, out
+):
+    position = 0
+    for i in range(close.shape[0]):
+        price = close[i]
+        value = rsi[i]
+        has_rsi = not math.isnan(value)
+        entry_long = has_rsi and not math.isnan(lower[i]) and value <= long_entry and price <= lower[i]
+        entry_short = has_rsi and not math.isnan(upper[i]) and value >= short_entry and price >= upper[i]
+        if position == 0:
+            if entry_long:
+                position = 1
+            elif entry_short and allow_short:
+                position = -1
+        elif position == 1:
+            exit_long = (has_rsi and value >= long_exit) or (not math.isnan(mid[i]) and price >= mid[i])
+            if exit_long:
+                position = -1 if entry_short and allow_short else 0
+        else:
+            exit_short = (has_rsi and value <= short_exit) or (not math.isnan(mid[i]) and price <= mid[i])
+            if exit_short:
+                position = 1 if entry_long else 0
+        out[i] = position
+
+
+@kernel
+def _pairs_kernel(zscore, entry_z, exit_z, stop_z, out):  # type: ignore[no-untyped-def]
+    position = 0
+    blocked = False  # after a stop, wait for |z| < entry_z before re-entering
+    use_stop = not math.isnan(stop_z)
+    for i in range(zscore.shape[0]):
+        z = zscore[i]
+        if math.isnan(z):
+            out[i] = position
+            continue
+        if blocked and abs(z) < entry_z:
+            blocked = False
+        if position == 0:
+            if not blocked:
+                if z >= entry_z:
+                    position = -1
+                elif z <= -entry_z:
+                    position = 1
+        elif position == 1:
+            if use_stop and z <= -stop_z:
+                position = 0
+                blocked = True
+            elif z >= -exit_z:
+                position = 0
+        else:
+            if use_stop and z >= stop_z:
+                position = 0
+                blocked = True
+            elif z <= exit_z:
+                position = 0
+        out[i] = position
+
+
+@kernel
+def _sliding_max_kernel(values, window, queue, out):  # type: ignore[no-untyped-def]
+    # queue[head:tail] holds indices whose values decrease from head to tail;
+    # each index is pushed and popped at most once, so the loop is O(n).
+    head = 0
+    tail = 0
+    for i in range(values.shape[0]):
+        while tail > head and values[queue[tail - 1]] <= values[i]:
+            tail -= 1
+        queue[tail] = i
+        tail += 1
+        if queue[head] <= i - window:
+            head += 1
+        if i >= window - 1:
+            out[i] = values[queue[head]]
+
+
+def donchian_positions(
+    high_channel: np.ndarray, low_channel: np.ndarray, close: np.ndarray, allow_short: bool
+) -> np.ndarray:
+    """+1/-1/0 positions from Donchian breakouts (flat until both channels exist)."""
+    out = np.zeros(len(close), dtype=np.int8)
+    _donchian_kernel(high_channel, low_channel, close, bool(allow_short), out)
+    return out
+
+
+def rsi_bollinger_positions(
+    close: np.ndarray,
+    rsi: np.ndarray,
+    mid: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    long_entry: float,
+    long_exit: float,
+    short_entry: float,
+    short_exit: float,
+    allow_short: bool,
+) -> np.ndarray:
+    """+1/-1/0 positions from the RSI + Bollinger entry/exit rules."""
+    out = np.zeros(len(close), dtype=np.int8)
+    # Thresholds take the array dtype so float32 runs compare in float32 on every backend.
+    scalar = rsi.dtype.type
+    _rsi_bollinger_kernel(
+        close,
+        rsi,
+        mid,
+        lower,
+        upper,
+        scalar(long_entry),
+        scalar(long_exit),
+        scalar(short_entry),
+        scalar(short_exit),
+        bool(allow_short),
+        out,
+    )
+    return out
+
+
+def pairs_positions(zscore: np.ndarray, entry_z: float, exit_z: float, stop_z: Optional[float] = None) -> np.ndarray:
+    """
+    +1 (long spread) / -1 (short spread) / 0 from spread z-scores.
+
+    Enter short above ``entry_z`` and long below ``-entry_z``, exit once the
+    z-score is back within ``exit_z`` of zero, and stop out beyond ``stop_z``
+    (no re-entry until it is back inside ``entry_z``). NaN z-scores hold.
+    """
+    out = np.zeros(len(zscore), dtype=np.int8)
+    scalar = zscore.dtype.type
+    stop = np.nan if stop_z is None else stop_z
+    _pairs_kernel(zscore, scalar(entry_z), scalar(exit_z), scalar(stop), out)
+    return out
+
+
+def sliding_max(values: np.ndarray, window: int) -> np.ndarray:
+    """Maximum of each trailing ``window`` values (NaN for the first ``window - 1``); input must not contain NaN."""
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    out = np.full(len(values), np.nan)
+    queue = np.empty(len(values), dtype=np.int64)
+    _sliding_max_kernel(values, int(window), queue, out)
+    return out
+
+
+# ---- #
+# Bar-by-bar simulation
+# ---- #
+@kernel
+def _simulate_kernel(  # type: ignore[no-untyped-def]
+    close,
+    opens,
+    highs,
+    lows,
+    signals,
+    atr,
+    rsi,
+    initial_capital,
+    position_size,
+    allow_short,
+    atr_multiplier,
+    intrabar,
+    rsi_threshold,
+    equity,
+    exit_prices,
+    entry_sizes,
+    final_exit,
+):
+    strategies = signals.shape[0]
+    bars = close.shape[0]
+    # Strategies are independent, so each one walks all bars in turn: its state
+    # stays in locals and its rows are read contiguously.
+    for s in range(strategies):
+        cash = initial_capital[s]
+        size = position_size[s]
+        can_short = allow_short[s]
+        multiplier = atr_multiplier[s]
+        uses_stop = not math.isnan(multiplier)
+        fills_intrabar = intrabar[s] and uses_stop
+        threshold = rsi_threshold[s]
+        signal_row = signals[s]
+        atr_row = atr[s]
+        rsi_row = rsi[s]
+        equity_row = equity[s]
+        exit_row = exit_prices[s]
+        entry_row = entry_sizes[s]
+        held = 0
+        stop = np.nan
+        for i in range(bars):
+            price = close[i]
+            signal = signal_row[i]
+
+            if fills_intrabar and held != 0 and not math.isnan(stop):
+                # Stop resting from the previous bar, filled at the stop or at a gapped Open.
+                fill = np.nan
+                if held > 0:
+                    if opens[i] <= stop:
+                        fill = opens[i]
+                    elif min(lows[i], highs[i], price) <= stop:
+                        fill = stop
+                else:
+                    if opens[i] >= stop:
+                        fill = opens[i]
+                    elif max(highs[i], lows[i], price) >= stop:
+                        fill = stop
+                if not math.isnan(fill):
+                    exit_row[i] = fill
+                    cash += fill * held
+                    held = 0
+                    stop = np.nan
+                    signal = 0
+
+            if uses_stop and held > 0 and not math.isnan(stop) and price <= stop:
+                signal = 0
+            if uses_stop and held < 0 and not math.isnan(stop) and price >= stop:
+                signal = 0
+            if held > 0 and not math.isnan(rsi_row[i]) and rsi_row[i] >= threshold:
+                # NaN thresholds compare False, so strategies without the RSI exit never trigger.
+                signal = 0
+
+            atr_value = atr_row[i] if uses_stop else np.nan
+            if signal > 0:
+                if held < 0:
+                    exit_row[i] = price
+                    cash += price * held
+                    held = 0
+                    stop = np.nan
+                if held == 0:
+                    held = size
+                    entry_row[i] = held
+                    cash -= price * held
+                    if not math.isnan(atr_value):
+                        stop = price - multiplier * atr_value
+            elif signal < 0:
+                if held > 0:
+                    exit_row[i] = price
+                    cash += price * held
+                    held = 0
+                    stop = np.nan
+                if can_short and held == 0:
+                    held = -size
+                    entry_row[i] = held
+                    cash -= price * held
+                    if not math.isnan(atr_value):
+                        stop = price + multiplier * atr_value
+            elif held != 0:
+                exit_row[i] = price
+                cash += price * held
+                held = 0
+                stop = np.nan
+
+            if not math.isnan(atr_value):
+                if held > 0:
+                    candidate = price - multiplier * atr_value
+                    if math.isnan(stop) or candidate > stop:
+                        stop = candidate
+                elif held < 0:
+                    candidate = price + multiplier * atr_value
+                    if math.isnan(stop) or candidate < stop:
+                        stop = candidate
+
+            equity_row[i] = cash + held * price
+
+        # Open positions are closed at the final price.
+        if held != 0:
+            equity_row[bars - 1] = cash + close[bars - 1] * held
+            final_exit[s] = True
+
+
+def simulate_strategies(
+    close: np.ndarray,
+    signals: np.ndarray,
+    initial_capital: np.ndarray,
+    position_size: np.ndarray,
+    allow_short: np.ndarray,
+    atr: Optional[np.ndarray] = None,
+    atr_multiplier: Optional[np.ndarray] = None,
+    rsi: Optional[np.ndarray] = None,
+    rsi_threshold: Optional[np.ndarray] = None,
+    opens: Optional[np.ndarray] = None,
+    highs: Optional[np.ndarray] = None,
+    lows: Optional[np.ndarray] = None,
+    intrabar: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Market-on-close simulation of several strategies over one bar series.
+
+    ``signals``, ``atr``, and ``rsi`` have shape (strategies, bars); the other
+    per-strategy arguments have shape (strategies,). A NaN ``atr_multiplier``
+    disables the ATR trailing stop and a NaN ``rsi_threshold`` the RSI exit;
+    ``intrabar`` strategies fill their stop against ``opens``/``highs``/``lows``.
+
+    Returns:
+        equity (strategies, bars); exit_prices (strategies, bars), NaN where no
+        position was closed; entry_sizes (strategies, bars), the signed
+        quantity opened on each bar; final_exit (strategies,), True where a
+        position was still open and closed at the last price.
+    """
+    signals = np.atleast_2d(signals)
+    strategies, bars = signals.shape
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    missing = np.full((strategies, bars), np.nan)
+    atr = missing if atr is None else np.ascontiguousarray(atr, dtype=np.float64).reshape(strategies, bars)
+    if rsi is None:
+        rsi = missing
+        rsi_threshold = np.full(strategies, np.nan)
+    rsi = np.ascontiguousarray(rsi).reshape(strategies, bars)
+    # Thresholds take the RSI dtype so float32 runs compare in float32 on every backend.
+    rsi_threshold = np.asarray(
+        np.full(strategies, np.nan) if rsi_threshold is None else rsi_threshold, dtype=rsi.dtype
+    )
+    prices = [close if values is None else np.ascontiguousarray(values, dtype=np.float64) for values in (opens, highs, lows)]
+    equity = np.empty((strategies, bars))
+    exit_prices = np.full((strategies, bars), np.nan)
+    entry_sizes = np.zeros((strategies, bars), dtype=np.int64)
+    final_exit = np.zeros(strategies, dtype=np.bool_)
+    _simulate_kernel(
+        close,
+        prices[0],
+        prices[1],
+        prices[2],
+        np.ascontiguousarray(signals, dtype=np.int8),
+        atr,
+        rsi,
+        np.asarray(initial_capital, dtype=np.float64),
+        np.asarray(position_size, dtype=np.int64),
+        np.asarray(allow_short, dtype=np.bool_),
+        np.full(strategies, np.nan) if atr_multiplier is None else np.asarray(atr_multiplier, dtype=np.float64),
+        np.zeros(strategies, dtype=np.bool_) if intrabar is None else np.asarray(intrabar, dtype=np.bool_),
+        rsi_threshold,
+        equity,
+        exit_prices,
+        entry_sizes,
+        final_exit,
+    )
+    return equity, exit_prices, entry_sizes, final_exit
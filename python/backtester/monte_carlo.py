@@ -0,0 +1,225 @@
+"""
+Monte Carlo robustness analysis for a finished backtest.
+
+Resamples either the trade PnL list or the per-bar return series of a
+``SimpleBacktest`` into many alternative paths and reports the distribution
+of total return, max drawdown, and Sharpe ratio instead of a single point
+estimate. Each chunk of paths is generated as one 2-D index array and reduced
+with the vectorized ``batch_metrics`` pass from ``simulation``.
+
+Methods:
+    shuffle    permutation without replacement (order risk only; with trade PnL
+               the total return is unchanged, drawdown and Sharpe path vary)
+    bootstrap  i.i.d. draws with replacement
+    block      stationary block bootstrap (Politis & Romano) with geometric
+               block lengths of mean ``block_length``; keeps autocorrelation
+
+Chunks get independent child seeds from one ``SeedSequence``, so results for a
+given seed and ``chunk_size`` are identical whether they run in one process or
+across ``workers`` processes.
+
+Example:
+    backtest.run()
+    result = monte_carlo(backtest, n_paths=100_000, method="block", seed=7, workers=4)
+    print(result.to_text())
+    low, high = result.confidence_interval("sharpe_ratio", 0.95)
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .simple_backtest import SimpleBacktest
+from .simulation import TRADING_DAYS, batch_metrics, periods_per_year
+
+METHODS = ("shuffle", "bootstrap", "block")
+SOURCES = ("returns", "trades")
+MC_METRICS = ["total_return", "max_drawdown", "sharpe_ratio"]
+# Cap on path x step elements per chunk (~160 MB of float64 equity).
+MAX_CHUNK_ELEMENTS = 20_000_000
+
+
+@dataclass
+class MonteCarloResult:
+    """Metric distributions over resampled paths plus the observed values."""
+
+    method: str
+    source: str
+    n_paths: int
+    seed: Optional[int]
+    observed: Dict[str, float]
+    metrics: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    def confidence_interval(self, metric: str, level: float = 0.95) -> Tuple[float, float]:
+        """Two-sided percentile interval for ``metric``."""
+        if not 0 < level < 1:
+            raise ValueError("level must be between 0 and 1.")
+        tail = (1 - level) / 2 * 100
+        low, high = np.nanpercentile(self.metrics[metric], [tail, 100 - tail])
+        return float(low), float(high)
+
+    def summary(self, percentiles: Sequence[float] = (5, 50, 95)) -> pd.DataFrame:
+        """One row per metric: observed, mean, std, and the requested percentiles."""
+        rows = []
+        for name in MC_METRICS:
+            values = self.metrics[name]
+            row = {
+                "metric": name,
+                "observed": self.observed[name],
+                "mean": float(np.nanmean(values)),
+                "std": float(np.nanstd(values)),
+            }
+            for pct, value in zip(percentiles, np.nanpercentile(values, percentiles)):
+                row[f"p{pct:g}"] = float(value)
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+    @property
+    def probability_of_loss(self) -> float:
+        """Share of paths that end below the initial capital."""
+        return float(np.mean(self.metrics["total_return"] < 0))
+
+    def to_frame(self) -> pd.DataFrame:
+        """One row per path."""
+        return pd.DataFrame(self.metrics)
+
+    def to_text(self) -> str:
+        title = f"MONTE CARLO ({self.method} on {self.source}, {self.n_paths:,} paths)"
+        lines = ["=" * 60, title, "=" * 60]
+        lines.append(f"{'Metric':<16}{'Observed':>10}{'p5':>10}{'p50':>10}{'p95':>10}")
+        for row in self.summary().itertuples(index=False):
+            label = row.metric.replace("_", " ").title()
+            lines.append(f"{label:<16}{row.observed:>10.2f}{row.p5:>10.2f}{row.p50:>10.2f}{row.p95:>10.2f}")
+        lines.append("-" * 60)
+        lines.append(f"{'Probability of loss':.<40} {self.probability_of_loss:.1%}")
+        lines.append("=" * 60)
+        return "\n".join(lines)
+
+
+def resample_indices(
+    rng: np.random.Generator,
+    length: int,
+    n_paths: int,
+    method: str,
+    block_length: float = 20.0,
+) -> np.ndarray:
+    """Index matrix of shape (n_paths, length) selecting the resampled steps."""
+    if method == "shuffle":
+        return rng.permuted(np.broadcast_to(np.arange(length, dtype=np.int32), (n_paths, length)), axis=1)
+    if method == "bootstrap":
+        return rng.integers(0, length, size=(n_paths, length), dtype=np.int32)
+    if method == "block":
+        if block_length < 1:
+            raise ValueError("block_length must be at least 1.")
+        # A new block starts with probability 1/L; inside a block indices advance by one (wrapping).
+        new_block = rng.random((n_paths, length), dtype=np.float32) < 1.0 / block_length
+        new_block[:, 0] = True
+        starts = rng.integers(0, length, size=(n_paths, length), dtype=np.int32)
+        steps = np.arange(length, dtype=np.int32)
+        block_start = np.maximum.accumulate(np.where(new_block, steps, 0), axis=1)
+        first = np.take_along_axis(starts, block_start, axis=1)
+        return (first + steps - block_start) % length
+    raise ValueError(f"Unknown resampling method: {method}. Choose from {METHODS}.")
+
+
+def equity_paths(samples: np.ndarray, source: str, initial_capital: float) -> np.ndarray:
+    """Equity rows (with the starting capital prepended) from resampled PnL or returns."""
+    samples = np.atleast_2d(samples)
+    equity = np.empty((samples.shape[0], samples.shape[1] + 1))
+    equity[:, 0] = initial_capital
+    if source == "trades":
+        np.cumsum(samples, axis=1, out=equity[:, 1:])
+        equity[:, 1:] += initial_capital
+    else:
+        np.cumprod(1 + samples, axis=1, out=equity[:, 1:])
+        equity[:, 1:] *= initial_capital
+    return equity
+
+
+def _simulate_chunk(
+    values: np.ndarray,
+    source: str,
+    method: str,
+    n_paths: int,
+    seed: np.random.SeedSequence,
+    block_length: float,
+    initial_capital: float,
+    periods_per_year: float,
+) -> Dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    samples = values[resample_indices(rng, len(values), n_paths, method, block_length)]
+    return batch_metrics(equity_paths(samples, source, initial_capital), periods_per_year=periods_per_year)
+
+
+def _chunk_run(args: Tuple) -> Dict[str, np.ndarray]:
+    return _simulate_chunk(*args)
+
+
+def monte_carlo(
+    backtest: SimpleBacktest,
+    n_paths: int = 10_000,
+    method: str = "bootstrap",
+    source: str = "returns",
+    block_length: float = 20.0,
+    seed: Optional[int] = None,
+    workers: int = 1,
+    chunk_size: Optional[int] = None,
+) -> MonteCarloResult:
+    """
+    Resample a completed backtest into ``n_paths`` alternative equity paths.
+
+    Args:
+        backtest: A ``SimpleBacktest`` after ``run()`` (or ``restore_results``).
+        n_paths: Number of resampled paths.
+        method: "shuffle", "bootstrap", or "block".
+        source: "returns" resamples per-bar equity returns; "trades" resamples trade PnL.
+        block_length: Mean block length for the stationary block bootstrap.
+        seed: Seed for reproducible paths (None draws fresh entropy).
+        workers: Processes used to evaluate chunks (1 = in-process).
+        chunk_size: Paths per chunk; defaults to fit ``MAX_CHUNK_ELEMENTS``.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown resampling method: {method}. Choose from {METHODS}.")
+    if source not in SOURCES:
+        raise ValueError(f"Unknown source: {source}. Choose from {SOURCES}.")
+    if n_paths < 1 or workers < 1:
+        raise ValueError("n_paths and workers must be at least 1.")
+
+    equity_curve = backtest.get_equity_curve()
+    if source == "trades":
+        values = np.array([trade.pnl for trade in backtest.trades], dtype=np.float64)
+        if len(values) < 2:
+            raise ValueError("Trade resampling needs at least two trades.")
+        years = (equity_curve.index[-1] - equity_curve.index[0]).days / 365.25
+        periods = len(values) / years if years > 0 else float(len(values))
+    else:
+        equity = equity_curve.to_numpy(dtype=np.float64)
+        values = equity[1:] / equity[:-1] - 1
+        if len(values) < 2:
+            raise ValueError("Return resampling needs at least three equity points.")
+        periods = TRADING_DAYS if backtest.timeframe is None else periods_per_year(equity_curve.index)
+
+    # Observed values on the same basis as the paths (trade-level equity for "trades").
+    baseline = batch_metrics(equity_paths(values, source, backtest.initial_capital), periods)
+    observed = {name: float(baseline[name][0]) for name in MC_METRICS}
+
+    chunk_size = chunk_size or max(1, MAX_CHUNK_ELEMENTS // (len(values) + 1))
+    sizes = [min(chunk_size, n_paths - start) for start in range(0, n_paths, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [
+        (values, source, method, size, child, block_length, backtest.initial_capital, periods)
+        for size, child in zip(sizes, seeds)
+    ]
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            chunks: List[Dict[str, np.ndarray]] = list(pool.map(_chunk_run, tasks))
+    else:
+        chunks = [_chunk_run(task) for task in tasks]
+
+    metrics = {name: np.concatenate([chunk[name] for chunk in chunks]) for name in MC_METRICS}
+    return MonteCarloResult(method, source, n_paths, seed, observed, metrics)
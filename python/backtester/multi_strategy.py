@@ -0,0 +1,163 @@
+"""
+Run several strategies over one symbol with a single data pass.
+
+``MultiStrategyBacktest`` loads the CSV once into a shared ``Dataset``,
+evaluates the union of every strategy's indicators once into the shared
+``IndicatorStore``, and then walks the bars a single time, advancing each
+strategy's own cash/position book and trade ledger on every bar. Each
+strategy ends up as a regular ``SimpleBacktest`` with the same results it
+would produce on its own; the combined portfolio is the sum of their equity
+curves (each strategy trades its own ``initial_capital``).
+
+Example:
+    runner = MultiStrategyBacktest(
+        "data/SPY.csv",
+        {
+            "ma": {"strategy": "ma_crossover", "fast_window": 20, "slow_window": 50},
+            "macd": {"strategy": "macd"},
+            "donchian": {"strategy": "donchian"},
+            "mean_rev": {"strategy": "rsi_bollinger"},
+        },
+    )
+    runner.run()
+    print(runner.summary())
+    combined = runner.get_combined_results()
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from .dataset import Dataset
+from .indicators import Indicator
+from .simple_backtest import SimpleBacktest, Trade, performance_metrics, simulate_backtests
+from .simulation import TRADING_DAYS, periods_per_year
+
+# Shared by every strategy because they read the same data pass.
+_SHARED_PARAMS = {"csv_file", "precision", "timeframe"}
+
+
+class MultiStrategyBacktest:
+    """Named ``SimpleBacktest`` configurations advanced together over one symbol."""
+
+    def __init__(
+        self,
+        csv_file: str,
+        strategies: Dict[str, Dict[str, Any]],
+        precision: str = "float64",
+        timeframe: Optional[str] = None,
+    ) -> None:
+        """
+        Args:
+            csv_file: OHLCV CSV shared by all strategies.
+            strategies: Strategy name -> ``SimpleBacktest`` keyword arguments
+                (e.g. ``{"strategy": "macd", "macd_fast": 8}``).
+            precision: "float64" or "float32", applied to every strategy.
+            timeframe: Optional resampling frequency applied to every strategy.
+        """
+        if not strategies:
+            raise ValueError("At least one strategy configuration is required.")
+        self.csv_file = csv_file
+        self.backtests: Dict[str, SimpleBacktest] = {}
+        for name, params in strategies.items():
+            shared = _SHARED_PARAMS.intersection(params)
+            if shared:
+                raise ValueError(f"Strategy '{name}' sets {sorted(shared)}; pass them to MultiStrategyBacktest instead.")
+            self.backtests[name] = SimpleBacktest(csv_file, precision=precision, timeframe=timeframe, **params)
+        self.dataset: Optional[Dataset] = None
+        self._combined_equity: pd.Series = pd.Series(dtype=float)
+        self._combined_results: Dict[str, float] = {}
+
+    def load_data(self, dataset: Optional[Dataset] = None) -> None:
+        """Load the CSV once and point every strategy at the shared frame and indicator store."""
+        self.dataset = dataset or Dataset(self.csv_file)
+        for backtest in self.backtests.values():
+            backtest.load_data(self.dataset)
+
+    def required_indicators(self) -> List[Indicator]:
+        """Distinct indicator nodes needed by any of the strategies."""
+        nodes: Dict[Indicator, None] = {}
+        for backtest in self.backtests.values():
+            nodes.update(dict.fromkeys(backtest.required_indicators().values()))
+        return list(nodes)
+
+    def calculate_indicators(self) -> None:
+        """Evaluate the union of indicators once; per-strategy checks then hit the memo."""
+        if self.dataset is None:
+            self.load_data()
+        first = next(iter(self.backtests.values()))
+        first.indicators.evaluate(self.required_indicators())
+        for backtest in self.backtests.values():
+            backtest.calculate_indicators()
+
+    def generate_signals(self) -> None:
+        for backtest in self.backtests.values():
+            backtest.generate_signals()
+
+    def run(self) -> None:
+        """Load, compute indicators and signals as needed, then simulate all strategies in one bar walk."""
+        if self.dataset is None:
+            self.load_data()
+        if any(backtest.signals is None for backtest in self.backtests.values()):
+            self.calculate_indicators()
+            self.generate_signals()
+
+        simulate_backtests(list(self.backtests.values()))
+
+        self._combined_equity = pd.concat(
+            [backtest.get_equity_curve() for backtest in self.backtests.values()], axis=1
+        ).sum(axis=1).rename("equity")
+        first = next(iter(self.backtests.values()))
+        periods = TRADING_DAYS if first.timeframe is None else periods_per_year(self._combined_equity.index)
+        self._combined_results = performance_metrics(self._combined_equity, self.all_trades(), periods)
+
+    # ------------------------------------------------------------------ #
+    # Results
+    # ------------------------------------------------------------------ #
+    def all_trades(self) -> List[Trade]:
+        """Every strategy's trades in exit order."""
+        trades = [trade for backtest in self.backtests.values() for trade in backtest.trades]
+        return sorted(trades, key=lambda trade: trade.exit_date)
+
+    def get_results(self) -> Dict[str, Dict[str, float]]:
+        """Per-strategy metrics keyed by strategy name."""
+        return {name: backtest.get_results() for name, backtest in self.backtests.items()}
+
+    def get_combined_results(self) -> Dict[str, float]:
+        """Metrics of the summed equity curve across all strategies."""
+        if not self._combined_results:
+            raise RuntimeError("Backtest has not been run yet.")
+        return self._combined_results
+
+    def get_combined_equity_curve(self) -> pd.Series:
+        if self._combined_equity.empty:
+            raise RuntimeError("Backtest has not been run yet.")
+        return self._combined_equity.copy()
+
+    def summary(self) -> pd.DataFrame:
+        """One row per strategy plus a final "combined" row."""
+        rows = []
+        for name, backtest in self.backtests.items():
+            total_pnl = sum(trade.pnl for trade in backtest.trades)
+            rows.append(
+                {
+                    "name": name,
+                    "strategy": backtest.strategy,
+                    "initial_capital": backtest.initial_capital,
+                    "final_capital": backtest.initial_capital + total_pnl,
+                    **backtest.get_results(),
+                }
+            )
+        combined_capital = sum(backtest.initial_capital for backtest in self.backtests.values())
+        rows.append(
+            {
+                "name": "combined",
+                "strategy": "",
+                "initial_capital": combined_capital,
+                "final_capital": combined_capital + sum(trade.pnl for trade in self.all_trades()),
+                **self.get_combined_results(),
+            }
+        )
+        return pd.DataFrame(rows)
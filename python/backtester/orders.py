@@ -0,0 +1,457 @@
+"""
+Event-driven order engine with price-keyed pending-order heaps.
+
+``OrderBook`` accepts market, limit, stop, and stop-limit orders from any
+number of strategies, plus OCO groups and bracket orders (entry followed by an
+OCO take-profit / stop-loss pair), and matches them bar by bar against each
+bar's Open/High/Low/Close.
+
+Resting orders live in four heaps keyed by their trigger price:
+
+    buy stop, sell limit    trigger when the price rises to them  (min-heap)
+    sell stop, buy limit    trigger when the price falls to them  (max-heap)
+
+so a bar only pops the orders its High/Low actually reached: O(k log n) for k
+triggered orders out of n resting, instead of scanning the whole book.
+Cancelled orders are deleted lazily (skipped when popped) and the heaps are
+compacted once stale entries outnumber live ones.
+
+Fill model:
+    - Market orders fill at the next bar's Open.
+    - Within a bar the price walks Open -> Low -> High -> Close when
+      Close >= Open, otherwise Open -> High -> Low -> Close. Triggered orders
+      fill in the order the path reaches them, which decides e.g. whether a
+      bracket's stop-loss or take-profit fires first.
+    - Stops and limits fill at their price, or at the Open when the bar gaps
+      through it (worse for stops, better for limits).
+    - A triggered stop-limit becomes a limit order: it fills immediately if the
+      trigger price satisfies the limit, later in the bar if the path returns
+      to the limit, and otherwise rests in the limit heap.
+    - Orders fill in full; partial fills and volume limits are not modeled.
+
+Example:
+    book = OrderBook()
+    entry, take_profit, stop_loss = book.bracket("ma", BUY, 10, take_profit=110.0, stop_loss=95.0)
+    book.submit("breakout", BUY, 5, "stop", stop_price=104.0)
+    for bar in frame.itertuples():
+        fills = book.process_bar(bar.Open, bar.High, bar.Low, bar.Close, bar.Date)
+    print(book.positions["ma"].realized_pnl)
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+BUY = 1
+SELL = -1
+ORDER_TYPES = ("market", "limit", "stop", "stop_limit")
+
+# Heap name -> True when its orders trigger on a rising price.
+_HEAPS = {"buy_stop": True, "sell_limit": True, "sell_stop": False, "buy_limit": False}
+# Compact the heaps once this many cancelled entries are waiting to be popped.
+_MIN_STALE_TO_COMPACT = 1024
+
+Path = Tuple[float, float, float, float]
+
+
+@dataclass
+class Order:
+    """An order and its lifecycle state (pending, held, filled, cancelled)."""
+
+    order_id: int
+    strategy: str
+    side: int
+    quantity: int
+    order_type: str
+    limit_price: Optional[float] = None
+    stop_price: Optional[float] = None
+    status: str = "pending"
+    # Stop-limit orders whose stop has been hit and now behave as limits.
+    triggered: bool = False
+    oco_group: Optional[int] = None
+    parent_id: Optional[int] = None
+    children: List[int] = field(default_factory=list)
+    fill_price: Optional[float] = None
+    fill_date: Any = None
+    # Where the order currently waits: "market", a heap name, or None.
+    queue: Optional[str] = None
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in {"pending", "held"}
+
+
+@dataclass(frozen=True)
+class Fill:
+    order_id: int
+    strategy: str
+    side: int
+    quantity: int
+    price: float
+    date: Any
+    bar_index: int
+
+
+@dataclass
+class Position:
+    """Net position of one strategy with average entry price and realized PnL."""
+
+    quantity: int = 0
+    average_price: float = 0.0
+    realized_pnl: float = 0.0
+
+    def apply(self, side: int, quantity: int, price: float) -> None:
+        signed = side * quantity
+        if self.quantity == 0 or (self.quantity > 0) == (signed > 0):
+            total = abs(self.quantity) + quantity
+            self.average_price = (self.average_price * abs(self.quantity) + price * quantity) / total
+            self.quantity += signed
+            return
+        closed = min(abs(self.quantity), quantity)
+        direction = 1 if self.quantity > 0 else -1
+        self.realized_pnl += closed * (price - self.average_price) * direction
+        self.quantity += signed
+        if self.quantity == 0:
+            self.average_price = 0.0
+        elif (self.quantity > 0) != (direction > 0):
+            # Flipped through zero: the remainder is a new position at this price.
+            self.average_price = price
+
+    def unrealized_pnl(self, price: float) -> float:
+        return self.quantity * (price - self.average_price)
+
+
+# ---- #
+# Intrabar price path
+# ---- #
+def bar_path(open_: float, high: float, low: float, close: float) -> Path:
+    """Assumed intrabar path: up bars visit the Low before the High, down bars the reverse."""
+    if close >= open_:
+        return (open_, low, high, close)
+    return (open_, high, low, close)
+
+
+def _price_at(path: Path, time: float) -> float:
+    index = min(int(time), 2)
+    return path[index] + (time - index) * (path[index + 1] - path[index])
+
+
+def first_touch(path: Path, level: float, rising: bool, start: float = 0.0) -> Optional[Tuple[float, float]]:
+    """
+    First (time, price) at or after ``start`` where the path reaches ``level``.
+
+    Time runs from 0 (Open) to 3 (Close). ``rising`` looks for price >= level,
+    otherwise price <= level. If the price is already beyond the level at
+    ``start`` (a gap), the fill price is the current price rather than the level.
+    """
+    current = _price_at(path, start)
+    if (current >= level) if rising else (current <= level):
+        return start, current
+    for index in range(min(int(start), 2), 3):
+        segment_start, segment_end = path[index], path[index + 1]
+        if (segment_end >= level) if rising else (segment_end <= level):
+            return index + (level - segment_start) / (segment_end - segment_start), level
+    return None
+
+
+def stop_fill_price(side: int, stop_price: float, open_: float, high: float, low: float, close: float) -> Optional[float]:
+    """Fill price of a stop order on this bar (gap-aware), or None if it is not triggered."""
+    touch = first_touch(bar_path(open_, high, low, close), stop_price, rising=side == BUY)
+    return None if touch is None else touch[1]
+
+
+# ---- #
+# Order book
+# ---- #
+class OrderBook:
+    """Pending orders of many strategies, matched bar by bar against OHLC prices."""
+
+    def __init__(self) -> None:
+        self.orders: Dict[int, Order] = {}
+        self.positions: Dict[str, Position] = defaultdict(Position)
+        self.fills: List[Fill] = []
+        self.bar_index = -1
+        self._ids = itertools.count(1)
+        self._groups = itertools.count(1)
+        self._oco: Dict[int, List[int]] = {}
+        self._market: Deque[int] = deque()
+        self._heaps: Dict[str, List[Tuple[float, int]]] = {name: [] for name in _HEAPS}
+        self._resting = 0
+
+    # ------------------------------------------------------------------ #
+    # Submission and cancellation
+    # ------------------------------------------------------------------ #
+    def submit(
+        self,
+        strategy: str,
+        side: int,
+        quantity: int,
+        order_type: str = "market",
+        limit_price: Optional[float] = None,
+        stop_price: Optional[float] = None,
+    ) -> int:
+        """Queue a new order and return its id."""
+        order = self._new_order(strategy, side, quantity, order_type, limit_price, stop_price)
+        self._activate(order)
+        return order.order_id
+
+    def bracket(
+        self,
+        strategy: str,
+        side: int,
+        quantity: int,
+        order_type: str = "market",
+        limit_price: Optional[float] = None,
+        stop_price: Optional[float] = None,
+        take_profit: Optional[float] = None,
+        stop_loss: Optional[float] = None,
+    ) -> Tuple[int, Optional[int], Optional[int]]:
+        """
+        Entry order plus exit orders that go live once the entry fills.
+
+        The take-profit (limit) and stop-loss (stop) exits close the full entry
+        quantity and form an OCO group. Returns (entry, take_profit, stop_loss)
+        ids; exits that were not requested are None.
+        """
+        if take_profit is None and stop_loss is None:
+            raise ValueError("A bracket needs a take_profit, a stop_loss, or both.")
+        entry = self._new_order(strategy, side, quantity, order_type, limit_price, stop_price)
+        exits: List[Optional[int]] = []
+        for exit_type, price in (("limit", take_profit), ("stop", stop_loss)):
+            if price is None:
+                exits.append(None)
+                continue
+            child = self._new_order(
+                strategy,
+                -side,
+                quantity,
+                exit_type,
+                limit_price=price if exit_type == "limit" else None,
+                stop_price=price if exit_type == "stop" else None,
+            )
+            child.status = "held"
+            child.parent_id = entry.order_id
+            entry.children.append(child.order_id)
+            exits.append(child.order_id)
+        if len(entry.children) > 1:
+            self.oco(*entry.children)
+        self._activate(entry)
+        return entry.order_id, exits[0], exits[1]
+
+    def oco(self, *order_ids: int) -> int:
+        """Link orders so that the first one to fill cancels the others."""
+        if len(order_ids) < 2:
+            raise ValueError("An OCO group needs at least two orders.")
+        for order_id in order_ids:
+            order = self._get(order_id)
+            if not order.is_active:
+                raise ValueError(f"Order {order_id} is {order.status} and cannot join an OCO group.")
+            if order.oco_group is not None:
+                raise ValueError(f"Order {order_id} already belongs to OCO group {order.oco_group}.")
+        group = next(self._groups)
+        for order_id in order_ids:
+            self.orders[order_id].oco_group = group
+        self._oco[group] = list(order_ids)
+        return group
+
+    def cancel(self, order_id: int) -> bool:
+        """Cancel an active order (and any held bracket exits). Returns False if already done."""
+        order = self._get(order_id)
+        if not order.is_active:
+            return False
+        if order.queue in _HEAPS:
+            self._resting -= 1
+        order.status = "cancelled"
+        order.queue = None
+        for child_id in order.children:
+            if self.orders[child_id].status == "held":
+                self.orders[child_id].status = "cancelled"
+        self._maybe_compact()
+        return True
+
+    def cancel_all(self, strategy: Optional[str] = None) -> int:
+        """Cancel every active order, optionally only those of ``strategy``."""
+        targets = [
+            order.order_id
+            for order in self.orders.values()
+            if order.is_active and (strategy is None or order.strategy == strategy)
+        ]
+        return sum(self.cancel(order_id) for order_id in targets)
+
+    def open_orders(self, strategy: Optional[str] = None) -> List[Order]:
+        return [
+            order
+            for order in self.orders.values()
+            if order.is_active and (strategy is None or order.strategy == strategy)
+        ]
+
+    @property
+    def resting_count(self) -> int:
+        """Live orders waiting in the price heaps."""
+        return self._resting
+
+    # ------------------------------------------------------------------ #
+    # Matching
+    # ------------------------------------------------------------------ #
+    def process_bar(self, open_: float, high: float, low: float, close: float, date: Any = None) -> List[Fill]:
+        """Match pending orders against one bar and return the fills in path order."""
+        if high < low:
+            raise ValueError(f"Bar high {high} is below its low {low}.")
+        self.bar_index += 1
+        path = bar_path(open_, high, low, close)
+        events: List[Tuple[float, int, float]] = []
+
+        while self._market:
+            order = self.orders[self._market.popleft()]
+            if order.status == "pending" and order.queue == "market":
+                order.queue = None
+                events.append((0.0, order.order_id, open_))
+
+        unreachable: List[Order] = []
+        for name, rising in _HEAPS.items():
+            heap = self._heaps[name]
+            threshold = high if rising else -low
+            while heap and heap[0][0] <= threshold:
+                _, order_id = heapq.heappop(heap)
+                order = self.orders[order_id]
+                if order.status != "pending" or order.queue != name:
+                    continue  # cancelled or moved; dropped lazily
+                self._resting -= 1
+                order.queue = None
+                touch = first_touch(path, self._trigger_level(order), rising)
+                if touch is not None:
+                    events.append((touch[0], order_id, touch[1]))
+                else:  # only possible when the Open/Close lie outside High/Low
+                    unreachable.append(order)
+        for order in unreachable:
+            self._push(order)
+
+        heapq.heapify(events)
+        fills: List[Fill] = []
+        while events:
+            time, order_id, price = heapq.heappop(events)
+            order = self.orders[order_id]
+            if order.status != "pending":
+                continue  # cancelled earlier in this bar by an OCO sibling
+            if order.order_type == "stop_limit" and not order.triggered:
+                order.triggered = True
+                if (price <= order.limit_price) if order.side == BUY else (price >= order.limit_price):
+                    heapq.heappush(events, (time, order_id, price))
+                else:
+                    self._schedule(order, path, time, events)
+                continue
+            fills.append(self._fill(order, price, date))
+            for child_id in order.children:
+                child = self.orders[child_id]
+                if child.status == "held":
+                    child.status = "pending"
+                    self._schedule(child, path, time, events)
+        return fills
+
+    # ------------------------------------------------------------------ #
+    # Internals
+    # ------------------------------------------------------------------ #
+    def _new_order(
+        self,
+        strategy: str,
+        side: int,
+        quantity: int,
+        order_type: str,
+        limit_price: Optional[float],
+        stop_price: Optional[float],
+    ) -> Order:
+        if side not in (BUY, SELL):
+            raise ValueError("side must be BUY (1) or SELL (-1).")
+        if int(quantity) <= 0:
+            raise ValueError("quantity must be a positive integer.")
+        if order_type not in ORDER_TYPES:
+            raise ValueError(f"Unknown order type: {order_type}. Choose from {ORDER_TYPES}.")
+        if order_type in {"limit", "stop_limit"} and limit_price is None:
+            raise ValueError(f"{order_type} orders need a limit_price.")
+        if order_type in {"stop", "stop_limit"} and stop_price is None:
+            raise ValueError(f"{order_type} orders need a stop_price.")
+        order = Order(
+            order_id=next(self._ids),
+            strategy=strategy,
+            side=side,
+            quantity=int(quantity),
+            order_type=order_type,
+            limit_price=float(limit_price) if limit_price is not None else None,
+            stop_price=float(stop_price) if stop_price is not None else None,
+        )
+        self.orders[order.order_id] = order
+        return order
+
+    def _get(self, order_id: int) -> Order:
+        if order_id not in self.orders:
+            raise KeyError(f"Unknown order id {order_id}.")
+        return self.orders[order_id]
+
+    def _activate(self, order: Order) -> None:
+        if order.order_type == "market":
+            order.queue = "market"
+            self._market.append(order.order_id)
+        else:
+            self._push(order)
+
+    @staticmethod
+    def _heap_name(order: Order) -> str:
+        kind = "stop" if order.order_type == "stop" or (order.order_type == "stop_limit" and not order.triggered) else "limit"
+        return f"{'buy' if order.side == BUY else 'sell'}_{kind}"
+
+    @staticmethod
+    def _trigger_level(order: Order) -> float:
+        if order.order_type == "stop" or (order.order_type == "stop_limit" and not order.triggered):
+            return order.stop_price  # type: ignore[return-value]
+        return order.limit_price  # type: ignore[return-value]
+
+    def _push(self, order: Order) -> None:
+        name = self._heap_name(order)
+        level = self._trigger_level(order)
+        heapq.heappush(self._heaps[name], (level if _HEAPS[name] else -level, order.order_id))
+        order.queue = name
+        self._resting += 1
+
+    def _schedule(self, order: Order, path: Path, start: float, events: List[Tuple[float, int, float]]) -> None:
+        """Queue ``order`` for the rest of the bar if the path still reaches it, else rest it."""
+        if order.order_type == "market":
+            heapq.heappush(events, (start, order.order_id, _price_at(path, start)))
+            return
+        touch = first_touch(path, self._trigger_level(order), _HEAPS[self._heap_name(order)], start)
+        if touch is None:
+            self._push(order)
+        else:
+            heapq.heappush(events, (touch[0], order.order_id, touch[1]))
+
+    def _fill(self, order: Order, price: float, date: Any) -> Fill:
+        order.status = "filled"
+        order.queue = None
+        order.fill_price = price
+        order.fill_date = date
+        self.positions[order.strategy].apply(order.side, order.quantity, price)
+        fill = Fill(order.order_id, order.strategy, order.side, order.quantity, price, date, self.bar_index)
+        self.fills.append(fill)
+        if order.oco_group is not None:
+            for sibling_id in self._oco.pop(order.oco_group, []):
+                if sibling_id != order.order_id:
+                    self.cancel(sibling_id)
+        return fill
+
+    def _maybe_compact(self) -> None:
+        entries = sum(len(heap) for heap in self._heaps.values())
+        stale = entries - self._resting
+        if stale < _MIN_STALE_TO_COMPACT or stale <= self._resting:
+            return
+        for name, heap in self._heaps.items():
+            live = [
+                entry
+                for entry in heap
+                if self.orders[entry[1]].status == "pending" and self.orders[entry[1]].queue == name
+            ]
+            heapq.heapify(live)
+            self._heaps[name] = live
+
@@ -0,0 +1,330 @@
+"""
+Pairs trading on the z-score of a rolling-hedge spread between two symbols.
+
+For a dependent symbol y and a hedge symbol x, a rolling OLS fit
+``y ~ alpha + beta * x`` over ``window`` bars gives the hedge ratio, the
+spread is ``y - beta * x``, and its z-score against a rolling mean/std over
+``z_window`` bars drives Bollinger-style rules: short the spread above
+``entry_z``, buy it below ``-entry_z``, exit back inside ``exit_z``, with an
+optional ``stop_z``. Every rolling statistic comes from windowed sums
+(``backtester.rolling``), so the whole chain is O(n) in the number of bars.
+
+A position holds ``position_size`` shares of y against ``beta`` times as many
+shares of x (the hedge ratio is locked at entry). Fills are at the close, as in
+``SimpleBacktest``. ``screen_pairs`` runs the same statistics over every pair
+in a universe at once to shortlist candidates.
+
+Example:
+    backtest = PairsBacktest("data/KO.csv", "data/PEP.csv", window=60, entry_z=2.0, exit_z=0.5)
+    backtest.run()
+    print(backtest.get_results())
+
+    candidates = screen_pairs(load_panel(paths, ["Close"])["Close"], min_correlation=0.6)
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from . import kernels
+from .dataset import Dataset, DatasetCache, symbol_from_path
+from .rolling import rolling_mean_std, rolling_regression
+from .simple_backtest import performance_metrics
+from .simulation import TRADING_DAYS
+
+SCREEN_COLUMNS = ["y", "x", "beta", "correlation", "half_life", "crossings_per_year", "signal_rate"]
+
+
+@dataclass
+class PairTrade:
+    """Completed spread trade: ``y_quantity`` of y against ``x_quantity`` of x (signed)."""
+
+    entry_date: pd.Timestamp
+    exit_date: pd.Timestamp
+    direction: int
+    y_entry: float
+    y_exit: float
+    x_entry: float
+    x_exit: float
+    y_quantity: float
+    x_quantity: float
+
+    @property
+    def pnl(self) -> float:
+        return self.y_quantity * (self.y_exit - self.y_entry) + self.x_quantity * (self.x_exit - self.x_entry)
+
+    @property
+    def duration_days(self) -> int:
+        return (self.exit_date - self.entry_date).days
+
+
+def spread_zscore(y: np.ndarray, x: np.ndarray, window: int, z_window: int) -> Dict[str, np.ndarray]:
+    """
+    Rolling alpha/beta of y on x, the spread ``y - beta * x``, and its z-score.
+
+    Works on (bars,) series or (bars, pairs) panels.
+    """
+    alpha, beta = rolling_regression(x, y, window)
+    spread = y - beta * x
+    mean, std = rolling_mean_std(spread, z_window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        zscore = np.where(std > 0, (spread - mean) / std, np.nan)
+    return {"alpha": alpha, "beta": beta, "spread": spread, "zscore": zscore}
+
+
+class PairsBacktest:
+    """Mean-reversion backtest on the spread between two symbols."""
+
+    def __init__(
+        self,
+        y_csv: Union[str, Path],
+        x_csv: Union[str, Path],
+        window: int = 60,
+        z_window: Optional[int] = None,
+        entry_z: float = 2.0,
+        exit_z: float = 0.5,
+        stop_z: Optional[float] = None,
+        log_prices: bool = False,
+        position_size: int = 100,
+        initial_capital: float = 10_000.0,
+    ) -> None:
+        """
+        Args:
+            y_csv: CSV of the dependent symbol (traded ``position_size`` shares).
+            x_csv: CSV of the hedge symbol (traded ``beta`` shares per y share).
+            window: Bars in the rolling hedge-ratio regression.
+            z_window: Bars in the spread mean/std (default: ``window``).
+            entry_z: Enter when |z| reaches this many standard deviations.
+            exit_z: Exit when |z| falls back to this level.
+            stop_z: Optional stop when |z| reaches this level.
+            log_prices: Fit the regression on log prices; the hedge then holds
+                ``beta * y / x`` shares of x per y share (equal-elasticity notional).
+            position_size: Shares of y per trade.
+            initial_capital: Starting cash.
+        """
+        z_window = window if z_window is None else z_window
+        if window < 2 or z_window < 2:
+            raise ValueError("window and z_window must be >= 2.")
+        if not 0 <= exit_z < entry_z:
+            raise ValueError("Require 0 <= exit_z < entry_z.")
+        if stop_z is not None and stop_z <= entry_z:
+            raise ValueError("stop_z must be greater than entry_z.")
+        if position_size <= 0:
+            raise ValueError("position_size must be positive.")
+
+        self.y_csv = str(y_csv)
+        self.x_csv = str(x_csv)
+        self.y_symbol = symbol_from_path(y_csv)
+        self.x_symbol = symbol_from_path(x_csv)
+        self.window = window
+        self.z_window = z_window
+        self.entry_z = entry_z
+        self.exit_z = exit_z
+        self.stop_z = stop_z
+        self.log_prices = log_prices
+        self.position_size = position_size
+        self.initial_capital = initial_capital
+
+        self.data: Optional[pd.DataFrame] = None
+        self.statistics: Dict[str, np.ndarray] = {}
+        self.positions: Optional[np.ndarray] = None
+        self.trades: List[PairTrade] = []
+        self._equity: pd.Series = pd.Series(dtype=float)
+        self._results: Dict[str, float] = {}
+
+    def load_data(self, cache: Optional[DatasetCache] = None) -> None:
+        """Load both CSVs (through ``cache`` when given) and align them on common dates."""
+        frames = []
+        for path, name in ((self.y_csv, "y"), (self.x_csv, "x")):
+            dataset = cache.get(path) if cache is not None else Dataset(path)
+            frames.append(dataset.frame[["Date", "Close"]].rename(columns={"Close": name}))
+        data = frames[0].merge(frames[1], on="Date", how="inner").dropna()
+        if len(data) <= max(self.window, self.z_window):
+            raise RuntimeError(
+                f"Only {len(data)} common bars for {self.y_symbol}/{self.x_symbol}; need more than the windows."
+            )
+        self.data = data.reset_index(drop=True)
+
+    def calculate_indicators(self) -> None:
+        if self.data is None:
+            self.load_data()
+        y = self.data["y"].to_numpy(dtype=np.float64)
+        x = self.data["x"].to_numpy(dtype=np.float64)
+        if self.log_prices:
+            if (y <= 0).any() or (x <= 0).any():
+                raise RuntimeError("log_prices requires strictly positive prices.")
+            y, x = np.log(y), np.log(x)
+        self.statistics = spread_zscore(y, x, self.window, self.z_window)
+
+    def generate_signals(self) -> None:
+        if not self.statistics:
+            self.calculate_indicators()
+        self.positions = kernels.pairs_positions(self.statistics["zscore"], self.entry_z, self.exit_z, self.stop_z)
+
+    def run(self) -> None:
+        """Simulate the spread positions with hedge ratios locked at entry."""
+        if self.positions is None:
+            self.generate_signals()
+        dates = self.data["Date"]
+        y = self.data["y"].to_numpy(dtype=np.float64)
+        x = self.data["x"].to_numpy(dtype=np.float64)
+        position = self.positions.astype(np.float64)
+
+        hedge = self.statistics["beta"] * self.position_size
+        if self.log_prices:
+            hedge = hedge * y / x
+        previous = np.concatenate([[0.0], position[:-1]])
+        entries = (position != 0) & (position != previous)
+        locked = hedge[np.maximum.accumulate(np.where(entries, np.arange(len(position)), 0))]
+        y_quantity = position * self.position_size
+        x_quantity = np.where(position != 0, -position * locked, 0.0)
+
+        pnl = np.zeros(len(position))
+        pnl[1:] = y_quantity[:-1] * np.diff(y) + x_quantity[:-1] * np.diff(x)
+        self._equity = pd.Series(self.initial_capital + np.cumsum(pnl), index=dates, name="equity")
+
+        exits = (previous != 0) & (position != previous)
+        entry_rows = np.flatnonzero(entries)
+        exit_rows = np.flatnonzero(exits)
+        if len(exit_rows) < len(entry_rows):
+            exit_rows = np.append(exit_rows, len(position) - 1)  # close the open spread on the last bar
+        self.trades = [
+            PairTrade(
+                entry_date=dates.iloc[start],
+                exit_date=dates.iloc[end],
+                direction=int(position[start]),
+                y_entry=float(y[start]),
+                y_exit=float(y[end]),
+                x_entry=float(x[start]),
+                x_exit=float(x[end]),
+                y_quantity=float(y_quantity[start]),
+                x_quantity=float(x_quantity[start]),
+            )
+            for start, end in zip(entry_rows, exit_rows)
+        ]
+        self._results = performance_metrics(self._equity, self.trades, TRADING_DAYS)
+
+    # ------------------------------------------------------------------ #
+    # Results
+    # ------------------------------------------------------------------ #
+    def get_results(self) -> Dict[str, float]:
+        if not self._results:
+            raise RuntimeError("Backtest has not been run yet.")
+        return self._results
+
+    def get_equity_curve(self) -> pd.Series:
+        if self._equity.empty:
+            raise RuntimeError("Backtest has not been run yet.")
+        return self._equity.copy()
+
+    def get_spread_frame(self) -> pd.DataFrame:
+        """Per-bar prices, hedge ratio, spread, z-score, and position."""
+        if self.positions is None:
+            raise RuntimeError("Signals have not been generated yet.")
+        frame = self.data.rename(columns={"y": self.y_symbol, "x": self.x_symbol}).set_index("Date")
+        for name in ("alpha", "beta", "spread", "zscore"):
+            frame[name] = self.statistics[name]
+        frame["position"] = self.positions
+        return frame
+
+    def trades_frame(self) -> pd.DataFrame:
+        columns = ["entry_date", "exit_date", "direction", "y_entry", "y_exit", "x_entry", "x_exit", "y_quantity", "x_quantity"]
+        rows = [[getattr(trade, name) for name in columns] + [trade.pnl] for trade in self.trades]
+        return pd.DataFrame(rows, columns=columns + ["pnl"])
+
+
+def screen_pairs(
+    close: pd.DataFrame,
+    window: int = 60,
+    entry_z: float = 2.0,
+    log_prices: bool = True,
+    min_correlation: float = 0.5,
+    max_half_life: Optional[float] = None,
+    chunk_size: int = 32,
+) -> pd.DataFrame:
+    """
+    Score every (y, x) pair of columns in a dates x symbols close panel.
+
+    Per pair, over the dates both symbols trade:
+        beta                full-sample hedge ratio of y on x
+        correlation         correlation of daily log returns
+        half_life           bars for the static spread to revert halfway (AR(1) fit)
+        crossings_per_year  times the spread crosses its mean, per 252 bars
+        signal_rate         share of bars with |rolling z-score| >= ``entry_z``
+
+    Pairs are evaluated ``chunk_size`` at a time as columns of one panel
+    (small chunks keep the working arrays in cache).
+    Returns the pairs with correlation >= ``min_correlation`` and a finite
+    half-life (<= ``max_half_life`` when given), shortest half-life first.
+    """
+    symbols = [str(symbol) for symbol in close.columns]
+    if len(symbols) < 2:
+        raise ValueError("Need at least two symbols to screen pairs.")
+    prices = close.to_numpy(dtype=np.float64)
+    if log_prices:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            prices = np.where(prices > 0, np.log(prices), np.nan)
+    y_index, x_index = np.triu_indices(len(symbols), 1)
+
+    frames = []
+    for start in range(0, len(y_index), chunk_size):
+        rows = slice(start, start + chunk_size)
+        y, x = prices[:, y_index[rows]], prices[:, x_index[rows]]
+        scores = _pair_statistics(y, x, window, entry_z)
+        scores["y"] = np.asarray(symbols, dtype=object)[y_index[rows]]
+        scores["x"] = np.asarray(symbols, dtype=object)[x_index[rows]]
+        frames.append(pd.DataFrame(scores))
+    frame = pd.concat(frames, ignore_index=True)[SCREEN_COLUMNS]
+
+    keep = (frame["correlation"] >= min_correlation) & np.isfinite(frame["half_life"])
+    if max_half_life is not None:
+        keep &= frame["half_life"] <= max_half_life
+    return frame[keep].sort_values(["half_life", "correlation"], ascending=[True, False], ignore_index=True)
+
+
+def _masked_mean(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    counts = mask.sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(mask, values, 0.0).sum(axis=0) / counts
+
+
+def _pair_statistics(y: np.ndarray, x: np.ndarray, window: int, entry_z: float) -> Dict[str, np.ndarray]:
+    """Screen statistics for (bars, pairs) panels of y and x prices."""
+    valid = np.isfinite(y) & np.isfinite(x)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        yc = np.where(valid, y - _masked_mean(y, valid), 0.0)
+        xc = np.where(valid, x - _masked_mean(x, valid), 0.0)
+        beta = (xc * yc).sum(axis=0) / (xc * xc).sum(axis=0)
+
+        both = valid[1:] & valid[:-1]
+        dy = np.where(both, np.diff(y, axis=0), 0.0)
+        dx = np.where(both, np.diff(x, axis=0), 0.0)
+        dy -= np.where(both, _masked_mean(dy, both), 0.0)
+        dx -= np.where(both, _masked_mean(dx, both), 0.0)
+        correlation = (dx * dy).sum(axis=0) / np.sqrt((dx * dx).sum(axis=0) * (dy * dy).sum(axis=0))
+
+        spread = np.where(valid, yc - beta * xc, 0.0)
+        lagged = np.where(both, spread[:-1] - _masked_mean(spread[:-1], both), 0.0)
+        change = np.where(both, spread[1:] - spread[:-1], 0.0)
+        slope = (change * lagged).sum(axis=0) / (lagged * lagged).sum(axis=0)
+        half_life = np.where(slope < 0, -np.log(2) / slope, np.inf)
+
+        side = np.sign(spread)
+        crossings = (both & (side[1:] * side[:-1] < 0)).sum(axis=0)
+        crossings_per_year = crossings / valid.sum(axis=0) * TRADING_DAYS
+
+        zscore = spread_zscore(np.where(valid, y, np.nan), np.where(valid, x, np.nan), window, window)["zscore"]
+        scored = np.isfinite(zscore)
+        signal_rate = (np.abs(np.where(scored, zscore, 0.0)) >= entry_z).sum(axis=0) / scored.sum(axis=0)
+    return {
+        "beta": beta,
+        "correlation": correlation,
+        "half_life": half_life,
+        "crossings_per_year": crossings_per_year,
+        "signal_rate": signal_rate,
+    }
@@ -0,0 +1,129 @@
+"""
+Accuracy report for the reduced-precision (float32) backtest mode.
+
+Runs the same configuration at float64 and float32 on one shared dataset and
+compares indicators, signals, metrics, and trades. Any trade that exists in
+only one of the two runs is flagged as flipped by precision.
+
+Example:
+    report = compare_precision("data/SPY.csv", strategy="rsi_bollinger")
+    print(report.to_text())
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .dataset import Dataset
+from .simple_backtest import SimpleBacktest, Trade
+
+
+@dataclass
+class PrecisionReport:
+    """Differences between a float64 baseline and a float32 run."""
+
+    indicator_max_abs_error: Dict[str, float]
+    signal_mismatch_dates: List[pd.Timestamp]
+    metrics: Dict[str, Tuple[float, float]]
+    flipped_trades: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def signal_mismatches(self) -> int:
+        return len(self.signal_mismatch_dates)
+
+    @property
+    def identical_trades(self) -> bool:
+        return not self.flipped_trades
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "indicator_max_abs_error": self.indicator_max_abs_error,
+            "signal_mismatches": self.signal_mismatches,
+            "signal_mismatch_dates": [str(date.date()) for date in self.signal_mismatch_dates],
+            "metrics": {
+                key: {"float64": base, "float32": reduced, "delta": reduced - base}
+                for key, (base, reduced) in self.metrics.items()
+            },
+            "flipped_trades": self.flipped_trades,
+        }
+
+    def to_text(self) -> str:
+        lines = ["=" * 60, "FLOAT32 ACCURACY REPORT (vs float64 baseline)", "=" * 60]
+        for role, error in self.indicator_max_abs_error.items():
+            lines.append(f"{('Max |err| ' + role):.<40} {error:.3g}")
+        lines.append(f"{'Signal mismatches':.<40} {self.signal_mismatches}")
+        lines.append("-" * 60)
+        for key, (base, reduced) in self.metrics.items():
+            lines.append(f"{key.replace('_', ' ').title():.<40} {base} -> {reduced}")
+        lines.append("-" * 60)
+        if self.flipped_trades:
+            lines.append(f"{len(self.flipped_trades)} trade(s) flipped by precision:")
+            for trade in self.flipped_trades:
+                lines.append(
+                    f"  [{trade['only_in']} only] {trade['side']} {trade['entry_date']} -> {trade['exit_date']}"
+                )
+        else:
+            lines.append("No trades flipped by precision.")
+        lines.append("=" * 60)
+        return "\n".join(lines)
+
+
+def _trade_key(trade: Trade) -> Tuple[str, str, str]:
+    side = "long" if trade.quantity > 0 else "short"
+    return side, str(trade.entry_date.date()), str(trade.exit_date.date())
+
+
+def _run(csv_file: str, dataset: Dataset, precision: str, params: Dict[str, Any]) -> SimpleBacktest:
+    backtest = SimpleBacktest(csv_file, precision=precision, **params)
+    backtest.load_data(dataset)
+    backtest.calculate_indicators()
+    backtest.generate_signals()
+    backtest.run()
+    return backtest
+
+
+def compare_precision(csv_file: str, dataset: Optional[Dataset] = None, **params: Any) -> PrecisionReport:
+    """
+    Run ``params`` at float64 and float32 and report the differences.
+
+    Args:
+        csv_file: OHLCV CSV used by both runs.
+        dataset: Optional shared ``Dataset`` for ``csv_file``.
+        **params: Remaining ``SimpleBacktest`` keyword arguments (not ``precision``).
+    """
+    params.pop("precision", None)
+    dataset = dataset or Dataset(csv_file)
+    baseline = _run(csv_file, dataset, "float64", params)
+    reduced = _run(csv_file, dataset, "float32", params)
+
+    errors: Dict[str, float] = {}
+    for role in baseline.required_indicators():
+        base_values = baseline.get_indicator(role)
+        reduced_values = reduced.get_indicator(role).astype(np.float64)
+        both = ~np.isnan(base_values) & ~np.isnan(reduced_values)
+        errors[role] = float(np.max(np.abs(base_values[both] - reduced_values[both]))) if both.any() else 0.0
+
+    dates = pd.DatetimeIndex(baseline.data["Date"])
+    mismatches = np.flatnonzero(baseline.signals != reduced.signals)
+
+    base_results = baseline.get_results()
+    reduced_results = reduced.get_results()
+    metrics = {key: (base_results[key], reduced_results[key]) for key in base_results}
+
+    base_trades = {_trade_key(trade) for trade in baseline.trades}
+    reduced_trades = {_trade_key(trade) for trade in reduced.trades}
+    flipped = [
+        {"only_in": only_in, "side": side, "entry_date": entry, "exit_date": exit_}
+        for only_in, keys in (("float64", base_trades - reduced_trades), ("float32", reduced_trades - base_trades))
+        for side, entry, exit_ in sorted(keys, key=lambda key: key[1])
+    ]
+    return PrecisionReport(
+        indicator_max_abs_error=errors,
+        signal_mismatch_dates=[dates[i] for i in mismatches],
+        metrics=metrics,
+        flipped_trades=flipped,
+    )
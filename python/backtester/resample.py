@@ -0,0 +1,238 @@
+"""
+OHLCV resampling to coarser timeframes, memoized per (symbol, frequency).
+
+Bars are aggregated Open=first, High=max, Low=min, Close/Adj Close=last,
+Volume=sum. Each resampled bar is stamped with the timestamp of the last base
+bar it contains, i.e. the moment its close is known, so joining timeframes
+with ``merge_timeframes`` never leaks a partially formed higher-timeframe bar
+into earlier base bars.
+
+``ResampleCache`` keeps results in memory and (optionally) as pickles on disk.
+When the base frame grows by appended bars, only the trailing, possibly
+incomplete bucket and the new bars are re-aggregated; if earlier base bars
+changed (checked against a hash of the Date/OHLCV rows already consumed), the
+frequency is rebuilt from scratch. Entries are keyed by a caller-chosen
+string; ``dataset.source_key`` gives CSVs one per resolved path.
+
+Example:
+    weekly = resample_ohlcv(daily, "W")
+    cache = ResampleCache("results/resample_cache")
+    four_hour = cache.get(source_key("data/BTC_USD.csv"), hourly, "4h")
+    backtest = SimpleBacktest("data/SPY.csv", timeframe="W", fast_window=4, slow_window=13)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+from pandas.tseries.offsets import Tick
+
+AGGREGATIONS = {
+    "Open": "first",
+    "High": "max",
+    "Low": "min",
+    "Close": "last",
+    "Adj Close": "last",
+    "Volume": "sum",
+}
+# Bump when the aggregation rules change so stale disk entries are rebuilt.
+CACHE_FORMAT = 2
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / "results" / "resample_cache"
+_BAR_END = "_bar_end"
+
+
+def normalize_frequency(freq: str) -> str:
+    """Canonical pandas alias for ``freq`` (e.g. "1W" -> "W-SUN")."""
+    try:
+        return to_offset(freq).freqstr
+    except ValueError as exc:
+        raise ValueError(f"Invalid resampling frequency: {freq}") from exc
+
+
+def _check_coarser(frame: pd.DataFrame, freq: str) -> None:
+    if len(frame) < 2:
+        return
+    base_step = frame["Date"].diff().median()
+    anchor = pd.Timestamp("2000-01-03")
+    target_step = (anchor + to_offset(freq)) - anchor
+    if target_step < base_step:
+        raise ValueError(f"Frequency {freq} is finer than the base data spacing ({base_step}).")
+
+
+def resample_ohlcv(frame: pd.DataFrame, freq: str) -> pd.DataFrame:
+    """
+    Aggregate a sorted OHLCV frame (with a Date column) to ``freq``.
+
+    Buckets use absolute boundaries (epoch origin for intraday frequencies), so
+    resampling a suffix of the data yields the same buckets as the full frame.
+    Empty buckets (weekends, holidays) are dropped.
+    """
+    freq = normalize_frequency(freq)
+    _check_coarser(frame, freq)
+    return _aggregate(frame, freq)
+
+
+def _aggregate(frame: pd.DataFrame, freq: str) -> pd.DataFrame:
+    rules = {column: rule for column, rule in AGGREGATIONS.items() if column in frame.columns}
+    rules[_BAR_END] = "last"
+    # Calendar offsets (W, ME, ...) are already absolute; fixed ones need an absolute origin.
+    origin = {"origin": "epoch"} if isinstance(to_offset(freq), Tick) else {}
+    grouped = frame.assign(**{_BAR_END: frame["Date"]}).set_index("Date").resample(freq, **origin)
+    bars = grouped.agg(rules).dropna(subset=[_BAR_END, "Close"])
+    bars = bars.rename(columns={_BAR_END: "Date"}).reset_index(drop=True)
+    return bars[["Date", *[column for column in rules if column != _BAR_END]]]
+
+
+def merge_timeframes(base: pd.DataFrame, higher: pd.DataFrame, suffix: str) -> pd.DataFrame:
+    """
+    Attach the latest completed higher-timeframe bar to every base bar.
+
+    Columns of ``higher`` (other than Date) are added with ``suffix`` appended,
+    e.g. ``merge_timeframes(daily, weekly, "_W")`` adds ``Close_W``.
+    """
+    right = higher.rename(columns={column: f"{column}{suffix}" for column in higher.columns})
+    return pd.merge_asof(base, right, left_on="Date", right_on=f"Date{suffix}", direction="backward")
+
+
+class ResampleCache:
+    """Resampled frames memoized per (source key, frequency), in memory and optionally on disk."""
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None) -> None:
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self._entries: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        # hits: served unchanged; extended: incrementally updated; rebuilt: full resample.
+        self.hits = 0
+        self.extended = 0
+        self.rebuilt = 0
+
+    def get(self, source: str, base: pd.DataFrame, freq: str) -> pd.DataFrame:
+        """Resampled view of ``base`` at ``freq``, reusing or extending the result cached for ``source``."""
+        freq = normalize_frequency(freq)
+        key = (source.upper(), freq)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._load(key)
+            updated = self._refresh(entry, base, freq)
+            if updated is not None:
+                entry = updated
+                self._save(key, entry)
+            self._entries[key] = entry
+        return entry["bars"]
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "extended": self.extended, "rebuilt": self.rebuilt}
+
+    def evict(self, source: str, freqs: Optional[Iterable[str]] = None) -> None:
+        """Drop cached frequencies for ``source`` (all of them by default), in memory and on disk."""
+        source = source.upper()
+        wanted = None if freqs is None else {normalize_frequency(freq) for freq in freqs}
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == source and (wanted is None or key[1] in wanted)]:
+                del self._entries[key]
+            if self.cache_dir is not None and self.cache_dir.exists():
+                for path in self.cache_dir.glob(f"{source}__*.pkl"):
+                    if wanted is None or self._freq_from_path(path) in wanted:
+                        path.unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------ #
+    # Internals
+    # ------------------------------------------------------------------ #
+    def _refresh(
+        self, entry: Optional[Dict[str, Any]], base: pd.DataFrame, freq: str
+    ) -> Optional[Dict[str, Any]]:
+        """Return a new entry for ``base``, or None when ``entry`` is already current."""
+        dates = base["Date"]
+        if entry is not None and entry["base_rows"] and len(base):
+            base_end = entry["base_end"]
+            consumed = int(dates.searchsorted(base_end, side="right"))
+            prefix_intact = (
+                consumed == entry["base_rows"]
+                and consumed > 0
+                and dates.iloc[consumed - 1] == base_end
+                and _fingerprint(base.iloc[:consumed]) == entry["base_fingerprint"]
+            )
+            if prefix_intact and consumed == len(base):
+                self.hits += 1
+                return None
+            if prefix_intact:
+                bars: pd.DataFrame = entry["bars"]
+                # Base bars after the previous complete bar belong to the last bucket or later.
+                tail = base[dates > bars["Date"].iloc[-2]] if len(bars) > 1 else base
+                self.extended += 1
+                return self._entry(base, pd.concat([bars.iloc[:-1], _aggregate(tail, freq)], ignore_index=True))
+        self.rebuilt += 1
+        return self._entry(base, resample_ohlcv(base, freq))
+
+    @staticmethod
+    def _entry(base: pd.DataFrame, bars: pd.DataFrame) -> Dict[str, Any]:
+        return {
+            "format": CACHE_FORMAT,
+            "bars": bars,
+            "base_rows": len(base),
+            "base_end": base["Date"].iloc[-1] if len(base) else None,
+            "base_fingerprint": _fingerprint(base),
+        }
+
+    def _path(self, key: Tuple[str, str]) -> Path:
+        symbol, freq = key
+        return self.cache_dir / f"{symbol}__{freq}.pkl"
+
+    @staticmethod
+    def _freq_from_path(path: Path) -> str:
+        return path.stem.split("__", 1)[1]
+
+    def _load(self, key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+        if self.cache_dir is None:
+            return None
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            with path.open("rb") as handle:
+                entry = pickle.load(handle)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+        return entry if isinstance(entry, dict) and entry.get("format") == CACHE_FORMAT else None
+
+    def _save(self, key: Tuple[str, str], entry: Dict[str, Any]) -> None:
+        if self.cache_dir is None:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with tmp_path.open("wb") as handle:
+            pickle.dump(entry, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+
+def _fingerprint(frame: pd.DataFrame) -> str:
+    """Hash of the Date and OHLCV columns, so any edit to consumed base bars is detected."""
+    columns = ["Date", *[column for column in AGGREGATIONS if column in frame.columns]]
+    rows = pd.util.hash_pandas_object(frame[columns], index=False).to_numpy()
+    return hashlib.sha256(rows.tobytes()).hexdigest()
+
+
+_default_cache: Optional[ResampleCache] = None
+
+
+def default_cache() -> ResampleCache:
+    """
+    Process-wide cache used by ``SimpleBacktest(timeframe=...)``.
+
+    Persists under ``results/resample_cache`` unless ``QT_RESAMPLE_CACHE`` names
+    another directory (an empty value keeps the cache in memory only).
+    """
+    global _default_cache
+    if _default_cache is None:
+        location = os.environ.get("QT_RESAMPLE_CACHE", str(DEFAULT_CACHE_DIR))
+        _default_cache = ResampleCache(location or None)
+    return _default_cache
@@ -0,0 +1,394 @@
+"""
+SQLite-backed store for completed backtest runs.
+
+Each run is keyed by a hash of its normalized parameters (see
+``SimpleBacktest.effective_params``) plus a hash of the CSV contents, so a
+config that has already been executed against the same data can be returned
+from the store instead of being simulated again. Metrics, trades, and equity
+curves are kept in separate tables and can be queried by symbol, strategy,
+and date range. Each equity curve is a single row of raw int64/float64
+blobs, so storing a run costs one insert, not one per bar.
+
+Example:
+    store = ResultStore("results/backtests.sqlite")
+    backtest = SimpleBacktest("data/AAPL.csv", fast_window=21, slow_window=63)
+    cached = store.run_cached(backtest, label="AAPL SMA21/63")
+    print(backtest.get_results(), "(cached)" if cached else "")
+    print(store.query_runs(symbol="AAPL", strategy="ma_crossover"))
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .dataset import Dataset, symbol_from_path
+from .simple_backtest import SimpleBacktest, Trade
+
+# Bump when engine changes alter results so stale entries stop matching.
+CACHE_VERSION = 1
+METRIC_COLUMNS = [
+    "total_trades",
+    "winning_trades",
+    "losing_trades",
+    "win_rate",
+    "total_return",
+    "max_drawdown",
+    "sharpe_ratio",
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_key TEXT PRIMARY KEY,
+    label TEXT,
+    symbol TEXT NOT NULL,
+    strategy TEXT NOT NULL,
+    params_json TEXT NOT NULL,
+    data_hash TEXT NOT NULL,
+    data_path TEXT,
+    start_date TEXT,
+    end_date TEXT,
+    total_trades INTEGER,
+    winning_trades INTEGER,
+    losing_trades INTEGER,
+    win_rate REAL,
+    total_return REAL,
+    max_drawdown REAL,
+    sharpe_ratio REAL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_symbol_strategy ON runs (symbol, strategy);
+CREATE TABLE IF NOT EXISTS trades (
+    run_key TEXT NOT NULL REFERENCES runs (run_key) ON DELETE CASCADE,
+    trade_index INTEGER NOT NULL,
+    entry_date TEXT NOT NULL,
+    entry_price REAL NOT NULL,
+    exit_date TEXT NOT NULL,
+    exit_price REAL NOT NULL,
+    quantity INTEGER NOT NULL,
+    pnl REAL NOT NULL,
+    PRIMARY KEY (run_key, trade_index)
+);
+CREATE INDEX IF NOT EXISTS idx_trades_exit_date ON trades (exit_date);
+-- One row per run: bar dates (int64 ns) and equity values (float64) as raw blobs.
+CREATE TABLE IF NOT EXISTS equity_curves (
+    run_key TEXT PRIMARY KEY REFERENCES runs (run_key) ON DELETE CASCADE,
+    bars INTEGER NOT NULL,
+    dates BLOB NOT NULL,
+    equity BLOB NOT NULL
+);
+"""
+
+_DATA_HASH_CACHE: Dict[Tuple[str, int, int], str] = {}
+
+
+@dataclass
+class StoredRun:
+    """A run loaded back from the store."""
+
+    run_key: str
+    label: Optional[str]
+    symbol: str
+    strategy: str
+    params: Dict[str, Any]
+    results: Dict[str, float]
+    trades: List[Trade] = field(default_factory=list)
+    equity_curve: pd.Series = field(default_factory=lambda: pd.Series(dtype=float))
+
+
+def data_hash(path: Union[str, Path]) -> str:
+    """SHA-256 of the file contents, memoized per (path, size, mtime)."""
+    resolved = Path(path).resolve()
+    stat = resolved.stat()
+    cache_key = (str(resolved), stat.st_size, stat.st_mtime_ns)
+    cached = _DATA_HASH_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+    digest = hashlib.sha256()
+    with resolved.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    value = digest.hexdigest()
+    _DATA_HASH_CACHE[cache_key] = value
+    return value
+
+
+def canonical_params(backtest: SimpleBacktest) -> str:
+    """Serialize the effective parameters deterministically."""
+    return json.dumps(backtest.effective_params(), sort_keys=True, separators=(",", ":"))
+
+
+def config_key(backtest: SimpleBacktest) -> str:
+    """Hash identifying a run: normalized params + data contents + cache version."""
+    payload = f"{CACHE_VERSION}|{canonical_params(backtest)}|{data_hash(backtest.csv_file)}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _iso(value: Any) -> str:
+    return pd.Timestamp(value).isoformat()
+
+
+class ResultStore:
+    """Local results database keyed by config/data hash."""
+
+    def __init__(self, path: Union[str, Path], check_same_thread: bool = True) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Pass check_same_thread=False only when callers serialize access themselves.
+        # The timeout lets several worker processes share one store file.
+        self._conn = sqlite3.connect(str(self.path), timeout=30.0, check_same_thread=check_same_thread)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------ #
+    # Read/write single runs
+    # ------------------------------------------------------------------ #
+    def contains(self, run_key: str) -> bool:
+        row = self._conn.execute("SELECT 1 FROM runs WHERE run_key = ?", (run_key,)).fetchone()
+        return row is not None
+
+    def get(self, run_key: str) -> Optional[StoredRun]:
+        """Load a stored run with its trades and equity curve, or None if absent."""
+        row = self._conn.execute(
+            f"SELECT label, symbol, strategy, params_json, {', '.join(METRIC_COLUMNS)} "
+            "FROM runs WHERE run_key = ?",
+            (run_key,),
+        ).fetchone()
+        if row is None:
+            return None
+        label, symbol, strategy, params_json = row[:4]
+        results = dict(zip(METRIC_COLUMNS, row[4:]))
+        return StoredRun(
+            run_key=run_key,
+            label=label,
+            symbol=symbol,
+            strategy=strategy,
+            params=json.loads(params_json),
+            results=results,
+            trades=self.load_trades(run_key),
+            equity_curve=self.load_equity_curve(run_key),
+        )
+
+    def put(self, run_key: str, backtest: SimpleBacktest, label: Optional[str] = None) -> None:
+        """Persist a completed backtest under ``run_key`` (replacing any previous entry)."""
+        results = backtest.get_results()
+        equity = backtest.get_equity_curve()
+        with self._conn:
+            self._conn.execute("DELETE FROM runs WHERE run_key = ?", (run_key,))
+            self._conn.execute(
+                f"INSERT INTO runs (run_key, label, symbol, strategy, params_json, data_hash, data_path, "
+                f"start_date, end_date, {', '.join(METRIC_COLUMNS)}, created_at) "
+                f"VALUES ({', '.join('?' * (10 + len(METRIC_COLUMNS)))})",
+                (
+                    run_key,
+                    label,
+                    symbol_from_path(backtest.csv_file),
+                    backtest.strategy,
+                    canonical_params(backtest),
+                    data_hash(backtest.csv_file),
+                    str(Path(backtest.csv_file).resolve()),
+                    _iso(equity.index[0]),
+                    _iso(equity.index[-1]),
+                    *(results.get(column) for column in METRIC_COLUMNS),
+                    datetime.now(timezone.utc).isoformat(),
+                ),
+            )
+            self._conn.executemany(
+                "INSERT INTO trades VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        run_key,
+                        index,
+                        _iso(trade.entry_date),
+                        float(trade.entry_price),
+                        _iso(trade.exit_date),
+                        float(trade.exit_price),
+                        int(trade.quantity),
+                        float(trade.pnl),
+                    )
+                    for index, trade in enumerate(backtest.trades)
+                ),
+            )
+            self._conn.execute(
+                "INSERT INTO equity_curves VALUES (?, ?, ?, ?)",
+                (
+                    run_key,
+                    len(equity),
+                    pd.DatetimeIndex(equity.index).to_numpy(dtype="datetime64[ns]").view(np.int64).tobytes(),
+                    equity.to_numpy(dtype=np.float64).tobytes(),
+                ),
+            )
+
+    def load_trades(self, run_key: str) -> List[Trade]:
+        rows = self._conn.execute(
+            "SELECT entry_date, entry_price, exit_date, exit_price, quantity "
+            "FROM trades WHERE run_key = ? ORDER BY trade_index",
+            (run_key,),
+        ).fetchall()
+        return [
+            Trade(
+                entry_date=pd.Timestamp(entry_date),
+                entry_price=entry_price,
+                exit_date=pd.Timestamp(exit_date),
+                exit_price=exit_price,
+                quantity=quantity,
+            )
+            for entry_date, entry_price, exit_date, exit_price, quantity in rows
+        ]
+
+    def load_equity_curve(self, run_key: str) -> pd.Series:
+        row = self._conn.execute("SELECT dates, equity FROM equity_curves WHERE run_key = ?", (run_key,)).fetchone()
+        if row is None:
+            return pd.Series(dtype=float, name="equity")
+        return _decode_curve(*row)
+
+    def run_cached(
+        self,
+        backtest: SimpleBacktest,
+        label: Optional[str] = None,
+        dataset: Optional[Dataset] = None,
+    ) -> bool:
+        """
+        Populate ``backtest`` from the store if possible, otherwise run and store it.
+
+        ``dataset`` is forwarded to ``load_data`` on a miss, so a shared dataset is
+        only parsed when at least one run actually has to execute.
+
+        Returns:
+            True when the results came from the store, False when the backtest was executed.
+        """
+        run_key = config_key(backtest)
+        stored = self.get(run_key)
+        if stored is not None and not stored.equity_curve.empty:
+            backtest.restore_results(stored.trades, stored.equity_curve)
+            return True
+        backtest.load_data(dataset)
+        backtest.calculate_indicators()
+        backtest.generate_signals()
+        backtest.run()
+        self.put(run_key, backtest, label=label)
+        return False
+
+    # ------------------------------------------------------------------ #
+    # Queries
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def _filters(
+        symbol: Optional[str],
+        strategy: Optional[str],
+        start: Optional[Any],
+        end: Optional[Any],
+        date_column: Optional[str],
+    ) -> Tuple[str, List[Any]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        if symbol:
+            clauses.append("r.symbol = ?")
+            params.append(symbol.upper())
+        if strategy:
+            clauses.append("r.strategy = ?")
+            params.append(strategy.lower())
+        if date_column is None:
+            # Runs overlap the requested window.
+            if start is not None:
+                clauses.append("r.end_date >= ?")
+                params.append(_iso(start))
+            if end is not None:
+                clauses.append("r.start_date <= ?")
+                params.append(_iso(end))
+        else:
+            if start is not None:
+                clauses.append(f"{date_column} >= ?")
+                params.append(_iso(start))
+            if end is not None:
+                clauses.append(f"{date_column} <= ?")
+                params.append(_iso(end))
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def query_runs(
+        self,
+        symbol: Optional[str] = None,
+        strategy: Optional[str] = None,
+        start: Optional[Any] = None,
+        end: Optional[Any] = None,
+    ) -> pd.DataFrame:
+        """Return run metadata and metrics for runs whose data overlaps [start, end]."""
+        where, params = self._filters(symbol, strategy, start, end, None)
+        query = (
+            "SELECT r.run_key, r.label, r.symbol, r.strategy, r.start_date, r.end_date, "
+            f"{', '.join('r.' + column for column in METRIC_COLUMNS)}, r.params_json, r.created_at "
+            f"FROM runs r{where} ORDER BY r.symbol, r.strategy, r.label"
+        )
+        return pd.read_sql_query(query, self._conn, params=params)
+
+    def query_trades(
+        self,
+        symbol: Optional[str] = None,
+        strategy: Optional[str] = None,
+        start: Optional[Any] = None,
+        end: Optional[Any] = None,
+    ) -> pd.DataFrame:
+        """Return trades (with run label/symbol/strategy) that exited within [start, end]."""
+        where, params = self._filters(symbol, strategy, start, end, "t.exit_date")
+        query = (
+            "SELECT r.run_key, r.label, r.symbol, r.strategy, t.trade_index, t.entry_date, "
+            "t.entry_price, t.exit_date, t.exit_price, t.quantity, t.pnl "
+            f"FROM trades t JOIN runs r ON r.run_key = t.run_key{where} "
+            "ORDER BY r.run_key, t.trade_index"
+        )
+        return pd.read_sql_query(query, self._conn, params=params, parse_dates=["entry_date", "exit_date"])
+
+    def query_equity(
+        self,
+        symbol: Optional[str] = None,
+        strategy: Optional[str] = None,
+        start: Optional[Any] = None,
+        end: Optional[Any] = None,
+    ) -> pd.DataFrame:
+        """Return equity points in long format (run_key, label, date, equity) within [start, end]."""
+        # Curves are blobs, so the date filter picks overlapping runs and each curve is clipped here.
+        where, params = self._filters(symbol, strategy, start, end, None)
+        rows = self._conn.execute(
+            "SELECT r.run_key, r.label, r.symbol, r.strategy, e.dates, e.equity "
+            f"FROM equity_curves e JOIN runs r ON r.run_key = e.run_key{where} ORDER BY r.run_key",
+            params,
+        ).fetchall()
+        columns = ["run_key", "label", "symbol", "strategy", "date", "equity"]
+        frames = []
+        for run_key, label, symbol, strategy, dates, values in rows:
+            curve = _decode_curve(dates, values)
+            if start is not None:
+                curve = curve[curve.index >= pd.Timestamp(start)]
+            if end is not None:
+                curve = curve[curve.index <= pd.Timestamp(end)]
+            frames.append(
+                pd.DataFrame(
+                    {"run_key": run_key, "label": label, "symbol": symbol, "strategy": strategy, "date": curve.index, "equity": curve.to_numpy()}
+                )
+            )
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(frames, ignore_index=True)[columns]
+
+
+def _decode_curve(dates: bytes, values: bytes) -> pd.Series:
+    index = pd.to_datetime(np.frombuffer(dates, dtype=np.int64).astype("datetime64[ns]"))
+    return pd.Series(np.frombuffer(values, dtype=np.float64).copy(), index=index, name="equity")
@@ -0,0 +1,203 @@
+"""
+O(n) rolling-window statistics built on prefix sums and monotonic queues.
+
+A windowed sum is the difference of two cumulative sums, so rolling means,
+variances, and least-squares fits cost O(n) whatever the window length,
+instead of O(n * window) for recomputing every window. Inputs are (bars,)
+series or (bars, columns) panels; windows run down axis 0, the first
+``window - 1`` rows are NaN, and any window containing a NaN is NaN.
+Rolling maxima/minima use the monotonic-queue kernel ``kernels.sliding_max``.
+
+Values are shifted by a per-column reference (their mean) before
+cumulating, which keeps prefix sums of squares and cross-products small and
+avoids the cancellation error of ``sum(x^2) - sum(x)^2 / n`` on raw prices.
+
+``rolling_metrics`` builds rolling and expanding return, Sharpe, max
+drawdown, and trade win rate for an equity curve from these pieces.
+
+Example:
+    mean, std = rolling_mean_std(spread, 20)
+    alpha, beta = rolling_regression(x_close, y_close, 60)   # y ~ alpha + beta * x
+    stability = rolling_metrics(backtest.get_equity_curve(), backtest.trades, window=126)
+"""
+
+from __future__ import annotations
+
+import warnings
+from typing import Any, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import kernels
+
+ROLLING_COLUMNS = [
+    "rolling_return",
+    "rolling_sharpe",
+    "rolling_max_drawdown",
+    "rolling_win_rate",
+    "expanding_return",
+    "expanding_sharpe",
+    "expanding_max_drawdown",
+    "expanding_win_rate",
+]
+
+
+def _reference(values: np.ndarray) -> np.ndarray:
+    """Per-column mean ignoring NaN (0 for all-NaN columns)."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        reference = np.nanmean(values, axis=0)
+    return np.nan_to_num(reference)
+
+
+def rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """Sum of each trailing ``window`` rows from two prefix sums."""
+    if window < 1:
+        raise ValueError("window must be >= 1")
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(values.shape, np.nan)
+    if len(values) < window:
+        return out
+    missing = np.isnan(values)
+    has_gaps = bool(missing.any())
+    prefix = np.zeros((len(values) + 1,) + values.shape[1:])
+    np.cumsum(np.where(missing, 0.0, values) if has_gaps else values, axis=0, out=prefix[1:])
+    np.subtract(prefix[window:], prefix[:-window], out=out[window - 1 :])
+    if has_gaps:
+        gaps = np.zeros(prefix.shape, dtype=np.int32)
+        np.cumsum(missing, axis=0, out=gaps[1:])
+        out[window - 1 :][gaps[window:] != gaps[:-window]] = np.nan
+    return out
+
+
+def rolling_mean_std(values: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Rolling mean and population standard deviation (ddof=0, like the Bollinger bands)."""
+    values = np.asarray(values, dtype=np.float64)
+    reference = _reference(values)
+    centered = values - reference
+    mean = rolling_sum(centered, window) / window
+    variance = rolling_sum(centered * centered, window) / window - mean * mean
+    return mean + reference, np.sqrt(np.maximum(variance, 0.0))
+
+
+def expanding_mean_std(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Mean and population standard deviation of all rows up to each row (1-D, no NaN)."""
+    values = np.asarray(values, dtype=np.float64)
+    reference = _reference(values)
+    centered = values - reference
+    counts = np.arange(1, len(values) + 1)
+    mean = np.cumsum(centered) / counts
+    variance = np.cumsum(centered * centered) / counts - mean * mean
+    return mean + reference, np.sqrt(np.maximum(variance, 0.0))
+
+
+def rolling_max(values: np.ndarray, window: int) -> np.ndarray:
+    return kernels.sliding_max(values, window)
+
+
+def rolling_min(values: np.ndarray, window: int) -> np.ndarray:
+    return -kernels.sliding_max(-np.asarray(values, dtype=np.float64), window)
+
+
+def rolling_regression(x: np.ndarray, y: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rolling OLS fit ``y ~ alpha + beta * x`` over each trailing window.
+
+    Uses windowed sums of x, y, x*y and x^2. Windows where x is constant
+    have NaN alpha and beta.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if x.shape != y.shape:
+        raise ValueError(f"x and y must have the same shape, got {x.shape} and {y.shape}")
+    # Mask each series with the other's gaps so every sum covers the same rows.
+    joint = np.isnan(x) | np.isnan(y)
+    x = np.where(joint, np.nan, x)
+    y = np.where(joint, np.nan, y)
+    x_ref, y_ref = _reference(x), _reference(y)
+    xc, yc = x - x_ref, y - y_ref
+
+    sum_x = rolling_sum(xc, window)
+    sum_y = rolling_sum(yc, window)
+    covariance = rolling_sum(xc * yc, window) - sum_x * sum_y / window
+    variance = rolling_sum(xc * xc, window) - sum_x * sum_x / window
+    with np.errstate(divide="ignore", invalid="ignore"):
+        beta = np.where(variance > 0, covariance / variance, np.nan)
+    alpha = (sum_y - beta * sum_x) / window + y_ref - beta * x_ref
+    return alpha, beta
+
+
+def _sharpe(mean: np.ndarray, std: np.ndarray, periods: float) -> np.ndarray:
+    """Annualized Sharpe; 0 for flat stretches, as in ``performance_metrics``."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(std > 0, mean / std * np.sqrt(periods), 0.0)
+    return np.where(np.isnan(mean), np.nan, sharpe)
+
+
+def rolling_metrics(
+    equity: pd.Series,
+    trades: Sequence[Any],
+    window: int,
+    trade_window: int = 20,
+    periods: float = 252,
+) -> pd.DataFrame:
+    """
+    Rolling and expanding stability metrics for an equity curve, one row per bar.
+
+    Columns (returns, drawdowns, and win rates in %, like ``performance_metrics``):
+        rolling_return          return over the last ``window`` bars
+        rolling_sharpe          annualized Sharpe of the last ``window`` bar returns
+        rolling_max_drawdown    deepest drawdown over the last ``window`` bars, each
+                                bar measured from the peak of the ``window`` bars before it
+        rolling_win_rate        winners among the last ``trade_window`` trades closed by the bar
+        expanding_*             the same from the first bar (or first trade) up to the bar
+
+    ``trades`` only need ``exit_date`` and ``pnl``.
+    """
+    if window < 2 or trade_window < 1:
+        raise ValueError("window must be >= 2 and trade_window >= 1.")
+    values = equity.to_numpy(dtype=np.float64)
+    bars = len(values)
+    frame = pd.DataFrame(index=equity.index, columns=ROLLING_COLUMNS, dtype=np.float64)
+
+    rolling_return = np.full(bars, np.nan)
+    rolling_return[window:] = (values[window:] / values[:-window] - 1) * 100
+    frame["rolling_return"] = rolling_return
+    frame["expanding_return"] = (values / values[0] - 1) * 100
+
+    returns = np.zeros(bars)
+    returns[1:] = values[1:] / values[:-1] - 1
+    mean, std = rolling_mean_std(returns[1:], window)
+    frame["rolling_sharpe"] = np.concatenate([[np.nan], _sharpe(mean, std, periods)])
+    mean, std = expanding_mean_std(returns[1:])
+    expanding_sharpe = _sharpe(mean, std, periods)
+    expanding_sharpe[0] = np.nan  # a single return has no spread
+    frame["expanding_sharpe"] = np.concatenate([[np.nan], expanding_sharpe])
+
+    peak = rolling_max(values, window)
+    peak[: window - 1] = np.maximum.accumulate(values[: window - 1])
+    rolling_drawdown = rolling_min(values / peak - 1, window) * 100
+    frame["rolling_max_drawdown"] = rolling_drawdown
+    frame["expanding_max_drawdown"] = np.minimum.accumulate(values / np.maximum.accumulate(values) - 1) * 100
+
+    closed = sorted(trades, key=lambda trade: trade.exit_date)
+    wins = np.cumsum([trade.pnl > 0 for trade in closed], dtype=np.float64)
+    rolling_rate = np.full(len(closed), np.nan)
+    if len(closed) >= trade_window:
+        previous = np.concatenate([[0.0], wins[:-trade_window]])
+        rolling_rate[trade_window - 1 :] = (wins[trade_window - 1 :] - previous) / trade_window * 100
+    expanding_rate = wins / np.arange(1, len(closed) + 1) * 100
+    # Each bar sees the trades that exited on or before it.
+    exits = pd.DatetimeIndex([trade.exit_date for trade in closed])
+    seen = np.searchsorted(exits, equity.index, side="right") - 1
+    frame["rolling_win_rate"] = _per_bar(rolling_rate, seen)
+    frame["expanding_win_rate"] = _per_bar(expanding_rate, seen)
+    return frame
+
+
+def _per_bar(per_trade: np.ndarray, seen: np.ndarray) -> np.ndarray:
+    out = np.full(len(seen), np.nan)
+    hit = seen >= 0
+    out[hit] = per_trade[seen[hit]]
+    return out
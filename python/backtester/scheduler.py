@@ -0,0 +1,282 @@
+"""
+Locality-aware scheduling of backtest runs across worker processes.
+
+Handing a mixed sweep to a plain process pool lets every worker pick up
+runs for every dataset. Each one then parses every CSV and recomputes
+indicators another worker already has. ``plan_lanes`` instead builds one
+ordered lane per worker:
+
+1. Runs are grouped by dataset (path, precision, timeframe). Inside a group
+   they are sorted by indicator signature (the indicator nodes the strategy
+   reads) and then by signal parameters. Runs that reuse the same indicator
+   and signal memos therefore execute back to back.
+2. Each run gets an estimated cost. That is bars x a per-strategy weight,
+   doubled for path-dependent rules (ATR stops, RSI exits) that need the
+   per-bar walk. Parsing a dataset costs ``LOAD_COST`` per bar.
+3. Groups larger than a fair share are cut into contiguous pieces along
+   that order. Pieces are placed longest-processing-time first, each on the
+   lane where it finishes earliest, counting the parse cost only for lanes
+   that do not hold the dataset yet. Datasets stay with their lanes across
+   windows.
+
+``LanePool`` runs the lanes, one single-process executor per lane, so each
+lane's dataset cache stays warm. A lane that runs dry steals from the tail
+of the lane with the most estimated work left. Finished runs are journaled
+through a ``Checkpoint`` exactly as in ``checkpoint.run_resumable``.
+``worker_stats`` collects each worker's cache counters so callers can report
+hit rates.
+
+Example:
+    runs = [describe_run(run_key(config), config, config) for config in configs]
+    lanes = plan_lanes(runs, workers=4)
+    with LanePool(4) as pool, Checkpoint("sweep.journal") as checkpoint:
+        pool.run(lanes, execute, checkpoint, on_result=lambda key, task, result: result)
+        print(pool.worker_stats(cache_stats))
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from .batch import _is_path_dependent
+from .checkpoint import Checkpoint, _ignore_sigint
+from .simple_backtest import SimpleBacktest
+
+# Relative simulation cost per bar; the RSI/Bollinger strategy reads five series.
+STRATEGY_COST = {"ma_crossover": 1.0, "macd": 1.0, "donchian": 1.0, "rsi_bollinger": 1.5}
+PATH_DEPENDENT_COST = 2.0
+# Parsing a CSV and building its frame, per bar, in the same units.
+LOAD_COST = 4.0
+
+
+@dataclass
+class ScheduledRun:
+    key: str
+    task: Any
+    dataset: str
+    signature: Tuple[str, ...]
+    cost: float
+
+
+@lru_cache(maxsize=None)
+def estimate_bars(path: str) -> int:
+    """Rows in a CSV, estimated from its size and the line length of its first 64 KiB."""
+    file = Path(path)
+    if not file.exists():
+        return 0
+    size = file.stat().st_size
+    with open(file, "rb") as handle:
+        head = handle.read(1 << 16)
+    lines = head.count(b"\n")
+    if lines <= 1 or len(head) == size:
+        return max(lines - 1, 0)
+    return int(size / (len(head) / lines)) - 1
+
+
+def describe_run(key: str, task: Any, config: Dict[str, Any], csv_file: Optional[str] = None) -> ScheduledRun:
+    """Dataset, indicator signature, and estimated cost of one ``SimpleBacktest`` config."""
+    params = {name: value for name, value in config.items() if name not in ("label", "csv_file")}
+    path = str(Path(csv_file or config["csv_file"]).expanduser().resolve())
+    backtest = SimpleBacktest(path, **params)
+    dataset = f"{path}|{backtest.precision}|{backtest.timeframe or ''}"
+    indicators = tuple(sorted(str(node) for node in backtest.required_indicators().values()))
+    signal = json.dumps(backtest.signal_params(), sort_keys=True, default=str)
+    weight = STRATEGY_COST.get(backtest.strategy, 1.0)
+    if _is_path_dependent(backtest):
+        weight *= PATH_DEPENDENT_COST
+    return ScheduledRun(key, task, dataset, indicators + (signal,), estimate_bars(path) * weight)
+
+
+def _dataset_bars(dataset: str) -> int:
+    return estimate_bars(dataset.split("|", 1)[0])
+
+
+def plan_lanes(
+    runs: Iterable[ScheduledRun],
+    workers: int,
+    resident: Optional[List[Set[str]]] = None,
+) -> List[List[ScheduledRun]]:
+    """
+    Split runs into ``workers`` ordered lanes (see the module docstring).
+
+    ``resident`` holds the datasets each lane has already loaded; it is
+    updated in place so consecutive windows of one sweep keep their affinity.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1.")
+    resident = resident if resident is not None else [set() for _ in range(workers)]
+    if len(resident) != workers:
+        raise ValueError("resident needs one set per worker.")
+    groups: Dict[str, List[ScheduledRun]] = {}
+    for run in runs:
+        groups.setdefault(run.dataset, []).append(run)
+    if not groups:
+        return [[] for _ in range(workers)]
+    for members in groups.values():
+        members.sort(key=lambda run: run.signature)
+
+    total = sum(run.cost for members in groups.values() for run in members)
+    total += sum(LOAD_COST * _dataset_bars(dataset) for dataset in groups)
+    share = total / workers
+    pieces: List[Tuple[float, str, List[ScheduledRun]]] = []
+    for dataset, members in groups.items():
+        cost = sum(run.cost for run in members)
+        count = max(1, min(len(members), math.ceil(cost / share))) if share > 0 else 1
+        target = cost / count
+        piece: List[ScheduledRun] = []
+        piece_cost = 0.0
+        for run in members:
+            piece.append(run)
+            piece_cost += run.cost
+            if piece_cost >= target:
+                pieces.append((piece_cost, dataset, piece))
+                piece, piece_cost = [], 0.0
+        if piece:
+            pieces.append((piece_cost, dataset, piece))
+
+    loads = [0.0] * workers
+    assigned: List[List[Tuple[str, List[ScheduledRun]]]] = [[] for _ in range(workers)]
+    for cost, dataset, piece in sorted(pieces, key=lambda item: -item[0]):
+        load_cost = LOAD_COST * _dataset_bars(dataset)
+        lane = min(
+            range(workers),
+            key=lambda index: (loads[index] + cost + (0.0 if dataset in resident[index] else load_cost), index),
+        )
+        if dataset not in resident[lane]:
+            loads[lane] += load_cost
+            resident[lane].add(dataset)
+        loads[lane] += cost
+        assigned[lane].append((dataset, piece))
+    # Keep each lane's pieces of one dataset together, in signature order.
+    return [
+        [run for _, piece in sorted(lane, key=lambda item: (item[0], item[1][0].signature)) for run in piece]
+        for lane in assigned
+    ]
+
+
+def lane_costs(lanes: List[List[ScheduledRun]]) -> List[float]:
+    """Estimated cost per lane including one parse per distinct dataset."""
+    return [
+        sum(run.cost for run in lane) + sum(LOAD_COST * _dataset_bars(dataset) for dataset in {run.dataset for run in lane})
+        for lane in lanes
+    ]
+
+
+class LanePool:
+    """One single-process executor per lane, so each lane keeps its own warm caches."""
+
+    def __init__(self, workers: int) -> None:
+        if workers < 1:
+            raise ValueError("workers must be at least 1.")
+        self.workers = workers
+        self._executors = [
+            ProcessPoolExecutor(max_workers=1, initializer=_ignore_sigint) for _ in range(workers)
+        ]
+        self.resident: List[Set[str]] = [set() for _ in range(workers)]
+        self.steals = 0
+        self._queues: List[Deque[ScheduledRun]] = []
+        self._in_flight: Dict[Future, Tuple[int, ScheduledRun]] = {}
+
+    def depth(self) -> int:
+        """Runs queued in the current ``run`` call or executing, for queue-depth telemetry."""
+        return sum(len(queue) for queue in self._queues) + len(self._in_flight)
+
+    def run(
+        self,
+        lanes: List[List[ScheduledRun]],
+        function: Callable[[Any], Any],
+        checkpoint: Checkpoint,
+        on_result: Callable[[str, Any, Any], Any],
+        max_pending: int = 2,
+    ) -> int:
+        """Execute every lane (skipping journaled keys); returns how many runs ran."""
+        if len(lanes) != self.workers:
+            raise ValueError(f"Expected {self.workers} lanes, got {len(lanes)}.")
+        queues = self._queues = [deque(run for run in lane if run.key not in checkpoint) for lane in lanes]
+        remaining = [sum(run.cost for run in queue) for queue in queues]
+        running = [0] * self.workers
+        in_flight = self._in_flight = {}
+        completed = 0
+
+        def next_run(lane: int) -> Optional[ScheduledRun]:
+            if queues[lane]:
+                run = queues[lane].popleft()
+                remaining[lane] -= run.cost
+                return run
+            donor = max(range(self.workers), key=lambda index: remaining[index])
+            if len(queues[donor]) < 2:
+                return None
+            # Take from the tail: the donor's own next runs keep their warm caches.
+            run = queues[donor].pop()
+            remaining[donor] -= run.cost
+            self.steals += 1
+            self.resident[lane].add(run.dataset)
+            return run
+
+        def fill(lane: int) -> None:
+            while running[lane] < max_pending:
+                run = next_run(lane)
+                if run is None:
+                    return
+                in_flight[self._executors[lane].submit(function, run.task)] = (lane, run)
+                running[lane] += 1
+
+        def collect(done: Iterable[Future]) -> None:
+            nonlocal completed
+            for future in done:
+                lane, run = in_flight.pop(future)
+                running[lane] -= 1
+                checkpoint.record(run.key, on_result(run.key, run.task, future.result()))
+                completed += 1
+
+        try:
+            for lane in range(self.workers):
+                fill(lane)
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                lanes_done = {in_flight[future][0] for future in done}
+                collect(done)
+                for lane in lanes_done:
+                    fill(lane)
+        except KeyboardInterrupt:
+            # Drop queued runs, then journal the ones already executing.
+            for future in list(in_flight):
+                if future.cancel():
+                    in_flight.pop(future)
+            collect(list(in_flight))
+            raise
+        return completed
+
+    def worker_stats(self, function: Callable[[], Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Call ``function`` inside every lane's worker process (e.g. to read its cache counters)."""
+        return [executor.submit(function).result() for executor in self._executors]
+
+    def close(self) -> None:
+        for executor in self._executors:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> "LanePool":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def hit_rates(stats: Iterable[Dict[str, int]]) -> Dict[str, float]:
+    """Totals and hit rates (%) over per-worker ``DatasetCache.stats()`` dicts."""
+    totals: Dict[str, float] = {}
+    for worker in stats:
+        for name, value in worker.items():
+            totals[name] = totals.get(name, 0) + value
+    for kind in ("indicators", "signals"):
+        computed = totals.get(f"{kind}_computed", 0)
+        reused = totals.get(f"{kind}_reused", 0)
+        totals[f"{kind}_hit_rate"] = round(reused / (computed + reused) * 100, 2) if computed + reused else 0.0
+    return totals
@@ -0,0 +1,376 @@
+"""
+Warm backtest service: JSON-RPC 2.0 over a unix socket.
+
+The server keeps parsed datasets and evaluated indicators resident in a
+``DatasetCache``, so a request only pays for signal generation and the
+simulation itself. Requests are newline-delimited JSON objects; each one is
+handled in its own task and executed on a thread pool, so one slow call does
+not hold up the others. Parameter sweeps (``grid``) run on a separate pool and
+can never occupy the workers that serve single backtests.
+
+Methods:
+    ping                    -> {"ok": true}
+    backtest(config, include=["metrics", "trades", "equity"])
+                            -> {"metrics", "trades", "equity", "cached", "elapsed_ms"}
+    grid(csv_file, x_param, x_values, y_param, y_values, base_params=None)
+                            -> {"x_param", "x_values", "y_param", "y_values", "metrics", "elapsed_ms"}
+    stats                   -> dataset/indicator cache counters and request totals
+    evict(csv_file)         -> drop a dataset (and its indicators) from memory
+    shutdown                -> stop the server after replying
+
+``config`` holds ``SimpleBacktest`` keyword arguments plus ``csv_file``;
+relative paths are resolved against the server's working directory. Datasets
+whose file changed on disk are reloaded automatically.
+
+Example:
+    # terminal 1
+    python scripts/cli.py serve --socket /tmp/backtest.sock
+    # research code
+    with BacktestClient("/tmp/backtest.sock") as client:
+        reply = client.call("backtest", config={"csv_file": "/data/SPY.csv", "strategy": "macd"})
+        print(reply["metrics"], len(reply["trades"]))
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .dataset import Dataset, DatasetCache
+from .grid import run_grid
+from .result_store import ResultStore, config_key
+from .simple_backtest import SimpleBacktest
+
+INCLUDE_ALL = ("metrics", "trades", "equity")
+# Requests/responses are single lines; allow large equity curves and grids.
+STREAM_LIMIT = 1 << 26
+
+# JSON-RPC 2.0 error codes.
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+
+class RpcError(Exception):
+    """Error reported to the client as a JSON-RPC error object."""
+
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (pd.Timestamp, np.datetime64)):
+        return pd.Timestamp(value).isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _finite_or_none(values: np.ndarray) -> List[Any]:
+    """Nested lists with NaN/inf replaced by null (strict JSON)."""
+    return [[value if math.isfinite(value) else None for value in row] for row in values.tolist()]
+
+
+def serialize_backtest(backtest: SimpleBacktest, include: Tuple[str, ...] = INCLUDE_ALL) -> Dict[str, Any]:
+    """Metrics, trades, and equity curve of a completed backtest as JSON-ready values."""
+    payload: Dict[str, Any] = {}
+    if "metrics" in include:
+        payload["metrics"] = dict(backtest.get_results())
+    if "trades" in include:
+        payload["trades"] = [
+            {
+                "entry_date": trade.entry_date.isoformat(),
+                "entry_price": float(trade.entry_price),
+                "exit_date": trade.exit_date.isoformat(),
+                "exit_price": float(trade.exit_price),
+                "quantity": int(trade.quantity),
+                "pnl": float(trade.pnl),
+            }
+            for trade in backtest.trades
+        ]
+    if "equity" in include:
+        equity = backtest.get_equity_curve()
+        payload["equity"] = {
+            "dates": np.datetime_as_string(equity.index.to_numpy(dtype="datetime64[s]"), unit="s").tolist(),
+            "values": equity.to_numpy(dtype=np.float64).tolist(),
+        }
+    return payload
+
+
+class BacktestServer:
+    """Asyncio unix-socket server holding datasets and indicators in memory."""
+
+    def __init__(
+        self,
+        socket_path: Union[str, Path],
+        store_path: Optional[Union[str, Path]] = None,
+        workers: int = 4,
+        sweep_workers: int = 1,
+    ) -> None:
+        self.socket_path = Path(socket_path)
+        self.datasets = DatasetCache()
+        self._signatures: Dict[Path, Tuple[int, int]] = {}
+        self._signature_lock = threading.Lock()
+        self._store = ResultStore(store_path, check_same_thread=False) if store_path else None
+        self._store_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="backtest")
+        self._sweep_executor = ThreadPoolExecutor(max_workers=sweep_workers, thread_name_prefix="sweep")
+        self._methods: Dict[str, Tuple[Callable[..., Any], Optional[ThreadPoolExecutor]]] = {
+            "ping": (self._ping, None),
+            "backtest": (self.run_backtest, self._executor),
+            "grid": (self.run_grid, self._sweep_executor),
+            "stats": (self.stats, None),
+            "evict": (self.evict, None),
+            "shutdown": (self._request_shutdown, None),
+        }
+        self._requests = 0
+        self._errors = 0
+        self._in_flight = 0
+        self._stopping: Optional[asyncio.Event] = None
+
+    # ------------------------------------------------------------------ #
+    # Methods (run on worker threads unless noted)
+    # ------------------------------------------------------------------ #
+    def dataset(self, csv_file: Union[str, Path]) -> Dataset:
+        """Resident dataset for ``csv_file``, reloaded if the file changed on disk."""
+        path = Path(csv_file).expanduser().resolve()
+        if not path.exists():
+            raise FileNotFoundError(f"CSV file not found: {path}")
+        stat = path.stat()
+        signature = (stat.st_size, stat.st_mtime_ns)
+        with self._signature_lock:
+            if self._signatures.get(path) != signature:
+                self.datasets.evict(path)
+                self._signatures[path] = signature
+        return self.datasets.get(path)
+
+    def run_backtest(self, config: Dict[str, Any], include: Optional[List[str]] = None) -> Dict[str, Any]:
+        started = time.perf_counter()
+        if not isinstance(config, dict):
+            raise RpcError(INVALID_PARAMS, "'config' must be an object of SimpleBacktest parameters.")
+        config = dict(config)
+        config.pop("label", None)
+        csv_file = config.pop("csv_file", None)
+        if not csv_file:
+            raise RpcError(INVALID_PARAMS, "config is missing 'csv_file'.")
+        include = tuple(include or INCLUDE_ALL)
+        unknown = set(include).difference(INCLUDE_ALL)
+        if unknown:
+            raise RpcError(INVALID_PARAMS, f"Unknown include values: {sorted(unknown)}")
+
+        dataset = self.dataset(csv_file)
+        backtest = SimpleBacktest(str(dataset.path), **config)
+        cached = False
+        run_key = None
+        if self._store is not None:
+            run_key = config_key(backtest)
+            with self._store_lock:
+                stored = self._store.get(run_key)
+            if stored is not None and not stored.equity_curve.empty:
+                backtest.restore_results(stored.trades, stored.equity_curve)
+                cached = True
+        if not cached:
+            backtest.load_data(dataset)
+            backtest.calculate_indicators()
+            backtest.generate_signals()
+            backtest.run()
+            if self._store is not None:
+                with self._store_lock:
+                    self._store.put(run_key, backtest, label=dataset.path.stem)
+
+        payload = serialize_backtest(backtest, include)
+        payload["cached"] = cached
+        payload["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        return payload
+
+    def run_grid(
+        self,
+        csv_file: str,
+        x_param: str,
+        x_values: List[Any],
+        y_param: str,
+        y_values: List[Any],
+        base_params: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        started = time.perf_counter()
+        dataset = self.dataset(csv_file)
+        grid = run_grid(str(dataset.path), x_param, x_values, y_param, y_values, base_params, dataset=dataset)
+        return {
+            "x_param": grid.x_param,
+            "x_values": grid.x_values,
+            "y_param": grid.y_param,
+            "y_values": grid.y_values,
+            "metrics": {name: _finite_or_none(values) for name, values in grid.metrics.items()},
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = dict(self.datasets.stats())
+        stats.update(requests=self._requests, errors=self._errors, in_flight=self._in_flight)
+        return stats
+
+    def evict(self, csv_file: str) -> Dict[str, Any]:
+        path = Path(csv_file).expanduser().resolve()
+        self.datasets.evict(path)
+        with self._signature_lock:
+            self._signatures.pop(path, None)
+        return {"evicted": str(path)}
+
+    def _ping(self) -> Dict[str, Any]:
+        return {"ok": True}
+
+    def _request_shutdown(self) -> Dict[str, Any]:
+        if self._stopping is not None:
+            asyncio.get_running_loop().call_soon(self._stopping.set)
+        return {"ok": True}
+
+    # ------------------------------------------------------------------ #
+    # Protocol
+    # ------------------------------------------------------------------ #
+    async def _dispatch(self, request: Any) -> Any:
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            raise RpcError(INVALID_REQUEST, "Request must be an object with a string 'method'.")
+        entry = self._methods.get(request["method"])
+        if entry is None:
+            raise RpcError(METHOD_NOT_FOUND, f"Unknown method: {request['method']}")
+        method, executor = entry
+        params = request.get("params") or {}
+        if not isinstance(params, dict):
+            raise RpcError(INVALID_PARAMS, "'params' must be an object.")
+        call = lambda: method(**params)  # noqa: E731
+        if executor is None:
+            return call()
+        return await asyncio.get_running_loop().run_in_executor(executor, call)
+
+    async def _handle_request(self, line: bytes, writer: asyncio.StreamWriter, write_lock: asyncio.Lock) -> None:
+        self._requests += 1
+        self._in_flight += 1
+        request_id = None
+        try:
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise RpcError(PARSE_ERROR, f"Invalid JSON: {exc}") from exc
+            if isinstance(request, dict):
+                request_id = request.get("id")
+            result = await self._dispatch(request)
+            response = {"jsonrpc": "2.0", "id": request_id, "result": result}
+        except RpcError as exc:
+            response = self._error(request_id, exc.code, str(exc))
+        except (TypeError, ValueError, KeyError) as exc:
+            response = self._error(request_id, INVALID_PARAMS, str(exc))
+        except Exception as exc:  # noqa: BLE001 - reported to the client, server keeps running
+            response = self._error(request_id, SERVER_ERROR, f"{type(exc).__name__}: {exc}")
+        finally:
+            self._in_flight -= 1
+        data = json.dumps(response, default=_json_default, separators=(",", ":")).encode("utf-8") + b"\n"
+        async with write_lock:
+            writer.write(data)
+            await writer.drain()
+
+    def _error(self, request_id: Any, code: int, message: str) -> Dict[str, Any]:
+        self._errors += 1
+        return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        write_lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                # Pipelined requests on one connection are served concurrently.
+                task = asyncio.create_task(self._handle_request(line, writer, write_lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass  # client went away or the server is shutting down
+        finally:
+            writer.close()
+
+    async def serve_forever(self) -> None:
+        """Listen on ``socket_path`` until a ``shutdown`` request arrives."""
+        self._remove_stale_socket()
+        self._stopping = asyncio.Event()
+        server = await asyncio.start_unix_server(
+            self._handle_connection, path=str(self.socket_path), limit=STREAM_LIMIT
+        )
+        try:
+            async with server:
+                await self._stopping.wait()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._sweep_executor.shutdown(wait=False, cancel_futures=True)
+        if self._store is not None:
+            self._store.close()
+        self.socket_path.unlink(missing_ok=True)
+
+    def _remove_stale_socket(self) -> None:
+        if not self.socket_path.exists():
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(self.socket_path))
+        except OSError:
+            self.socket_path.unlink()
+        else:
+            raise RuntimeError(f"A server is already listening on {self.socket_path}")
+        finally:
+            probe.close()
+
+
+class BacktestClient:
+    """Blocking client for ``BacktestServer`` (one request at a time per client)."""
+
+    def __init__(self, socket_path: Union[str, Path], timeout: Optional[float] = None) -> None:
+        self.socket_path = Path(socket_path)
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.settimeout(timeout)
+        self._socket.connect(str(self.socket_path))
+        self._reader = self._socket.makefile("rb")
+        self._next_id = 0
+
+    def call(self, method: str, **params: Any) -> Any:
+        """Send one request and return its ``result``; raises RuntimeError on RPC errors."""
+        self._next_id += 1
+        request = {"jsonrpc": "2.0", "id": self._next_id, "method": method, "params": params}
+        self._socket.sendall(json.dumps(request, default=_json_default).encode("utf-8") + b"\n")
+        line = self._reader.readline()
+        if not line:
+            raise RuntimeError("Backtest server closed the connection.")
+        response = json.loads(line)
+        if "error" in response:
+            error = response["error"]
+            raise RuntimeError(f"{method} failed ({error['code']}): {error['message']}")
+        return response["result"]
+
+    def close(self) -> None:
+        self._reader.close()
+        self._socket.close()
+
+    def __enter__(self) -> "BacktestClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
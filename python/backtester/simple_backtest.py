@@ -11,14 +11,37 @@ Implements the Week 1 requirement for a lightweight engine that:
 
 from __future__ import annotations
 
+import json
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
 
-REQUIRED_COLUMNS = {"Date", "Close"}
+from . import indicators, kernels
+from .dataset import PRECISIONS, Dataset, downcast_ohlcv, read_ohlcv_csv, source_key
+from .indicators import Indicator, IndicatorStore
+from .resample import default_cache, normalize_frequency
+from .rolling import rolling_metrics
+from .simulation import TRADING_DAYS, periods_per_year
+
+STOP_FILLS = ("close", "intrabar")
+# Parameters read only by run(); runs that differ only in these share signals.
+SIMULATION_PARAMS = frozenset(
+    {
+        "initial_capital",
+        "position_size",
+        "use_atr_trailing_stop",
+        "atr_multiplier",
+        "stop_fill",
+        "use_rsi_exit",
+        "rsi_exit_threshold",
+    }
+)
+
+_NO_DATA = pd.DataFrame()
+_NO_EQUITY = pd.Series(dtype=float)
 
 
 @dataclass
@@ -44,6 +67,35 @@ class Trade:
         return (self.exit_date - self.entry_date).days if self.exit_date and self.entry_date else 0
 
 
+def performance_metrics(equity: pd.Series, trades: List[Trade], periods: float = TRADING_DAYS) -> Dict[str, float]:
+    """Trade counts, win rate, total return, max drawdown, and Sharpe ratio of an equity curve."""
+    returns = equity.pct_change().dropna()
+
+    total_return = float(((equity.iloc[-1] / equity.iloc[0]) - 1) * 100)
+    winners = sum(1 for trade in trades if trade.pnl > 0)
+    losers = sum(1 for trade in trades if trade.pnl < 0)
+    total_trades = len(trades)
+    win_rate = (winners / total_trades) * 100 if total_trades else 0.0
+
+    rolling_max = equity.cummax()
+    drawdown = equity / rolling_max - 1
+    max_drawdown = float(drawdown.min() * 100) if not drawdown.empty else 0.0
+
+    sharpe_ratio = 0.0
+    if len(returns) > 1 and returns.std(ddof=0) != 0:
+        sharpe_ratio = (returns.mean() / returns.std(ddof=0)) * np.sqrt(periods)
+
+    return {
+        "total_trades": total_trades,
+        "winning_trades": winners,
+        "losing_trades": losers,
+        "win_rate": round(win_rate, 2),
+        "total_return": round(total_return, 2),
+        "max_drawdown": round(max_drawdown, 2),
+        "sharpe_ratio": round(float(sharpe_ratio), 2),
+    }
+
+
 class SimpleBacktest:
     """Moving-average crossover or RSI+Bollinger mean-reversion backtest."""
 
@@ -78,6 +130,9 @@ class SimpleBacktest:
         atr_multiplier: float = 3.0,
         use_atr_volatility_filter: bool = False,
         atr_volatility_threshold: float = 0.02,
+        precision: str = "float64",
+        timeframe: Optional[str] = None,
+        stop_fill: str = "close",
     ) -> None:
         """
         Args:
@@ -96,6 +151,19 @@ class SimpleBacktest:
             rsi_long_exit: RSI threshold for closing longs.
             rsi_short_entry: RSI threshold for opening shorts.
             rsi_short_exit: RSI threshold for closing shorts.
+            precision: "float64" (default) or "float32". Float32 stores prices,
+                volume, indicators, and signal inputs at reduced precision to cut
+                memory bandwidth in large sweeps; see ``backtester.precision``
+                for an accuracy report against the float64 baseline.
+            timeframe: Optional pandas frequency (e.g. "W", "ME", "4h") to resample
+                the CSV bars to before running; None trades the bars as stored.
+                Resampled frames are memoized per (symbol, timeframe), see
+                ``backtester.resample``.
+            stop_fill: How the ATR trailing stop is checked. "close" (default)
+                exits at the Close of the first bar that closes through the
+                stop; "intrabar" exits as soon as the bar's High/Low reaches it,
+                at the stop price or at the Open when the bar gaps through it
+                (see ``backtester.orders``). Requires Open/High/Low columns.
         """
         self.csv_file = csv_file
         self.initial_capital = float(initial_capital)
@@ -120,6 +188,8 @@ class SimpleBacktest:
         else:
             self.allow_short = bool(allow_short)
         self.rsi_period = int(rsi_period)
+        if self.rsi_period <= 0:
+            raise ValueError("rsi_period must be a positive integer.")
         self.bollinger_window = int(bollinger_window)
         if self.bollinger_window <= 0:
             raise ValueError("bollinger_window must be a positive integer.")
@@ -167,234 +237,294 @@ class SimpleBacktest:
         self.atr_volatility_threshold = float(atr_volatility_threshold)
         if self.atr_volatility_threshold < 0:
             raise ValueError("atr_volatility_threshold must be non-negative.")
-        self.data: pd.DataFrame = pd.DataFrame()
+        self.precision = precision.lower()
+        if self.precision not in PRECISIONS:
+            raise ValueError("precision must be 'float64' or 'float32'.")
+        self.timeframe = normalize_frequency(timeframe) if timeframe else None
+        self.stop_fill = stop_fill.lower()
+        if self.stop_fill not in STOP_FILLS:
+            raise ValueError("stop_fill must be 'close' or 'intrabar'.")
+        # Shared empty placeholders (always replaced, never mutated) keep construction
+        # cheap enough to validate large sweeps config by config.
+        self.data: pd.DataFrame = _NO_DATA
+        self._dataset: Optional[Dataset] = None
+        self.indicators: IndicatorStore = IndicatorStore(self.data)
+        self.signals: Optional[np.ndarray] = None
         self.trades: List[Trade] = []
-        self._equity_curve: pd.Series = pd.Series(dtype=float)
+        self._equity_curve: pd.Series = _NO_EQUITY
         self._results: Dict[str, float] = {}
 
+    def effective_params(self) -> Dict[str, Any]:
+        """
+        Return the normalized parameters that can influence this run's results.
+
+        Settings the configured strategy never reads (e.g. Bollinger bands on an
+        MA crossover, or RSI bounds while the RSI filter is off) are dropped, so
+        two configs that differ only in ignored values produce the same dict.
+        """
+        params: Dict[str, Any] = {
+            "strategy": self.strategy,
+            "initial_capital": self.initial_capital,
+            "position_size": self.position_size,
+            "allow_short": self.allow_short,
+        }
+        uses_rsi_exit = self.use_rsi_exit and self.strategy in {"ma_crossover", "rsi_bollinger"}
+        if self.strategy == "ma_crossover":
+            params.update(
+                {
+                    "moving_average": self.moving_average,
+                    "fast_window": self.fast_window,
+                    "slow_window": self.slow_window,
+                }
+            )
+            if self.use_rsi_filter:
+                params.update({"ma_rsi_lower": self.ma_rsi_lower, "ma_rsi_upper": self.ma_rsi_upper})
+            if self.use_rsi_filter or self.use_rsi_exit:
+                params["rsi_period"] = self.rsi_period
+            if self.use_atr_volatility_filter:
+                params["atr_volatility_threshold"] = self.atr_volatility_threshold
+            if self.use_atr_trailing_stop:
+                params["atr_multiplier"] = self.atr_multiplier
+                if self.stop_fill != "close":
+                    params["stop_fill"] = self.stop_fill
+            if self.use_atr_trailing_stop or self.use_atr_volatility_filter:
+                params["atr_period"] = self.atr_period
+            params["use_rsi_filter"] = self.use_rsi_filter
+            params["use_atr_trailing_stop"] = self.use_atr_trailing_stop
+            params["use_atr_volatility_filter"] = self.use_atr_volatility_filter
+        elif self.strategy == "rsi_bollinger":
+            params.update(
+                {
+                    "rsi_period": self.rsi_period,
+                    "bollinger_window": self.bollinger_window,
+                    "bollinger_std": self.bollinger_std,
+                    "rsi_long_entry": self.rsi_long_entry,
+                    "rsi_long_exit": self.rsi_long_exit,
+                    "rsi_short_entry": self.rsi_short_entry,
+                    "rsi_short_exit": self.rsi_short_exit,
+                }
+            )
+        elif self.strategy == "macd":
+            params.update(
+                {
+                    "macd_fast": self.macd_fast,
+                    "macd_slow": self.macd_slow,
+                    "macd_signal": self.macd_signal,
+                }
+            )
+        elif self.strategy == "donchian":
+            params["donchian_window"] = self.donchian_window
+        params["use_rsi_exit"] = uses_rsi_exit
+        if uses_rsi_exit:
+            params["rsi_exit_threshold"] = self.rsi_exit_threshold
+        if self.precision != "float64":
+            params["precision"] = self.precision
+        if self.timeframe is not None:
+            params["timeframe"] = self.timeframe
+        return params
+
     # ------------------------------------------------------------------ #
     # Data preparation
     # ------------------------------------------------------------------ #
-    def load_data(self) -> None:
-        """Load CSV into a DataFrame, validate columns, and sort by date."""
-        path = Path(self.csv_file)
-        if not path.exists():
-            raise FileNotFoundError(f"CSV file not found: {self.csv_file}")
-
-        df = pd.read_csv(path)
-        missing = REQUIRED_COLUMNS.difference(df.columns)
-        if missing:
-            raise ValueError(f"CSV missing required columns: {missing}")
+    def signal_params(self) -> Dict[str, Any]:
+        """
+        The subset of ``effective_params()`` that ``generate_signals`` depends on.
 
-        df["Date"] = pd.to_datetime(df["Date"])
-        df.sort_values("Date", inplace=True)
-        df.reset_index(drop=True, inplace=True)
+        Runs with equal signal params produce identical signal arrays, so a
+        shared ``Dataset`` computes them once (see ``Dataset.signals_for``).
+        """
+        params = {name: value for name, value in self.effective_params().items() if name not in SIMULATION_PARAMS}
+        if self.strategy == "ma_crossover":
+            # Shorting only changes how run() trades the -1 signals of a crossover.
+            params.pop("allow_short", None)
+            if not self.use_rsi_filter:
+                params.pop("rsi_period", None)
+            if not self.use_atr_volatility_filter:
+                params.pop("atr_period", None)
+        return params
+
+    def load_data(self, dataset: Optional[Dataset] = None) -> None:
+        """
+        Load CSV into a DataFrame, validate columns, and sort by date.
 
-        self.data = df
+        Args:
+            dataset: Optional shared ``Dataset`` for ``csv_file``. Its parsed frame
+                and indicator store are reused instead of reading the CSV again.
+        """
+        self.signals = None
+        if dataset is None:
+            self._dataset = None
+            data = read_ohlcv_csv(self.csv_file)
+            if self.timeframe is not None:
+                data = default_cache().get(source_key(self.csv_file), data, self.timeframe)
+            self.data = data if self.precision == "float64" else downcast_ohlcv(data, self.precision)
+            self.indicators = IndicatorStore(self.data, dtype=PRECISIONS[self.precision])
+            return
+        self._dataset = dataset
+        # The shared frame is never mutated: indicators and signals live outside it.
+        self.data = dataset.frame_for(self.precision, self.timeframe)
+        self.indicators = dataset.indicators_for(self.precision, self.timeframe)
+
+    def required_indicators(self) -> Dict[str, Indicator]:
+        """
+        Declare the indicator nodes the configured strategy reads, keyed by role.
 
-    def calculate_indicators(self) -> None:
-        """Add fast/slow MA columns based on the configured windows."""
-        self._ensure_data_loaded()
-        close = self.data["Close"]
+        Nodes are shared structurally, so e.g. an RSI filter and an RSI exit on
+        the same period resolve to one computation in the indicator store.
+        """
+        required: Dict[str, Indicator] = {}
         if self.strategy == "ma_crossover":
-            self.data[self.fast_col] = self._compute_moving_average(close, self.fast_window)
-            self.data[self.slow_col] = self._compute_moving_average(close, self.slow_window)
-            if self.use_rsi_filter or self.use_rsi_exit or self.use_atr_volatility_filter:
-                self.data[self.rsi_col] = self._compute_rsi(close, self.rsi_period)
+            required["fast"] = indicators.moving_average(self.moving_average, indicators.CLOSE, self.fast_window)
+            required["slow"] = indicators.moving_average(self.moving_average, indicators.CLOSE, self.slow_window)
+            if self.use_rsi_filter or self.use_rsi_exit:
+                required["rsi"] = indicators.rsi(self.rsi_period)
             if self.use_atr_trailing_stop or self.use_atr_volatility_filter:
-                self._ensure_ohlc_columns()
-                self.data[self.atr_col] = self._compute_atr(self.data["High"], self.data["Low"], close, self.atr_period)
+                required["atr"] = indicators.atr(self.atr_period)
         elif self.strategy == "rsi_bollinger":
-            self.data[self.bb_mid_col] = close.rolling(
-                window=self.bollinger_window, min_periods=self.bollinger_window
-            ).mean()
-            rolling_std = close.rolling(
-                window=self.bollinger_window, min_periods=self.bollinger_window
-            ).std(ddof=0)
-            self.data[self.bb_upper_col] = self.data[self.bb_mid_col] + self.bollinger_std * rolling_std
-            self.data[self.bb_lower_col] = self.data[self.bb_mid_col] - self.bollinger_std * rolling_std
-            self.data[self.rsi_col] = self._compute_rsi(close, self.rsi_period)
+            mid, upper, lower = indicators.bollinger_bands(self.bollinger_window, self.bollinger_std)
+            required.update({"bb_mid": mid, "bb_upper": upper, "bb_lower": lower})
+            required["rsi"] = indicators.rsi(self.rsi_period)
         elif self.strategy == "macd":
-            ema_fast = close.ewm(span=self.macd_fast, adjust=False, min_periods=self.macd_fast).mean()
-            ema_slow = close.ewm(span=self.macd_slow, adjust=False, min_periods=self.macd_slow).mean()
-            macd_line = ema_fast - ema_slow
-            self.data[self.macd_col] = macd_line
-            self.data[self.macd_signal_col] = macd_line.ewm(span=self.macd_signal, adjust=False, min_periods=self.macd_signal).mean()
+            required["macd"], required["macd_signal"] = indicators.macd(
+                self.macd_fast, self.macd_slow, self.macd_signal
+            )
         elif self.strategy == "donchian":
-            self._ensure_ohlc_columns()
-            self.data["DONCHIAN_HIGH"] = self.data["High"].rolling(window=self.donchian_window, min_periods=self.donchian_window).max()
-            self.data["DONCHIAN_LOW"] = self.data["Low"].rolling(window=self.donchian_window, min_periods=self.donchian_window).min()
+            required["donchian_high"], required["donchian_low"] = indicators.donchian(self.donchian_window)
         else:
             raise RuntimeError(f"Unsupported strategy: {self.strategy}")
+        return required
+
+    def calculate_indicators(self) -> None:
+        """Evaluate the strategy's declared indicators into the indicator store."""
+        self._ensure_data_loaded()
+        required = self.required_indicators()
+        if "atr" in required or "donchian_high" in required:
+            self._ensure_ohlc_columns()
+        self.indicators.evaluate(required.values())
+
+    def get_indicator(self, role: str) -> np.ndarray:
+        """Return the (read-only) array for a declared indicator role, e.g. "fast" or "rsi"."""
+        required = self.required_indicators()
+        if role not in required:
+            raise KeyError(f"Strategy '{self.strategy}' does not use indicator '{role}'.")
+        self._ensure_data_loaded()
+        return self.indicators.get(required[role])
+
+    def get_indicator_frame(self) -> pd.DataFrame:
+        """Return Date plus the strategy's indicators under their legacy column names."""
+        self._ensure_indicators()
+        names = {
+            "fast": self.fast_col,
+            "slow": self.slow_col,
+            "rsi": self.rsi_col,
+            "atr": self.atr_col,
+            "bb_mid": self.bb_mid_col,
+            "bb_upper": self.bb_upper_col,
+            "bb_lower": self.bb_lower_col,
+            "macd": self.macd_col,
+            "macd_signal": self.macd_signal_col,
+            "donchian_high": "DONCHIAN_HIGH",
+            "donchian_low": "DONCHIAN_LOW",
+        }
+        columns = {"Date": self.data["Date"].to_numpy()}
+        for role, node in self.required_indicators().items():
+            columns[names[role]] = self.indicators.get(node)
+        if self.signals is not None:
+            columns["signal"] = self.signals
+        return pd.DataFrame(columns)
 
     def generate_signals(self) -> None:
-        """Create buy/sell/hold signals based on SMA crossovers."""
+        """
+        Create buy/sell/hold signals (+1/-1/0) for the configured strategy.
+
+        Runs loaded from a shared ``Dataset`` reuse (read-only) the signals of
+        any earlier run with the same ``signal_params()``.
+        """
         self._ensure_indicators()
+        if self._dataset is None:
+            self.signals = self._compute_signals()
+            return
+        key = json.dumps(self.signal_params(), sort_keys=True)
+        self.signals = self._dataset.signals_for(self.precision, self.timeframe, key, self._compute_signals)
+
+    def _compute_signals(self) -> np.ndarray:
+        ind = self.get_indicator
         if self.strategy == "ma_crossover":
-            fast = self.data[self.fast_col]
-            slow = self.data[self.slow_col]
+            fast = ind("fast")
+            slow = ind("slow")
             signal = np.where(fast > slow, 1, -1)
-            signal = np.where(fast.isna() | slow.isna(), 0, signal)
+            signal = np.where(np.isnan(fast) | np.isnan(slow), 0, signal)
             if self.use_rsi_filter:
-                rsi = self.data[self.rsi_col]
+                rsi = ind("rsi")
                 within_range = (rsi >= self.ma_rsi_lower) & (rsi <= self.ma_rsi_upper)
-                signal = np.where(within_range & rsi.notna(), signal, 0)
+                signal = np.where(within_range & ~np.isnan(rsi), signal, 0)
             if self.use_atr_volatility_filter:
-                atr = self.data[self.atr_col]
-                atr_pct = atr / self.data["Close"]
+                atr_pct = ind("atr") / self.indicators.get(indicators.CLOSE)
                 adequate_vol = atr_pct >= self.atr_volatility_threshold
-                signal = np.where(adequate_vol & atr_pct.notna(), signal, 0)
-            self.data["signal"] = signal
+                signal = np.where(adequate_vol & ~np.isnan(atr_pct), signal, 0)
         elif self.strategy == "macd":
-            macd = self.data[self.macd_col]
-            macd_signal = self.data[self.macd_signal_col]
+            macd = ind("macd")
+            macd_signal = ind("macd_signal")
             signal = np.where(macd > macd_signal, 1, -1)
-            signal = np.where(macd.isna() | macd_signal.isna(), 0, signal)
+            signal = np.where(np.isnan(macd) | np.isnan(macd_signal), 0, signal)
             if not self.allow_short:
                 signal = np.where(signal < 0, 0, signal)
-            self.data["signal"] = signal
         elif self.strategy == "donchian":
-            self.data["signal"] = self._generate_donchian_signals()
+            signal = self._generate_donchian_signals()
         else:
-            self.data["signal"] = self._generate_rsi_bollinger_signals()
+            signal = self._generate_rsi_bollinger_signals()
+        return np.asarray(signal, dtype=np.int8)
 
     # ------------------------------------------------------------------ #
     # Backtest execution
     # ------------------------------------------------------------------ #
     def run(self) -> None:
         """Simulate trades using the generated signals."""
+        simulate_backtests([self])
+
+    def _simulation_inputs(self) -> Dict[str, Any]:
+        """Per-strategy arrays and settings consumed by ``kernels.simulate_strategies``."""
         self._ensure_signals()
-        cash = self.initial_capital
-        position = 0
-        entry_price: Optional[float] = None
-        entry_date: Optional[pd.Timestamp] = None
-
-        equity_values: List[float] = []
-        equity_dates: List[pd.Timestamp] = []
-        trailing_stop_price: Optional[float] = None
-        atr_available = self.use_atr_trailing_stop and self.atr_col in self.data.columns
-
-        for _, row in self.data.iterrows():
-            price = float(row["Close"])
-            date = pd.Timestamp(row["Date"])
-            signal = int(row["signal"])
-            rsi_value = row[self.rsi_col] if (self.use_rsi_filter or self.use_rsi_exit) else np.nan
-            atr_value = row[self.atr_col] if atr_available else np.nan
-
-            if atr_available and position > 0 and trailing_stop_price is not None and price <= trailing_stop_price:
-                signal = 0
-            if atr_available and position < 0 and trailing_stop_price is not None and price >= trailing_stop_price:
-                signal = 0
-
-            if (
-                self.use_rsi_exit
-                and position > 0
-                and pd.notna(rsi_value)
-                and self.rsi_exit_threshold is not None
-                and rsi_value >= self.rsi_exit_threshold
-            ):
-                # Force flat signal when RSI exit triggers to avoid re-entry on same bar.
-                signal = 0
-
-            if signal > 0:
-                # Close short positions before entering long.
-                if position < 0:
-                    trade = self._close_trade(price, date, entry_price, entry_date, position)
-                    self.trades.append(trade)
-                    cash += price * position
-                    position = 0
-                    entry_price = None
-                    entry_date = None
-                    trailing_stop_price = None
-                if position == 0:
-                    position = self.position_size
-                    entry_price = price
-                    entry_date = date
-                    cash -= price * position
-                    if atr_available and pd.notna(atr_value):
-                        trailing_stop_price = price - self.atr_multiplier * float(atr_value)
-                    else:
-                        trailing_stop_price = None
-
-            elif signal < 0:
-                # Exit any open long.
-                if position > 0:
-                    trade = self._close_trade(price, date, entry_price, entry_date, position)
-                    self.trades.append(trade)
-                    cash += price * position
-                    position = 0
-                    entry_price = None
-                    entry_date = None
-                    trailing_stop_price = None
-                # Enter short if allowed and currently flat.
-                if self.allow_short and position == 0:
-                    position = -self.position_size
-                    entry_price = price
-                    entry_date = date
-                    cash -= price * position  # subtracting a negative adds cash
-                    if atr_available and pd.notna(atr_value):
-                        trailing_stop_price = price + self.atr_multiplier * float(atr_value)
-                    else:
-                        trailing_stop_price = None
-
-            else:
-                # Signal to be flat: close any open position.
-                if position != 0:
-                    trade = self._close_trade(price, date, entry_price, entry_date, position)
-                    self.trades.append(trade)
-                    cash += price * position
-                    position = 0
-                    entry_price = None
-                    entry_date = None
-                    trailing_stop_price = None
-
-            if atr_available and pd.notna(atr_value):
-                if position > 0:
-                    candidate = price - self.atr_multiplier * float(atr_value)
-                    if trailing_stop_price is None:
-                        trailing_stop_price = candidate
-                    else:
-                        trailing_stop_price = max(trailing_stop_price, candidate)
-                elif position < 0:
-                    candidate = price + self.atr_multiplier * float(atr_value)
-                    if trailing_stop_price is None:
-                        trailing_stop_price = candidate
-                    else:
-                        trailing_stop_price = min(trailing_stop_price, candidate)
-
-            equity = cash + position * price
-            equity_values.append(equity)
-            equity_dates.append(date)
-
-        # Close any open position at the final price.
-        if position != 0 and entry_price is not None and entry_date is not None:
-            last_price = float(self.data.iloc[-1]["Close"])
-            last_date = pd.Timestamp(self.data.iloc[-1]["Date"])
-            trade = self._close_trade(last_price, last_date, entry_price, entry_date, position)
-            self.trades.append(trade)
-            cash += last_price * position
-            equity_values[-1] = cash  # update final equity
-
-        self._equity_curve = pd.Series(equity_values, index=equity_dates, name="equity")
-        self._results = self._calculate_metrics()
+        required = self.required_indicators()
+        atr_available = self.use_atr_trailing_stop and "atr" in required
+        return {
+            "signals": self.signals,
+            "atr": self.indicators.get(required["atr"]) if atr_available else None,
+            "atr_multiplier": self.atr_multiplier if atr_available else np.nan,
+            "intrabar": atr_available and self.stop_fill == "intrabar",
+            "rsi": self.indicators.get(required["rsi"]) if "rsi" in required else None,
+            "rsi_threshold": self.rsi_exit_threshold if self.use_rsi_exit else np.nan,
+        }
 
-    def _close_trade(
+    def _store_simulation(
         self,
-        exit_price: float,
-        exit_date: pd.Timestamp,
-        entry_price: Optional[float],
-        entry_date: Optional[pd.Timestamp],
-        quantity: int,
-    ) -> Trade:
-        if entry_price is None or entry_date is None:
-            raise ValueError("Attempted to close a trade that was never opened.")
-        return Trade(
-            entry_date=entry_date,
-            entry_price=entry_price,
-            exit_date=exit_date,
-            exit_price=exit_price,
-            quantity=quantity,
-        )
+        dates: pd.DatetimeIndex,
+        closes: np.ndarray,
+        equity: np.ndarray,
+        exit_prices: np.ndarray,
+        entry_sizes: np.ndarray,
+        final_exit: bool,
+    ) -> None:
+        """Rebuild the trade ledger, equity curve, and metrics from kernel output rows."""
+        entry_bars = np.flatnonzero(entry_sizes).tolist()
+        exit_bars = np.flatnonzero(~np.isnan(exit_prices)).tolist()
+        exit_values = exit_prices[exit_bars].tolist()
+        if final_exit:
+            # Any open position is closed at the final price.
+            exit_bars.append(len(closes) - 1)
+            exit_values.append(float(closes[-1]))
+        self.trades = [
+            Trade(
+                entry_date=dates[entry],
+                entry_price=float(closes[entry]),
+                exit_date=dates[exit_bar],
+                exit_price=exit_price,
+                quantity=int(entry_sizes[entry]),
+            )
+            for entry, exit_bar, exit_price in zip(entry_bars, exit_bars, exit_values)
+        ]
+        self._equity_curve = pd.Series(equity, index=dates, name="equity")
+        self._results = self._calculate_metrics()
 
     # ------------------------------------------------------------------ #
     # Metrics
@@ -402,68 +532,11 @@ class SimpleBacktest:
     def _calculate_metrics(self) -> Dict[str, float]:
         if self._equity_curve.empty:
             return {}
+        return performance_metrics(self._equity_curve, self.trades, self._periods_per_year())
 
-        equity = self._equity_curve
-        returns = equity.pct_change().dropna()
-
-        total_return = float(((equity.iloc[-1] / equity.iloc[0]) - 1) * 100)
-        winners = sum(1 for trade in self.trades if trade.pnl > 0)
-        losers = sum(1 for trade in self.trades if trade.pnl < 0)
-        total_trades = len(self.trades)
-        win_rate = (winners / total_trades) * 100 if total_trades else 0.0
-
-        rolling_max = equity.cummax()
-        drawdown = equity / rolling_max - 1
-        max_drawdown = float(drawdown.min() * 100) if not drawdown.empty else 0.0
-
-        sharpe_ratio = 0.0
-        if len(returns) > 1 and returns.std(ddof=0) != 0:
-            sharpe_ratio = (returns.mean() / returns.std(ddof=0)) * np.sqrt(252)
-
-        return {
-            "total_trades": total_trades,
-            "winning_trades": winners,
-            "losing_trades": losers,
-            "win_rate": round(win_rate, 2),
-            "total_return": round(total_return, 2),
-            "max_drawdown": round(max_drawdown, 2),
-            "sharpe_ratio": round(float(sharpe_ratio), 2),
-        }
-
-    def _compute_moving_average(self, series: pd.Series, window: int) -> pd.Series:
-        """Compute the configured moving-average type for a given window."""
-        if self.moving_average == "sma":
-            return series.rolling(window=window, min_periods=window).mean()
-        if self.moving_average == "ema":
-            return series.ewm(span=window, adjust=False, min_periods=window).mean()
-        if self.moving_average == "wma":
-            return self._weighted_moving_average(series, window)
-        if self.moving_average == "wema":
-            ema = series.ewm(span=window, adjust=False, min_periods=window).mean()
-            return self._weighted_moving_average(ema, window)
-        raise ValueError(f"Unsupported moving average type: {self.moving_average}")
-
-    @staticmethod
-    def _weighted_moving_average(series: pd.Series, window: int) -> pd.Series:
-        """Return linearly weighted moving average (heavier weight on recent data)."""
-        weights = np.arange(1, window + 1, dtype=float)
-        weight_sum = weights.sum()
-        return series.rolling(window=window, min_periods=window).apply(
-            lambda values: np.dot(values, weights) / weight_sum,
-            raw=True,
-        )
-
-    @staticmethod
-    def _compute_rsi(series: pd.Series, period: int) -> pd.Series:
-        """Compute the Relative Strength Index."""
-        delta = series.diff()
-        gain = delta.clip(lower=0.0)
-        loss = -delta.clip(upper=0.0)
-        avg_gain = gain.ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
-        avg_loss = loss.ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
-        rs = avg_gain / avg_loss.replace(0, np.nan)
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+    def _periods_per_year(self) -> float:
+        # Resampled timeframes annualize by their observed bars per year.
+        return TRADING_DAYS if self.timeframe is None else periods_per_year(self._equity_curve.index)
 
     def _ensure_ohlc_columns(self) -> None:
         required = {"High", "Low"}
@@ -471,89 +544,29 @@ class SimpleBacktest:
         if missing:
             raise RuntimeError(f"Data missing required OHLC columns for ATR/Donchian: {missing}")
 
-    @staticmethod
-    def _compute_atr(high: pd.Series, low: pd.Series, close: pd.Series, period: int) -> pd.Series:
-        """Average True Range."""
-        prev_close = close.shift(1)
-        tr = pd.concat(
-            [
-                high - low,
-                (high - prev_close).abs(),
-                (low - prev_close).abs(),
-            ],
-            axis=1,
-        ).max(axis=1)
-        atr = tr.rolling(window=period, min_periods=period).mean()
-        return atr
-
-    def _generate_rsi_bollinger_signals(self) -> pd.Series:
+    def _generate_rsi_bollinger_signals(self) -> np.ndarray:
         """Generate +/-1/0 signals based on RSI and Bollinger band rules."""
-        signals: List[int] = []
-        position = 0
-        for _, row in self.data.iterrows():
-            price = row["Close"]
-            rsi = row[self.rsi_col]
-            mid = row[self.bb_mid_col]
-            lower = row[self.bb_lower_col]
-            upper = row[self.bb_upper_col]
-            entry_long = (
-                pd.notna(rsi)
-                and pd.notna(lower)
-                and rsi <= self.rsi_long_entry
-                and price <= lower
-            )
-            entry_short = (
-                pd.notna(rsi)
-                and pd.notna(upper)
-                and rsi >= self.rsi_short_entry
-                and price >= upper
-            )
-            exit_long = position == 1 and (
-                (pd.notna(rsi) and rsi >= self.rsi_long_exit)
-                or (pd.notna(mid) and price >= mid)
-            )
-            exit_short = position == -1 and (
-                (pd.notna(rsi) and rsi <= self.rsi_short_exit)
-                or (pd.notna(mid) and price <= mid)
-            )
+        return kernels.rsi_bollinger_positions(
+            self.indicators.get(indicators.CLOSE),
+            self.get_indicator("rsi"),
+            self.get_indicator("bb_mid"),
+            self.get_indicator("bb_lower"),
+            self.get_indicator("bb_upper"),
+            self.rsi_long_entry,
+            self.rsi_long_exit,
+            self.rsi_short_entry,
+            self.rsi_short_exit,
+            self.allow_short,
+        )
 
-            if position == 0:
-                if entry_long:
-                    position = 1
-                elif entry_short and self.allow_short:
-                    position = -1
-            elif position == 1:
-                if exit_long:
-                    if entry_short and self.allow_short:
-                        position = -1
-                    else:
-                        position = 0
-            elif position == -1:
-                if exit_short:
-                    if entry_long:
-                        position = 1
-                    else:
-                        position = 0
-            signals.append(position)
-        return pd.Series(signals, index=self.data.index, dtype=int)
-
-    def _generate_donchian_signals(self) -> pd.Series:
+    def _generate_donchian_signals(self) -> np.ndarray:
         """Generate signals using Donchian channel breakout."""
-        signals: List[int] = []
-        position = 0
-        highs = self.data["DONCHIAN_HIGH"]
-        lows = self.data["DONCHIAN_LOW"]
-        closes = self.data["Close"]
-        for high_channel, low_channel, close in zip(highs, lows, closes):
-            if pd.isna(high_channel) or pd.isna(low_channel):
-                signals.append(0)
-                continue
-            if close >= high_channel:
-                position = 1
-            elif close <= low_channel:
-                position = -1 if self.allow_short else 0
-            signals.append(position)
-        return pd.Series(signals, index=self.data.index, dtype=int)
+        return kernels.donchian_positions(
+            self.get_indicator("donchian_high"),
+            self.get_indicator("donchian_low"),
+            self.indicators.get(indicators.CLOSE),
+            self.allow_short,
+        )
 
     def get_results(self) -> Dict[str, float]:
         """Return the metrics dictionary."""
@@ -567,6 +580,23 @@ class SimpleBacktest:
             raise RuntimeError("Backtest has not been run yet.")
         return self._equity_curve.copy()
 
+    def get_rolling_metrics(self, window: int = 126, trade_window: int = 20) -> pd.DataFrame:
+        """
+        Rolling (last ``window`` bars / ``trade_window`` trades) and expanding
+        return, Sharpe, max drawdown, and win rate per bar; see ``rolling.rolling_metrics``.
+        """
+        if self._equity_curve.empty:
+            raise RuntimeError("Backtest has not been run yet.")
+        return rolling_metrics(self._equity_curve, self.trades, window, trade_window, self._periods_per_year())
+
+    def restore_results(self, trades: List[Trade], equity_curve: pd.Series) -> None:
+        """Adopt trades and an equity curve from a previous run instead of simulating."""
+        if equity_curve.empty:
+            raise ValueError("Cannot restore results from an empty equity curve.")
+        self.trades = list(trades)
+        self._equity_curve = equity_curve.rename("equity")
+        self._results = self._calculate_metrics()
+
     def export_trades_to_csv(self, filename: str) -> None:
         """Export trade history to CSV."""
         if not self.trades:
@@ -590,6 +620,21 @@ class SimpleBacktest:
         output_path.parent.mkdir(parents=True, exist_ok=True)
         df.to_csv(output_path, index=False)
 
+    def export_equity_to_csv(self, filename: str, rolling_window: Optional[int] = None, trade_window: int = 20) -> None:
+        """Export the equity curve, plus rolling/expanding metrics when ``rolling_window`` is set."""
+        frame = self.get_equity_curve().to_frame()
+        if rolling_window is not None:
+            frame = frame.join(self.get_rolling_metrics(rolling_window, trade_window))
+        output_path = Path(filename)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        frame.to_csv(output_path, index_label="Date")
+
+    def export_signals_binary(self, filename: str) -> Path:
+        """Export signals, indicators, and trades to the binary exchange format (see binary_io)."""
+        from .binary_io import write_backtest
+
+        return write_backtest(self, filename)
+
     # ------------------------------------------------------------------ #
     # Validation helpers
     # ------------------------------------------------------------------ #
@@ -599,35 +644,81 @@ class SimpleBacktest:
 
     def _ensure_indicators(self) -> None:
         self._ensure_data_loaded()
-        if self.strategy == "ma_crossover":
-            if self.fast_col not in self.data or self.slow_col not in self.data:
-                raise RuntimeError("Indicators not calculated. Call calculate_indicators().")
-            if (self.use_rsi_filter or self.use_rsi_exit) and self.rsi_col not in self.data:
-                raise RuntimeError("RSI column missing for MA filter/exit. Call calculate_indicators().")
-            if self.use_atr_trailing_stop and self.atr_col not in self.data:
-                raise RuntimeError("ATR column missing for trailing stop. Call calculate_indicators().")
-        elif self.strategy == "macd":
-            if self.macd_col not in self.data or self.macd_signal_col not in self.data:
-                raise RuntimeError("MACD indicators missing. Call calculate_indicators().")
-        elif self.strategy == "donchian":
-            if "DONCHIAN_HIGH" not in self.data or "DONCHIAN_LOW" not in self.data:
-                raise RuntimeError("Donchian channels missing. Call calculate_indicators().")
-        else:
-            required = {
-                self.bb_mid_col,
-                self.bb_upper_col,
-                self.bb_lower_col,
-                self.rsi_col,
-            }
-            if any(col not in self.data for col in required):
-                raise RuntimeError("RSI/Bollinger indicators missing. Call calculate_indicators().")
+        missing = [role for role, node in self.required_indicators().items() if node not in self.indicators]
+        if missing:
+            raise RuntimeError(f"Indicators missing ({', '.join(missing)}). Call calculate_indicators().")
 
     def _ensure_signals(self) -> None:
         self._ensure_indicators()
-        if "signal" not in self.data:
+        if self.signals is None or len(self.signals) != len(self.data):
             raise RuntimeError("Signals not generated. Call generate_signals().")
 
 
+def simulate_backtests(backtests: Sequence[SimpleBacktest]) -> None:
+    """
+    Run the simulation of several backtests over the same bars in one walk.
+
+    Every backtest must already hold signals for the same bar series (e.g. all
+    loaded from one ``Dataset`` with equal precision and timeframe). Each one
+    ends up with its own trades, equity curve, and metrics, exactly as if it
+    had been run alone.
+    """
+    closes, equity, exit_prices, entry_sizes, final_exit = simulate_arrays(backtests)
+    dates = pd.DatetimeIndex(backtests[0].data["Date"])
+    for row, backtest in enumerate(backtests):
+        backtest._store_simulation(
+            dates, closes, equity[row].copy(), exit_prices[row], entry_sizes[row], bool(final_exit[row])
+        )
+
+
+def simulate_arrays(backtests: Sequence[SimpleBacktest]) -> Tuple[np.ndarray, ...]:
+    """
+    ``kernels.simulate_strategies`` over several backtests sharing the same bars.
+
+    Returns the closes followed by the kernel's (equity, exit_prices,
+    entry_sizes, final_exit) rows, one per backtest, without building trade
+    ledgers; sweeps that only need metrics read these directly.
+    """
+    first = backtests[0]
+    closes = first.indicators.get(indicators.CLOSE)
+    inputs = [backtest._simulation_inputs() for backtest in backtests]
+    if any(len(backtest.indicators.get(indicators.CLOSE)) != len(closes) for backtest in backtests):
+        raise ValueError("All backtests simulated together must share the same bars.")
+
+    shape = (len(backtests), len(closes))
+    atr = np.full(shape, np.nan)
+    rsi = np.full(shape, np.nan, dtype=PRECISIONS[first.precision])
+    for row, item in enumerate(inputs):
+        if item["atr"] is not None:
+            atr[row] = item["atr"]
+        if item["rsi"] is not None:
+            rsi[row] = item["rsi"]
+    intrabar = np.array([item["intrabar"] for item in inputs], dtype=bool)
+    bar_prices: Dict[str, Optional[np.ndarray]] = {"Open": None, "High": None, "Low": None}
+    if intrabar.any():
+        missing = set(bar_prices) - set(first.data.columns)
+        if missing:
+            raise ValueError(f"stop_fill='intrabar' requires columns: {sorted(missing)}")
+        bar_prices = {name: first.indicators.get(indicators.column(name)) for name in bar_prices}
+
+    equity, exit_prices, entry_sizes, final_exit = kernels.simulate_strategies(
+        closes,
+        np.vstack([item["signals"] for item in inputs]),
+        initial_capital=np.array([backtest.initial_capital for backtest in backtests]),
+        position_size=np.array([backtest.position_size for backtest in backtests]),
+        allow_short=np.array([backtest.allow_short for backtest in backtests]),
+        atr=atr,
+        atr_multiplier=np.array([item["atr_multiplier"] for item in inputs], dtype=np.float64),
+        rsi=rsi,
+        rsi_threshold=np.array([item["rsi_threshold"] for item in inputs], dtype=np.float64),
+        opens=bar_prices["Open"],
+        highs=bar_prices["High"],
+        lows=bar_prices["Low"],
+        intrabar=intrabar,
+    )
+    return closes, equity, exit_prices, entry_sizes, final_exit
+
+
 def main() -> None:
     """Quick manual test when running this module directly."""
     csv = Path(__file__).resolve().parents[2] / "data" / "AAPL.csv"
@@ -0,0 +1,99 @@
+"""
+Array-based simulation helpers shared by batch tools.
+
+``SimpleBacktest.run`` walks bars one at a time because ATR trailing stops and
+RSI exits depend on the open position. Without those rules, positions follow
+directly from signals, so many runs can be simulated together as rows of a
+2-D array: positions -> equity -> metrics in a few vectorized passes.
+
+Equity follows the same market-on-close accounting as ``SimpleBacktest.run``:
+positions change at the bar's close, so the PnL of bar ``t`` is
+``position[t-1] * (close[t] - close[t-1])``.
+
+Position-dependent rules (ATR trailing stop, RSI exit) go through
+``kernels.simulate_strategies`` instead, which advances many strategies over
+the same bars in one walk.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Sequence
+
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+
+
+def periods_per_year(dates: Sequence) -> float:
+    """Observed bars per calendar year, used to annualize Sharpe on resampled timeframes."""
+    dates = pd.DatetimeIndex(dates)
+    if len(dates) < 2:
+        return float(TRADING_DAYS)
+    years = (dates[-1] - dates[0]).total_seconds() / (365.25 * 86400)
+    return (len(dates) - 1) / years if years > 0 else float(TRADING_DAYS)
+
+
+def positions_from_signals(signals: np.ndarray, allow_short: bool) -> np.ndarray:
+    """Map +1/-1/0 signals to held positions (+1 long, -1 short, 0 flat)."""
+    signals = np.asarray(signals)
+    if allow_short:
+        return np.sign(signals).astype(np.int8)
+    return (signals > 0).astype(np.int8)
+
+
+def equity_from_positions(
+    close: np.ndarray,
+    positions: np.ndarray,
+    initial_capital: float,
+    position_size: int,
+) -> np.ndarray:
+    """
+    Equity curves for one or many position paths.
+
+    Args:
+        close: Close prices, shape (bars,).
+        positions: Positions in units of ``position_size``, shape (bars,) or (runs, bars).
+        initial_capital: Starting cash.
+        position_size: Shares per unit position.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    positions = np.atleast_2d(positions)
+    pnl = np.zeros(positions.shape, dtype=np.float64)
+    pnl[:, 1:] = positions[:, :-1] * np.diff(close) * position_size
+    return initial_capital + np.cumsum(pnl, axis=1)
+
+
+def count_trades(positions: np.ndarray) -> np.ndarray:
+    """Number of completed trades per row (open positions are closed on the last bar)."""
+    positions = np.atleast_2d(positions)
+    previous = np.zeros_like(positions)
+    previous[:, 1:] = positions[:, :-1]
+    closes = (previous != 0) & (positions != previous)
+    return closes.sum(axis=1) + (positions[:, -1] != 0)
+
+
+def batch_metrics(equity: np.ndarray, periods_per_year: float = TRADING_DAYS) -> Dict[str, np.ndarray]:
+    """
+    Total return, max drawdown (both in %), and annualized Sharpe for each row.
+
+    Matches ``SimpleBacktest._calculate_metrics`` but without rounding.
+    ``periods_per_year`` annualizes Sharpe for non-daily steps (e.g. per trade).
+    """
+    equity = np.atleast_2d(np.asarray(equity, dtype=np.float64))
+    total_return = (equity[:, -1] / equity[:, 0] - 1) * 100
+    drawdown = equity / np.maximum.accumulate(equity, axis=1) - 1
+    max_drawdown = drawdown.min(axis=1) * 100
+
+    sharpe = np.zeros(len(equity))
+    if equity.shape[1] > 2:
+        returns = equity[:, 1:] / equity[:, :-1] - 1
+        std = returns.std(axis=1)
+        valid = std != 0
+        sharpe[valid] = returns[valid].mean(axis=1) / std[valid] * np.sqrt(periods_per_year)
+    return {
+        "total_return": total_return,
+        "max_drawdown": max_drawdown,
+        "sharpe_ratio": sharpe,
+    }
+
@@ -0,0 +1,178 @@
+"""
+Append-only on-disk spill for equity curves produced by long sweeps.
+
+Keeping every curve of a large comparison in memory grows without bound
+and loses everything on a crash. ``CurveSpill`` appends each curve's values
+as float32 to one flat file as soon as the run finishes. Each distinct date
+index is written once as int64 nanoseconds, since runs on the same dataset
+share it. A JSON-lines index records where every curve lives. Reading a
+curve back memory-maps only its slice, so a plot of the top few runs never
+loads the rest.
+
+A ``DataFrame`` can be spilled under one label too. Its rows are stored
+back to back, and the index entry records the column names, so the rolling
+metrics of a sweep can live next to its equity curves.
+
+Reopening a spill (``reset=False``) repairs what a crash mid-append can
+leave behind: a torn last index line is dropped, and ``values.f32`` is
+truncated to the end of the last indexed curve, so new curves start at the
+offsets the index records. ``sync`` makes every appended curve durable, so
+a caller journaling finished work can call it before its journal record.
+
+Layout of the spill directory:
+    values.f32        float32 equity values of every curve, back to back
+    dates_<key>.i64   int64 nanosecond timestamps, one file per distinct index
+    index.jsonl       {"label", "dates", "offset", "length", "final"} per curve
+                      (plus "columns" for a spilled frame; "length" counts values)
+
+Example:
+    with CurveSpill("results/week2/comparisons/sweep_curves", reset=True) as spill:
+        for label, curve in run_everything():
+            spill.append(label, curve)
+        best = spill.curve("SPY sma 20/50")
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Union
+
+import numpy as np
+import pandas as pd
+
+VALUES_FILE = "values.f32"
+INDEX_FILE = "index.jsonl"
+
+
+class CurveSpill:
+    """Float32 equity curves appended to disk and read back by label through ``np.memmap``."""
+
+    def __init__(self, directory: Union[str, Path], reset: bool = False) -> None:
+        """
+        Args:
+            directory: Spill directory (created if missing).
+            reset: Delete any existing spill first instead of appending to it.
+        """
+        self.directory = Path(directory)
+        if reset and self.directory.exists():
+            shutil.rmtree(self.directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        index_path = self.directory / INDEX_FILE
+        values_path = self.directory / VALUES_FILE
+        self._offset = self._repair(index_path, values_path)
+        self._values = open(values_path, "ab")
+        self._index = open(index_path, "a")
+
+    def _repair(self, index_path: Path, values_path: Path) -> int:
+        """Load complete index lines, truncate both files to them, and return the next offset."""
+        values_size = values_path.stat().st_size if values_path.exists() else 0
+        good = 0
+        end = 0
+        if index_path.exists():
+            with open(index_path, "rb") as handle:
+                for line in handle:
+                    if not line.endswith(b"\n"):
+                        break  # torn write from a crash
+                    if not line.strip():
+                        good += len(line)
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break
+                    stop = entry["offset"] + entry["length"]
+                    if stop * 4 > values_size:
+                        break  # indexed before its values reached the disk
+                    self.entries[entry["label"]] = entry
+                    end = max(end, stop)
+                    good += len(line)
+            if good < index_path.stat().st_size:
+                with open(index_path, "r+b") as handle:
+                    handle.truncate(good)
+        if values_size > end * 4:
+            # Values of a curve whose index line never made it, possibly partial.
+            with open(values_path, "r+b") as handle:
+                handle.truncate(end * 4)
+        return end
+
+    def append(self, label: str, curve: Union[pd.Series, pd.DataFrame]) -> Dict[str, Any]:
+        """Spill one curve (or frame of curves); a repeated label points at the newest copy."""
+        dates = pd.DatetimeIndex(curve.index).to_numpy(dtype="datetime64[ns]").view("<i8")
+        key = hashlib.blake2b(dates.tobytes(), digest_size=8).hexdigest()
+        dates_path = self.directory / f"dates_{key}.i64"
+        if not dates_path.exists():
+            # Written under a temporary name so a crash never leaves a short dates file behind.
+            temporary = dates_path.with_name(f".{dates_path.name}.tmp")
+            with open(temporary, "wb") as handle:
+                handle.write(dates.astype("<i8").tobytes())
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(temporary, dates_path)
+        values = np.ascontiguousarray(curve.to_numpy(dtype="<f4"))
+        self._values.write(values.tobytes())
+        entry = {
+            "label": label,
+            "dates": key,
+            "offset": self._offset,
+            "length": values.size,
+            "final": float(curve.iloc[-1]) if isinstance(curve, pd.Series) and len(curve) else None,
+        }
+        if isinstance(curve, pd.DataFrame):
+            entry["columns"] = [str(column) for column in curve.columns]
+        self._offset += values.size
+        self._index.write(json.dumps(entry) + "\n")
+        self.flush()
+        self.entries[label] = entry
+        return entry
+
+    def flush(self) -> None:
+        self._values.flush()
+        self._index.flush()
+
+    def sync(self) -> None:
+        """Flush and fsync the values and index, so appended curves survive a power loss."""
+        self.flush()
+        os.fsync(self._values.fileno())
+        os.fsync(self._index.fileno())
+
+    def curve(self, label: str) -> Union[pd.Series, pd.DataFrame]:
+        """Read one spilled curve (or frame) back (float32 values, DatetimeIndex)."""
+        entry = self.entries.get(label)
+        if entry is None:
+            raise KeyError(f"No spilled curve labelled {label!r}")
+        self.flush()
+        values = np.empty(0, dtype="<f4")
+        if entry["length"]:
+            values = np.memmap(
+                self.directory / VALUES_FILE, dtype="<f4", mode="r", offset=entry["offset"] * 4, shape=(entry["length"],)
+            )
+        dates = np.fromfile(self.directory / f"dates_{entry['dates']}.i64", dtype="<i8")
+        dates = pd.DatetimeIndex(dates.view("datetime64[ns]"))
+        if "columns" in entry:
+            rows = np.array(values).reshape(len(dates), len(entry["columns"]))
+            return pd.DataFrame(rows, index=dates, columns=entry["columns"])
+        return pd.Series(np.array(values), index=dates, name=label)
+
+    def labels(self) -> List[str]:
+        return list(self.entries)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def close(self) -> None:
+        self._values.close()
+        self._index.close()
+
+    def __enter__(self) -> "CurveSpill":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
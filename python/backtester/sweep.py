@@ -0,0 +1,430 @@
+"""
+Declarative, lazily expanded sweeps over ``SimpleBacktest`` parameters.
+
+A sweep spec describes a parameter space instead of listing every run:
+
+    {
+      "base": {"csv_file": "data/SPY.csv", "strategy": "ma_crossover"},
+      "space": {"product": [
+        {"moving_average": ["sma", "ema", "wma"]},
+        {"fast_window": {"range": [5, 50, 5]}, "slow_window": {"range": [20, 200, 10]}},
+        {"if": {"moving_average": "wma"}, "then": {"use_rsi_filter": [false, true]}}
+      ]},
+      "constraints": ["fast_window < slow_window", "slow_window >= 2 * fast_window"],
+      "label": "{moving_average} {fast_window}/{slow_window}"
+    }
+
+Spaces:
+    {"p": values, "q": values}   grid: product of each parameter's values
+    {"product": [space, ...]}    every combination; later spaces see earlier bindings
+    {"zip": [space, ...]}        lockstep over spaces of equal length
+    {"chain": [space, ...]}      one space after another
+    {"if": cond, "then": space, "else": space}
+                                 expand ``then`` when every ``param: value`` (or
+                                 ``param: [allowed values]``) in cond matches the
+                                 parameters bound so far (else ``else``, if given)
+
+Values are a list, a scalar, ``{"range": [start, stop, step]}`` (stop
+inclusive), or ``{"linspace": [start, stop, count]}``. Constraints are Python
+comparisons/arithmetic over parameter names and are evaluated with
+``SimpleBacktest`` defaults for unset parameters. A constraint prunes a
+whole subtree as soon as its parameters are bound. Parameter names are
+checked against the constructor signature when the spec is parsed. Each
+surviving config is then checked with the constructor itself, and rejected
+ones are counted, not yielded.
+
+Expansion is a generator, so a million-run sweep never exists as a list.
+``shard=(i, n)`` keeps every n-th valid config starting at i, so n workers
+split one spec without coordinating. A plain JSON list of run dicts (the
+older config format) is accepted as a chain of fixed points.
+
+Example:
+    sweep = Sweep.from_json(json.loads(Path("configs/spy_ma_sweep.json").read_text()))
+    for config in sweep.configs(shard=(0, 4)):
+        backtest = SimpleBacktest(**config)
+    print(sweep.stats)
+"""
+
+from __future__ import annotations
+
+import ast
+import inspect
+import math
+import operator
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+from .simple_backtest import SimpleBacktest
+
+SPACE_KEYS = ("product", "zip", "chain", "if")
+_CONDITIONAL_KEYS = {"if", "then", "else"}
+
+_BINARY = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+_COMPARE = {
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.In: lambda left, right: left in right,
+    ast.NotIn: lambda left, right: left not in right,
+}
+
+
+def constructor_defaults() -> Dict[str, Any]:
+    """``SimpleBacktest`` keyword parameters and their defaults (csv_file has none)."""
+    parameters = inspect.signature(SimpleBacktest.__init__).parameters
+    return {
+        name: (None if parameter.default is inspect.Parameter.empty else parameter.default)
+        for name, parameter in parameters.items()
+        if name != "self"
+    }
+
+
+# ---------------------------------------------------------------------- #
+# Constraints
+# ---------------------------------------------------------------------- #
+class Constraint:
+    """A safe boolean expression over parameter names, e.g. ``fast_window < slow_window``."""
+
+    def __init__(self, expression: str) -> None:
+        self.expression = expression
+        try:
+            tree = ast.parse(expression, mode="eval")
+        except SyntaxError as exc:
+            raise ValueError(f"Invalid constraint {expression!r}: {exc.msg}") from exc
+        self._body = tree.body
+        self.names: Set[str] = set()
+        self._check(self._body)
+
+    def _check(self, node: ast.AST) -> None:
+        if isinstance(node, ast.Name):
+            self.names.add(node.id)
+        elif isinstance(node, ast.Constant):
+            pass
+        elif isinstance(node, ast.BoolOp):
+            for value in node.values:
+                self._check(value)
+        elif isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.Not, ast.USub, ast.UAdd)):
+            self._check(node.operand)
+        elif isinstance(node, ast.BinOp) and type(node.op) in _BINARY:
+            self._check(node.left)
+            self._check(node.right)
+        elif isinstance(node, ast.Compare) and all(type(op) in _COMPARE for op in node.ops):
+            for child in [node.left, *node.comparators]:
+                self._check(child)
+        elif isinstance(node, (ast.List, ast.Tuple)):
+            for element in node.elts:
+                self._check(element)
+        else:
+            raise ValueError(f"Unsupported syntax in constraint {self.expression!r}: {type(node).__name__}")
+
+    def __call__(self, params: Dict[str, Any]) -> bool:
+        return bool(self._eval(self._body, params))
+
+    def _eval(self, node: ast.AST, params: Dict[str, Any]) -> Any:
+        if isinstance(node, ast.Name):
+            return params[node.id]
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.BoolOp):
+            values = (self._eval(value, params) for value in node.values)
+            return all(values) if isinstance(node.op, ast.And) else any(values)
+        if isinstance(node, ast.UnaryOp):
+            operand = self._eval(node.operand, params)
+            if isinstance(node.op, ast.Not):
+                return not operand
+            return -operand if isinstance(node.op, ast.USub) else +operand
+        if isinstance(node, ast.BinOp):
+            return _BINARY[type(node.op)](self._eval(node.left, params), self._eval(node.right, params))
+        if isinstance(node, ast.Compare):
+            left = self._eval(node.left, params)
+            for op, comparator in zip(node.ops, node.comparators):
+                right = self._eval(comparator, params)
+                if not _COMPARE[type(op)](left, right):
+                    return False
+                left = right
+            return True
+        return [self._eval(element, params) for element in node.elts]  # List / Tuple
+
+    def __repr__(self) -> str:
+        return f"Constraint({self.expression!r})"
+
+
+# ---------------------------------------------------------------------- #
+# Values and spaces
+# ---------------------------------------------------------------------- #
+def expand_values(spec: Any) -> List[Any]:
+    """Concrete values for one parameter: list, scalar, range (stop inclusive), or linspace."""
+    if isinstance(spec, list):
+        return spec
+    if not isinstance(spec, dict):
+        return [spec]
+    if set(spec) == {"range"}:
+        start, stop, step = spec["range"]
+        if step == 0 or (stop - start) / step < 0:
+            raise ValueError(f"Empty or infinite range: {spec['range']}")
+        count = int(math.floor((stop - start) / step + 1e-9)) + 1
+        values = [start + index * step for index in range(count)]
+        if all(isinstance(item, int) for item in (start, stop, step)):
+            return values
+        return [round(value, 12) for value in values]
+    if set(spec) == {"linspace"}:
+        start, stop, count = spec["linspace"]
+        if count < 1:
+            raise ValueError(f"linspace needs at least one point: {spec['linspace']}")
+        if count == 1:
+            return [start]
+        return [round(start + (stop - start) * index / (count - 1), 12) for index in range(count)]
+    if set(spec) == {"values"}:
+        return list(spec["values"])
+    raise ValueError(f"Unsupported value spec: {spec}")
+
+
+Prune = Callable[[Dict[str, Any], Set[str]], bool]
+
+
+class Sweep:
+    """Lazily expanded parameter space with constraints, validation, and sharding."""
+
+    def __init__(
+        self,
+        space: Any = None,
+        base: Optional[Dict[str, Any]] = None,
+        constraints: Sequence[str] = (),
+        label: Optional[str] = None,
+        extra_keys: Sequence[str] = ("label",),
+        auto_label: bool = True,
+    ) -> None:
+        """
+        Args:
+            space: Space spec (see module docstring); None sweeps nothing (one run of ``base``).
+            base: Fixed parameters merged under every config.
+            constraints: Boolean expressions every config must satisfy.
+            label: Optional ``str.format`` template over the config for its "label".
+            extra_keys: Non-constructor keys allowed in configs (dropped before validation).
+            auto_label: Without a template, label unlabelled configs by their swept values.
+        """
+        self.space = {} if space is None else space
+        self.base = dict(base or {})
+        self.label = label
+        self.auto_label = auto_label
+        self.extra_keys = set(extra_keys)
+        self.defaults = constructor_defaults()
+        allowed = set(self.defaults) | self.extra_keys
+
+        self.swept: List[str] = []
+        self._collect(self.space, self.swept)
+        unknown = sorted((set(self.swept) | set(self.base)) - allowed)
+        if unknown:
+            raise ValueError(f"Unknown SimpleBacktest parameter(s) in sweep: {unknown}")
+        self.constraints = [Constraint(expression) for expression in constraints]
+        for constraint in self.constraints:
+            missing = sorted(constraint.names - allowed)
+            if missing:
+                raise ValueError(f"Constraint {constraint.expression!r} uses unknown name(s): {missing}")
+        self.stats = {"generated": 0, "pruned": 0, "invalid": 0, "valid": 0}
+        self.rejections: List[Tuple[Dict[str, Any], str]] = []
+
+    @classmethod
+    def from_json(cls, data: Union[Dict[str, Any], List[Dict[str, Any]]], **kwargs: Any) -> "Sweep":
+        """Build from a parsed sweep spec object, or from a list of explicit run dicts."""
+        if isinstance(data, list):
+            if not all(isinstance(item, dict) for item in data):
+                raise ValueError("A run list must contain only objects.")
+            fixed = [{name: [value] for name, value in run.items()} for run in data]
+            return cls({"chain": fixed}, auto_label=False, **kwargs)
+        if not isinstance(data, dict):
+            raise ValueError("Sweep spec must be a JSON object or a list of runs.")
+        unknown = sorted(set(data) - {"base", "space", "constraints", "label"})
+        if unknown:
+            raise ValueError(f"Unknown sweep spec keys: {unknown}")
+        return cls(
+            data.get("space"),
+            base=data.get("base"),
+            constraints=data.get("constraints", ()),
+            label=data.get("label"),
+            **kwargs,
+        )
+
+    def _collect(self, space: Any, names: List[str]) -> None:
+        """Record swept parameter names (first-seen order) and check the spec shape."""
+        if not isinstance(space, dict):
+            raise ValueError(f"A space must be an object, got {type(space).__name__}: {space!r}")
+        if "if" in space:
+            if not set(space) <= _CONDITIONAL_KEYS or "then" not in space:
+                raise ValueError(f"Conditional space needs 'if' and 'then' (and optional 'else'): {space}")
+            if not isinstance(space["if"], dict):
+                raise ValueError(f"'if' must map parameters to values: {space['if']}")
+            names.extend(name for name in space["if"] if name not in names)
+            self._collect(space["then"], names)
+            if "else" in space:
+                self._collect(space["else"], names)
+            return
+        combinator = [key for key in ("product", "zip", "chain") if key in space]
+        if combinator:
+            if len(space) != 1:
+                raise ValueError(f"'{combinator[0]}' cannot be mixed with other keys: {space}")
+            children = space[combinator[0]]
+            if not isinstance(children, list):
+                raise ValueError(f"'{combinator[0]}' takes a list of spaces.")
+            for child in children:
+                self._collect(child, names)
+            return
+        for name, values in space.items():
+            expand_values(values)  # validate now, not mid-sweep
+            if name not in names:
+                names.append(name)
+
+    # ------------------------------------------------------------------ #
+    # Expansion
+    # ------------------------------------------------------------------ #
+    def _expand(self, space: Dict[str, Any], bound: Dict[str, Any], prune: Prune) -> Iterator[Dict[str, Any]]:
+        """Partial configs (only the parameters ``space`` binds) given the ``bound`` context."""
+        if "product" in space:
+            yield from self._product(space["product"], bound, {}, prune)
+        elif "zip" in space:
+            iterators = [self._expand(child, bound, prune) for child in space["zip"]]
+            sentinel = object()
+            while True:
+                items = [next(iterator, sentinel) for iterator in iterators]
+                if all(item is sentinel for item in items):
+                    return
+                if any(item is sentinel for item in items):
+                    raise ValueError("zip spaces have different lengths.")
+                merged: Dict[str, Any] = {}
+                for item in items:
+                    merged = self._merge(merged, item)
+                yield merged
+        elif "chain" in space:
+            for child in space["chain"]:
+                yield from self._expand(child, bound, prune)
+        elif "if" in space:
+            context = {**self.defaults, **bound}
+            matched = all(
+                context.get(name) in (expected if isinstance(expected, list) else [expected])
+                for name, expected in space["if"].items()
+            )
+            branch = space["then"] if matched else space.get("else")
+            if branch is None:
+                yield {}
+            else:
+                yield from self._expand(branch, bound, prune)
+        else:
+            grid = [{name: values} for name, values in space.items()]
+            if len(grid) == 1:
+                (name, values), = space.items()
+                for value in expand_values(values):
+                    partial = {name: value}
+                    if not prune({**bound, **partial}, {name}):
+                        yield partial
+            else:
+                yield from self._product(grid, bound, {}, prune)
+
+    def _product(
+        self, factors: List[Any], bound: Dict[str, Any], partial: Dict[str, Any], prune: Prune
+    ) -> Iterator[Dict[str, Any]]:
+        if not factors:
+            yield partial
+            return
+        for item in self._expand(factors[0], {**bound, **partial}, prune):
+            merged = self._merge(partial, item)
+            if item and prune({**bound, **merged}, set(item)):
+                continue
+            yield from self._product(factors[1:], bound, merged, prune)
+
+    @staticmethod
+    def _merge(left: Dict[str, Any], right: Dict[str, Any]) -> Dict[str, Any]:
+        twice = set(left) & set(right)
+        if twice:
+            raise ValueError(f"Parameter(s) bound twice in one config: {sorted(twice)}")
+        return {**left, **right}
+
+    def _prune(self, params: Dict[str, Any], new: Set[str]) -> bool:
+        """True when a constraint that just became fully bound fails (counted as pruned)."""
+        for constraint in self.constraints:
+            if constraint.names & new and constraint.names <= params.keys() and not constraint(params):
+                self.stats["pruned"] += 1
+                return True
+        return False
+
+    def candidates(self) -> Iterator[Dict[str, Any]]:
+        """Configs that pass the constraints, before constructor validation."""
+        for partial in self._expand(self.space, dict(self.base), self._prune):
+            config = {**self.base, **partial}
+            self.stats["generated"] += 1
+            context = {**self.defaults, **config}
+            if not all(constraint(context) for constraint in self.constraints):
+                self.stats["pruned"] += 1
+                continue
+            if self.label is not None:
+                config["label"] = self.label.format(**context)
+            elif self.auto_label and "label" not in config and self.swept:
+                config["label"] = self.default_label(config)
+            yield config
+
+    def validate(self, config: Dict[str, Any]) -> Optional[str]:
+        """Constructor error message for ``config``, or None when it is valid."""
+        params = {name: value for name, value in config.items() if name not in self.extra_keys}
+        params.setdefault("csv_file", "")
+        try:
+            SimpleBacktest(**params)
+        except (TypeError, ValueError) as exc:
+            return str(exc)
+        return None
+
+    def configs(self, shard: Optional[Tuple[int, int]] = None, validate: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield valid configs; ``shard=(i, n)`` keeps the i-th of every n.
+
+        Rejected configs are counted in ``stats["invalid"]`` and the first few
+        are kept with their errors in ``rejections``.
+        """
+        index, count = shard or (0, 1)
+        if count < 1 or not 0 <= index < count:
+            raise ValueError(f"Invalid shard {index}/{count}: need 0 <= i < n.")
+        position = 0
+        for config in self.candidates():
+            if validate:
+                error = self.validate(config)
+                if error is not None:
+                    self.stats["invalid"] += 1
+                    if len(self.rejections) < 20:
+                        self.rejections.append((config, error))
+                    continue
+            self.stats["valid"] += 1
+            if position % count == index:
+                yield config
+            position += 1
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self.configs()
+
+    def default_label(self, config: Dict[str, Any]) -> str:
+        """``name=value`` pairs for the swept parameters of ``config`` (data files by stem)."""
+        pairs = []
+        for name in self.swept:
+            if name in config and name != "label":
+                value = Path(config[name]).stem if name == "csv_file" else config[name]
+                pairs.append(f"{name}={value}")
+        return " ".join(pairs)
+
+
+def parse_shard(text: str) -> Tuple[int, int]:
+    """Parse "i/n" (0-based worker i of n)."""
+    try:
+        index, count = (int(part) for part in text.split("/"))
+    except ValueError as exc:
+        raise ValueError(f"Shard must look like i/n, got {text!r}") from exc
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Invalid shard {text}: need 0 <= i < n.")
+    return index, count
@@ -0,0 +1,284 @@
+"""
+Live throughput telemetry for sweeps and queue workers.
+
+``Telemetry`` tracks completed runs and bars, queue depth, worker
+utilization, and a latency histogram per stage (load, indicators, signals,
+simulate, write, ...). It exposes them in three ways:
+
+* ``progress_line()`` is a one-line status for the CLI;
+* ``write_prometheus(path)`` writes the Prometheus text exposition format,
+  atomically, for a node-exporter textfile collector or any local scraper;
+* ``summary()`` is a JSON-ready dict for the final report.
+
+``tick()`` prints the progress line and rewrites the metrics file at most
+once per ``interval`` seconds, so calling it after every run is cheap.
+Rates in the progress line and the gauges cover the last interval. The
+summary rates cover the whole run.
+
+Histograms use fixed, roughly logarithmic buckets (100µs to 5 minutes);
+quantiles are interpolated within a bucket, which is accurate enough to
+tell a 3ms stage from a 30ms one.
+
+Example:
+    telemetry = Telemetry(workers=4, labels={"sweep": "spy"}, metrics_path="results/sweep.prom")
+    for result in results:
+        telemetry.record_run(bars=result.bars, stages=result.timings, busy=result.seconds)
+        telemetry.set_queue_depth(pending)
+        telemetry.tick()
+    print(json.dumps(telemetry.summary(), indent=2))
+"""
+
+from __future__ import annotations
+
+import bisect
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+# Upper bounds in seconds; the last bucket (+Inf) catches the rest.
+LATENCY_BUCKETS = [
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0,
+]
+METRIC_PREFIX = "qt_sweep"
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram (Prometheus style)."""
+
+    def __init__(self, buckets: Optional[List[float]] = None) -> None:
+        self.buckets = list(buckets or LATENCY_BUCKETS)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, q: float) -> float:
+        """Approximate quantile, linearly interpolated inside its bucket."""
+        if not self.count:
+            return float("nan")
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else lower * 2 or 1.0
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    def summary(self) -> Dict[str, float]:
+        mean = self.sum / self.count if self.count else float("nan")
+        return {
+            "count": self.count,
+            "mean_ms": round(mean * 1000, 3),
+            "p50_ms": round(self.quantile(0.5) * 1000, 3),
+            "p95_ms": round(self.quantile(0.95) * 1000, 3),
+            "p99_ms": round(self.quantile(0.99) * 1000, 3),
+            "total_s": round(self.sum, 3),
+        }
+
+
+class Telemetry:
+    """Counters, gauges, and stage histograms for one sweep or worker."""
+
+    def __init__(
+        self,
+        workers: int = 1,
+        labels: Optional[Dict[str, str]] = None,
+        metrics_path: Optional[Union[str, Path]] = None,
+        interval: float = 5.0,
+        total: Optional[int] = None,
+        printer: Optional[Callable[[str], None]] = print,
+        depth: Optional[Callable[[], int]] = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        """
+        Args:
+            workers: Worker processes sharing the work (for utilization).
+            labels: Prometheus labels attached to every series (e.g. sweep name).
+            metrics_path: Prometheus text file rewritten on every report (None: off).
+            interval: Minimum seconds between reports from ``tick``.
+            total: Expected run count, when known, for the progress line.
+            printer: Receives the progress line (None: silent).
+            depth: Polled on each report for the queue depth (instead of ``set_queue_depth``).
+            clock: Monotonic time source.
+        """
+        self.workers = workers
+        self.labels = dict(labels or {})
+        self.metrics_path = Path(metrics_path) if metrics_path is not None else None
+        self.interval = interval
+        self.total = total
+        self.printer = printer
+        self.depth = depth
+        self.clock = clock
+        self.started = clock()
+        self.runs = 0
+        self.bars = 0
+        self.failures = 0
+        self.queue_depth = 0
+        self.busy_seconds = 0.0
+        self.stages: Dict[str, Histogram] = {}
+        self._last_report = self.started
+        self._last_runs = 0
+        self._last_bars = 0
+        self._last_busy = 0.0
+        self._recent = {"runs_per_second": 0.0, "bars_per_second": 0.0, "utilization": 0.0}
+
+    # ------------------------------------------------------------------ #
+    # Recording
+    # ------------------------------------------------------------------ #
+    def record_run(self, bars: int = 0, stages: Optional[Dict[str, float]] = None, busy: Optional[float] = None) -> None:
+        """One finished run; ``busy`` defaults to the sum of its stage times."""
+        self.runs += 1
+        self.bars += int(bars)
+        for stage, seconds in (stages or {}).items():
+            self.observe(stage, seconds)
+        self.busy_seconds += sum((stages or {}).values()) if busy is None else busy
+
+    def record_failure(self) -> None:
+        self.failures += 1
+
+    def observe(self, stage: str, seconds: float) -> None:
+        histogram = self.stages.get(stage)
+        if histogram is None:
+            histogram = self.stages[stage] = Histogram()
+        histogram.observe(seconds)
+
+    def set_queue_depth(self, depth: int) -> None:
+        self.queue_depth = int(depth)
+
+    # ------------------------------------------------------------------ #
+    # Reporting
+    # ------------------------------------------------------------------ #
+    def elapsed(self) -> float:
+        return max(self.clock() - self.started, 1e-9)
+
+    def tick(self, force: bool = False) -> bool:
+        """Report if ``interval`` has passed (or ``force``); returns whether it did."""
+        now = self.clock()
+        if not force and now - self._last_report < self.interval:
+            return False
+        window = max(now - self._last_report, 1e-9)
+        self._recent = {
+            "runs_per_second": (self.runs - self._last_runs) / window,
+            "bars_per_second": (self.bars - self._last_bars) / window,
+            "utilization": min((self.busy_seconds - self._last_busy) / (window * self.workers), 1.0),
+        }
+        self._last_report, self._last_runs, self._last_bars, self._last_busy = now, self.runs, self.bars, self.busy_seconds
+        if self.depth is not None:
+            self.queue_depth = int(self.depth())
+        if self.printer is not None:
+            self.printer(self.progress_line())
+        if self.metrics_path is not None:
+            self.write_prometheus(self.metrics_path)
+        return True
+
+    def progress_line(self) -> str:
+        done = f"{self.runs:,}/{self.total:,}" if self.total else f"{self.runs:,}"
+        parts = [
+            f"{done} runs",
+            f"{self._recent['runs_per_second']:.1f} runs/s",
+            f"{self._recent['bars_per_second']:,.0f} bars/s",
+            f"depth {self.queue_depth:,}",
+            f"util {self._recent['utilization'] * 100:.0f}%",
+        ]
+        if self.failures:
+            parts.append(f"{self.failures:,} failed")
+        slowest = sorted(self.stages.items(), key=lambda item: -item[1].sum)[:2]
+        for stage, histogram in slowest:
+            parts.append(f"{stage} p50 {histogram.quantile(0.5) * 1000:.1f}ms p95 {histogram.quantile(0.95) * 1000:.1f}ms")
+        return "… " + " | ".join(parts)
+
+    def summary(self) -> Dict[str, Any]:
+        elapsed = self.elapsed()
+        return {
+            "labels": self.labels,
+            "elapsed_s": round(elapsed, 3),
+            "workers": self.workers,
+            "runs": self.runs,
+            "failures": self.failures,
+            "bars": self.bars,
+            "runs_per_second": round(self.runs / elapsed, 3),
+            "bars_per_second": round(self.bars / elapsed, 1),
+            "worker_utilization": round(min(self.busy_seconds / (elapsed * self.workers), 1.0), 4),
+            "stages": {stage: histogram.summary() for stage, histogram in sorted(self.stages.items())},
+        }
+
+    def prometheus_text(self) -> str:
+        base = ",".join(f'{name}="{_escape(value)}"' for name, value in sorted(self.labels.items()))
+
+        def series(name: str, extra: str = "") -> str:
+            labels = ",".join(part for part in (base, extra) if part)
+            return f"{METRIC_PREFIX}_{name}{{{labels}}}" if labels else f"{METRIC_PREFIX}_{name}"
+
+        lines: List[str] = []
+
+        def metric(name: str, kind: str, help_text: str, value: float) -> None:
+            lines.extend(
+                [f"# HELP {METRIC_PREFIX}_{name} {help_text}", f"# TYPE {METRIC_PREFIX}_{name} {kind}", f"{series(name)} {_number(value)}"]
+            )
+
+        metric("runs_total", "counter", "Backtest runs completed.", self.runs)
+        metric("failures_total", "counter", "Backtest runs that failed.", self.failures)
+        metric("bars_total", "counter", "Bars simulated by completed runs.", self.bars)
+        metric("runs_per_second", "gauge", "Runs completed per second over the last report interval.", self._recent["runs_per_second"])
+        metric("bars_per_second", "gauge", "Bars simulated per second over the last report interval.", self._recent["bars_per_second"])
+        metric("queue_depth", "gauge", "Runs queued or in flight.", self.queue_depth)
+        metric("workers", "gauge", "Worker processes.", self.workers)
+        metric("worker_utilization", "gauge", "Busy fraction of worker time over the last report interval.", self._recent["utilization"])
+        metric("elapsed_seconds", "gauge", "Seconds since the sweep started.", self.elapsed())
+        name = "stage_seconds"
+        lines.extend([f"# HELP {METRIC_PREFIX}_{name} Per-run latency of each stage.", f"# TYPE {METRIC_PREFIX}_{name} histogram"])
+        for stage, histogram in sorted(self.stages.items()):
+            stage_label = f'stage="{_escape(stage)}"'
+            cumulative = 0
+            for bound, count in zip(histogram.buckets + [float("inf")], histogram.counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                bucket_labels = f'{stage_label},le="{le}"'
+                lines.append(f"{series(name + '_bucket', bucket_labels)} {cumulative}")
+            lines.append(f"{series(name + '_sum', stage_label)} {_number(histogram.sum)}")
+            lines.append(f"{series(name + '_count', stage_label)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: Union[str, Path]) -> None:
+        """Write the metrics atomically (temp file + rename) so scrapers never see half a file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        temporary.write_text(self.prometheus_text())
+        os.replace(temporary, path)
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class StageTimer:
+    """Accumulates ``perf_counter`` durations per stage: ``with timer("simulate"): ...``."""
+
+    def __init__(self) -> None:
+        self.timings: Dict[str, float] = {}
+        self._stage = ""
+        self._started = 0.0
+
+    def __call__(self, stage: str) -> "StageTimer":
+        self._stage = stage
+        return self
+
+    def __enter__(self) -> "StageTimer":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.timings[self._stage] = self.timings.get(self._stage, 0.0) + time.perf_counter() - self._started
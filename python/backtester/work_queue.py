@@ -0,0 +1,357 @@
+"""
+Work queue for spreading sweeps over several processes or hosts.
+
+A coordinator publishes run configs as tasks. Workers lease tasks, run them
+against their own data and result store, and complete them with a small JSON
+result (usually the summary metrics). Leases expire. A task whose worker
+died or stopped heartbeating returns to the queue and is retried, and after
+``max_attempts`` leases it is marked failed. A task a worker fails waits
+``retry_delay`` seconds before anyone retries it, and while other workers
+are active the worker that failed it last leaves it to them, so a host
+missing a run's data does not burn every attempt itself. Task ids are run keys, so publishing the
+same sweep twice adds nothing, and a result is stored at most once per task
+(the first completion wins; a late completion from a worker whose task was
+re-leased to another is ignored). Together this gives at-least-once execution with no
+duplicate results.
+
+Backends implement the ``WorkQueue`` methods and register a URL scheme with
+``register_backend``. The built-in ``sqlite:///path/to/queue.sqlite`` backend
+keeps everything in one SQLite file with transactional leases. It suits
+workers on one host or a local test. Hosts that share it need a filesystem
+with reliable locking. Other brokers can plug in behind the same interface.
+
+Example:
+    queue = open_queue("sqlite:///results/queue.sqlite")
+    queue.publish("spy_sweep", ((run_key(config), config) for config in sweep))
+    # on each worker
+    for task in queue.lease("host-a:1234", lease_seconds=300):
+        queue.complete("host-a:1234", task.task_id, run(task.payload))
+    print(queue.stats("spy_sweep"))
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+TASK_STATES = ("pending", "leased", "done", "failed")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id TEXT PRIMARY KEY,
+    sweep TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    error TEXT,
+    failed_by TEXT,
+    retry_after REAL,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_state ON tasks (state, lease_expires);
+CREATE INDEX IF NOT EXISTS tasks_sweep ON tasks (sweep, state);
+CREATE TABLE IF NOT EXISTS workers (
+    worker TEXT PRIMARY KEY,
+    last_seen REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    task_id TEXT PRIMARY KEY REFERENCES tasks (task_id),
+    sweep TEXT NOT NULL,
+    worker TEXT NOT NULL,
+    result TEXT NOT NULL,
+    finished REAL NOT NULL
+);
+"""
+
+
+@dataclass
+class Task:
+    task_id: str
+    sweep: str
+    payload: Dict[str, Any]
+    attempt: int
+
+
+class WorkQueue(ABC):
+    """Interface every queue backend provides; see ``SQLiteWorkQueue`` for the semantics."""
+
+    @abstractmethod
+    def publish(self, sweep: str, tasks: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """Add ``(task_id, payload)`` pairs under ``sweep``; returns how many were new."""
+
+    @abstractmethod
+    def lease(self, worker: str, lease_seconds: float, limit: int = 1, sweep: Optional[str] = None) -> List[Task]:
+        """
+        Claim up to ``limit`` pending (or lease-expired) tasks for ``lease_seconds``,
+        skipping tasks waiting out a retry delay and, while other workers are
+        active, tasks this worker failed last.
+        """
+
+    @abstractmethod
+    def heartbeat(self, worker: str, task_ids: Iterable[str], lease_seconds: float) -> List[str]:
+        """Extend this worker's leases; returns the task ids it still holds."""
+
+    @abstractmethod
+    def complete(self, worker: str, task_id: str, result: Dict[str, Any]) -> bool:
+        """Store the result; False when another completion won or the task was re-leased to another worker."""
+
+    @abstractmethod
+    def fail(self, worker: str, task_id: str, error: str) -> None:
+        """Give the task back for a delayed retry, or mark it failed after ``max_attempts``."""
+
+    @abstractmethod
+    def release(self, worker: str, task_id: str) -> None:
+        """Hand a held task back unrun (e.g. on shutdown) without using up an attempt."""
+
+    @abstractmethod
+    def stats(self, sweep: Optional[str] = None) -> Dict[str, int]:
+        """Task counts per state (plus "results")."""
+
+    @abstractmethod
+    def results(self, sweep: Optional[str] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Stored ``(task_id, result)`` pairs."""
+
+    @abstractmethod
+    def failures(self, sweep: Optional[str] = None) -> List[Tuple[str, str]]:
+        """``(task_id, last error)`` of failed tasks."""
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "WorkQueue":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class SQLiteWorkQueue(WorkQueue):
+    """Single-file queue; every state change is one ``BEGIN IMMEDIATE`` transaction."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_attempts: int = 3,
+        retry_delay: float = 30.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Args:
+            path: SQLite file (created with its parent directory if missing).
+            max_attempts: Leases a task gets before it is marked failed.
+            retry_delay: Seconds a failed task waits before it can be leased again.
+            clock: Time source for leases (wall clock, shared by every host).
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1.")
+        if retry_delay < 0:
+            raise ValueError("retry_delay must be >= 0.")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.clock = clock
+        # Autocommit mode: transactions are opened explicitly below.
+        self._conn = sqlite3.connect(str(self.path), timeout=30.0, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _transaction(self) -> "_Transaction":
+        return _Transaction(self._conn)
+
+    def publish(self, sweep: str, tasks: Iterable[Tuple[str, Dict[str, Any]]], batch_size: int = 1000) -> int:
+        added = 0
+        batch: List[Tuple[str, str, str, float]] = []
+
+        def flush() -> int:
+            with self._transaction():
+                before = self._conn.total_changes
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO tasks (task_id, sweep, payload, created) VALUES (?, ?, ?, ?)", batch
+                )
+                return self._conn.total_changes - before
+
+        now = self.clock()
+        for task_id, payload in tasks:
+            batch.append((task_id, sweep, json.dumps(payload, sort_keys=True, default=str), now))
+            if len(batch) >= batch_size:
+                added += flush()
+                batch = []
+        if batch:
+            added += flush()
+        return added
+
+    def _expire(self, now: float) -> None:
+        """Return lapsed leases to the queue (or fail them once attempts run out)."""
+        self._conn.execute(
+            "UPDATE tasks SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "lease_owner = NULL, lease_expires = NULL, "
+            "error = COALESCE(error, 'lease expired') "
+            "WHERE state = 'leased' AND lease_expires < ?",
+            (self.max_attempts, now),
+        )
+
+    def _seen(self, worker: str, now: float) -> None:
+        self._conn.execute(
+            "INSERT INTO workers (worker, last_seen) VALUES (?, ?) "
+            "ON CONFLICT (worker) DO UPDATE SET last_seen = excluded.last_seen",
+            (worker, now),
+        )
+
+    def lease(self, worker: str, lease_seconds: float, limit: int = 1, sweep: Optional[str] = None) -> List[Task]:
+        now = self.clock()
+        with self._transaction():
+            self._expire(now)
+            self._seen(worker, now)
+            # A live worker polls or heartbeats well within a lease, so anyone seen
+            # in the last lease_seconds can still take the tasks this one failed.
+            others = self._conn.execute(
+                "SELECT COUNT(*) FROM workers WHERE worker != ? AND last_seen >= ?", (worker, now - lease_seconds)
+            ).fetchone()[0]
+            query = (
+                "SELECT task_id, sweep, payload, attempts FROM tasks "
+                "WHERE state = 'pending' AND (retry_after IS NULL OR retry_after <= ?)"
+            )
+            params: List[Any] = [now]
+            if others:
+                query += " AND (failed_by IS NULL OR failed_by != ?)"
+                params.append(worker)
+            if sweep is not None:
+                query += " AND sweep = ?"
+                params.append(sweep)
+            rows = self._conn.execute(query + " ORDER BY created, task_id LIMIT ?", (*params, limit)).fetchall()
+            self._conn.executemany(
+                "UPDATE tasks SET state = 'leased', attempts = attempts + 1, lease_owner = ?, lease_expires = ? "
+                "WHERE task_id = ?",
+                [(worker, now + lease_seconds, row[0]) for row in rows],
+            )
+        return [Task(task_id, task_sweep, json.loads(payload), attempts + 1) for task_id, task_sweep, payload, attempts in rows]
+
+    def heartbeat(self, worker: str, task_ids: Iterable[str], lease_seconds: float) -> List[str]:
+        now = self.clock()
+        held = []
+        with self._transaction():
+            self._seen(worker, now)
+            for task_id in task_ids:
+                cursor = self._conn.execute(
+                    "UPDATE tasks SET lease_expires = ? WHERE task_id = ? AND state = 'leased' AND lease_owner = ?",
+                    (now + lease_seconds, task_id, worker),
+                )
+                if cursor.rowcount:
+                    held.append(task_id)
+        return held
+
+    def complete(self, worker: str, task_id: str, result: Dict[str, Any]) -> bool:
+        with self._transaction():
+            row = self._conn.execute(
+                "SELECT sweep, state, lease_owner FROM tasks WHERE task_id = ?", (task_id,)
+            ).fetchone()
+            if row is None:
+                raise KeyError(f"Unknown task: {task_id}")
+            sweep, state, owner = row
+            # A worker that lost its lease to another must not overwrite the new holder's run;
+            # an unleased (expired, not yet re-leased) task still takes the result.
+            if state == "failed" or (state == "leased" and owner != worker):
+                return False
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO results (task_id, sweep, worker, result, finished) VALUES (?, ?, ?, ?, ?)",
+                (task_id, sweep, worker, json.dumps(result, default=str), self.clock()),
+            )
+            if not cursor.rowcount:
+                return False
+            self._conn.execute(
+                "UPDATE tasks SET state = 'done', lease_owner = NULL, lease_expires = NULL, error = NULL "
+                "WHERE task_id = ?",
+                (task_id,),
+            )
+        return True
+
+    def fail(self, worker: str, task_id: str, error: str) -> None:
+        with self._transaction():
+            self._conn.execute(
+                "UPDATE tasks SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "lease_owner = NULL, lease_expires = NULL, error = ?, failed_by = ?, retry_after = ? "
+                "WHERE task_id = ? AND state = 'leased' AND lease_owner = ?",
+                (self.max_attempts, error, worker, self.clock() + self.retry_delay, task_id, worker),
+            )
+
+    def release(self, worker: str, task_id: str) -> None:
+        with self._transaction():
+            self._conn.execute(
+                "UPDATE tasks SET state = 'pending', attempts = attempts - 1, lease_owner = NULL, lease_expires = NULL "
+                "WHERE task_id = ? AND state = 'leased' AND lease_owner = ?",
+                (task_id, worker),
+            )
+
+    def stats(self, sweep: Optional[str] = None) -> Dict[str, int]:
+        where, params = ("WHERE sweep = ?", (sweep,)) if sweep is not None else ("", ())
+        with self._transaction():
+            self._expire(self.clock())
+        counts = dict.fromkeys(TASK_STATES, 0)
+        for state, count in self._conn.execute(f"SELECT state, COUNT(*) FROM tasks {where} GROUP BY state", params):
+            counts[state] = count
+        counts["results"] = self._conn.execute(f"SELECT COUNT(*) FROM results {where}", params).fetchone()[0]
+        return counts
+
+    def results(self, sweep: Optional[str] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        where, params = ("WHERE sweep = ?", (sweep,)) if sweep is not None else ("", ())
+        cursor = self._conn.execute(f"SELECT task_id, result FROM results {where} ORDER BY finished", params)
+        for task_id, result in cursor:
+            yield task_id, json.loads(result)
+
+    def failures(self, sweep: Optional[str] = None) -> List[Tuple[str, str]]:
+        where = " AND sweep = ?" if sweep is not None else ""
+        params = (sweep,) if sweep is not None else ()
+        return self._conn.execute(
+            f"SELECT task_id, COALESCE(error, '') FROM tasks WHERE state = 'failed'{where}", params
+        ).fetchall()
+
+
+class _Transaction:
+    """``BEGIN IMMEDIATE`` ... ``COMMIT`` (``ROLLBACK`` on error) on an autocommit connection."""
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self._conn = conn
+
+    def __enter__(self) -> None:
+        self._conn.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self, exc_type: Any, *exc_info: Any) -> None:
+        self._conn.execute("COMMIT" if exc_type is None else "ROLLBACK")
+
+
+# ---------------------------------------------------------------------- #
+# Backends
+# ---------------------------------------------------------------------- #
+_BACKENDS: Dict[str, Callable[..., WorkQueue]] = {}
+
+
+def register_backend(scheme: str, factory: Callable[..., WorkQueue]) -> None:
+    """Make ``open_queue("<scheme>://...")`` call ``factory(location, **options)``."""
+    _BACKENDS[scheme] = factory
+
+
+def open_queue(url: str, **options: Any) -> WorkQueue:
+    """Open a queue by URL, e.g. ``sqlite:///results/queue.sqlite`` or a bare SQLite path."""
+    scheme, sep, location = url.partition("://")
+    if not sep:
+        scheme, location = "sqlite", url
+    elif scheme == "sqlite" and location.startswith("/"):
+        location = location[1:]  # sqlite:///relative/path, sqlite:////absolute/path
+    factory = _BACKENDS.get(scheme)
+    if factory is None:
+        raise ValueError(f"Unknown queue backend {scheme!r}; registered: {sorted(_BACKENDS)}")
+    return factory(location, **options)
+
+
+register_backend("sqlite", SQLiteWorkQueue)
@@ -16,23 +16,14 @@ Example:
 
 from __future__ import annotations
 
+import argparse
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Union
-
-import pandas as pd
-import yfinance as yf
-from pandas.tseries.holiday import (
-    AbstractHolidayCalendar,
-    GoodFriday,
-    Holiday,
-    USLaborDay,
-    USMartinLutherKingJr,
-    USMemorialDay,
-    USPresidentsDay,
-    USThanksgivingDay,
-    nearest_workday,
-)
-from pandas.tseries.offsets import CustomBusinessDay
+from typing import TYPE_CHECKING, Any, List, Optional, Union
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from pandas.tseries.offsets import CustomBusinessDay
 
 DATA_DIR = Path(__file__).resolve().parents[2] / "data"
 REQUIRED_COLUMNS = ["Date", "Open", "High", "Low", "Close", "Volume"]
@@ -48,6 +39,8 @@ def is_valid_ticker(symbol: str) -> bool:
     cleaned = symbol.upper().strip()
     if not cleaned:
         return False
+    import yfinance as yf
+
     try:
         history = yf.Ticker(cleaned).history(period="5d")
     except Exception:
@@ -70,6 +63,9 @@ def download_stock_data(symbol: str, start_date: str, end_date: str) -> pd.DataF
     Raises:
         SystemExit: if the download fails or returns empty data.
     """
+    import pandas as pd
+    import yfinance as yf
+
     symbol = symbol.upper().strip()
     try:
         start = pd.to_datetime(start_date, format="%Y-%m-%d")
@@ -118,25 +114,55 @@ def download_stock_data(symbol: str, start_date: str, end_date: str) -> pd.DataF
     return data[REQUIRED_COLUMNS].copy()
 
 
-class USTradingHolidayCalendar(AbstractHolidayCalendar):
-    """U.S. stock market holiday calendar approximation."""
-
-    rules = [
-        Holiday("NewYearsDay", month=1, day=1, observance=nearest_workday),
-        USMartinLutherKingJr,
-        USPresidentsDay,
+@lru_cache(maxsize=None)
+def trading_calendar() -> Any:
+    """U.S. stock market holiday calendar approximation (built on first use)."""
+    from pandas.tseries.holiday import (
+        AbstractHolidayCalendar,
         GoodFriday,
-        USMemorialDay,
-        Holiday("Juneteenth", month=6, day=19, observance=nearest_workday, start_date="2022-01-01"),
-        Holiday("IndependenceDay", month=7, day=4, observance=nearest_workday),
+        Holiday,
         USLaborDay,
+        USMartinLutherKingJr,
+        USMemorialDay,
+        USPresidentsDay,
         USThanksgivingDay,
-        Holiday("Christmas", month=12, day=25, observance=nearest_workday),
-    ]
+        nearest_workday,
+    )
+
+    class USTradingHolidayCalendar(AbstractHolidayCalendar):
+        rules = [
+            Holiday("NewYearsDay", month=1, day=1, observance=nearest_workday),
+            USMartinLutherKingJr,
+            USPresidentsDay,
+            GoodFriday,
+            USMemorialDay,
+            Holiday("Juneteenth", month=6, day=19, observance=nearest_workday, start_date="2022-01-01"),
+            Holiday("IndependenceDay", month=7, day=4, observance=nearest_workday),
+            USLaborDay,
+            USThanksgivingDay,
+            Holiday("Christmas", month=12, day=25, observance=nearest_workday),
+        ]
+
+    return USTradingHolidayCalendar()
+
 
+@lru_cache(maxsize=None)
+def trading_bday() -> "CustomBusinessDay":
+    """Business-day offset that skips U.S. market holidays."""
+    from pandas.tseries.offsets import CustomBusinessDay
 
-TRADING_CALENDAR = USTradingHolidayCalendar()
-TRADING_BDAY = CustomBusinessDay(calendar=TRADING_CALENDAR)
+    return CustomBusinessDay(calendar=trading_calendar())
+
+
+def __getattr__(name: str) -> Any:
+    # Backwards-compatible module constants, now built lazily.
+    if name == "TRADING_CALENDAR":
+        return trading_calendar()
+    if name == "TRADING_BDAY":
+        return trading_bday()
+    if name == "USTradingHolidayCalendar":
+        return type(trading_calendar())
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def validate_ohlc_data(df: pd.DataFrame) -> Union[bool, List[str]]:
@@ -156,6 +182,8 @@ def validate_ohlc_data(df: pd.DataFrame) -> Union[bool, List[str]]:
     Returns:
         True if all checks pass, otherwise a list of error messages.
     """
+    import pandas as pd
+
     errors: List[str] = []
     warnings: List[str] = []
 
@@ -173,7 +201,7 @@ def validate_ohlc_data(df: pd.DataFrame) -> Union[bool, List[str]]:
     df.sort_values("Date", inplace=True)
 
     expected_dates = pd.date_range(
-        start=df["Date"].min(), end=df["Date"].max(), freq=TRADING_BDAY
+        start=df["Date"].min(), end=df["Date"].max(), freq=trading_bday()
     )
     missing_dates = expected_dates.difference(df["Date"].dt.normalize().unique())
     if len(missing_dates) > 0:
@@ -224,6 +252,8 @@ def save_data(df: pd.DataFrame, filename: Union[str, Path]) -> None:
         df: DataFrame to save.
         filename: Target filename (e.g., "data/AAPL.csv").
     """
+    import pandas as pd
+
     path = Path(filename)
     if not path.is_absolute():
         path = DATA_DIR / path
@@ -243,28 +273,52 @@ def build_output_filename(symbol: str, start_date: str, end_date: str) -> Path:
     return DATA_DIR / name
 
 
-def prompt_user_inputs() -> tuple[str, str, str]:
-    """Interactively gather ticker, start date, and end date from the user."""
-    symbol = input("Enter ticker symbol (e.g., NVDA): ").strip().upper()
+def prompt_user_inputs(
+    symbol: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+) -> tuple[str, str, str]:
+    """Interactively gather whichever of ticker, start date, and end date were not given."""
     if not symbol:
-        raise SystemExit("[ERROR] Ticker symbol cannot be empty.")
-    if not is_valid_ticker(symbol):
-        raise SystemExit(f"[ERROR] '{symbol}' is not a recognized ticker or has no data.")
-
-    start_date = input("Enter start date (YYYY-MM-DD): ").strip()
-    end_date = input("Enter end date (YYYY-MM-DD): ").strip()
+        symbol = input("Enter ticker symbol (e.g., NVDA): ").strip().upper()
+        if not symbol:
+            raise SystemExit("[ERROR] Ticker symbol cannot be empty.")
+        if not is_valid_ticker(symbol):
+            raise SystemExit(f"[ERROR] '{symbol}' is not a recognized ticker or has no data.")
+
+    if not start_date:
+        start_date = input("Enter start date (YYYY-MM-DD): ").strip()
+    if not end_date:
+        end_date = input("Enter end date (YYYY-MM-DD): ").strip()
     return symbol, start_date, end_date
 
 
-def main() -> None:
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Download, validate, and save daily OHLCV data (prompts for missing values)."
+    )
+    parser.add_argument("--symbol", help="Ticker symbol, e.g. NVDA.")
+    parser.add_argument("--start", help="Start date YYYY-MM-DD.")
+    parser.add_argument("--end", help="End date YYYY-MM-DD.")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="Target CSV (default: data/SYMBOL_end_start.csv).",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = build_parser().parse_args(argv)
     print("=== Stock Data Downloader ===")
-    symbol, start_date, end_date = prompt_user_inputs()
+    symbol = args.symbol.strip().upper() if args.symbol else None
+    symbol, start_date, end_date = prompt_user_inputs(symbol, args.start, args.end)
 
     data = download_stock_data(symbol, start_date, end_date)
     validation_result = validate_ohlc_data(data)
 
     if validation_result is True:
-        output_path = build_output_filename(symbol, start_date, end_date)
+        output_path = args.output or build_output_filename(symbol, start_date, end_date)
         save_data(data, output_path)
         print(f"✓ Saved {len(data)} {symbol} rows to {output_path.name}")
     else:
@@ -0,0 +1,80 @@
+"""
+Run the warm backtest server (JSON-RPC over a unix socket).
+
+Datasets and indicators stay in memory between requests, so research tools can
+query backtests without paying interpreter start-up, CSV parsing, or indicator
+computation per call. See ``backtester/server.py`` for the protocol and
+``BacktestClient`` for a Python client.
+
+Example:
+    cd python
+    python scripts/backtest_server.py --socket /tmp/backtest.sock --workers 4
+    python scripts/backtest_server.py --store ../results/backtests.sqlite
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+from pathlib import Path
+from typing import List, Optional
+
+import sys
+
+PYTHON_DIR = Path(__file__).resolve().parents[1]
+if str(PYTHON_DIR) not in sys.path:
+    sys.path.insert(0, str(PYTHON_DIR))
+
+DEFAULT_SOCKET = Path(tempfile.gettempdir()) / "backtest-server.sock"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Serve SimpleBacktest requests from a long-lived process.")
+    parser.add_argument(
+        "--socket",
+        type=Path,
+        default=DEFAULT_SOCKET,
+        help=f"Unix socket path to listen on (default: {DEFAULT_SOCKET}).",
+    )
+    parser.add_argument(
+        "--store",
+        type=Path,
+        help="Optional SQLite results store used to memoize runs across restarts.",
+    )
+    parser.add_argument("--workers", type=int, default=4, help="Threads serving single backtests (default: 4).")
+    parser.add_argument(
+        "--sweep-workers",
+        type=int,
+        default=1,
+        help="Threads reserved for grid sweeps so they never block single backtests (default: 1).",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.workers < 1 or args.sweep_workers < 1:
+        raise SystemExit("--workers and --sweep-workers must be at least 1.")
+    import asyncio
+
+    from backtester.server import BacktestServer
+
+    server = BacktestServer(
+        args.socket.expanduser(),
+        store_path=args.store.expanduser().resolve() if args.store else None,
+        workers=args.workers,
+        sweep_workers=args.sweep_workers,
+    )
+    print(f"✓ Backtest server listening on {server.socket_path} ({args.workers} worker(s))")
+    try:
+        asyncio.run(server.serve_forever())
+    except RuntimeError as exc:
+        raise SystemExit(str(exc)) from exc
+    except KeyboardInterrupt:
+        server.close()
+    print("✓ Backtest server stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Benchmark the path-dependent kernels on the Python and numba backends.
+
+Times every kernel in ``backtester.kernels`` on a synthetic random-walk
+series (or a CSV), checks that both backends return identical arrays, and
+prints the warm runtime per backend, the speedup, and the first-call time
+for numba (compilation, or loading from the on-disk cache).
+
+Example:
+    cd python
+    python scripts/benchmark_kernels.py --bars 200000 --strategies 8
+    python scripts/benchmark_kernels.py --data ../data/SPY.csv --repeats 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+import sys
+
+PYTHON_DIR = Path(__file__).resolve().parents[1]
+if str(PYTHON_DIR) not in sys.path:
+    sys.path.insert(0, str(PYTHON_DIR))
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+Case = Tuple[Callable[..., Any], Tuple[Any, ...], Dict[str, Any]]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark path-dependent kernels (Python vs numba).")
+    parser.add_argument("--data", type=Path, help="OHLCV CSV to benchmark on (default: synthetic bars).")
+    parser.add_argument("--bars", type=int, default=100_000, help="Synthetic bars (default: 100000).")
+    parser.add_argument(
+        "--strategies",
+        type=int,
+        default=4,
+        help="Strategies simulated together by simulate_strategies (default: 4).",
+    )
+    parser.add_argument("--repeats", type=int, default=5, help="Timed repetitions per kernel (default: 5).")
+    parser.add_argument("--seed", type=int, default=7, help="Seed for the synthetic series.")
+    return parser
+
+
+def synthetic_frame(bars: int, seed: int) -> pd.DataFrame:
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, bars)))
+    open_ = np.concatenate([[close[0]], close[:-1]]) * (1 + rng.normal(0, 0.002, bars))
+    spread = np.abs(rng.normal(0, 0.006, bars)) * close
+    return pd.DataFrame(
+        {
+            "Date": pd.date_range("2000-01-03", periods=bars, freq="B"),
+            "Open": open_,
+            "High": np.maximum(open_, close) + spread,
+            "Low": np.minimum(open_, close) - spread,
+            "Close": close,
+        }
+    )
+
+
+def build_cases(frame: pd.DataFrame, strategies: int) -> Dict[str, Case]:
+    import numpy as np
+
+    from backtester import indicators, kernels
+    from backtester.indicators import IndicatorStore
+
+    store = IndicatorStore(frame)
+    get = store.get
+    close = get(indicators.CLOSE)
+    upper_channel, lower_channel = indicators.donchian(20)
+    mid, upper, lower = indicators.bollinger_bands(20, 2.0)
+    rsi = get(indicators.rsi(14))
+    atr = get(indicators.atr(14))
+
+    rows = []
+    for index in range(strategies):
+        fast = get(indicators.sma(indicators.CLOSE, 10 + 5 * index))
+        slow = get(indicators.sma(indicators.CLOSE, 50 + 10 * index))
+        rows.append(np.where(np.isnan(fast) | np.isnan(slow), 0, np.where(fast > slow, 1, -1)))
+    signals = np.vstack(rows).astype(np.int8)
+    shape = (strategies, len(close))
+    return {
+        "donchian_positions": (
+            kernels.donchian_positions,
+            (get(upper_channel), get(lower_channel), close, True),
+            {},
+        ),
+        "rsi_bollinger_positions": (
+            kernels.rsi_bollinger_positions,
+            (close, rsi, get(mid), get(lower), get(upper), 25.0, 55.0, 75.0, 45.0, True),
+            {},
+        ),
+        "pairs_positions": (
+            kernels.pairs_positions,
+            ((close - get(mid)) / (get(upper) - get(mid)) * 2.0, 2.0, 0.5, 3.5),
+            {},
+        ),
+        "sliding_max": (kernels.sliding_max, (close, 252), {}),
+        "simulate_strategies": (
+            kernels.simulate_strategies,
+            (close, signals),
+            {
+                "initial_capital": np.full(strategies, 10_000.0),
+                "position_size": np.ones(strategies, dtype=np.int64),
+                "allow_short": np.arange(strategies) % 2 == 0,
+                "atr": np.broadcast_to(atr, shape),
+                "atr_multiplier": np.linspace(1.5, 4.0, strategies),
+                "rsi": np.broadcast_to(rsi, shape),
+                "rsi_threshold": np.full(strategies, 70.0),
+                "opens": get(indicators.OPEN),
+                "highs": get(indicators.HIGH),
+                "lows": get(indicators.LOW),
+                "intrabar": np.arange(strategies) % 2 == 1,
+            },
+        ),
+    }
+
+
+def best_time(case: Case, repeats: int) -> Tuple[float, Any]:
+    func, args, kwargs = case
+    best = float("inf")
+    result = None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def same_output(left: Any, right: Any) -> bool:
+    import numpy as np
+
+    if isinstance(left, tuple):
+        return all(same_output(a, b) for a, b in zip(left, right))
+    return bool(np.array_equal(left, right, equal_nan=left.dtype.kind == "f"))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    from backtester import kernels
+    from backtester.dataset import read_ohlcv_csv
+
+    if args.data is not None:
+        data_path = args.data.expanduser().resolve()
+        if not data_path.exists():
+            raise SystemExit(f"Input CSV not found: {data_path}")
+        frame = read_ohlcv_csv(data_path)
+        missing = {"Open", "High", "Low"} - set(frame.columns)
+        if missing:
+            raise SystemExit(f"Benchmark needs Open/High/Low columns; missing {sorted(missing)}")
+    else:
+        frame = synthetic_frame(args.bars, args.seed)
+    cases = build_cases(frame, args.strategies)
+    has_numba = kernels.numba_available()
+    print(f"✓ {len(frame):,} bars, {args.strategies} strategies, numba {'available' if has_numba else 'not installed'}")
+
+    header = f"{'Kernel':<26}{'Python ms':>11}{'numba ms':>11}{'Speedup':>9}{'1st call s':>12}  Match"
+    print(header)
+    print("-" * len(header))
+    for name, case in cases.items():
+        kernels.set_backend("python")
+        python_time, python_result = best_time(case, args.repeats)
+        if not has_numba:
+            print(f"{name:<26}{python_time * 1000:>11.2f}{'-':>11}{'-':>9}{'-':>12}  -")
+            continue
+        kernels.set_backend("numba")
+        first_call, _ = best_time(case, 1)
+        numba_time, numba_result = best_time(case, args.repeats)
+        match = "yes" if same_output(python_result, numba_result) else "NO"
+        print(
+            f"{name:<26}{python_time * 1000:>11.2f}{numba_time * 1000:>11.2f}"
+            f"{python_time / numba_time:>8.1f}x{first_call:>12.2f}  {match}"
+        )
+    if not has_numba:
+        print("Install numba to compare against the JIT backend: pip install numba")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Build an ML feature matrix, forward-return labels, and purged splits for a universe.
+
+Computes every indicator family in ``backtester.features`` over its window
+grid for each symbol and writes the stacked float32 matrix to a ``.npy``
+memmap, one symbol at a time, so large universes never sit in memory. Next
+to it go ``<stem>_labels.npy`` (forward returns per horizon),
+``<stem>_times.npy``, ``<stem>_symbols.npy``, and ``<stem>.json``
+(column names, grid, horizons, symbols). ``--splits N`` also saves
+walk-forward (or ``--kfold``) train/test row indices to ``<stem>_splits.npz``.
+
+Example:
+    cd python
+    python scripts/build_features.py --data ../data/universe --horizons 1 5 20
+    python scripts/build_features.py --data ../data/SPY.csv ../data/QQQ.csv \\
+        --grid configs/feature_grid.json --splits 5 --embargo 5 --output ../results/features/spy_qqq.npy
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import sys
+
+PYTHON_DIR = Path(__file__).resolve().parents[1]
+if str(PYTHON_DIR) not in sys.path:
+    sys.path.insert(0, str(PYTHON_DIR))
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_OUTPUT = REPO_ROOT / "results" / "features" / "features.npy"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Build a feature matrix with labels and purged splits.")
+    parser.add_argument("--data", type=Path, nargs="+", required=True, help="OHLCV CSVs and/or directories of CSVs.")
+    parser.add_argument("--grid", type=Path, help="JSON object of FeatureGrid fields (default: built-in grid).")
+    parser.add_argument("--horizons", type=int, nargs="+", default=[1, 5], help="Label horizons in bars (default: 1 5).")
+    parser.add_argument(
+        "--raw",
+        action="store_true",
+        help="Keep price-level features (MAs, ATR, MACD) in price units instead of relative to the close.",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=DEFAULT_OUTPUT,
+        help="Feature matrix .npy path; sidecar files use its stem (default: results/features/features.npy).",
+    )
+    parser.add_argument("--splits", type=int, default=0, help="Train/test splits to save (default: none).")
+    parser.add_argument("--embargo", type=int, default=0, help="Extra bars kept out of training after each purged test block (k-fold).")
+    parser.add_argument("--kfold", action="store_true", help="Purged k-fold instead of walk-forward splits.")
+    return parser
+
+
+def expand_paths(entries: List[Path]) -> List[Path]:
+    paths: List[Path] = []
+    for entry in entries:
+        entry = entry.expanduser().resolve()
+        if entry.is_dir():
+            paths.extend(sorted(entry.glob("*.csv")))
+        elif entry.exists():
+            paths.append(entry)
+        else:
+            raise SystemExit(f"Input not found: {entry}")
+    if not paths:
+        raise SystemExit("No CSV files found in the given inputs.")
+    return paths
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    import numpy as np
+
+    from backtester.features import FeatureGrid, build_universe
+
+    try:
+        grid = FeatureGrid.from_dict(json.loads(args.grid.read_text())) if args.grid else FeatureGrid()
+    except (OSError, ValueError, TypeError) as exc:
+        raise SystemExit(f"Invalid feature grid: {exc}") from exc
+    paths = expand_paths(args.data)
+    output = args.output.expanduser().resolve()
+    if output.suffix != ".npy":
+        raise SystemExit("--output must be a .npy path.")
+
+    started = time.perf_counter()
+    try:
+        features = build_universe(paths, grid, args.horizons, relative=not args.raw, path=output)
+    except (FileNotFoundError, ValueError) as exc:
+        raise SystemExit(f"Failed to build features: {exc}") from exc
+    rows, width = features.matrix.shape
+    print(
+        f"✓ Built {rows:,} rows x {width} features for {len(features.symbol_names)} symbol(s) "
+        f"in {time.perf_counter() - started:.2f}s"
+    )
+
+    stem = output.with_suffix("")
+    np.save(f"{stem}_labels.npy", features.labels)
+    np.save(f"{stem}_times.npy", features.times)
+    np.save(f"{stem}_symbols.npy", features.symbols)
+    valid = features.valid_rows()
+    meta = {
+        "rows": rows,
+        "valid_rows": int(valid.sum()),
+        "features": features.names,
+        "horizons": features.horizons,
+        "symbols": features.symbol_names,
+        "relative": not args.raw,
+        "grid": dict(vars(grid)),
+    }
+    Path(f"{stem}.json").write_text(json.dumps(meta, indent=2))
+    print(f"✓ Saved matrix to {output} ({int(valid.sum()):,} rows complete after warm-up and label tails)")
+
+    if args.splits:
+        try:
+            splits = features.splits(args.splits, embargo=args.embargo, expanding=not args.kfold)
+        except ValueError as exc:
+            raise SystemExit(f"Cannot split: {exc}") from exc
+        arrays = {}
+        for index, (train, test) in enumerate(splits):
+            # Only rows with complete features and labels are worth handing to a model.
+            train, test = train[valid[train]], test[valid[test]]
+            arrays[f"train_{index}"], arrays[f"test_{index}"] = train, test
+            print(f"  split {index}: train {len(train):,} rows, test {len(test):,} rows")
+        np.savez(f"{stem}_splits.npz", **arrays)
+        print(f"✓ Saved {len(splits)} {'k-fold' if args.kfold else 'walk-forward'} split(s) to {stem}_splits.npz")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Single entry point for the backtesting tools.
+
+Each subcommand forwards its remaining arguments to the matching script's
+``main(argv)``. Scripts are imported only when their subcommand runs, and they
+import pandas/numpy/matplotlib inside ``main``, so ``--help`` and argument errors
+return without loading the scientific stack.
+
+Example:
+    cd python
+    python scripts/cli.py backtest --config configs/btc_rsi_bollinger_noshort.json
+    python scripts/cli.py compare --config configs/week2_spy_runs.json
+    python scripts/cli.py download --symbol SPY --start 2020-01-01 --end 2024-12-31
+    python scripts/cli.py validate ../data/SPY.csv
+    python scripts/cli.py plot --input ../results/week1/trades.csv
+    python scripts/cli.py serve --socket /tmp/backtest.sock
+    python scripts/cli.py import-budget
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import re
+import subprocess
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import sys
+
+PYTHON_DIR = Path(__file__).resolve().parents[1]
+SCRIPTS_DIR = Path(__file__).resolve().parent
+for path in (PYTHON_DIR, SCRIPTS_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+# subcommand -> (module providing main(argv), help text)
+COMMANDS: Dict[str, Tuple[str, str]] = {
+    "backtest": ("test_backtest", "Run a single SimpleBacktest configuration."),
+    "compare": ("compare_configs", "Compare several configurations from a JSON file."),
+    "compare-ma": ("compare_ma_types", "Compare SMA/EMA/WMA/WEMA crossovers."),
+    "sensitivity": ("sensitivity", "Two-parameter sensitivity heatmaps."),
+    "multi": ("multi_strategy", "Run several strategies over one symbol in a single pass."),
+    "xsec": ("cross_sectional", "Cross-sectional momentum over a symbol universe."),
+    "pairs": ("pairs", "Pairs-trading backtest or pair screening over a universe."),
+    "features": ("build_features", "Build an ML feature matrix with labels and purged splits."),
+    "queue": ("sweep_queue", "Publish, work on, and collect a sweep over a work queue."),
+    "monte-carlo": ("monte_carlo", "Monte Carlo confidence intervals for one backtest."),
+    "query": ("query_results", "Query the SQLite results store."),
+    "serve": ("backtest_server", "Run the warm backtest server on a unix socket."),
+    "download": ("data_utils.stock_data", "Download OHLCV data from Yahoo Finance."),
+    "plot": ("plot_results", "Plot cumulative PnL from a trades CSV."),
+    "bench-kernels": ("benchmark_kernels", "Benchmark path-dependent kernels (Python vs numba)."),
+}
+
+# Modules that must not be loaded just to start the CLI or print help.
+HEAVY_MODULES = ["pandas", "numpy", "matplotlib", "yfinance"]
+# Wall-clock budget (ms) for `cli.py --help` and `cli.py <command> --help`.
+IMPORT_BUDGET_MS = 150.0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Backtesting toolkit entry point.")
+    subparsers = parser.add_subparsers(dest="command", metavar="command", required=True)
+    for name, (_, help_text) in COMMANDS.items():
+        # Arguments (including --help) are parsed by the target script itself.
+        subparsers.add_parser(name, help=help_text, add_help=False)
+    validate = subparsers.add_parser("validate", help="Validate OHLCV CSV files.")
+    validate.add_argument("csv_files", type=Path, nargs="+", help="CSV files to validate.")
+    budget = subparsers.add_parser("import-budget", help="Measure CLI start-up against the import budget.")
+    budget.add_argument(
+        "--budget-ms",
+        type=float,
+        default=IMPORT_BUDGET_MS,
+        help=f"Maximum wall time per --help invocation (default: {IMPORT_BUDGET_MS:.0f}ms).",
+    )
+    budget.add_argument("--repeat", type=int, default=3, help="Runs per command; the fastest is kept.")
+    return parser
+
+
+def run_validate(args: argparse.Namespace) -> None:
+    import pandas as pd
+
+    from data_utils.stock_data import validate_ohlc_data
+
+    failed = 0
+    for csv_file in args.csv_files:
+        path = csv_file.expanduser().resolve()
+        if not path.exists():
+            print(f"✗ {path}: file not found")
+            failed += 1
+            continue
+        result = validate_ohlc_data(pd.read_csv(path))
+        if result is True:
+            print(f"✓ {path.name}: valid")
+        else:
+            failed += 1
+            print(f"✗ {path.name}: {len(result)} error(s)")
+            for error in result:
+                print(f"    - {error}")
+    if failed:
+        raise SystemExit(1)
+
+
+def measure_startup(argv: List[str], repeat: int) -> Tuple[float, float, List[str]]:
+    """
+    Run ``cli.py <argv>`` under ``-X importtime``.
+
+    Returns the fastest wall time (ms), the cumulative import time (ms) of that
+    run, and any heavy modules it imported.
+    """
+    best: Optional[Tuple[float, float, List[str]]] = None
+    command = [sys.executable, "-X", "importtime", str(Path(__file__).resolve()), *argv]
+    for _ in range(max(repeat, 1)):
+        started = time.perf_counter()
+        completed = subprocess.run(command, capture_output=True, text=True)
+        wall_ms = (time.perf_counter() - started) * 1000
+        if completed.returncode != 0:
+            raise SystemExit(f"'{' '.join(argv)}' failed:\n{completed.stderr}")
+        import_us = 0
+        loaded = set()
+        for line in completed.stderr.splitlines():
+            match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)", line)
+            if not match:
+                continue
+            if len(match.group(2)) == 1:
+                import_us += int(match.group(1))  # top-level imports only
+            loaded.add(match.group(3).split(".")[0])
+        heavy = [name for name in HEAVY_MODULES if name in loaded]
+        if best is None or wall_ms < best[0]:
+            best = (wall_ms, import_us / 1000, heavy)
+    return best
+
+
+def run_import_budget(args: argparse.Namespace) -> None:
+    invocations = [["--help"]] + [[name, "--help"] for name in COMMANDS]
+    over_budget = 0
+    print(f"{'Invocation':<28} {'Wall (ms)':>10} {'Imports (ms)':>13}  Heavy modules")
+    for argv in invocations:
+        wall_ms, import_ms, heavy = measure_startup(argv, args.repeat)
+        ok = wall_ms <= args.budget_ms and not heavy
+        over_budget += not ok
+        marker = "✓" if ok else "✗"
+        print(f"{marker} {' '.join(argv):<26} {wall_ms:>10.1f} {import_ms:>13.1f}  {', '.join(heavy) or '-'}")
+    if over_budget:
+        raise SystemExit(f"{over_budget} invocation(s) exceeded the {args.budget_ms:.0f}ms import budget.")
+    print(f"✓ All invocations within the {args.budget_ms:.0f}ms import budget")
+
+
+HANDLERS: Dict[str, Callable[[argparse.Namespace], None]] = {
+    "validate": run_validate,
+    "import-budget": run_import_budget,
+}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = build_parser()
+    args, remaining = parser.parse_known_args(argv)
+    if args.command in COMMANDS:
+        module = importlib.import_module(COMMANDS[args.command][0])
+        module.main(remaining)
+        return
+    if remaining:
+        parser.error(f"unrecognized arguments: {' '.join(remaining)}")
+    HANDLERS[args.command](args)
+
+
+if __name__ == "__main__":
+    main()
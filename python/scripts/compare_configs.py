@@ -3,20 +3,59 @@ Compare arbitrary SimpleBacktest configurations and export a summary plus
 combined equity curve plot. Useful for Week 2 experiments that mix different
 moving-average windows or indicator types.
 
+The config is either a list of run definitions or a sweep spec (ranges,
+products, zips, conditionals, and constraints; see ``backtester.sweep``).
+Sweeps expand lazily, invalid combinations are skipped before any data is
+loaded, and ``--shard i/n`` runs every n-th config so n machines can split
+one sweep.
+
+Results stream to disk as runs finish. Summary rows go to the CSV (sorted
+by label once the sweep completes), equity curves go to a float32 spill
+directory (``backtester.spill``), and rolling metrics go to a float32 spill
+inside it that is converted to their long CSV once at the end. Memory therefore stays flat however many runs there are, and a crash keeps
+everything finished so far. The plots show the best ``--plot-top`` runs by
+``--rank-by``.
+
+Every finished run is also journaled to a checkpoint (``backtester.checkpoint``).
+Rerunning the same command after a crash or Ctrl-C skips the journaled runs
+and continues where it stopped. ``--workers N`` runs backtests in N processes;
+by default they get one lane each, planned by ``backtester.scheduler`` so
+each dataset and its indicators stay in as few workers as possible. Cache
+hit rates are reported at the end.
+
+While it runs, a throughput line (runs/s, bars/s, queue depth, worker
+utilization, and the slowest stages' p50/p95 latency) is printed every
+``--progress-interval`` seconds. ``--metrics-file`` keeps the same numbers,
+with full per-stage latency histograms, in a Prometheus text file, and the
+final totals go to ``<summary stem>_telemetry.json`` (``backtester.telemetry``).
+
+Plotted curves are reduced to about one point per pixel column by a
+shape-preserving downsampler (``--downsample lttb|minmax``), and the equity
+and rolling figures render headless in parallel processes
+(``backtester.plotting``).
+
 Example:
     cd python
     python scripts/compare_configs.py --config configs/week2_spy_runs.json
+    python scripts/compare_configs.py --config configs/week2_spy_runs.json --rolling-window 126
+    python scripts/compare_configs.py --config configs/spy_ma_sweep.json --dry-run
+    python scripts/compare_configs.py --config configs/spy_ma_sweep.json --shard 0/4 --label spy_sweep_0
+    python scripts/compare_configs.py --config configs/spy_ma_sweep.json --plot-top 10 --rank-by total_return
+    python scripts/compare_configs.py --config configs/spy_ma_sweep.json --workers 8   # rerun to resume
+    python scripts/compare_configs.py --config configs/spy_ma_sweep.json --workers 8 --metrics-file ../results/sweep.prom
 """
 
 from __future__ import annotations
 
 import argparse
+import csv
+import heapq
 import json
+import os
+import time
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Any, Dict, List
-
-import matplotlib.pyplot as plt
-import pandas as pd
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional
 
 import sys
 
@@ -24,9 +63,37 @@ PYTHON_DIR = Path(__file__).resolve().parents[1]
 if str(PYTHON_DIR) not in sys.path:
     sys.path.insert(0, str(PYTHON_DIR))
 
-from backtester.simple_backtest import SimpleBacktest
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from backtester.checkpoint import Checkpoint
+    from backtester.dataset import Dataset
+    from backtester.result_store import ResultStore
+    from backtester.scheduler import LanePool
+    from backtester.spill import CurveSpill
+    from backtester.plotting import FigureSpec
+    from backtester.sweep import Sweep
+    from backtester.telemetry import StageTimer, Telemetry
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_STORE = REPO_ROOT / "results" / "backtests.sqlite"
+SUMMARY_COLUMNS = [
+    "label",
+    "strategy",
+    "moving_average",
+    "fast_window",
+    "slow_window",
+    "initial_capital",
+    "final_capital",
+    "total_trades",
+    "winning_trades",
+    "losing_trades",
+    "win_rate",
+    "total_return",
+    "max_drawdown",
+    "sharpe_ratio",
+]
+RANK_COLUMNS = ["sharpe_ratio", "total_return", "final_capital", "max_drawdown", "win_rate"]
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -35,7 +102,17 @@ def build_parser() -> argparse.ArgumentParser:
         "--config",
         type=Path,
         required=True,
-        help="JSON file describing a list of run configurations.",
+        help="JSON file with a list of run configurations or a sweep spec.",
+    )
+    parser.add_argument(
+        "--shard",
+        type=str,
+        help="Run only shard i of n (0-based, e.g. 0/4): every n-th valid config starting at i.",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Expand and validate the configs, print the count and the first few, and exit.",
     )
     parser.add_argument(
         "--label",
@@ -52,21 +129,145 @@ def build_parser() -> argparse.ArgumentParser:
         type=Path,
         help="Override path for combined equity curve PNG.",
     )
+    parser.add_argument(
+        "--rolling-window",
+        type=int,
+        help="Also plot and export rolling Sharpe/return/drawdown/win rate over this many bars.",
+    )
+    parser.add_argument(
+        "--trade-window",
+        type=int,
+        default=20,
+        help="Trades in the rolling win rate used with --rolling-window (default: 20).",
+    )
+    parser.add_argument(
+        "--rolling-plot",
+        type=Path,
+        help="Override path for the rolling metrics PNG (the CSV is written next to it).",
+    )
+    parser.add_argument(
+        "--plot-top",
+        type=int,
+        default=20,
+        help="Plot only the best N runs; every run is still in the summary CSV (default: 20).",
+    )
+    parser.add_argument(
+        "--rank-by",
+        choices=RANK_COLUMNS,
+        default="sharpe_ratio",
+        help="Metric that picks the plotted runs, higher is better (default: sharpe_ratio).",
+    )
+    parser.add_argument(
+        "--downsample",
+        choices=["lttb", "minmax", "none"],
+        default="lttb",
+        help="Shape-preserving reduction applied to each plotted curve (default: lttb).",
+    )
+    parser.add_argument(
+        "--plot-points",
+        type=int,
+        help="Points kept per plotted curve (default: the figure's pixel width, twice that for minmax).",
+    )
+    parser.add_argument(
+        "--plot-workers",
+        type=int,
+        help="Processes rendering the figures in parallel (default: one per figure).",
+    )
+    parser.add_argument(
+        "--spill-dir",
+        type=Path,
+        help="Directory for the on-disk equity curves (default: <summary stem>_curves next to the summary).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes running backtests (default: 1, in-process).",
+    )
+    parser.add_argument(
+        "--schedule",
+        choices=["auto", "none", "locality"],
+        default="auto",
+        help="Run order: 'locality' groups runs by dataset and indicators into one lane per worker, "
+        "'none' deals config order round-robin; 'auto' uses locality with --workers > 1 (default: auto).",
+    )
+    parser.add_argument(
+        "--schedule-window",
+        type=int,
+        default=20_000,
+        help="Runs planned at a time with --schedule locality (default: 20000).",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        help="Journal of finished runs used to resume (default: <summary stem>.journal next to the summary).",
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore an existing checkpoint and start the comparison over.",
+    )
+    parser.add_argument(
+        "--progress-interval",
+        type=float,
+        default=5.0,
+        help="Seconds between throughput lines (runs/s, bars/s, queue depth, utilization, stage latency); "
+        "0 turns them off (default: 5).",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        type=Path,
+        help="Prometheus text file rewritten with the live throughput metrics (e.g. for a textfile collector).",
+    )
+    parser.add_argument(
+        "--telemetry-json",
+        type=Path,
+        help="Final throughput and stage-latency summary (default: <summary stem>_telemetry.json next to the summary).",
+    )
+    parser.add_argument(
+        "--store",
+        type=Path,
+        nargs="?",
+        const=DEFAULT_STORE,
+        help="Opt-in SQLite results store used to skip runs already executed "
+        "(bare --store: results/backtests.sqlite; default: off).",
+    )
     return parser
 
 
-def load_config(path: Path) -> List[Dict[str, Any]]:
+def load_config(path: Path) -> Sweep:
+    from backtester.sweep import Sweep
+
     if not path.exists():
         raise SystemExit(f"Config file not found: {path}")
     try:
         data = json.loads(path.read_text())
     except json.JSONDecodeError as exc:
         raise SystemExit(f"Failed to parse config JSON: {exc}") from exc
-    if not isinstance(data, list) or not all(isinstance(item, dict) for item in data):
-        raise SystemExit("Config JSON must be a list of run definitions.")
-    if not data:
+    if isinstance(data, list) and not data:
         raise SystemExit("Config file is empty—add at least one run definition.")
-    return data
+    try:
+        sweep = Sweep.from_json(data)
+    except ValueError as exc:
+        raise SystemExit(f"Invalid config: {exc}") from exc
+    return sweep
+
+
+def iter_runs(sweep: Sweep, shard: Optional[tuple[int, int]]) -> Iterator[Dict[str, Any]]:
+    try:
+        yield from sweep.configs(shard=shard)
+    except ValueError as exc:
+        raise SystemExit(f"Invalid config: {exc}") from exc
+
+
+def report_sweep(sweep: Sweep) -> None:
+    stats = sweep.stats
+    print(
+        f"✓ Sweep: {stats['valid']:,} valid config(s), {stats['pruned']:,} pruned by constraints, "
+        f"{stats['invalid']:,} rejected by SimpleBacktest"
+    )
+    for run, error in sweep.rejections[:3]:
+        print(f"  Rejected {run}: {error}")
 
 
 def resolve_path(value: str | Path) -> Path:
@@ -76,44 +277,219 @@ def resolve_path(value: str | Path) -> Path:
     return path
 
 
-def run_backtest(run_config: Dict[str, Any]) -> tuple[Dict[str, Any], pd.Series]:
-    config = run_config.copy()
-    label = config.pop("label", None)
-    csv_file = config.pop("csv_file", None)
+def run_data_path(run_config: Dict[str, Any]) -> Path:
+    csv_file = run_config.get("csv_file")
     if not csv_file:
-        raise SystemExit(f"Run {label or config} missing 'csv_file'.")
-
+        raise SystemExit(f"Run {run_config.get('label') or run_config} missing 'csv_file'.")
     data_path = resolve_path(csv_file)
     if not data_path.exists():
         raise SystemExit(f"Data file not found: {data_path}")
+    return data_path
+
+
+def run_backtest(
+    run_config: Dict[str, Any],
+    store: Optional[ResultStore] = None,
+    dataset: Optional[Dataset] = None,
+    rolling_window: Optional[int] = None,
+    trade_window: int = 20,
+    timer: Optional[StageTimer] = None,
+) -> tuple[Dict[str, Any], pd.Series, Optional[pd.DataFrame]]:
+    from backtester.simple_backtest import SimpleBacktest
+    from backtester.telemetry import StageTimer
+
+    timer = timer if timer is not None else StageTimer()
+    data_path = run_data_path(run_config)
+    config = run_config.copy()
+    label = config.pop("label", None)
+    config.pop("csv_file", None)
 
     # Instantiate backtest with remaining parameters.
     backtest = SimpleBacktest(str(data_path), **config)
-    backtest.load_data()
-    backtest.calculate_indicators()
-    backtest.generate_signals()
-    backtest.run()
-
-    results = backtest.get_results().copy()
-    total_pnl = sum(trade.pnl for trade in backtest.trades)
-    record = {
-        "label": label or data_path.stem,
-        "strategy": backtest.strategy,
-        "moving_average": backtest.moving_average,
-        "fast_window": backtest.fast_window,
-        "slow_window": backtest.slow_window,
-        "initial_capital": backtest.initial_capital,
-        "final_capital": backtest.initial_capital + total_pnl,
-    }
-    record.update(results)
-    return record, backtest.get_equity_curve()
-
-
-def main() -> None:
+    if store is not None:
+        # A store hit skips the whole pipeline, so it is timed as one stage.
+        with timer("store"):
+            store.run_cached(backtest, label=label or data_path.stem, dataset=dataset)
+    else:
+        with timer("load"):
+            backtest.load_data(dataset)
+        with timer("indicators"):
+            backtest.calculate_indicators()
+        with timer("signals"):
+            backtest.generate_signals()
+        with timer("simulate"):
+            backtest.run()
+
+    with timer("metrics"):
+        results = backtest.get_results().copy()
+        total_pnl = sum(trade.pnl for trade in backtest.trades)
+        record = {
+            "label": label or data_path.stem,
+            "strategy": backtest.strategy,
+            "moving_average": backtest.moving_average,
+            "fast_window": backtest.fast_window,
+            "slow_window": backtest.slow_window,
+            "initial_capital": backtest.initial_capital,
+            "final_capital": backtest.initial_capital + total_pnl,
+        }
+        record.update(results)
+        rolling = backtest.get_rolling_metrics(rolling_window, trade_window) if rolling_window else None
+    return record, backtest.get_equity_curve(), rolling
+
+
+# Per-process dataset cache and result store, shared by every run a process executes.
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def execute_run(
+    task: tuple[Dict[str, Any], Optional[Path], Optional[int], int],
+) -> tuple[Dict[str, Any], pd.Series, Optional[pd.DataFrame], Dict[str, Any]]:
+    """
+    Run one config in this process (the main process or a pool worker).
+
+    Returns the summary record, equity curve, rolling metrics, and run
+    telemetry: ``{"bars": ..., "busy": seconds, "stages": {stage: seconds}}``.
+    """
+    from backtester.dataset import DatasetCache
+    from backtester.result_store import ResultStore
+    from backtester.telemetry import StageTimer
+
+    started = time.perf_counter()
+    timer = StageTimer()
+    run, store_path, rolling_window, trade_window = task
+    datasets = _WORKER_STATE.setdefault("datasets", DatasetCache())
+    store = None
+    if store_path is not None:
+        store = _WORKER_STATE.get("store")
+        if store is None:
+            store = _WORKER_STATE["store"] = ResultStore(store_path)
+    with timer("dataset"):
+        dataset = datasets.get(run_data_path(run))
+    record, curve, rolling = run_backtest(run, store, dataset, rolling_window, trade_window, timer)
+    stats = {"bars": len(curve), "busy": time.perf_counter() - started, "stages": timer.timings}
+    return record, curve, rolling, stats
+
+
+def close_worker_state() -> None:
+    store = _WORKER_STATE.pop("store", None)
+    if store is not None:
+        store.close()
+    _WORKER_STATE.pop("datasets", None)
+
+
+def cache_stats() -> Dict[str, int]:
+    """This process's dataset/indicator/signal cache counters."""
+    datasets = _WORKER_STATE.get("datasets")
+    return datasets.stats() if datasets is not None else {}
+
+
+def windows(items: Iterator[Any], size: int) -> Iterator[List[Any]]:
+    """Consecutive lists of up to ``size`` items, so a lazy sweep is scheduled a window at a time."""
+    window: List[Any] = []
+    for item in items:
+        window.append(item)
+        if len(window) >= size:
+            yield window
+            window = []
+    if window:
+        yield window
+
+
+def report_cache(
+    worker_stats: List[Dict[str, int]], lanes: Optional[List[float]], pool: Optional[LanePool]
+) -> Dict[str, float]:
+    """Print cache hit rates and lane balance; returns the cache totals."""
+    from backtester.scheduler import hit_rates
+
+    totals = hit_rates(worker_stats)
+    print(
+        f"✓ Cache: {int(totals.get('datasets_loaded', 0))} dataset load(s) across {len(worker_stats)} worker(s); "
+        f"indicator hit rate {totals['indicators_hit_rate']:.1f}% "
+        f"({int(totals.get('indicators_reused', 0)):,} reused / {int(totals.get('indicators_computed', 0)):,} computed), "
+        f"signal hit rate {totals['signals_hit_rate']:.1f}%"
+    )
+    if pool is None:
+        return totals
+    balance = ""
+    if lanes is not None and sum(lanes):
+        balance = f"estimated max/mean lane cost {max(lanes) / (sum(lanes) / len(lanes)):.2f}, "
+    print(f"  Lanes: {balance}{pool.steals} run(s) stolen by idle workers")
+    for index, stats in enumerate(worker_stats):
+        print(
+            f"  worker {index}: {stats.get('datasets_loaded', 0)} dataset(s), "
+            f"{stats.get('indicators_computed', 0):,} indicator(s) computed, {stats.get('indicators_reused', 0):,} reused"
+        )
+    return totals
+
+
+def write_telemetry(telemetry: Telemetry, path: Path, cache: Optional[Dict[str, float]] = None) -> None:
+    """Final metrics file and summary JSON; prints the overall throughput."""
+    if telemetry.metrics_path is not None:
+        telemetry.tick(force=True)
+    report = telemetry.summary()
+    if cache is not None:
+        report["cache"] = cache
+    path.write_text(json.dumps(report, indent=2) + "\n")
+    print(
+        f"✓ Throughput: {report['runs']:,} run(s) in {report['elapsed_s']:.1f}s "
+        f"({report['runs_per_second']:.1f} runs/s, {report['bars_per_second']:,.0f} bars/s, "
+        f"{report['worker_utilization'] * 100:.0f}% worker utilization); telemetry saved to {path}"
+    )
+
+
+def restore_outputs(checkpoint: Checkpoint, summary_path: Path, top: TopRuns, rank_by: str) -> None:
+    """Rewrite the summary to exactly the checkpointed runs and reseed the top-k."""
+    temporary = summary_path.with_suffix(".tmp")
+    with open(temporary, "w", newline="") as handle:
+        summary = csv.DictWriter(handle, fieldnames=SUMMARY_COLUMNS, extrasaction="ignore")
+        summary.writeheader()
+        for _, metrics in checkpoint.payloads():
+            summary.writerow(metrics)
+            top.push(metrics.get(rank_by), metrics["label"])
+    os.replace(temporary, summary_path)
+
+
+def sort_summary(summary_path: Path) -> List[str]:
+    """Rewrite the summary sorted by label, so its row order does not depend on completion order."""
+    import pandas as pd
+
+    frame = pd.read_csv(summary_path, dtype={"label": str}).sort_values("label", kind="stable")
+    temporary = summary_path.with_suffix(".tmp")
+    frame.to_csv(temporary, index=False)
+    os.replace(temporary, summary_path)
+    return frame["label"].tolist()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
     parser = build_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    from backtester.checkpoint import Checkpoint, fingerprint, run_key, run_resumable
+    from backtester.scheduler import LanePool, ScheduledRun, describe_run, lane_costs, plan_lanes
+    from backtester.spill import CurveSpill
+    from backtester.plotting import FigureSpec, Panel, render_all
+    from backtester.sweep import parse_shard
+    from backtester.telemetry import Telemetry
 
-    runs = load_config(args.config.expanduser().resolve())
+    sweep = load_config(args.config.expanduser().resolve())
+    try:
+        shard = parse_shard(args.shard) if args.shard else None
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from exc
+    if args.dry_run:
+        preview = []
+        for run in iter_runs(sweep, shard):
+            if len(preview) < 10:
+                preview.append(run)
+        report_sweep(sweep)
+        total = sweep.stats["valid"] if shard is None else len(range(shard[0], sweep.stats["valid"], shard[1]))
+        print(f"✓ {total:,} run(s) in this shard" if shard else f"✓ {total:,} run(s)")
+        for run in preview:
+            print(f"  {run}")
+        return
+    if args.plot_top < 1:
+        raise SystemExit("--plot-top must be >= 1.")
+    if (args.plot_points is not None and args.plot_points < 3) or (args.plot_workers is not None and args.plot_workers < 1):
+        raise SystemExit("--plot-points must be >= 3 and --plot-workers >= 1.")
     label = args.label or args.config.stem
     summary_path = (
         args.summary_csv.expanduser().resolve()
@@ -125,53 +501,226 @@ def main() -> None:
         if args.equity_plot
         else REPO_ROOT / "results" / "week2" / "comparisons" / f"{label}_equity_curve.png"
     )
+    rolling_plot_path = (
+        args.rolling_plot.expanduser().resolve()
+        if args.rolling_plot
+        else REPO_ROOT / "results" / "week2" / "comparisons" / f"{label}_rolling.png"
+    )
+    spill_dir = (
+        args.spill_dir.expanduser().resolve()
+        if args.spill_dir
+        else summary_path.with_name(f"{summary_path.stem}_curves")
+    )
+    rolling_csv_path = rolling_plot_path.with_suffix(".csv")
+    checkpoint_path = (
+        args.checkpoint.expanduser().resolve()
+        if args.checkpoint
+        else summary_path.with_name(f"{summary_path.stem}.journal")
+    )
+    telemetry_path = (
+        args.telemetry_json.expanduser().resolve()
+        if args.telemetry_json
+        else summary_path.with_name(f"{summary_path.stem}_telemetry.json")
+    )
+    metrics_path = args.metrics_file.expanduser().resolve() if args.metrics_file else None
+    if args.workers < 1 or args.schedule_window < 1:
+        raise SystemExit("--workers and --schedule-window must be at least 1.")
+    schedule = args.schedule if args.schedule != "auto" else ("locality" if args.workers > 1 else "none")
+    if args.rolling_window is not None and (args.rolling_window < 2 or args.trade_window < 1):
+        raise SystemExit("--rolling-window must be >= 2 and --trade-window >= 1.")
     summary_path.parent.mkdir(parents=True, exist_ok=True)
     equity_plot_path.parent.mkdir(parents=True, exist_ok=True)
+    if args.rolling_window is not None:
+        rolling_csv_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Runs are consumed straight from the lazy sweep. The dataset cache parses
+    # each CSV once and computes indicators shared by several runs (same name
+    # and parameters) once per file, whatever order the runs arrive in. Each
+    # finished run is written out immediately: its summary row to the CSV, its
+    # equity curve to the spill, its rolling metrics to the rolling spill.
+    # Only the top --plot-top (score, label) pairs stay in memory. The run is
+    # journaled last, after its spilled outputs are fsynced, so on resume every
+    # output is trimmed back to the journal and no journaled curve is missing.
+    try:
+        checkpoint = Checkpoint(
+            checkpoint_path,
+            fingerprint(args.config.expanduser().resolve().read_text(), args.shard, args.rolling_window, args.trade_window),
+            resume=not args.restart,
+        )
+    except ValueError as exc:
+        raise SystemExit(f"{exc} (pass --restart)") from exc
+    top = TopRuns(args.plot_top)
+    resumed = len(checkpoint)
+    if resumed:
+        restore_outputs(checkpoint, summary_path, top, args.rank_by)
+        print(f"✓ Resuming: {resumed:,} run(s) already checkpointed in {checkpoint_path}")
+    store_path = args.store.expanduser().resolve() if args.store else None
+    rolling_spill_dir = spill_dir / "rolling"
+    with checkpoint, open(summary_path, "a" if resumed else "w", newline="") as summary_file, CurveSpill(
+        spill_dir, reset=not resumed
+    ) as spill, (
+        CurveSpill(rolling_spill_dir, reset=not resumed) if args.rolling_window is not None else nullcontext()
+    ) as rolling_spill:
+        summary = csv.DictWriter(summary_file, fieldnames=SUMMARY_COLUMNS, extrasaction="ignore")
+        if not resumed:
+            summary.writeheader()
+
+        pool = LanePool(args.workers) if args.workers > 1 else None
+        telemetry = Telemetry(
+            workers=args.workers,
+            labels={"sweep": label},
+            metrics_path=metrics_path,
+            interval=args.progress_interval if args.progress_interval > 0 else 5.0,
+            printer=print if args.progress_interval > 0 else None,
+            depth=pool.depth if pool is not None else None,
+        )
+
+        def write_outputs(key: str, task: Any, output: tuple) -> Dict[str, Any]:
+            metrics, curve, rolling, stats = output
+            telemetry.record_run(stats["bars"], stats["stages"], busy=stats["busy"])
+            started = time.perf_counter()
+            summary.writerow(metrics)
+            summary_file.flush()
+            spill.append(metrics["label"], curve)
+            spill.sync()
+            if rolling is not None:
+                rolling_spill.append(metrics["label"], rolling)
+                rolling_spill.sync()
+            top.push(metrics.get(args.rank_by), metrics["label"])
+            telemetry.observe("write", time.perf_counter() - started)
+            print(f"✓ Completed {metrics['label']} ({metrics['moving_average'].upper()} {metrics['fast_window']}/{metrics['slow_window']})")
+            telemetry.tick()
+            return {name: value.item() if hasattr(value, "item") else value for name, value in metrics.items()}
+
+        tasks = ((run_key(run), (run, store_path, args.rolling_window, args.trade_window)) for run in iter_runs(sweep, shard))
+        lanes = [0.0] * args.workers
+        try:
+            if pool is None and schedule == "none":
+                run_resumable(tasks, execute_run, checkpoint, write_outputs)
+            else:
+                resident = pool.resident if pool is not None else [set()]
+                for window in windows(tasks, args.schedule_window):
+                    pending = [(key, task) for key, task in window if key not in checkpoint]
+                    if schedule == "locality":
+                        runs = [describe_run(key, task, task[0], str(run_data_path(task[0]))) for key, task in pending]
+                        planned = plan_lanes(runs, len(resident), resident)
+                        lanes = [total + cost for total, cost in zip(lanes, lane_costs(planned))]
+                    else:
+                        # Config order dealt round-robin, like a plain process pool.
+                        runs = [ScheduledRun(key, task, "", (), 1.0) for key, task in pending]
+                        planned = [runs[index :: len(resident)] for index in range(len(resident))]
+                    if pool is not None:
+                        pool.run(planned, execute_run, checkpoint, write_outputs)
+                    else:
+                        run_resumable(((run.key, run.task) for run in planned[0]), execute_run, checkpoint, write_outputs)
+            worker_stats = pool.worker_stats(cache_stats) if pool is not None else [cache_stats()]
+        except KeyboardInterrupt:
+            write_telemetry(telemetry, telemetry_path)
+            raise SystemExit(
+                f"Interrupted: {len(checkpoint):,} run(s) checkpointed in {checkpoint_path}; "
+                "rerun the same command to resume."
+            ) from None
+        finally:
+            if pool is not None:
+                pool.close()
+            close_worker_state()
+        completed = len(checkpoint)
+    report_sweep(sweep)
+    if not completed:
+        raise SystemExit("No valid runs to compare.")
+    cache = report_cache(worker_stats, lanes if schedule == "locality" else None, pool)
+    write_telemetry(telemetry, telemetry_path, cache)
+    labels = sort_summary(summary_path)
+    print(f"✓ Summary of {completed:,} run(s) saved to {summary_path}")
+    print(f"✓ Equity curves spilled to {spill_dir}; checkpoint at {checkpoint_path}")
+
+    best = top.labels()
+    shown = f"top {len(best)} of {completed:,} by {args.rank_by}" if completed > len(best) else "all runs"
+    with CurveSpill(spill_dir) as spill:
+        # A curve whose spill write a crash cut short is missing from the repaired index.
+        equity_curves = {run_label: spill.curve(run_label) for run_label in best if run_label in spill.entries}
+    if args.rolling_window is not None:
+        with CurveSpill(rolling_spill_dir) as rolling_spill:
+            write_rolling_csv(rolling_spill, rolling_csv_path, labels)
+            rolling_frames = {
+                run_label: rolling_spill.curve(run_label) for run_label in best if run_label in rolling_spill.entries
+            }
+    figures = [
+        FigureSpec(
+            equity_plot_path,
+            [Panel(equity_curves, ylabel="Equity ($)")],
+            title=f"Equity Curve Comparison - {label} ({shown})",
+        )
+    ]
+    if args.rolling_window is not None:
+        figures.append(rolling_figure(rolling_frames, args.rolling_window, label, rolling_plot_path))
+    render_all(figures, args.plot_points, args.downsample, args.plot_workers)
+    print(f"✓ Combined equity curves ({shown}) saved to {equity_plot_path}")
+    if args.rolling_window is not None:
+        print(f"✓ Rolling metrics saved to {rolling_plot_path} and {rolling_csv_path}")
+
+
+class TopRuns:
+    """The ``size`` best (score, label) pairs seen so far; NaN or missing scores rank last."""
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._heap: List[tuple[float, int, str]] = []
+        self._seen = 0
+
+    def push(self, score: Optional[float], run_label: str) -> None:
+        value = float("-inf") if score is None or score != score else float(score)
+        item = (value, -self._seen, run_label)  # ties keep the earlier run
+        self._seen += 1
+        if len(self._heap) < self.size:
+            heapq.heappush(self._heap, item)
+        elif item > self._heap[0]:
+            heapq.heapreplace(self._heap, item)
+
+    def labels(self) -> List[str]:
+        """Best first."""
+        return [run_label for _, _, run_label in sorted(self._heap, reverse=True)]
+
+
+def write_rolling_csv(rolling_spill: CurveSpill, csv_path: Path, labels: List[str]) -> None:
+    """Convert the spilled rolling frames of ``labels`` to one long CSV, in label order."""
+    temporary = csv_path.with_suffix(".tmp")
+    with open(temporary, "w", newline="") as handle:
+        header = True
+        for run_label in labels:
+            if run_label not in rolling_spill.entries:
+                continue
+            rows = rolling_spill.curve(run_label).rename_axis("Date").reset_index()
+            rows.insert(0, "label", run_label)
+            rows.to_csv(handle, header=header, index=False)
+            header = False
+    os.replace(temporary, csv_path)
+
+
+ROLLING_PANELS = [
+    ("rolling_sharpe", "Sharpe"),
+    ("rolling_return", "Return (%)"),
+    ("rolling_max_drawdown", "Max Drawdown (%)"),
+    ("rolling_win_rate", "Win Rate (%)"),
+]
+
+
+def rolling_figure(rolling_frames: Dict[str, pd.DataFrame], window: int, label: str, plot_path: Path) -> FigureSpec:
+    """Stacked rolling Sharpe/return/drawdown/win rate panels, one line per run."""
+    from backtester.plotting import FigureSpec, Panel
 
-    records: List[Dict[str, Any]] = []
-    equity_curves: Dict[str, pd.Series] = {}
-
-    for run in runs:
-        metrics, curve = run_backtest(run)
-        records.append(metrics)
-        equity_curves[metrics["label"]] = curve
-        print(f"✓ Completed {metrics['label']} ({metrics['moving_average'].upper()} {metrics['fast_window']}/{metrics['slow_window']})")
-
-    df = pd.DataFrame(records)
-    columns = [
-        "label",
-        "strategy",
-        "moving_average",
-        "fast_window",
-        "slow_window",
-        "initial_capital",
-        "final_capital",
-        "total_trades",
-        "winning_trades",
-        "losing_trades",
-        "win_rate",
-        "total_return",
-        "max_drawdown",
-        "sharpe_ratio",
+    panels = [
+        Panel(
+            {run_label: frame[column] for run_label, frame in rolling_frames.items()},
+            ylabel=title,
+            linewidth=1.2,
+            hline=0.0 if index == 0 else None,
+            legend=index == 0,
+            legend_fontsize=8,
+        )
+        for index, (column, title) in enumerate(ROLLING_PANELS)
     ]
-    df = df[columns]
-    df.sort_values("label", inplace=True)
-    df.to_csv(summary_path, index=False)
-    print(f"✓ Summary saved to {summary_path}")
-
-    plt.figure(figsize=(12, 6))
-    for run_label, series in equity_curves.items():
-        series = series.sort_index()
-        plt.plot(series.index, series.values, label=run_label, linewidth=1.8)
-    plt.title(f"Equity Curve Comparison - {label}")
-    plt.xlabel("Date")
-    plt.ylabel("Equity ($)")
-    plt.grid(True, linestyle="--", alpha=0.4)
-    plt.legend()
-    plt.tight_layout()
-    plt.savefig(equity_plot_path, dpi=150)
-    plt.close()
-    print(f"✓ Combined equity curves saved to {equity_plot_path}")
+    return FigureSpec(plot_path, panels, title=f"Rolling {window}-bar Metrics - {label}", figsize=(12, 11))
 
 
 if __name__ == "__main__":
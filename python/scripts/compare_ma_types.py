@@ -1,6 +1,9 @@
 """
 Compare multiple moving-average crossover variants on a single dataset.
 
+Equity curves are downsampled to the plot's pixel width before drawing
+(``--downsample lttb|minmax|none``), so long intraday runs plot quickly.
+
 Example:
     cd python
     python scripts/compare_ma_types.py --data ../data/AAPL.csv
@@ -10,18 +13,18 @@ from __future__ import annotations
 
 import argparse
 from pathlib import Path
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, List, Optional
 
 import sys
 
-import matplotlib.pyplot as plt
-import pandas as pd
-
 PYTHON_DIR = Path(__file__).resolve().parents[1]
 if str(PYTHON_DIR) not in sys.path:
     sys.path.insert(0, str(PYTHON_DIR))
 
-from backtester.simple_backtest import SimpleBacktest
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from backtester.dataset import Dataset
 
 MA_CHOICES = ["sma", "ema", "wma", "wema"]
 COLOR_MAP = {
@@ -86,6 +89,17 @@ def build_parser() -> argparse.ArgumentParser:
         type=str,
         help="Custom label used for output filenames (default: data filename stem).",
     )
+    parser.add_argument(
+        "--downsample",
+        choices=["lttb", "minmax", "none"],
+        default="lttb",
+        help="Shape-preserving reduction applied to each plotted curve (default: lttb).",
+    )
+    parser.add_argument(
+        "--plot-points",
+        type=int,
+        help="Points kept per plotted curve (default: the figure's pixel width, twice that for minmax).",
+    )
     return parser
 
 
@@ -96,7 +110,10 @@ def run_backtest(
     position_size: int,
     fast_window: int,
     slow_window: int,
+    dataset: Optional[Dataset] = None,
 ) -> tuple[Dict[str, float], pd.Series]:
+    from backtester.simple_backtest import SimpleBacktest
+
     backtest = SimpleBacktest(
         str(data_path),
         initial_capital=capital,
@@ -105,7 +122,7 @@ def run_backtest(
         fast_window=fast_window,
         slow_window=slow_window,
     )
-    backtest.load_data()
+    backtest.load_data(dataset)
     backtest.calculate_indicators()
     backtest.generate_signals()
     backtest.run()
@@ -124,10 +141,16 @@ def run_backtest(
     return results, backtest.get_equity_curve()
 
 
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> None:
     parser = build_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    import pandas as pd
 
+    from backtester.dataset import Dataset
+    from backtester.plotting import FigureSpec, Panel, render_all
+
+    if args.plot_points is not None and args.plot_points < 3:
+        raise SystemExit("--plot-points must be >= 3.")
     data_path = args.data.expanduser().resolve()
     if not data_path.exists():
         raise SystemExit(f"Input CSV not found: {data_path}")
@@ -150,6 +173,8 @@ def main() -> None:
     records: List[Dict[str, float]] = []
     equity_curves: Dict[str, pd.Series] = {}
 
+    # Parse the CSV once and share it across every MA variant.
+    dataset = Dataset(data_path)
     for ma in args.ma_types:
         print(f"Running {ma.upper()} crossover...")
         metrics, curve = run_backtest(
@@ -159,6 +184,7 @@ def main() -> None:
             args.position_size,
             args.fast_window,
             args.slow_window,
+            dataset,
         )
         records.append(metrics)
         equity_curves[ma.upper()] = curve
@@ -183,24 +209,13 @@ def main() -> None:
     df.to_csv(summary_path, index=False)
     print(f"✓ Summary saved to {summary_path}")
 
-    plt.figure(figsize=(12, 6))
-    for ma_label, series in equity_curves.items():
-        series = series.sort_index()
-        plt.plot(
-            series.index,
-            series.values,
-            label=ma_label,
-            linewidth=1.8,
-            color=COLOR_MAP.get(ma_label.lower(), None),
-        )
-    plt.title(f"Equity Curve Comparison - {label} ({args.fast_window}/{args.slow_window})")
-    plt.xlabel("Date")
-    plt.ylabel("Equity ($)")
-    plt.grid(True, linestyle="--", alpha=0.4)
-    plt.legend()
-    plt.tight_layout()
-    plt.savefig(equity_plot_path, dpi=150)
-    plt.close()
+    colors = {ma_label: COLOR_MAP[ma_label.lower()] for ma_label in equity_curves if ma_label.lower() in COLOR_MAP}
+    figure = FigureSpec(
+        equity_plot_path,
+        [Panel(equity_curves, ylabel="Equity ($)", colors=colors)],
+        title=f"Equity Curve Comparison - {label} ({args.fast_window}/{args.slow_window})",
+    )
+    render_all([figure], args.plot_points, args.downsample)
     print(f"✓ Equity curves saved to {equity_plot_path}")
 
 
@@ -0,0 +1,170 @@
+"""
+Cross-sectional momentum over a universe of symbols.
+
+Loads one OHLCV CSV per symbol (files or directories of CSVs), ranks the
+universe by lookback or volatility-adjusted momentum on every rebalance, and
+holds the top-k long and optionally the bottom-k short. Prints the metrics
+and timings and saves the equity curve and the per-rebalance holdings.
+``--synthetic`` builds a random-walk universe instead, to check throughput.
+
+Example:
+    cd python
+    python scripts/cross_sectional.py --data ../data/universe --lookback 252 --skip 21 --top-k 20
+    python scripts/cross_sectional.py --data ../data/universe --ranking vol_adjusted \\
+        --top-k 10 --bottom-k 10 --trend-window 200 --rebalance-every 5 --cost-bps 5
+    python scripts/cross_sectional.py --synthetic 1000 --bars 5040 --top-k 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional
+
+import sys
+
+PYTHON_DIR = Path(__file__).resolve().parents[1]
+if str(PYTHON_DIR) not in sys.path:
+    sys.path.insert(0, str(PYTHON_DIR))
+
+if TYPE_CHECKING:
+    from backtester.cross_sectional import Panel
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_OUTPUT_DIR = REPO_ROOT / "results" / "cross_sectional"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Cross-sectional momentum over a symbol universe.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--data", type=Path, nargs="+", help="OHLCV CSVs and/or directories of CSVs, one per symbol.")
+    source.add_argument("--synthetic", type=int, metavar="SYMBOLS", help="Use a random-walk universe of this size.")
+    parser.add_argument("--bars", type=int, default=5040, help="Bars per synthetic symbol (default: 5040).")
+    parser.add_argument("--seed", type=int, default=7, help="Seed for the synthetic universe.")
+    parser.add_argument("--lookback", type=int, default=126, help="Momentum lookback in bars (default: 126).")
+    parser.add_argument("--skip", type=int, default=0, help="Most recent bars excluded from the lookback (default: 0).")
+    parser.add_argument(
+        "--ranking",
+        choices=["return", "vol_adjusted"],
+        default="return",
+        help="Rank by lookback return or return / daily volatility (default: return).",
+    )
+    parser.add_argument("--vol-window", type=int, default=63, help="Volatility window for vol_adjusted (default: 63).")
+    parser.add_argument("--top-k", type=int, default=10, help="Symbols held long (default: 10).")
+    parser.add_argument("--bottom-k", type=int, default=0, help="Symbols held short (default: 0).")
+    parser.add_argument("--rebalance-every", type=int, default=1, help="Bars between rebalances (default: 1).")
+    parser.add_argument("--trend-window", type=int, help="Only long above / short below this moving average.")
+    parser.add_argument(
+        "--moving-average",
+        choices=["sma", "ema", "wma", "wema"],
+        default="sma",
+        help="Moving average used by the trend filter (default: sma).",
+    )
+    parser.add_argument("--atr-period", type=int, default=14, help="ATR window for --max-atr-pct (default: 14).")
+    parser.add_argument("--max-atr-pct", type=float, help="Skip symbols whose ATR / Close exceeds this fraction.")
+    parser.add_argument("--cost-bps", type=float, default=0.0, help="Cost on traded notional in bps (default: 0).")
+    parser.add_argument("--initial-capital", type=float, default=100_000.0, help="Starting equity (default: 100000).")
+    parser.add_argument(
+        "--precision",
+        choices=["float64", "float32"],
+        default="float64",
+        help="Floating-point precision for the panel and indicators (default: float64).",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=DEFAULT_OUTPUT_DIR,
+        help="Directory for the equity and holdings CSVs (default: results/cross_sectional).",
+    )
+    parser.add_argument("--label", type=str, help="Prefix for output files (default: universe name).")
+    return parser
+
+
+def expand_paths(entries: List[Path]) -> List[Path]:
+    paths: List[Path] = []
+    for entry in entries:
+        entry = entry.expanduser().resolve()
+        if entry.is_dir():
+            paths.extend(sorted(entry.glob("*.csv")))
+        elif entry.exists():
+            paths.append(entry)
+        else:
+            raise SystemExit(f"Input not found: {entry}")
+    if not paths:
+        raise SystemExit("No CSV files found in the given inputs.")
+    return paths
+
+
+def synthetic_panel(symbols: int, bars: int, seed: int) -> Panel:
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0002, 0.02, (bars, symbols)), axis=0))
+    spread = np.abs(rng.normal(0, 0.01, (bars, symbols))) * close
+    dates = pd.date_range("2000-01-03", periods=bars, freq="B")
+    names = [f"SYM{index:04d}" for index in range(symbols)]
+    fields = {"Close": close, "High": close + spread, "Low": close - spread}
+    return {field: pd.DataFrame(values, index=dates, columns=names) for field, values in fields.items()}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    from backtester.cross_sectional import PANEL_FIELDS, CrossSectionalMomentum, load_panel
+
+    started = time.perf_counter()
+    if args.synthetic is not None:
+        panel = synthetic_panel(args.synthetic, args.bars, args.seed)
+        default_label = f"synthetic_{args.synthetic}"
+    else:
+        paths = expand_paths(args.data)
+        fields = ["Close"] if args.max_atr_pct is None else list(PANEL_FIELDS)
+        try:
+            panel = load_panel(paths, fields)
+        except (FileNotFoundError, ValueError) as exc:
+            raise SystemExit(f"Failed to load universe: {exc}") from exc
+        default_label = args.data[0].expanduser().resolve().stem
+    close = panel["Close"]
+    print(f"✓ Loaded {close.shape[1]:,} symbols x {close.shape[0]:,} bars in {time.perf_counter() - started:.2f}s")
+
+    try:
+        strategy = CrossSectionalMomentum(
+            panel,
+            lookback=args.lookback,
+            skip=args.skip,
+            ranking=args.ranking,
+            vol_window=args.vol_window,
+            top_k=args.top_k,
+            bottom_k=args.bottom_k,
+            rebalance_every=args.rebalance_every,
+            trend_window=args.trend_window,
+            moving_average=args.moving_average,
+            atr_period=args.atr_period,
+            max_atr_pct=args.max_atr_pct,
+            cost_bps=args.cost_bps,
+            initial_capital=args.initial_capital,
+            precision=args.precision,
+        )
+    except ValueError as exc:
+        raise SystemExit(f"Invalid configuration: {exc}") from exc
+    started = time.perf_counter()
+    strategy.run()
+    print(f"✓ Ranked and simulated {len(strategy.rebalance_rows):,} rebalances in {time.perf_counter() - started:.2f}s")
+    for name, value in strategy.get_results().items():
+        print(f"  {name:<14}{value}")
+
+    label = args.label or default_label
+    output_dir = args.output_dir.expanduser().resolve()
+    output_dir.mkdir(parents=True, exist_ok=True)
+    equity_path = output_dir / f"{label}_equity.csv"
+    strategy.get_equity_curve().to_csv(equity_path, index_label="Date")
+    holdings_path = output_dir / f"{label}_holdings.csv"
+    strategy.get_holdings().to_csv(holdings_path, index=False)
+    print(f"✓ Equity curve saved to {equity_path}")
+    print(f"✓ Holdings saved to {holdings_path}")
+
+
+if __name__ == "__main__":
+    main()
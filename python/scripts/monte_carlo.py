@@ -0,0 +1,146 @@
+"""
+Monte Carlo confidence intervals for a single SimpleBacktest configuration.
+
+Runs the backtest once, resamples its per-bar returns or trade PnL into many
+paths (shuffle, i.i.d. bootstrap, or stationary block bootstrap), prints the
+metric percentiles, and saves the per-path distribution plus histograms.
+
+Example:
+    cd python
+    python scripts/monte_carlo.py --data ../data/SPY.csv --param strategy=macd \\
+        --paths 100000 --method block --block-length 20 --seed 7 --workers 4
+    python scripts/monte_carlo.py --data ../data/BTC.csv --config run.json --source trades --method shuffle
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import sys
+
+PYTHON_DIR = Path(__file__).resolve().parents[1]
+SCRIPTS_DIR = Path(__file__).resolve().parent
+for path in (PYTHON_DIR, SCRIPTS_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from sensitivity import load_base_params
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_OUTPUT_DIR = REPO_ROOT / "results" / "monte_carlo"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Monte Carlo robustness analysis for one backtest.")
+    parser.add_argument("--data", type=Path, required=True, help="Path to OHLCV CSV.")
+    parser.add_argument(
+        "--param",
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="SimpleBacktest parameter (repeatable).",
+    )
+    parser.add_argument(
+        "--config",
+        type=Path,
+        help="Optional JSON object of SimpleBacktest parameters (--param overrides it).",
+    )
+    parser.add_argument("--paths", type=int, default=10_000, help="Number of resampled paths (default: 10000).")
+    parser.add_argument(
+        "--method",
+        choices=["shuffle", "bootstrap", "block"],
+        default="bootstrap",
+        help="Resampling method (default: bootstrap).",
+    )
+    parser.add_argument(
+        "--source",
+        choices=["returns", "trades"],
+        default="returns",
+        help="Resample per-bar returns or trade PnL (default: returns).",
+    )
+    parser.add_argument(
+        "--block-length",
+        type=float,
+        default=20.0,
+        help="Mean block length for --method block (default: 20).",
+    )
+    parser.add_argument("--seed", type=int, help="Seed for reproducible paths.")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (default: 1).")
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=DEFAULT_OUTPUT_DIR,
+        help="Directory for the distribution CSV and histograms (default: results/monte_carlo).",
+    )
+    parser.add_argument("--label", type=str, help="Prefix for output files (default: <data stem>_<method>).")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    import matplotlib.pyplot as plt
+
+    from backtester.monte_carlo import MC_METRICS, monte_carlo
+    from backtester.simple_backtest import SimpleBacktest
+
+    data_path = args.data.expanduser().resolve()
+    if not data_path.exists():
+        raise SystemExit(f"Input CSV not found: {data_path}")
+    params = load_base_params(args)
+    try:
+        backtest = SimpleBacktest(str(data_path), **params)
+    except (TypeError, ValueError) as exc:
+        raise SystemExit(f"Invalid backtest configuration: {exc}") from exc
+    backtest.load_data()
+    backtest.calculate_indicators()
+    backtest.generate_signals()
+    backtest.run()
+
+    started = time.perf_counter()
+    try:
+        result = monte_carlo(
+            backtest,
+            n_paths=args.paths,
+            method=args.method,
+            source=args.source,
+            block_length=args.block_length,
+            seed=args.seed,
+            workers=args.workers,
+        )
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from exc
+    print(f"✓ Simulated {args.paths:,} paths in {time.perf_counter() - started:.2f}s")
+    print(result.to_text())
+
+    label = args.label or f"{data_path.stem}_{args.method}"
+    output_dir = args.output_dir.expanduser().resolve()
+    output_dir.mkdir(parents=True, exist_ok=True)
+    summary_path = output_dir / f"{label}_summary.csv"
+    result.summary().to_csv(summary_path, index=False)
+    paths_path = output_dir / f"{label}_paths.csv"
+    result.to_frame().to_csv(paths_path, index=False)
+    print(f"✓ Summary saved to {summary_path}")
+    print(f"✓ Per-path metrics saved to {paths_path}")
+
+    fig, axes = plt.subplots(1, len(MC_METRICS), figsize=(15, 4.5))
+    for ax, metric in zip(axes, MC_METRICS):
+        low, high = result.confidence_interval(metric, 0.90)
+        ax.hist(result.metrics[metric], bins=60, color="steelblue", alpha=0.8)
+        ax.axvline(result.observed[metric], color="black", linewidth=1.5, label="observed")
+        ax.axvspan(low, high, color="orange", alpha=0.15, label="90% interval")
+        ax.set_title(metric.replace("_", " ").title())
+        ax.legend(fontsize=8)
+    fig.suptitle(f"Monte Carlo ({args.method} on {args.source}) - {label}")
+    fig.tight_layout()
+    plot_path = output_dir / f"{label}_histograms.png"
+    fig.savefig(plot_path, dpi=150)
+    plt.close(fig)
+    print(f"✓ Histograms saved to {plot_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Run several strategies side by side over one symbol with a single data pass.
+
+The CSV is loaded once, the union of indicators is computed once, and every
+strategy advances through the same bar walk with its own book and trade
+ledger. Prints per-strategy and combined metrics and saves them as CSV along
+with the per-strategy and combined equity curves.
+
+Example:
+    cd python
+    python scripts/multi_strategy.py --data ../data/SPY.csv
+    python scripts/multi_strategy.py --data ../data/SPY.csv --strategies ma_crossover,macd
+    python scripts/multi_strategy.py --data ../data/BTC.csv --config configs/multi.json --timeframe W
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import sys
+
+PYTHON_DIR = Path(__file__).resolve().parents[1]
+if str(PYTHON_DIR) not in sys.path:
+    sys.path.insert(0, str(PYTHON_DIR))
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_OUTPUT_DIR = REPO_ROOT / "results" / "multi_strategy"
+DEFAULT_STRATEGIES = ["ma_crossover", "macd", "donchian", "rsi_bollinger"]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Run several strategies over one symbol in a single pass.")
+    parser.add_argument("--data", type=Path, required=True, help="Path to OHLCV CSV.")
+    parser.add_argument(
+        "--strategies",
+        type=str,
+        default=",".join(DEFAULT_STRATEGIES),
+        help="Comma-separated strategies run with default parameters (default: all four).",
+    )
+    parser.add_argument(
+        "--config",
+        type=Path,
+        help='JSON object of name -> SimpleBacktest parameters, e.g. {"fast_ma": {"fast_window": 10}}; '
+        "replaces --strategies.",
+    )
+    parser.add_argument(
+        "--precision",
+        choices=["float64", "float32"],
+        default="float64",
+        help="Floating-point precision for all strategies (default: float64).",
+    )
+    parser.add_argument("--timeframe", type=str, help="Resample bars to this pandas frequency first (e.g. W).")
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=DEFAULT_OUTPUT_DIR,
+        help="Directory for the summary and equity CSVs (default: results/multi_strategy).",
+    )
+    parser.add_argument("--label", type=str, help="Prefix for output files (default: data stem).")
+    return parser
+
+
+def load_strategies(args: argparse.Namespace) -> Dict[str, Dict[str, Any]]:
+    if args.config is None:
+        names = [name.strip() for name in args.strategies.split(",") if name.strip()]
+        if not names:
+            raise SystemExit("No strategies given.")
+        return {name: {"strategy": name} for name in names}
+    path = args.config.expanduser().resolve()
+    if not path.exists():
+        raise SystemExit(f"Config file not found: {path}")
+    try:
+        data = json.loads(path.read_text())
+    except json.JSONDecodeError as exc:
+        raise SystemExit(f"Failed to parse config JSON: {exc}") from exc
+    if not isinstance(data, dict) or not data or not all(isinstance(value, dict) for value in data.values()):
+        raise SystemExit("Config JSON must be a non-empty object of name -> parameter objects.")
+    return data
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    import pandas as pd
+
+    from backtester.multi_strategy import MultiStrategyBacktest
+
+    data_path = args.data.expanduser().resolve()
+    if not data_path.exists():
+        raise SystemExit(f"Input CSV not found: {data_path}")
+    strategies = load_strategies(args)
+    try:
+        runner = MultiStrategyBacktest(
+            str(data_path), strategies, precision=args.precision, timeframe=args.timeframe
+        )
+    except (TypeError, ValueError) as exc:
+        raise SystemExit(f"Invalid backtest configuration: {exc}") from exc
+    runner.run()
+    bars = len(next(iter(runner.backtests.values())).data)
+    print(f"✓ Ran {len(strategies)} strategies over {bars:,} bars in one pass")
+
+    summary = runner.summary()
+    columns = ["name", "strategy", "total_trades", "win_rate", "total_return", "max_drawdown", "sharpe_ratio"]
+    print(summary[columns].to_string(index=False))
+
+    label = args.label or data_path.stem
+    output_dir = args.output_dir.expanduser().resolve()
+    output_dir.mkdir(parents=True, exist_ok=True)
+    summary_path = output_dir / f"{label}_summary.csv"
+    summary.to_csv(summary_path, index=False)
+    equity = pd.concat(
+        {name: backtest.get_equity_curve() for name, backtest in runner.backtests.items()}, axis=1
+    )
+    equity["combined"] = runner.get_combined_equity_curve()
+    equity_path = output_dir / f"{label}_equity.csv"
+    equity.to_csv(equity_path, index_label="Date")
+    print(f"✓ Summary saved to {summary_path}")
+    print(f"✓ Equity curves saved to {equity_path}")
+
+
+if __name__ == "__main__":
+    main()
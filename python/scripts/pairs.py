@@ -0,0 +1,171 @@
+"""
+Pairs trading: backtest one spread or screen a universe for candidate pairs.
+
+``--pair Y.csv X.csv`` trades the z-score of ``Y - beta * X`` with a rolling
+hedge ratio and saves the equity curve, the per-bar spread/z-score, and the
+trades. ``--screen`` scores every pair in a set of CSVs (files or
+directories) by return correlation, spread half-life, mean crossings, and
+how often |z| reaches the entry level. ``--backtest-top N`` then backtests the
+N best candidates with the same rules.
+
+Example:
+    cd python
+    python scripts/pairs.py --pair ../data/KO.csv ../data/PEP.csv --window 60 --entry-z 2 --exit-z 0.5
+    python scripts/pairs.py --screen ../data/universe --min-correlation 0.6 --max-half-life 30 --backtest-top 5
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import sys
+
+PYTHON_DIR = Path(__file__).resolve().parents[1]
+SCRIPTS_DIR = Path(__file__).resolve().parent
+for path in (PYTHON_DIR, SCRIPTS_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from cross_sectional import expand_paths
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_OUTPUT_DIR = REPO_ROOT / "results" / "pairs"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Pairs trading backtest and pair screening.")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--pair", type=Path, nargs=2, metavar=("Y_CSV", "X_CSV"), help="Backtest Y against hedge X.")
+    mode.add_argument("--screen", type=Path, nargs="+", help="CSVs and/or directories of CSVs to screen.")
+    parser.add_argument("--window", type=int, default=60, help="Hedge-ratio regression window (default: 60).")
+    parser.add_argument("--z-window", type=int, help="Spread z-score window (default: --window).")
+    parser.add_argument("--entry-z", type=float, default=2.0, help="Entry |z| (default: 2.0).")
+    parser.add_argument("--exit-z", type=float, default=0.5, help="Exit |z| (default: 0.5).")
+    parser.add_argument("--stop-z", type=float, help="Optional stop-out |z|.")
+    parser.add_argument("--log-prices", action="store_true", help="Regress log prices instead of prices.")
+    parser.add_argument("--position-size", type=int, default=100, help="Shares of Y per trade (default: 100).")
+    parser.add_argument("--initial-capital", type=float, default=10_000.0, help="Starting cash (default: 10000).")
+    parser.add_argument(
+        "--min-correlation",
+        type=float,
+        default=0.5,
+        help="Screen: minimum correlation of daily log returns (default: 0.5).",
+    )
+    parser.add_argument("--max-half-life", type=float, help="Screen: maximum spread half-life in bars.")
+    parser.add_argument("--top", type=int, default=20, help="Screen: candidates to print (default: 20).")
+    parser.add_argument("--backtest-top", type=int, default=0, help="Screen: backtest the N best candidates.")
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=DEFAULT_OUTPUT_DIR,
+        help="Directory for output CSVs (default: results/pairs).",
+    )
+    parser.add_argument("--label", type=str, help="Prefix for output files.")
+    return parser
+
+
+def backtest_params(args: argparse.Namespace) -> Dict[str, Any]:
+    return {
+        "window": args.window,
+        "z_window": args.z_window,
+        "entry_z": args.entry_z,
+        "exit_z": args.exit_z,
+        "stop_z": args.stop_z,
+        "log_prices": args.log_prices,
+        "position_size": args.position_size,
+        "initial_capital": args.initial_capital,
+    }
+
+
+def run_pair(args: argparse.Namespace, output_dir: Path) -> None:
+    from backtester.pairs import PairsBacktest
+
+    y_path, x_path = (path.expanduser().resolve() for path in args.pair)
+    for path in (y_path, x_path):
+        if not path.exists():
+            raise SystemExit(f"Input CSV not found: {path}")
+    try:
+        backtest = PairsBacktest(y_path, x_path, **backtest_params(args))
+        backtest.run()
+    except (ValueError, RuntimeError) as exc:
+        raise SystemExit(f"Pairs backtest failed: {exc}") from exc
+    print(f"✓ {backtest.y_symbol} vs {backtest.x_symbol}: {len(backtest.data):,} common bars")
+    for name, value in backtest.get_results().items():
+        print(f"  {name:<16}{value}")
+
+    label = args.label or f"{backtest.y_symbol}_{backtest.x_symbol}"
+    spread_path = output_dir / f"{label}_spread.csv"
+    frame = backtest.get_spread_frame()
+    frame["equity"] = backtest.get_equity_curve().to_numpy()
+    frame.to_csv(spread_path, index_label="Date")
+    trades_path = output_dir / f"{label}_trades.csv"
+    backtest.trades_frame().to_csv(trades_path, index=False)
+    print(f"✓ Spread, z-score, and equity saved to {spread_path}")
+    print(f"✓ Trades saved to {trades_path}")
+
+
+def run_screen(args: argparse.Namespace, output_dir: Path) -> None:
+    import pandas as pd
+
+    from backtester.cross_sectional import load_panel
+    from backtester.dataset import symbol_from_path
+    from backtester.pairs import PairsBacktest, screen_pairs
+
+    paths = expand_paths(args.screen)
+    if len(paths) < 2:
+        raise SystemExit("Screening needs at least two CSVs.")
+    try:
+        close = load_panel(paths, ["Close"])["Close"]
+    except (FileNotFoundError, ValueError) as exc:
+        raise SystemExit(f"Failed to load universe: {exc}") from exc
+    candidates = screen_pairs(
+        close,
+        window=args.window,
+        entry_z=args.entry_z,
+        log_prices=True,
+        min_correlation=args.min_correlation,
+        max_half_life=args.max_half_life,
+    )
+    pairs = close.shape[1] * (close.shape[1] - 1) // 2
+    print(f"✓ Screened {pairs:,} pairs from {close.shape[1]} symbols; {len(candidates):,} candidates")
+    print(candidates.head(args.top).to_string(index=False))
+
+    label = args.label or "screen"
+    screen_path = output_dir / f"{label}_candidates.csv"
+    candidates.to_csv(screen_path, index=False)
+    print(f"✓ Candidates saved to {screen_path}")
+    if args.backtest_top <= 0 or candidates.empty:
+        return
+
+    by_symbol = {symbol_from_path(path): path for path in paths}
+    rows = []
+    for candidate in candidates.head(args.backtest_top).itertuples(index=False):
+        try:
+            backtest = PairsBacktest(by_symbol[candidate.y], by_symbol[candidate.x], **backtest_params(args))
+            backtest.run()
+        except (ValueError, RuntimeError) as exc:
+            print(f"  Skipping {candidate.y}/{candidate.x}: {exc}")
+            continue
+        rows.append({"y": candidate.y, "x": candidate.x, **backtest.get_results()})
+    results = pd.DataFrame(rows)
+    print(results.to_string(index=False))
+    backtests_path = output_dir / f"{label}_backtests.csv"
+    results.to_csv(backtests_path, index=False)
+    print(f"✓ Candidate backtests saved to {backtests_path}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    output_dir = args.output_dir.expanduser().resolve()
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if args.pair is not None:
+        run_pair(args, output_dir)
+    else:
+        run_screen(args, output_dir)
+
+
+if __name__ == "__main__":
+    main()
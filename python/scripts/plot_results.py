@@ -1,18 +1,28 @@
 """
 Plot cumulative PnL from backtest trade history.
 
+Several trade files can be given at once; each gets its own chart (named
+after its label, next to ``--output``) and the charts render in parallel
+processes. Long histories are downsampled to the chart's pixel width first
+(``--downsample lttb|minmax|none``).
+
 Example:
     cd python
     python scripts/plot_results.py --input ../results/backtest_trades.csv
+    python scripts/plot_results.py --input ../results/week1/trades/backtest_trades_*.csv
 """
 
 from __future__ import annotations
 
 import argparse
 from pathlib import Path
+from typing import List, Optional
+
+import sys
 
-import matplotlib.pyplot as plt
-import pandas as pd
+PYTHON_DIR = Path(__file__).resolve().parents[1]
+if str(PYTHON_DIR) not in sys.path:
+    sys.path.insert(0, str(PYTHON_DIR))
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
 DEFAULT_INPUT = REPO_ROOT / "results" / "week1" / "trades" / "backtest_trades.csv"
@@ -24,51 +34,78 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--input",
         type=Path,
-        default=DEFAULT_INPUT,
-        help="CSV file with trade history (default: results/backtest_trades.csv).",
+        nargs="+",
+        default=[DEFAULT_INPUT],
+        help="CSV file(s) with trade history (default: results/backtest_trades.csv).",
     )
     parser.add_argument(
         "--output",
         type=Path,
         default=DEFAULT_OUTPUT,
-        help="Target path for saved figure (default: results/equity_curve.png).",
+        help="Target path for saved figure; with several inputs, charts are saved next to it as "
+        "<stem>_<label>.png (default: results/equity_curve.png).",
     )
     parser.add_argument(
         "--label",
         type=str,
-        help="Optional label/ticker for plot title (default: derived from input filename).",
+        help="Optional label/ticker for plot title, single input only (default: derived from input filename).",
+    )
+    parser.add_argument(
+        "--downsample",
+        choices=["lttb", "minmax", "none"],
+        default="lttb",
+        help="Shape-preserving reduction applied to each curve (default: lttb).",
+    )
+    parser.add_argument(
+        "--plot-points",
+        type=int,
+        help="Points kept per curve (default: the figure's pixel width, twice that for minmax).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Processes rendering charts in parallel (default: one per chart).",
     )
     return parser
 
 
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> None:
     parser = build_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    import pandas as pd
+
+    from backtester.plotting import FigureSpec, Panel, render_all
 
-    input_path = args.input.expanduser().resolve()
+    input_paths = [path.expanduser().resolve() for path in args.input]
     output_path = args.output.expanduser().resolve()
-    if not input_path.exists():
-        raise SystemExit(f"Trade CSV not found: {input_path}")
-
-    trades = pd.read_csv(input_path, parse_dates=["entry_date", "exit_date"])
-    if trades.empty:
-        raise SystemExit("Trade CSV is empty—run the backtest first.")
-
-    trades["cumulative_pnl"] = trades["pnl"].cumsum()
-    label = args.label or input_path.stem.replace("backtest_trades_", "").upper()
-
-    plt.figure(figsize=(12, 6))
-    plt.plot(trades["exit_date"], trades["cumulative_pnl"], marker="o")
-    plt.title(f"Backtest Equity Curve - {label}")
-    plt.xlabel("Exit Date")
-    plt.ylabel("Cumulative PnL ($)")
-    plt.grid(True, linestyle="--", alpha=0.4)
-    plt.tight_layout()
-
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    plt.savefig(output_path, dpi=150)
-    plt.close()
-    print(f"✓ Chart saved to {output_path}")
+    if args.label and len(input_paths) > 1:
+        raise SystemExit("--label only applies to a single --input.")
+    if (args.plot_points is not None and args.plot_points < 3) or (args.workers is not None and args.workers < 1):
+        raise SystemExit("--plot-points must be >= 3 and --workers >= 1.")
+
+    figures = []
+    for input_path in input_paths:
+        if not input_path.exists():
+            raise SystemExit(f"Trade CSV not found: {input_path}")
+        trades = pd.read_csv(input_path, parse_dates=["entry_date", "exit_date"])
+        if trades.empty:
+            raise SystemExit(f"Trade CSV is empty—run the backtest first: {input_path}")
+
+        cumulative_pnl = trades["pnl"].cumsum()
+        cumulative_pnl.index = trades["exit_date"]
+        label = args.label or input_path.stem.replace("backtest_trades_", "").upper()
+        path = output_path if len(input_paths) == 1 else output_path.with_name(f"{output_path.stem}_{label}{output_path.suffix}")
+        figures.append(
+            FigureSpec(
+                path,
+                [Panel({label: cumulative_pnl}, ylabel="Cumulative PnL ($)", linewidth=1.5, marker="o", legend=False)],
+                title=f"Backtest Equity Curve - {label}",
+                xlabel="Exit Date",
+            )
+        )
+
+    for path in render_all(figures, args.plot_points, args.downsample, args.workers):
+        print(f"✓ Chart saved to {path}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,78 @@
+"""
+Query the SQLite results store written by compare_configs.py / test_backtest.py.
+
+Example:
+    cd python
+    python scripts/query_results.py runs --symbol SPY --strategy ma_crossover
+    python scripts/query_results.py trades --symbol BTC_USD --start 2024-01-01 --output trades.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import List, Optional
+
+import sys
+
+PYTHON_DIR = Path(__file__).resolve().parents[1]
+if str(PYTHON_DIR) not in sys.path:
+    sys.path.insert(0, str(PYTHON_DIR))
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_STORE = REPO_ROOT / "results" / "backtests.sqlite"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Query stored backtest runs, trades, or equity curves.")
+    parser.add_argument(
+        "table",
+        choices=["runs", "trades", "equity"],
+        help="What to query: run metrics, individual trades, or equity points.",
+    )
+    parser.add_argument(
+        "--store",
+        type=Path,
+        default=DEFAULT_STORE,
+        help="SQLite results store (default: results/backtests.sqlite).",
+    )
+    parser.add_argument("--symbol", type=str, help="Filter by symbol (e.g., SPY).")
+    parser.add_argument("--strategy", type=str, help="Filter by strategy (e.g., ma_crossover).")
+    parser.add_argument("--start", type=str, help="Start date YYYY-MM-DD (inclusive).")
+    parser.add_argument("--end", type=str, help="End date YYYY-MM-DD (inclusive).")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="Optional CSV path; prints to stdout when omitted.",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    from backtester.result_store import ResultStore
+
+    store_path = args.store.expanduser().resolve()
+    if not store_path.exists():
+        raise SystemExit(f"Results store not found: {store_path}")
+
+    with ResultStore(store_path) as store:
+        query = {
+            "runs": store.query_runs,
+            "trades": store.query_trades,
+            "equity": store.query_equity,
+        }[args.table]
+        df = query(symbol=args.symbol, strategy=args.strategy, start=args.start, end=args.end)
+
+    if args.output:
+        output_path = args.output.expanduser().resolve()
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_csv(output_path, index=False)
+        print(f"✓ Saved {len(df)} rows to {output_path}")
+    else:
+        print(df.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Parameter-sensitivity heatmaps over a two-parameter SimpleBacktest grid.
+
+Evaluates every combination of two parameters, writes the metric matrices as
+CSV, and renders a heatmap per metric (Sharpe, total return, max drawdown).
+Axis values accept comma lists ("10,20,50") or inclusive ranges
+("start:stop:step", e.g. "5:100:5" or "1.0:3.0:0.25").
+
+Example:
+    cd python
+    python scripts/sensitivity.py --data ../data/SPY.csv \\
+        --x fast_window=5:100:1 --y slow_window=20:220:2 --param moving_average=ema
+    python scripts/sensitivity.py --data ../data/BTC.csv --x bollinger_window=10:40:2 \\
+        --y bollinger_std=1.0:3.0:0.25 --param strategy=rsi_bollinger
+    python scripts/sensitivity.py --data ../data/SPY.csv --x fast_window=5:200:1 \\
+        --y slow_window=20:400:1 --checkpoint   # rerun after an interrupt to resume
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+import sys
+
+PYTHON_DIR = Path(__file__).resolve().parents[1]
+if str(PYTHON_DIR) not in sys.path:
+    sys.path.insert(0, str(PYTHON_DIR))
+
+if TYPE_CHECKING:
+    from backtester.grid import GridResult
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_OUTPUT_DIR = REPO_ROOT / "results" / "sensitivity"
+HEATMAP_METRICS = ["sharpe_ratio", "total_return", "max_drawdown"]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Two-parameter sensitivity heatmaps for SimpleBacktest.")
+    parser.add_argument("--data", type=Path, required=True, help="Path to OHLCV CSV.")
+    parser.add_argument(
+        "--x",
+        required=True,
+        help="X axis as name=values, e.g. fast_window=5:50:5 or atr_period=7,14,21.",
+    )
+    parser.add_argument(
+        "--y",
+        required=True,
+        help="Y axis as name=values, e.g. slow_window=50:200:10 or atr_multiplier=1.5:4:0.5.",
+    )
+    parser.add_argument(
+        "--param",
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="Fixed SimpleBacktest parameter applied to every cell (repeatable).",
+    )
+    parser.add_argument(
+        "--config",
+        type=Path,
+        help="Optional JSON object of fixed SimpleBacktest parameters (--param overrides it).",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=DEFAULT_OUTPUT_DIR,
+        help="Directory for matrices and heatmaps (default: results/sensitivity).",
+    )
+    parser.add_argument(
+        "--label",
+        type=str,
+        help="Prefix for output files (default: <data stem>_<x>_<y>).",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        action="store_true",
+        help="Journal finished grid rows to <label>.journal so an interrupted grid resumes.",
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="With --checkpoint, discard an existing journal and start over.",
+    )
+    return parser
+
+
+def parse_scalar(text: str) -> Any:
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return text
+
+
+def parse_values(text: str) -> List[Any]:
+    """Parse "a,b,c" or an inclusive "start:stop:step" range."""
+    if ":" in text:
+        parts = text.split(":")
+        if len(parts) != 3:
+            raise SystemExit(f"Range must be start:stop:step, got '{text}'.")
+        start, stop, step = (parse_scalar(part) for part in parts)
+        if not all(isinstance(value, (int, float)) for value in (start, stop, step)) or step <= 0:
+            raise SystemExit(f"Invalid numeric range '{text}'.")
+        if all(isinstance(value, int) for value in (start, stop, step)):
+            return list(range(start, stop + 1, step))
+        count = math.floor((stop - start) / step + 1e-9) + 1
+        return [round(start + i * step, 10) for i in range(count)]
+    return [parse_scalar(part.strip()) for part in text.split(",") if part.strip()]
+
+
+def parse_axis(text: str) -> Tuple[str, List[Any]]:
+    name, sep, values = text.partition("=")
+    if not sep or not name.strip():
+        raise SystemExit(f"Axis must look like name=values, got '{text}'.")
+    parsed = parse_values(values)
+    if not parsed:
+        raise SystemExit(f"Axis '{name}' has no values.")
+    return name.strip(), parsed
+
+
+def load_base_params(args: argparse.Namespace) -> Dict[str, Any]:
+    params: Dict[str, Any] = {}
+    if args.config:
+        config_path = args.config.expanduser().resolve()
+        if not config_path.exists():
+            raise SystemExit(f"Config file not found: {config_path}")
+        try:
+            params.update(json.loads(config_path.read_text()))
+        except json.JSONDecodeError as exc:
+            raise SystemExit(f"Failed to parse config JSON: {exc}") from exc
+    for item in args.param:
+        name, sep, value = item.partition("=")
+        if not sep:
+            raise SystemExit(f"--param must look like NAME=VALUE, got '{item}'.")
+        params[name.strip()] = parse_scalar(value)
+    params.pop("csv_file", None)
+    params.pop("label", None)
+    return params
+
+
+def save_heatmap(grid: GridResult, metric: str, path: Path, title: str) -> None:
+    import matplotlib.pyplot as plt
+    import numpy as np
+
+    matrix = np.ma.masked_invalid(grid.metrics[metric])
+    fig, ax = plt.subplots(figsize=(10, 8))
+    image = ax.imshow(matrix, origin="lower", aspect="auto", cmap="RdYlGn", interpolation="nearest")
+    fig.colorbar(image, ax=ax, label=metric.replace("_", " ").title())
+
+    def ticks(values: List[Any]) -> Tuple[np.ndarray, List[str]]:
+        positions = np.unique(np.linspace(0, len(values) - 1, min(len(values), 12)).round().astype(int))
+        return positions, [str(values[i]) for i in positions]
+
+    x_pos, x_labels = ticks(grid.x_values)
+    y_pos, y_labels = ticks(grid.y_values)
+    ax.set_xticks(x_pos, x_labels, rotation=45)
+    ax.set_yticks(y_pos, y_labels)
+    ax.set_xlabel(grid.x_param)
+    ax.set_ylabel(grid.y_param)
+    ax.set_title(title)
+    fig.tight_layout()
+    fig.savefig(path, dpi=150)
+    plt.close(fig)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    import numpy as np
+
+    from backtester.grid import run_grid
+
+    data_path = args.data.expanduser().resolve()
+    if not data_path.exists():
+        raise SystemExit(f"Input CSV not found: {data_path}")
+    x_param, x_values = parse_axis(args.x)
+    y_param, y_values = parse_axis(args.y)
+    base_params = load_base_params(args)
+    label = args.label or f"{data_path.stem}_{x_param}_{y_param}"
+    output_dir = args.output_dir.expanduser().resolve()
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    checkpoint = None
+    if args.checkpoint:
+        from backtester.checkpoint import Checkpoint, fingerprint
+
+        stat = data_path.stat()
+        journal = output_dir / f"{label}.journal"
+        work = fingerprint(str(data_path), stat.st_size, stat.st_mtime_ns, x_param, x_values, y_param, y_values, base_params)
+        try:
+            checkpoint = Checkpoint(journal, work, resume=not args.restart)
+        except ValueError as exc:
+            raise SystemExit(f"{exc} (pass --restart)") from exc
+        if len(checkpoint):
+            print(f"✓ Resuming: {len(checkpoint)} block(s) of rows already in {journal}")
+
+    started = time.perf_counter()
+    try:
+        grid = run_grid(str(data_path), x_param, x_values, y_param, y_values, base_params, checkpoint=checkpoint)
+    except (TypeError, ValueError) as exc:
+        raise SystemExit(f"Invalid grid configuration: {exc}") from exc
+    except KeyboardInterrupt:
+        raise SystemExit("Interrupted: finished rows are journaled; rerun the same command to resume.") from None
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+    elapsed = time.perf_counter() - started
+    valid = int(np.isfinite(grid.metrics["total_return"]).sum())
+    print(f"✓ Evaluated {valid}/{len(x_values) * len(y_values)} valid cells in {elapsed:.2f}s")
+
+    grid_csv = output_dir / f"{label}_grid.csv"
+    grid.to_frame().to_csv(grid_csv, index=False)
+    print(f"✓ Grid saved to {grid_csv}")
+    for metric in HEATMAP_METRICS:
+        matrix_path = output_dir / f"{label}_{metric}.csv"
+        grid.matrix(metric).to_csv(matrix_path)
+        heatmap_path = output_dir / f"{label}_{metric}_heatmap.png"
+        save_heatmap(grid, metric, heatmap_path, f"{metric.replace('_', ' ').title()} - {label}")
+        print(f"✓ {metric} matrix/heatmap saved to {matrix_path.name}, {heatmap_path.name}")
+
+    best = grid.to_frame().dropna(subset=["sharpe_ratio"]).nlargest(1, "sharpe_ratio")
+    if not best.empty:
+        row = best.iloc[0]
+        print(
+            f"Best Sharpe: {row['sharpe_ratio']:.2f} at {x_param}={row[x_param]}, {y_param}={row[y_param]} "
+            f"(return {row['total_return']:.2f}%, max DD {row['max_drawdown']:.2f}%)"
+        )
+
+
+if __name__ == "__main__":
+    main()
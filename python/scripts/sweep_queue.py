@@ -0,0 +1,281 @@
+"""
+Distribute a compare_configs sweep over a work queue.
+
+``publish`` expands a config (a run list or a sweep spec) and queues each
+run under a sweep name. ``work`` leases runs, executes them against the
+worker's own data directory and result store, and pushes the summary
+metrics back. Its leases are renewed by a heartbeat thread while a run
+executes, and ``--metrics-file`` exports the worker's throughput and stage
+latencies for Prometheus. ``status`` shows progress and ``collect`` writes
+the summary CSV. Start as many workers as you like, on as many hosts as can reach the
+queue. A run whose worker dies is retried once its lease lapses, and each
+run's result is stored once. A run a worker fails (say its CSV is missing on
+that host) is retried after ``--retry-delay`` seconds, by another worker
+while any other is active.
+
+Relative ``csv_file`` paths in the config are resolved by each worker
+against ``--data-root``, so hosts can keep their data in different places.
+
+Example:
+    cd python
+    python scripts/sweep_queue.py publish --queue sqlite:///../results/queue.sqlite --config configs/spy_ma_sweep.json
+    python scripts/sweep_queue.py work --queue sqlite:///../results/queue.sqlite --data-root /mnt/data/market
+    python scripts/sweep_queue.py status --queue sqlite:///../results/queue.sqlite --sweep spy_ma_sweep
+    python scripts/sweep_queue.py collect --queue sqlite:///../results/queue.sqlite --sweep spy_ma_sweep
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set
+
+import sys
+
+PYTHON_DIR = Path(__file__).resolve().parents[1]
+SCRIPTS_DIR = Path(__file__).resolve().parent
+for path in (PYTHON_DIR, SCRIPTS_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from compare_configs import DEFAULT_STORE, REPO_ROOT, SUMMARY_COLUMNS
+
+if TYPE_CHECKING:
+    from backtester.work_queue import WorkQueue
+
+DEFAULT_QUEUE = f"sqlite:///{REPO_ROOT / 'results' / 'queue.sqlite'}"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Publish, work on, and collect a distributed backtest sweep.")
+    commands = parser.add_subparsers(dest="action", metavar="action", required=True)
+
+    publish = commands.add_parser("publish", help="Queue every run of a config.")
+    publish.add_argument("--config", type=Path, required=True, help="Run list or sweep spec JSON.")
+    publish.add_argument("--sweep", type=str, help="Sweep name (default: config stem).")
+
+    work = commands.add_parser("work", help="Lease and run queued backtests until the queue is drained.")
+    work.add_argument("--worker-id", type=str, help="Worker name in leases (default: <host>:<pid>).")
+    work.add_argument("--sweep", type=str, help="Only take runs from this sweep.")
+    work.add_argument("--data-root", type=Path, default=REPO_ROOT, help="Base for relative csv_file paths.")
+    work.add_argument("--lease", type=float, default=300.0, help="Lease length in seconds (default: 300).")
+    work.add_argument("--batch", type=int, default=1, help="Runs leased per request (default: 1).")
+    work.add_argument("--poll", type=float, default=5.0, help="Seconds between polls of an empty queue.")
+    work.add_argument(
+        "--idle-exit",
+        type=float,
+        default=30.0,
+        help="Exit after the queue has been empty this long, in seconds (default: 30; 0 exits at once).",
+    )
+    work.add_argument("--max-tasks", type=int, help="Exit after this many runs.")
+    work.add_argument(
+        "--retry-delay",
+        type=float,
+        default=30.0,
+        help="Seconds a failed run waits before it is leased again (default: 30).",
+    )
+    work.add_argument(
+        "--store",
+        type=Path,
+        nargs="?",
+        const=DEFAULT_STORE,
+        help="Opt-in local SQLite results store (bare --store: results/backtests.sqlite; default: off).",
+    )
+    work.add_argument(
+        "--progress-interval",
+        type=float,
+        default=30.0,
+        help="Seconds between throughput lines; 0 turns them off (default: 30).",
+    )
+    work.add_argument("--metrics-file", type=Path, help="Prometheus text file with this worker's live throughput metrics.")
+
+    status = commands.add_parser("status", help="Show task counts and failures.")
+    status.add_argument("--sweep", type=str, help="Only this sweep.")
+
+    collect = commands.add_parser("collect", help="Write the collected results as a summary CSV.")
+    collect.add_argument("--sweep", type=str, required=True, help="Sweep to collect.")
+    collect.add_argument("--summary-csv", type=Path, help="Output path (default: results/week2/comparisons/<sweep>_summary.csv).")
+
+    for sub in (publish, work, status, collect):
+        sub.add_argument("--queue", type=str, default=DEFAULT_QUEUE, help="Queue URL (default: sqlite:///results/queue.sqlite).")
+        sub.add_argument("--max-attempts", type=int, default=3, help="Leases per run before it fails (default: 3).")
+    return parser
+
+
+def run_publish(args: argparse.Namespace, queue: WorkQueue) -> None:
+    from compare_configs import iter_runs, load_config, report_sweep
+
+    from backtester.checkpoint import run_key
+
+    sweep = load_config(args.config.expanduser().resolve())
+    name = args.sweep or args.config.stem
+    added = queue.publish(name, ((run_key(run), run) for run in iter_runs(sweep, None)))
+    report_sweep(sweep)
+    print(f"✓ Queued {added:,} new run(s) under {name!r} ({sweep.stats['valid'] - added:,} already queued)")
+
+
+class Heartbeat(threading.Thread):
+    """Renews the worker's leases every third of a lease on its own connection."""
+
+    def __init__(self, url: str, worker: str, lease_seconds: float, max_attempts: int) -> None:
+        super().__init__(daemon=True, name="lease-heartbeat")
+        self.url = url
+        self.worker = worker
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.held: Set[str] = set()
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        from backtester.work_queue import open_queue
+
+        with open_queue(self.url, max_attempts=self.max_attempts) as queue:
+            while not self.stopped.wait(self.lease_seconds / 3):
+                with self.lock:
+                    held = list(self.held)
+                if held:
+                    queue.heartbeat(self.worker, held, self.lease_seconds)
+
+
+def run_work(args: argparse.Namespace, queue: WorkQueue) -> None:
+    from compare_configs import close_worker_state, execute_run
+
+    from backtester.telemetry import Telemetry
+
+    if args.lease <= 0 or args.batch < 1:
+        raise SystemExit("--lease must be positive and --batch at least 1.")
+    worker = args.worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    data_root = args.data_root.expanduser().resolve()
+    store_path = args.store.expanduser().resolve() if args.store else None
+    heartbeat = Heartbeat(args.queue, worker, args.lease, args.max_attempts)
+    heartbeat.start()
+    telemetry = Telemetry(
+        labels={"sweep": args.sweep or "all", "worker": worker},
+        metrics_path=args.metrics_file.expanduser().resolve() if args.metrics_file else None,
+        interval=args.progress_interval if args.progress_interval > 0 else 30.0,
+        printer=print if args.progress_interval > 0 else None,
+        depth=lambda: queue.stats(args.sweep)["pending"],
+    )
+    done = attempts_failed = lost = 0
+    failed: Set[str] = set()
+    idle_since = time.monotonic()
+    held: List[str] = []
+    print(f"✓ Worker {worker} polling {args.queue}")
+    try:
+        while args.max_tasks is None or done + attempts_failed < args.max_tasks:
+            limit = args.batch if args.max_tasks is None else min(args.batch, args.max_tasks - done - attempts_failed)
+            tasks = queue.lease(worker, args.lease, limit=limit, sweep=args.sweep)
+            if not tasks:
+                # Pending runs this worker cannot lease yet are waiting out a retry
+                # delay or left to other workers; the queue is not empty until they finish.
+                waiting = queue.stats(args.sweep)["pending"]
+                if waiting:
+                    idle_since = time.monotonic()
+                elif time.monotonic() - idle_since >= args.idle_exit:
+                    break
+                remaining = args.idle_exit - (time.monotonic() - idle_since)
+                time.sleep(args.poll if waiting else min(args.poll, max(remaining, 0.0)))
+                continue
+            held = [task.task_id for task in tasks]
+            with heartbeat.lock:
+                heartbeat.held.update(held)
+            for task in tasks:
+                run = dict(task.payload)
+                csv_file = Path(run.get("csv_file", "")).expanduser()
+                run["csv_file"] = str(csv_file if csv_file.is_absolute() else data_root / csv_file)
+                try:
+                    if not Path(run["csv_file"]).is_file():
+                        raise FileNotFoundError(f"Data file not found on {worker}: {run['csv_file']}")
+                    metrics, _, _, stats = execute_run((run, store_path, None, 20))
+                except (FileNotFoundError, ValueError, RuntimeError, KeyError) as exc:
+                    queue.fail(worker, task.task_id, f"{type(exc).__name__}: {exc}")
+                    telemetry.record_failure()
+                    attempts_failed += 1
+                    failed.add(task.task_id)
+                    print(f"  Failed {task.task_id} (attempt {task.attempt}): {exc}")
+                else:
+                    telemetry.record_run(stats["bars"], stats["stages"], busy=stats["busy"])
+                    result = {name: value.item() if hasattr(value, "item") else value for name, value in metrics.items()}
+                    if queue.complete(worker, task.task_id, result):
+                        done += 1
+                        print(f"✓ Completed {metrics['label']} (attempt {task.attempt})")
+                    else:
+                        lost += 1
+                finally:
+                    held.remove(task.task_id)
+                    with heartbeat.lock:
+                        heartbeat.held.discard(task.task_id)
+                    telemetry.tick()
+            idle_since = time.monotonic()
+    except KeyboardInterrupt:
+        print(f"Interrupted: handing {len(held)} leased run(s) back to the queue.")
+    finally:
+        for task_id in held:
+            queue.release(worker, task_id)
+        heartbeat.stopped.set()
+        close_worker_state()
+    if telemetry.metrics_path is not None:
+        telemetry.tick(force=True)
+    report = telemetry.summary()
+    print(f"✓ Worker {worker}: {done} completed, {len(failed)} failed, {lost} already completed elsewhere")
+    print(
+        f"  {report['runs_per_second']:.1f} runs/s, {report['bars_per_second']:,.0f} bars/s, "
+        f"{report['worker_utilization'] * 100:.0f}% busy over {report['elapsed_s']:.0f}s"
+    )
+
+
+def run_status(args: argparse.Namespace, queue: WorkQueue) -> None:
+    stats = queue.stats(args.sweep)
+    total = sum(stats[state] for state in ("pending", "leased", "done", "failed"))
+    print(f"{args.sweep or 'all sweeps'}: {total:,} run(s)")
+    for name, count in stats.items():
+        print(f"  {name:<9}{count:>10,}")
+    for task_id, error in queue.failures(args.sweep)[:10]:
+        print(f"  failed {task_id}: {error}")
+
+
+def run_collect(args: argparse.Namespace, queue: WorkQueue) -> None:
+    summary_path = (
+        args.summary_csv.expanduser().resolve()
+        if args.summary_csv
+        else REPO_ROOT / "results" / "week2" / "comparisons" / f"{args.sweep}_summary.csv"
+    )
+    summary_path.parent.mkdir(parents=True, exist_ok=True)
+    rows = 0
+    with open(summary_path, "w", newline="") as handle:
+        summary = csv.DictWriter(handle, fieldnames=SUMMARY_COLUMNS, extrasaction="ignore")
+        summary.writeheader()
+        for _, result in queue.results(args.sweep):
+            summary.writerow(result)
+            rows += 1
+    stats = queue.stats(args.sweep)
+    print(f"✓ {rows:,} result(s) saved to {summary_path}")
+    if stats["pending"] or stats["leased"] or stats["failed"]:
+        print(f"  Incomplete: {stats['pending']:,} pending, {stats['leased']:,} leased, {stats['failed']:,} failed")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    from backtester.work_queue import open_queue
+
+    try:
+        options = {"max_attempts": args.max_attempts}
+        if args.action == "work":
+            options["retry_delay"] = args.retry_delay
+        queue = open_queue(args.queue, **options)
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from exc
+    actions: Dict[str, Any] = {"publish": run_publish, "work": run_work, "status": run_status, "collect": run_collect}
+    with queue:
+        actions[args.action](args, queue)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ Utility script to run the SimpleBacktest engine on a CSV file.
 Example:
     cd python
     python scripts/test_backtest.py --data ../data/AAPL.csv
+    python scripts/test_backtest.py --data ../data/AAPL.csv --rolling-window 126
 """
 
 from __future__ import annotations
@@ -11,7 +12,7 @@ from __future__ import annotations
 import argparse
 import json
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import sys
 
@@ -19,11 +20,10 @@ PYTHON_DIR = Path(__file__).resolve().parents[1]
 if str(PYTHON_DIR) not in sys.path:
     sys.path.insert(0, str(PYTHON_DIR))
 
-from backtester.simple_backtest import SimpleBacktest
-
 REPO_ROOT = Path(__file__).resolve().parents[2]
 DEFAULT_DATA = REPO_ROOT / "data" / "AAPL.csv"
 DEFAULT_TRADES = REPO_ROOT / "results" / "week1" / "trades" / "backtest_trades.csv"
+DEFAULT_STORE = REPO_ROOT / "results" / "backtests.sqlite"
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -120,6 +120,12 @@ def build_parser() -> argparse.ArgumentParser:
         default=3.0,
         help="ATR multiplier for trailing stops (default: 3.0).",
     )
+    parser.add_argument(
+        "--stop-fill",
+        choices=["close", "intrabar"],
+        default="close",
+        help="Check the ATR stop at the bar Close (default) or intrabar against High/Low.",
+    )
     parser.add_argument(
         "--use-atr-vol-filter",
         action="store_true",
@@ -173,6 +179,18 @@ def build_parser() -> argparse.ArgumentParser:
         default=DEFAULT_TRADES,
         help="CSV path for exporting individual trades (default: results/backtest_trades.csv).",
     )
+    parser.add_argument(
+        "--rolling-window",
+        type=int,
+        help="Also export the equity curve with rolling/expanding metrics over this many bars "
+        "(next to the trades CSV, as <name>_equity.csv).",
+    )
+    parser.add_argument(
+        "--trade-window",
+        type=int,
+        default=20,
+        help="Trades in the rolling win rate used with --rolling-window (default: 20).",
+    )
     parser.add_argument(
         "--rsi-period",
         type=int,
@@ -215,6 +233,35 @@ def build_parser() -> argparse.ArgumentParser:
         default=45.0,
         help="RSI threshold (<=) to close shorts (default: 45).",
     )
+    parser.add_argument(
+        "--precision",
+        choices=["float64", "float32"],
+        default="float64",
+        help="Numeric precision for prices, indicators, and signals (default: float64).",
+    )
+    parser.add_argument(
+        "--timeframe",
+        type=str,
+        help="Resample bars to a coarser pandas frequency before running (e.g. W, ME, 4h).",
+    )
+    parser.add_argument(
+        "--precision-report",
+        action="store_true",
+        help="Also run float64 vs float32 and report indicator/signal/metric drift and flipped trades.",
+    )
+    parser.add_argument(
+        "--export-binary",
+        type=Path,
+        help="Also write signals, indicators, and trades to this binary exchange file (.qtbx).",
+    )
+    parser.add_argument(
+        "--store",
+        type=Path,
+        nargs="?",
+        const=DEFAULT_STORE,
+        help="Opt-in SQLite results store used to reuse identical runs "
+        "(bare --store: results/backtests.sqlite; default: off).",
+    )
     parser.set_defaults(allow_short=None)
     return parser
 
@@ -265,9 +312,14 @@ def format_results(
     return "\n".join(lines)
 
 
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> None:
     parser = build_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    # Heavy imports are deferred so --help and argument errors return instantly.
+    from backtester.precision import compare_precision
+    from backtester.result_store import ResultStore
+    from backtester.simple_backtest import SimpleBacktest
+
     if args.config:
         config_values = load_config(args.config.expanduser().resolve())
         apply_config_overrides(args, parser, config_values)
@@ -276,8 +328,7 @@ def main() -> None:
     trades_path = args.trades_csv.expanduser().resolve()
     trades_path.parent.mkdir(parents=True, exist_ok=True)
 
-    backtest = SimpleBacktest(
-        str(data_path),
+    params = dict(
         initial_capital=args.capital,
         position_size=args.position_size,
         moving_average=args.ma_type,
@@ -304,13 +355,24 @@ def main() -> None:
         use_atr_trailing_stop=args.use_atr_stop,
         atr_period=args.atr_period,
         atr_multiplier=args.atr_multiplier,
+        stop_fill=args.stop_fill,
         use_atr_volatility_filter=args.use_atr_vol_filter,
         atr_volatility_threshold=args.atr_vol_threshold,
+        timeframe=args.timeframe,
     )
-    backtest.load_data()
-    backtest.calculate_indicators()
-    backtest.generate_signals()
-    backtest.run()
+    try:
+        backtest = SimpleBacktest(str(data_path), precision=args.precision, **params)
+    except ValueError as exc:
+        raise SystemExit(f"Invalid backtest configuration: {exc}") from exc
+    from_store = False
+    if args.store:
+        with ResultStore(args.store.expanduser().resolve()) as store:
+            from_store = store.run_cached(backtest, label=data_path.stem)
+    else:
+        backtest.load_data()
+        backtest.calculate_indicators()
+        backtest.generate_signals()
+        backtest.run()
 
     results = backtest.get_results()
     initial_capital = float(args.capital)
@@ -333,6 +395,7 @@ def main() -> None:
             detail_lines.append(
                 f"ATR Trailing Stop (period/mult):..... {args.atr_period}/{args.atr_multiplier}"
             )
+            detail_lines.append(f"ATR Stop Fill:....................... {args.stop_fill}")
         if args.use_atr_vol_filter:
             detail_lines.append(
                 f"ATR Volatility Filter (threshold):... {args.atr_vol_threshold:.4f}"
@@ -363,6 +426,8 @@ def main() -> None:
             f"Bollinger Window/Std:................ {args.bollinger_window}/{args.bollinger_std}",
             f"Short Selling Enabled:............... {'Yes' if backtest.allow_short else 'No'}",
         ]
+    if backtest.timeframe is not None:
+        detail_lines.append(f"Timeframe:........................... {backtest.timeframe}")
     print(
         format_results(
             results,
@@ -373,8 +438,35 @@ def main() -> None:
         )
     )
 
+    if from_store:
+        print("Results loaded from store (identical config and data already executed).")
+    if args.precision_report:
+        print(compare_precision(str(data_path), **params).to_text())
     backtest.export_trades_to_csv(str(trades_path))
     print(f"Exported {len(backtest.trades)} trades to {trades_path}")
+    if args.rolling_window:
+        try:
+            rolling = backtest.get_rolling_metrics(args.rolling_window, args.trade_window)
+        except ValueError as exc:
+            raise SystemExit(f"Invalid rolling window: {exc}") from exc
+        sharpe = rolling["rolling_sharpe"].dropna()
+        if not sharpe.empty:
+            print(
+                f"Rolling {args.rolling_window}-bar Sharpe min/median/max: "
+                f"{sharpe.min():.2f}/{sharpe.median():.2f}/{sharpe.max():.2f} "
+                f"({(sharpe > 0).mean() * 100:.0f}% of windows positive)"
+            )
+        equity_path = trades_path.with_name(f"{trades_path.stem}_equity.csv")
+        backtest.export_equity_to_csv(str(equity_path), args.rolling_window, args.trade_window)
+        print(f"Exported equity curve and rolling metrics to {equity_path}")
+    if args.export_binary:
+        if backtest.signals is None:
+            # Store hits restore trades/equity only; rebuild signals without re-running.
+            backtest.load_data()
+            backtest.calculate_indicators()
+            backtest.generate_signals()
+        binary_path = backtest.export_signals_binary(str(args.export_binary.expanduser().resolve()))
+        print(f"Exported signals/indicators/trades to {binary_path}")
 
 
 if __name__ == "__main__":